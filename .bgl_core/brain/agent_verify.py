@@ -1,8 +1,20 @@
 import importlib
+import inspect
 import json
-import importlib
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import List, Dict, Any, Iterable, Set
+from typing import List, Dict, Any, Iterable, Optional, Set
+
+try:
+    from .check_context import CheckContext, InputDigest  # type: ignore
+except Exception:
+    from check_context import CheckContext, InputDigest  # type: ignore
+try:
+    from .config_loader import load_config  # type: ignore
+except Exception:
+    from config_loader import load_config  # type: ignore
 
 
 def _normalize_path(path: str) -> str:
@@ -60,59 +72,157 @@ def _load_patterns(project_root: Path) -> List[Dict[str, Any]]:
         return []
 
 
-def run_all_checks(project_root: Path) -> Dict[str, Any]:
+def _cache_path(project_root: Path) -> Path:
+    return project_root / ".bgl_core" / "logs" / "agent_verify_cache.json"
+
+
+def _load_cache(project_root: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(_cache_path(project_root).read_text(encoding="utf-8"))
+        if isinstance(data, dict) and data.get("version") == 1:
+            return data
+    except Exception:
+        pass
+    return {"version": 1, "files": {}, "results": {}}
+
+
+def _save_cache(project_root: Path, cache: Dict[str, Any]) -> None:
+    try:
+        path = _cache_path(project_root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+    except Exception:
+        pass
+
+
+def _import_check(check_name: str):
+    try:
+        return importlib.import_module(f".checks.{check_name}", package="brain")
+    except Exception:
+        return importlib.import_module(f"checks.{check_name}")
+
+
+def _accepts_context(fn) -> bool:
+    try:
+        return len(inspect.signature(fn).parameters) >= 2
+    except (TypeError, ValueError):
+        return False
+
+
+def _failed(pat: Dict[str, Any], check_name: str, message: str) -> Dict[str, Any]:
+    return {
+        "id": pat.get("id", check_name),
+        "check": check_name,
+        "passed": False,
+        "evidence": [message],
+        "scope": pat.get("scope", []),
+    }
+
+
+def _run_checks(project_root: Path, patterns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    مصدر موحد لتشغيل كل checks المحددة في inference_patterns.json.
-    يعيد JSON يحتوي على النتائج وتمرير/فشل إجمالي.
+    Run the checks behind `patterns` on a thread pool, in pattern order.
+
+    Artifacts are loaded once into a shared CheckContext. A check that declares
+    INPUTS (see check_context.py) is memoized on the content digest of its
+    code, inputs and ENV, persisted in .bgl_core/logs/agent_verify_cache.json;
+    checks without a declaration (or CACHEABLE = False) always run.
     """
-    results: List[Dict[str, Any]] = []
-    patterns = _load_patterns(project_root)
-    if not patterns:
-        return {"passed": True, "results": results}
-    for pat in patterns:
+    cfg = load_config(project_root) or {}
+    try:
+        timeout = float(os.getenv("BGL_AGENT_VERIFY_TIMEOUT", cfg.get("agent_verify_check_timeout_sec", 30)) or 30)
+    except Exception:
+        timeout = 30.0
+    try:
+        workers = int(os.getenv("BGL_AGENT_VERIFY_WORKERS", cfg.get("agent_verify_workers", 0)) or 0)
+    except Exception:
+        workers = 0
+    use_cache = str(os.getenv("BGL_AGENT_VERIFY_CACHE", cfg.get("agent_verify_cache", 1))).strip() != "0"
+
+    cache = _load_cache(project_root) if use_cache else {"version": 1, "files": {}, "results": {}}
+    digests = InputDigest(project_root, cache.get("files"))
+    memo: Dict[str, Any] = cache.setdefault("results", {})
+    context = CheckContext(project_root)
+
+    slots: List[Optional[Dict[str, Any]]] = [None] * len(patterns)
+    jobs: List[Dict[str, Any]] = []
+    for i, pat in enumerate(patterns):
         check_name = pat.get("check")
-        if not check_name:
-            continue
         try:
-            module = importlib.import_module(f".checks.{check_name}", package="brain")
-        except Exception:
-            try:
-                module = importlib.import_module(f"checks.{check_name}")
-            except Exception as e:
-                results.append(
-                    {
-                        "id": pat.get("id", check_name),
-                        "check": check_name,
-                        "passed": False,
-                        "evidence": [f"import failed: {e}"],
-                        "scope": pat.get("scope", []),
-                    }
-                )
-                continue
+            module = _import_check(check_name)
+        except Exception as e:
+            slots[i] = _failed(pat, check_name, f"import failed: {e}")
+            continue
         if not hasattr(module, "run"):
-            results.append(
-                {
-                    "id": pat.get("id", check_name),
-                    "check": check_name,
-                    "passed": False,
-                    "evidence": ["missing run()"],
-                    "scope": pat.get("scope", []),
-                }
-            )
+            slots[i] = _failed(pat, check_name, "missing run()")
             continue
+        digest = None
+        inputs = getattr(module, "INPUTS", None)
+        if use_cache and inputs is not None and getattr(module, "CACHEABLE", True):
+            try:
+                digest = digests.digest(getattr(module, "__file__", None), inputs, getattr(module, "ENV", ()))
+            except Exception:
+                digest = None
+            hit = memo.get(check_name) if digest else None
+            if hit and hit.get("digest") == digest and isinstance(hit.get("res"), dict):
+                slots[i] = {"res": hit["res"], "cached": True}
+                continue
+        jobs.append({"index": i, "name": check_name, "module": module, "digest": digest})
+
+    def _call(job: Dict[str, Any]) -> Dict[str, Any]:
+        job["started"] = time.monotonic()
+        fn = job["module"].run
+        if _accepts_context(fn):
+            return fn(project_root, context)
+        return fn(project_root)
+
+    if jobs:
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(workers or 8, len(jobs))), thread_name_prefix="agent_verify"
+        )
         try:
-            res = module.run(project_root)
-        except Exception as e:
-            results.append(
-                {
-                    "id": pat.get("id", check_name),
-                    "check": check_name,
-                    "passed": False,
-                    "evidence": [f"runtime error: {e}"],
-                    "scope": pat.get("scope", []),
-                }
-            )
+            pending = {pool.submit(_call, job): job for job in jobs}
+            while pending:
+                started = [j["started"] for j in pending.values() if "started" in j]
+                wait_for = (min(started) + timeout - time.monotonic()) if started else 0.1
+                done, _ = wait(list(pending), timeout=max(0.01, wait_for), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    job = pending.pop(fut)
+                    pat = patterns[job["index"]]
+                    try:
+                        res = fut.result()
+                    except Exception as e:
+                        slots[job["index"]] = _failed(pat, job["name"], f"runtime error: {e}")
+                        continue
+                    slots[job["index"]] = {"res": res, "cached": False}
+                    if job["digest"] and isinstance(res, dict):
+                        memo[job["name"]] = {"digest": job["digest"], "res": res}
+                now = time.monotonic()
+                for fut, job in list(pending.items()):
+                    if "started" in job and now - job["started"] >= timeout:
+                        # The thread cannot be killed; its late result is discarded.
+                        pending.pop(fut)
+                        slots[job["index"]] = _failed(
+                            patterns[job["index"]], job["name"], f"timeout after {timeout:g}s"
+                        )
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    if use_cache:
+        cache["files"] = digests.file_hashes
+        _save_cache(project_root, cache)
+
+    results: List[Dict[str, Any]] = []
+    for pat, slot in zip(patterns, slots):
+        if slot is None:
+            continue
+        if "res" not in slot:
+            results.append(slot)
             continue
+        res = slot["res"]
+        check_name = pat.get("check")
         results.append(
             {
                 "id": pat.get("id", check_name),
@@ -123,7 +233,18 @@ def run_all_checks(project_root: Path) -> Dict[str, Any]:
                 "recommendation": pat.get("recommendation", ""),
             }
         )
+    return results
+
 
+def run_all_checks(project_root: Path) -> Dict[str, Any]:
+    """
+    مصدر موحد لتشغيل كل checks المحددة في inference_patterns.json.
+    يعيد JSON يحتوي على النتائج وتمرير/فشل إجمالي.
+    """
+    patterns = _load_patterns(project_root)
+    if not patterns:
+        return {"passed": True, "results": []}
+    results = _run_checks(project_root, [p for p in patterns if p.get("check")])
     all_passed = all(r.get("passed") for r in results)
     return {"passed": all_passed, "results": results}
 
@@ -140,61 +261,7 @@ def run_contextual_checks(project_root: Path, changed_files: List[str]) -> Dict[
     filtered = [p for p in patterns if _pattern_matches_scope(p.get("scope"), scopes)]
     if not filtered:
         filtered = patterns
-    results: List[Dict[str, Any]] = []
-    for pat in filtered:
-        check_name = pat.get("check")
-        if not check_name:
-            continue
-        try:
-            module = importlib.import_module(f".checks.{check_name}", package="brain")
-        except Exception:
-            try:
-                module = importlib.import_module(f"checks.{check_name}")
-            except Exception as e:
-                results.append(
-                    {
-                        "id": pat.get("id", check_name),
-                        "check": check_name,
-                        "passed": False,
-                        "evidence": [f"import failed: {e}"],
-                        "scope": pat.get("scope", []),
-                    }
-                )
-                continue
-        if not hasattr(module, "run"):
-            results.append(
-                {
-                    "id": pat.get("id", check_name),
-                    "check": check_name,
-                    "passed": False,
-                    "evidence": ["missing run()"],
-                    "scope": pat.get("scope", []),
-                }
-            )
-            continue
-        try:
-            res = module.run(project_root)
-        except Exception as e:
-            results.append(
-                {
-                    "id": pat.get("id", check_name),
-                    "check": check_name,
-                    "passed": False,
-                    "evidence": [f"runtime error: {e}"],
-                    "scope": pat.get("scope", []),
-                }
-            )
-            continue
-        results.append(
-            {
-                "id": pat.get("id", check_name),
-                "check": check_name,
-                "passed": bool(res.get("passed", False)),
-                "evidence": res.get("evidence", []),
-                "scope": res.get("scope", pat.get("scope", [])),
-                "recommendation": pat.get("recommendation", ""),
-            }
-        )
+    results = _run_checks(project_root, [p for p in filtered if p.get("check")])
     all_passed = all(r.get("passed") for r in results)
     return {
         "passed": all_passed,
@@ -29,6 +29,7 @@ try:
     from .decision_engine import decide  # type: ignore
     from .observations import latest_env_snapshot  # type: ignore
     from .self_policy import load_self_policy  # type: ignore
+    from .runtime_contracts import RuntimeContractIndex  # type: ignore
 except Exception:
     from brain_types import ActionRequest, ActionKind, GateResult
     from config_loader import load_config
@@ -36,6 +37,7 @@ except Exception:
     from decision_engine import decide
     from observations import latest_env_snapshot
     from self_policy import load_self_policy
+    from runtime_contracts import RuntimeContractIndex
 
 
 def _ensure_agent_permissions_table(conn: sqlite3.Connection):
@@ -126,11 +128,16 @@ class Authority:
         self._decision_cache_ttl_s: float = float(
             os.getenv("BGL_DECISION_CACHE_TTL", "600") or 600
         )
-        self._runtime_contracts_cache: Dict[str, Any] = {
-            "ts": 0.0,
-            "routes": {},
-            "files": {},
-        }
+        # Runtime evidence from analysis/code_contracts.json, materialized into an
+        # indexed knowledge.db table (see runtime_contracts.py).
+        self._runtime_contracts = RuntimeContractIndex(
+            self.db_path,
+            root_dir / "analysis" / "code_contracts.json",
+            normalize_route=self._normalize_route,
+            normalize_path=self._normalize_path,
+        )
+        self._runtime_contracts_build_ts: float = 0.0
+        # Minimum spacing between attempts to build a missing code_contracts.json.
         self._runtime_contracts_ttl_s: float = float(
             os.getenv("BGL_RUNTIME_CONTRACTS_TTL", "600") or 600
         )
@@ -194,15 +201,13 @@ class Authority:
         p = str(path).replace("\\", "/").lstrip("./")
         return p
 
-    def _load_runtime_contracts(self) -> Dict[str, Any]:
+    def _load_runtime_contracts(self) -> RuntimeContractIndex:
+        contracts_path = self._runtime_contracts.contracts_path
         now = time.time()
-        if (now - float(self._runtime_contracts_cache.get("ts") or 0)) < float(
+        if not contracts_path.exists() and (now - self._runtime_contracts_build_ts) >= float(
             self._runtime_contracts_ttl_s
         ):
-            return self._runtime_contracts_cache
-
-        contracts_path = self.root_dir / "analysis" / "code_contracts.json"
-        if not contracts_path.exists():
+            self._runtime_contracts_build_ts = now
             try:
                 from .code_contracts import build_code_contracts  # type: ignore
             except Exception:
@@ -215,44 +220,11 @@ class Authority:
                     build_code_contracts(self.root_dir)
                 except Exception:
                     pass
-
-        routes: Dict[str, Dict[str, Any]] = {}
-        files: Dict[str, Dict[str, Any]] = {}
-        try:
-            data = json.loads(contracts_path.read_text(encoding="utf-8"))
-            for c in data.get("contracts", []):
-                if not isinstance(c, dict):
-                    continue
-                runtime = c.get("runtime") or {}
-                if not runtime:
-                    continue
-                kind = str(c.get("kind") or "")
-                if kind == "api":
-                    route = self._normalize_route(str(c.get("route") or ""))
-                    if route:
-                        routes[route] = runtime
-                    file_path = self._normalize_path(str(c.get("file") or ""))
-                    if file_path:
-                        files[file_path] = runtime
-                elif kind == "php_module":
-                    file_path = self._normalize_path(str(c.get("file") or ""))
-                    if file_path:
-                        files[file_path] = runtime
-        except Exception:
-            routes = {}
-            files = {}
-
-        self._runtime_contracts_cache = {
-            "ts": now,
-            "routes": routes,
-            "files": files,
-        }
-        return self._runtime_contracts_cache
+        self._runtime_contracts.sync()
+        return self._runtime_contracts
 
     def _runtime_hint(self, scope: List[str], metadata: Dict[str, Any]) -> Dict[str, Any]:
-        cache = self._load_runtime_contracts()
-        routes = cache.get("routes") or {}
-        files = cache.get("files") or {}
+        index = self._load_runtime_contracts()
 
         scope_items = []
         for item in scope or []:
@@ -271,18 +243,15 @@ class Authority:
 
         matched: List[Tuple[str, Dict[str, Any]]] = []
         for p in scope_items:
-            if p in files:
-                matched.append((f"file:{p}", files[p]))
-            else:
-                # try suffix match
-                for fpath, stats in files.items():
-                    if fpath.endswith(p):
-                        matched.append((f"file:{fpath}", stats))
-                        break
+            # exact path, else first file ending with it
+            hit = index.lookup_file(p)
+            if hit:
+                matched.append((f"file:{hit[0]}", hit[1]))
 
         for r in route_candidates:
-            if r in routes:
-                matched.append((f"route:{r}", routes[r]))
+            stats = index.lookup_route(r)
+            if stats is not None:
+                matched.append((f"route:{r}", stats))
 
         if not matched:
             return {"has_evidence": False, "event_count": 0, "error_count": 0}
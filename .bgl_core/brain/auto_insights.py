@@ -5,7 +5,14 @@ import re
 import os
 import time
 from pathlib import Path
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+try:
+    from .db_utils import connect_db  # type: ignore
+    from .schema_migrations import ensure_schema  # type: ignore
+except Exception:
+    from db_utils import connect_db  # type: ignore
+    from schema_migrations import ensure_schema  # type: ignore
 
 
 def _extract_meta(content: str) -> Tuple[Optional[str], Optional[str]]:
@@ -24,11 +31,13 @@ def should_include_insight(
     project_root: Path,
     *,
     allow_legacy: bool = False,
+    hashes: Optional["SourceHashCache"] = None,
 ) -> Tuple[bool, str]:
     """
     Decide whether an auto-insight should be included.
     Returns (include, reason_code).
     reason_code: ok | duplicate | missing_meta | nested | missing_source | stale | expired
+    With `hashes`, the source digest is served from the persistent stat cache.
     """
     name = doc_file.name
     if name.endswith(".insight.md.insight.md"):
@@ -49,7 +58,7 @@ def should_include_insight(
     if not source_full.exists():
         return False, "missing_source"
     try:
-        current_hash = _hash_file(source_full)
+        current_hash = hashes.digest(source_full) if hashes is not None else _hash_file(source_full)
     except Exception:
         current_hash = ""
     if current_hash and current_hash != stored_hash:
@@ -77,15 +86,111 @@ def _hash_file(path: Path) -> str:
     return h.hexdigest()
 
 
+class SourceHashCache:
+    """
+    Persistent (path, size, mtime_ns) -> SHA-256 table (`source_hashes` in
+    knowledge.db). A file is re-hashed only when its stat tuple changes, so a
+    no-change audit costs one stat() per source. Call `flush()` to persist.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.rows: Dict[str, Tuple[int, int, str]] = {}
+        self._dirty: Dict[str, Tuple[int, int, str]] = {}
+        self.stats: Dict[str, int] = {"hash_reused": 0, "hash_computed": 0}
+        self.loaded = False
+
+    def load(self) -> "SourceHashCache":
+        self.loaded = True
+        if not self.db_path.exists():
+            return self
+        try:
+            ensure_schema(self.db_path)
+            conn = connect_db(self.db_path)
+        except Exception:
+            return self
+        try:
+            rows = conn.execute("SELECT path, size, mtime_ns, digest FROM source_hashes").fetchall()
+        except Exception:
+            rows = []
+        finally:
+            conn.close()
+        for path, size, mtime_ns, digest in rows:
+            self.rows[str(path)] = (int(size), int(mtime_ns), str(digest))
+        return self
+
+    def digest(self, path: Path) -> str:
+        if not self.loaded:
+            self.load()
+        key = os.path.abspath(str(path))
+        st = os.stat(key)
+        cached = self.rows.get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            self.stats["hash_reused"] += 1
+            return cached[2]
+        digest = _hash_file(Path(key))
+        entry = (int(st.st_size), int(st.st_mtime_ns), digest)
+        self.rows[key] = entry
+        self._dirty[key] = entry
+        self.stats["hash_computed"] += 1
+        return digest
+
+    def flush(self) -> int:
+        """Upsert re-hashed entries in one transaction; returns rows written."""
+        if not self._dirty:
+            return 0
+        items = list(self._dirty.items())
+        try:
+            ensure_schema(self.db_path)
+            conn = connect_db(self.db_path)
+        except Exception:
+            return 0
+        try:
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS source_hashes (path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL, hashed_at REAL)"
+                )
+                now = time.time()
+                conn.executemany(
+                    """
+                    INSERT INTO source_hashes (path, size, mtime_ns, digest, hashed_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        size=excluded.size, mtime_ns=excluded.mtime_ns,
+                        digest=excluded.digest, hashed_at=excluded.hashed_at
+                    """,
+                    [(k, size, mtime_ns, digest, now) for k, (size, mtime_ns, digest) in items],
+                )
+        except Exception:
+            return 0
+        finally:
+            conn.close()
+        for k, entry in items:
+            if self._dirty.get(k) == entry:
+                self._dirty.pop(k, None)
+        return len(items)
+
+
+def default_hash_cache(project_root: Path) -> Optional[SourceHashCache]:
+    """Cache backed by the project's knowledge.db (None when BGL_AUTO_INSIGHTS_HASH_CACHE=0)."""
+    if os.getenv("BGL_AUTO_INSIGHTS_HASH_CACHE", "1") == "0":
+        return None
+    return SourceHashCache(project_root / ".bgl_core" / "brain" / "knowledge.db")
+
+
 def audit_auto_insights(
     project_root: Path,
     *,
     allow_legacy: bool = False,
     max_insights: int = 0,
+    hashes: Optional[SourceHashCache] = None,
 ) -> Dict[str, int]:
     """
     Audit auto_insights health. Returns counts.
+    Source digests come from `hashes` (default: the knowledge.db stat cache).
     """
+    if hashes is None:
+        hashes = default_hash_cache(project_root)
     folder = project_root / ".bgl_core" / "knowledge" / "auto_insights"
     counts = {
         "total": 0,
@@ -100,13 +205,16 @@ def audit_auto_insights(
     }
     if not folder.exists():
         return counts
+    if hashes is not None:
+        counts["hash_reused"] = 0
+        counts["hash_computed"] = 0
     loaded = 0
     for doc_file in folder.rglob("*.md"):
         if ".insight.md" not in doc_file.name:
             continue
         counts["total"] += 1
         ok, reason = should_include_insight(
-            doc_file, project_root, allow_legacy=allow_legacy
+            doc_file, project_root, allow_legacy=allow_legacy, hashes=hashes
         )
         if ok:
             if max_insights and loaded >= max_insights:
@@ -116,9 +224,53 @@ def audit_auto_insights(
             loaded += 1
         else:
             counts[reason] = counts.get(reason, 0) + 1
+    if hashes is not None:
+        counts["hash_reused"] = hashes.stats["hash_reused"]
+        counts["hash_computed"] = hashes.stats["hash_computed"]
+        hashes.flush()
     return counts
 
 
+class _FullRehash(SourceHashCache):
+    """Benchmark baseline: hashes every source, persists nothing."""
+
+    def __init__(self) -> None:
+        super().__init__(Path(os.devnull))
+
+    def digest(self, path: Path) -> str:
+        self.stats["hash_computed"] += 1
+        return _hash_file(path)
+
+    def flush(self) -> int:
+        return 0
+
+
+def benchmark_audit(project_root: Path, *, repeats: int = 5) -> Dict[str, float]:
+    """
+    Time a no-change audit served from the hash cache against a full re-hash
+    of every source (the pre-cache behaviour). Returns best-of-N milliseconds.
+    """
+    def _best(fn) -> float:
+        times: List[float] = []
+        for _ in range(max(1, int(repeats))):
+            started = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - started) * 1000.0)
+        return round(min(times), 3)
+
+    db_path = project_root / ".bgl_core" / "brain" / "knowledge.db"
+    audit_auto_insights(project_root, hashes=SourceHashCache(db_path))  # persist current digests
+    full_ms = _best(lambda: audit_auto_insights(project_root, hashes=_FullRehash()))
+    # A fresh cache per run so the table load is part of the measured cost.
+    cached_ms = _best(lambda: audit_auto_insights(project_root, hashes=SourceHashCache(db_path)))
+    return {
+        "full_rehash_ms": full_ms,
+        "cached_ms": cached_ms,
+        "speedup": round(full_ms / cached_ms, 2) if cached_ms else 0.0,
+    }
+
+
+
 def write_auto_insights_status(project_root: Path, data: Dict[str, int]) -> None:
     try:
         logs = project_root / ".bgl_core" / "logs"
@@ -127,3 +279,18 @@ def write_auto_insights_status(project_root: Path, data: Dict[str, int]) -> None
         out_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
     except Exception:
         return
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="auto_insights audit")
+    parser.add_argument("--root", default=str(Path(__file__).resolve().parents[2]))
+    parser.add_argument("--bench", action="store_true", help="compare cached vs full re-hash audit")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    root = Path(args.root)
+    if args.bench:
+        print(json.dumps(benchmark_audit(root, repeats=args.repeats), indent=2))
+    else:
+        print(json.dumps(audit_auto_insights(root), indent=2))
@@ -1,10 +1,32 @@
+from __future__ import annotations
+
 import asyncio
+import shutil
 import time
 import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
+
+try:
+    from .lazy_imports import lazy_import  # type: ignore
+except Exception:
+    from lazy_imports import lazy_import  # type: ignore
+try:
+    from .capture_store import record_run  # type: ignore
+except Exception:
+    from capture_store import record_run  # type: ignore
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page
+
+# Playwright loads on first browser launch, not on import.
+_async_api = lazy_import("playwright.async_api")
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+VIDEO_DIR = Path("storage/logs/playwright_video")
+# always: keep every video | on_failure: record to a pending dir, keep only if a
+# failure was marked | flaky: like on_failure, but record only when
+# request_video() was called before the context opened | off: never record.
+VIDEO_POLICIES = ("always", "on_failure", "flaky", "off")
 
 
 class BrowserManager:
@@ -22,6 +44,7 @@ class BrowserManager:
         persist: bool = False,
         slow_mo_ms: int = 0,
         extra_http_headers: Optional[Dict[str, str]] = None,
+        video_policy: Optional[str] = None,
     ):
         self.base_url = base_url
         self.headless = headless
@@ -36,26 +59,105 @@ class BrowserManager:
         self._pages: List[Page] = []
         self._last_restart = 0.0
         self._lock = asyncio.Lock()
+        policy = str(video_policy or os.getenv("BGL_VIDEO_POLICY") or "on_failure").strip().lower()
+        self.video_policy = policy if policy in VIDEO_POLICIES else "on_failure"
+        self._video_requested = False
+        self._video_dir: Optional[Path] = None
+        self._failures: List[str] = []
+        self._scenario_times: List[Tuple[str, float]] = []
+        self.video_stats: Dict[str, int] = {"bytes_kept": 0, "bytes_discarded": 0}
 
     async def _ensure_browser(self):
-        if self._browser:
+        if self._browser and self._context:
             return
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(
-            headless=self.headless, slow_mo=self.slow_mo_ms or None
-        )
-        # Setup video recording
-        video_dir = Path("storage/logs/playwright_video")
-        video_dir.mkdir(parents=True, exist_ok=True)
-        self._context = await self._browser.new_context(
-            base_url=self.base_url,
-            record_video_dir=str(video_dir),
-            record_video_size={"width": 1280, "height": 720},
-            extra_http_headers=self.extra_http_headers,
-        )
+        if self._browser is not None and not self._browser.is_connected():
+            self._browser = None
+        if self._browser is None:
+            if self._playwright is None:
+                self._playwright = await _async_api.async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless, slow_mo=self.slow_mo_ms or None
+            )
+        self._video_dir = self._video_target()
+        options: Dict[str, Any] = {"base_url": self.base_url, "extra_http_headers": self.extra_http_headers}
+        if self._video_dir is not None:
+            self._video_dir.mkdir(parents=True, exist_ok=True)
+            options["record_video_dir"] = str(self._video_dir)
+            options["record_video_size"] = {"width": 1280, "height": 720}
+        self._context = await self._browser.new_context(**options)
+        self._failures = []
+        self._scenario_times = []
         self._last_restart = time.time()
         self._pages = []
 
+    def _video_target(self) -> Optional[Path]:
+        """Directory the next context records into (None: no recording)."""
+        if self.video_policy == "off" or (self.video_policy == "flaky" and not self._video_requested):
+            return None
+        if self.video_policy == "always":
+            return VIDEO_DIR
+        pending_root = VIDEO_DIR / ".pending"
+        try:
+            # Leftovers from runs that died before finalizing.
+            for stale in pending_root.iterdir():
+                if time.time() - stale.stat().st_mtime > 86400:
+                    shutil.rmtree(stale, ignore_errors=True)
+        except OSError:
+            pass
+        return pending_root / f"{os.getpid()}_{int(time.time() * 1000)}"
+
+    def request_video(self, enabled: bool = True) -> None:
+        """Under the `flaky` policy, record the next context (call before the first page)."""
+        self._video_requested = bool(enabled)
+
+    def mark_failure(self, label: str = "") -> None:
+        """Keep this context's video (on_failure/flaky policies)."""
+        self._failures.append(str(label or "failure"))
+
+    def note_scenario(self, name: str, wall_s: float) -> None:
+        """Scenario wall time, attributed to video on/off in the savings ledger."""
+        self._scenario_times.append((str(name), float(wall_s)))
+
+    def _finalize_video(self) -> None:
+        """
+        After the context closed (videos flushed): keep pending videos when a
+        failure was marked, otherwise delete them; record bytes, failures and
+        scenario timings in the savings ledger.
+        """
+        video_dir = self._video_dir
+        self._video_dir = None
+        if not self._scenario_times and video_dir is None:
+            return
+        size = 0
+        kept = False
+        if video_dir is not None:
+            files = [f for f in video_dir.glob("*") if f.is_file()] if video_dir.exists() else []
+            size = sum(f.stat().st_size for f in files)
+            kept = video_dir == VIDEO_DIR or bool(self._failures)
+            if video_dir != VIDEO_DIR:
+                if kept:
+                    VIDEO_DIR.mkdir(parents=True, exist_ok=True)
+                    for f in files:
+                        try:
+                            shutil.move(str(f), str(VIDEO_DIR / f.name))
+                        except Exception:
+                            pass
+                shutil.rmtree(video_dir, ignore_errors=True)
+            self.video_stats["bytes_kept" if kept else "bytes_discarded"] += size
+        try:
+            record_run(
+                policy=self.video_policy,
+                video_on=video_dir is not None,
+                kept=kept,
+                video_bytes=size,
+                scenarios=self._scenario_times,
+                failures=self._failures,
+            )
+        except Exception:
+            pass
+        self._scenario_times = []
+        self._failures = []
+
     async def _cleanup_idle_pages(self):
         now = time.time()
         keep = []
@@ -209,6 +311,7 @@ class BrowserManager:
                     await self._context.close()
                 except Exception:
                     pass
+                self._finalize_video()
             if self._browser:
                 try:
                     await self._browser.close()
@@ -223,6 +326,46 @@ class BrowserManager:
             self._context = None
             self._playwright = None
 
+    async def release(self):
+        """
+        End a run without tearing down Chromium: close pages and the context
+        (flushing videos) but keep the browser process for the next run.
+        """
+        async with self._lock:
+            for p in self._pages:
+                try:
+                    if not p.is_closed():
+                        await p.close()
+                except Exception:
+                    pass
+            self._pages = []
+            if self._context:
+                try:
+                    await self._context.close()
+                except Exception:
+                    pass
+                self._finalize_video()
+            self._context = None
+
+    def abandon(self) -> None:
+        """
+        Drop a manager whose event loop has closed. Its Playwright objects can
+        no longer be awaited, so kill the driver process directly (Chromium
+        exits with its pipe) and forget the handles.
+        """
+        proc = self._playwright
+        for attr in ("_impl_obj", "_connection", "_transport", "_proc"):
+            proc = getattr(proc, attr, None)
+        try:
+            if proc is not None and proc.returncode is None:
+                proc.kill()
+        except Exception:
+            pass
+        self._pages = []
+        self._context = None
+        self._browser = None
+        self._playwright = None
+
     def status(self) -> Dict[str, Any]:
         return {
             "headless": self.headless,
@@ -232,4 +375,77 @@ class BrowserManager:
             "last_restart": self._last_restart,
             "max_pages": self.max_pages,
             "idle_timeout": self.idle_timeout,
+            "video_policy": self.video_policy,
+            "video_recording": self._video_dir is not None,
+            "video_stats": dict(self.video_stats),
         }
+
+
+# Warm managers reused across in-process runs (diagnostic daemon worker).
+# Playwright objects are bound to their event loop, so the loop is part of the key.
+_SHARED: Dict[tuple, BrowserManager] = {}
+_SHARED_LOOPS: Dict[tuple, asyncio.AbstractEventLoop] = {}
+
+
+def _retire(manager: BrowserManager, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Close a manager left behind by another event loop."""
+    if loop is not None and loop.is_running() and not loop.is_closed():
+        # Still serving another thread: close there.
+        try:
+            asyncio.run_coroutine_threadsafe(manager.close(), loop)
+            return
+        except Exception:
+            pass
+    manager.abandon()
+
+
+def shared_manager(
+    base_url: str,
+    headless: bool = True,
+    max_pages: int = 3,
+    idle_timeout: int = 120,
+    slow_mo_ms: int = 0,
+    extra_http_headers: Optional[Dict[str, str]] = None,
+    video_policy: Optional[str] = None,
+) -> BrowserManager:
+    loop = asyncio.get_running_loop()
+    loop_id = id(loop)
+    key = (
+        loop_id,
+        base_url,
+        bool(headless),
+        int(max_pages),
+        int(slow_mo_ms or 0),
+        tuple(sorted((extra_http_headers or {}).items())),
+        str(video_policy or ""),
+    )
+    for stale in [k for k in _SHARED if _SHARED_LOOPS.get(k) is not loop]:
+        retired = _SHARED.pop(stale, None)
+        if retired is not None:
+            _retire(retired, _SHARED_LOOPS.pop(stale, None))
+    manager = _SHARED.get(key)
+    if manager is None:
+        manager = BrowserManager(
+            base_url=base_url,
+            headless=headless,
+            max_pages=max_pages,
+            idle_timeout=idle_timeout,
+            persist=True,
+            slow_mo_ms=slow_mo_ms,
+            extra_http_headers=extra_http_headers,
+            video_policy=video_policy,
+        )
+        _SHARED[key] = manager
+        _SHARED_LOOPS[key] = loop
+    return manager
+
+
+async def close_shared_managers() -> None:
+    managers = list(_SHARED.values())
+    _SHARED.clear()
+    _SHARED_LOOPS.clear()
+    for manager in managers:
+        try:
+            await manager.close()
+        except Exception:
+            pass
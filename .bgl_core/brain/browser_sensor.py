@@ -2,10 +2,11 @@ import asyncio
 import json
 import os
 import time
-from playwright.async_api import async_playwright
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from lazy_imports import lazy_import
+from capture_store import default_store
 from perception import (
     capture_ui_map,
     project_interactive_elements,
@@ -14,6 +15,10 @@ from perception import (
 )
 
 
+# Playwright loads on first browser use, not on import (API/report-only runs).
+_async_api = lazy_import("playwright.async_api")
+
+
 class BrowserSensor:
     _playwright: Any = None
     _browser: Any = None
@@ -58,7 +63,7 @@ class BrowserSensor:
 
     async def _ensure_browser(self):
         if not BrowserSensor._playwright:
-            BrowserSensor._playwright = await async_playwright().start()
+            BrowserSensor._playwright = await _async_api.async_playwright().start()
         if not BrowserSensor._browser:
             BrowserSensor._browser = await BrowserSensor._playwright.chromium.launch(
                 headless=self.headless
@@ -278,8 +283,10 @@ class BrowserSensor:
                     screenshot_filename = (
                         f"scan_{path.replace('/', '_')}_{int(time.time())}.png"
                     )
-                    screenshot_path = self.reports_dir / screenshot_filename
-                    await page.screenshot(path=str(screenshot_path))
+                    png = await page.screenshot()
+                    screenshot_path = default_store(self.reports_dir).save(
+                        png, self.reports_dir / screenshot_filename, scope=path, near_dup=False
+                    )
                     report["screenshot_path"] = str(screenshot_path)
                 if har_path:
                     report["har_path"] = str(har_path)
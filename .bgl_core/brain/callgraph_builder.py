@@ -3,6 +3,11 @@ import sqlite3
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+try:
+    from .db_utils import pooled_connection  # type: ignore
+except Exception:
+    from db_utils import pooled_connection  # type: ignore
+
 
 def _guess_layer(name: str) -> Optional[str]:
     if not name:
@@ -64,57 +69,55 @@ def build_callgraph(root: Path) -> Dict[str, Any]:
         return meta
 
     try:
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
-
-        # 1. Get all routes
-        routes = conn.execute(
-            "SELECT uri, controller, action, file_path FROM routes"
-        ).fetchall()
-        graph = []
-
-        for r in routes:
-            route_data = dict(r)
-            # uri = r["uri"]
-            file_path = r["file_path"]
-
-            # Use relative path for lookup
-            try:
-                rel_path = str(Path(file_path).relative_to(root))
-            except ValueError:
-                rel_path = file_path  # fallback
-
-            # 2. Find "main" method for this file (root script)
-            query = """
-                SELECT m.id 
-                FROM methods m 
-                JOIN entities e ON m.entity_id = e.id 
-                JOIN files f ON e.file_id = f.id 
-                WHERE f.path = ? AND e.type = 'root' AND m.name = 'main'
-            """
-            # Try both backslash and forward slash
-            main_method = conn.execute(query, (rel_path,)).fetchone()
-            if not main_method:
-                main_method = conn.execute(
-                    query, (rel_path.replace("/", "\\"),)
-                ).fetchone()
-
-            dependencies = []
-            if main_method:
-                # 3. Get direct dependencies
-                direct_deps = _get_dependencies(conn, main_method["id"])
-
-                # 4. For each direct dep, try to find ITS dependencies (1 level deep for now)
-                for dep in direct_deps:
-                    dep_name = dep["name"]
-                    # Check if it's a class we have indexed
-                    construct_id = _get_entity_method_id(conn, dep_name, "__construct")
-                    if construct_id:
-                        dep["calls"] = _get_dependencies(conn, construct_id)
-                    dependencies.append(dep)
-
-            route_data["dependencies"] = dependencies
-            graph.append(route_data)
+        with pooled_connection(db_path, row_factory=sqlite3.Row) as conn:
+            # 1. Get all routes
+            routes = conn.execute(
+                "SELECT uri, controller, action, file_path FROM routes"
+            ).fetchall()
+            graph = []
+
+            for r in routes:
+                route_data = dict(r)
+                # uri = r["uri"]
+                file_path = r["file_path"]
+
+                # Use relative path for lookup
+                try:
+                    rel_path = str(Path(file_path).relative_to(root))
+                except ValueError:
+                    rel_path = file_path  # fallback
+
+                # 2. Find "main" method for this file (root script)
+                query = """
+                    SELECT m.id 
+                    FROM methods m 
+                    JOIN entities e ON m.entity_id = e.id 
+                    JOIN files f ON e.file_id = f.id 
+                    WHERE f.path = ? AND e.type = 'root' AND m.name = 'main'
+                """
+                # Try both backslash and forward slash
+                main_method = conn.execute(query, (rel_path,)).fetchone()
+                if not main_method:
+                    main_method = conn.execute(
+                        query, (rel_path.replace("/", "\\"),)
+                    ).fetchone()
+
+                dependencies = []
+                if main_method:
+                    # 3. Get direct dependencies
+                    direct_deps = _get_dependencies(conn, main_method["id"])
+
+                    # 4. For each direct dep, try to find ITS dependencies (1 level deep for now)
+                    for dep in direct_deps:
+                        dep_name = dep["name"]
+                        # Check if it's a class we have indexed
+                        construct_id = _get_entity_method_id(conn, dep_name, "__construct")
+                        if construct_id:
+                            dep["calls"] = _get_dependencies(conn, construct_id)
+                        dependencies.append(dep)
+
+                route_data["dependencies"] = dependencies
+                graph.append(route_data)
 
         meta["total_routes"] = len(graph)
         meta["mapped_layers"] = sum(1 for r in graph if r.get("dependencies"))
@@ -126,11 +129,6 @@ def build_callgraph(root: Path) -> Dict[str, Any]:
 
     except Exception as e:
         meta["error"] = str(e)
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
     return meta
 
@@ -0,0 +1,352 @@
+"""
+capture_store.py
+----------------
+Screenshot deduplication/compression and the capture savings ledger.
+
+`ScreenshotStore.save(png, dest)` computes a 64-bit difference hash (dHash)
+of the image; when a stored capture in the same directory and dedup scope
+(route or target tag; by default the destination file name) is within
+`screenshot_phash_distance` bits, nothing is written and the existing file is
+returned. Scoping keeps one route's evidence from resolving to a look-alike
+capture of another route. Failure evidence is saved with `near_dup=False`:
+only a byte-identical capture is reused, so a failing page is never resolved
+to an earlier healthy look-alike. With `screenshot_format: webp` new captures
+are re-encoded as WebP (`screenshot_webp_quality`); the shipped default is
+png. Pillow is optional: without it the store falls back to exact (sha1)
+dedup and keeps PNG, and says so once per process.
+
+The ledger (.bgl_core/logs/capture_savings.json) accumulates the bytes
+saved by screenshot dedup/compression and by discarding videos of passing
+runs, plus per-scenario wall time with and without video recording; the
+difference of the two means is the wall time saved per scenario.
+
+Usage:
+    python .bgl_core/brain/capture_store.py      # print the savings report
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .lazy_imports import lazy_import  # type: ignore
+except Exception:
+    from lazy_imports import lazy_import  # type: ignore
+
+Image = lazy_import("PIL.Image")
+
+ROOT = Path(__file__).resolve().parents[2]
+LEDGER_PATH = ROOT / ".bgl_core" / "logs" / "capture_savings.json"
+INDEX_NAME = ".phash_index.json"
+INDEX_VERSION = 1
+
+_lock = threading.Lock()
+_STORES: Dict[str, "ScreenshotStore"] = {}
+_FALLBACK_WARNED = False
+
+
+def _warn_fallback() -> None:
+    global _FALLBACK_WARNED
+    if _FALLBACK_WARNED:
+        return
+    _FALLBACK_WARNED = True
+    print("[!] capture_store: Pillow not installed; screenshots use exact dedup and stay PNG (pip install Pillow)")
+
+
+def dhash(png: bytes) -> Optional[int]:
+    """64-bit difference hash (9x8 grayscale, left/right gradient); None without Pillow."""
+    if not Image:
+        return None
+    with Image.open(io.BytesIO(png)) as img:
+        small = img.convert("L").resize((9, 8), Image.BILINEAR)
+        px = small.tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (1 if px[row * 9 + col] > px[row * 9 + col + 1] else 0)
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class ScreenshotStore:
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        fmt: str = "png",
+        quality: int = 80,
+        max_distance: int = 2,
+    ):
+        self.directory = Path(directory)
+        self.fmt = str(fmt or "png").lower()
+        self.quality = int(quality)
+        # < 0 disables dedup; 0 only merges identical hashes.
+        self.max_distance = int(max_distance)
+        self._entries: Optional[List[Dict[str, Any]]] = None
+        self._totals: Dict[str, int] = {}
+        self.stats: Dict[str, int] = {"saved": 0, "deduped": 0, "bytes_in": 0, "bytes_out": 0}
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / INDEX_NAME
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if self._entries is not None:
+            return self._entries
+        entries: List[Dict[str, Any]] = []
+        totals: Dict[str, int] = {}
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if isinstance(data, dict) and data.get("version") == INDEX_VERSION:
+                entries = [e for e in data.get("entries") or [] if Path(str(e.get("path") or "")).exists()]
+                totals = {k: int(v) for k, v in (data.get("totals") or {}).items()}
+        except Exception:
+            pass
+        self._entries = entries
+        self._totals = totals
+        return entries
+
+    def _persist(self) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            payload = {"version": INDEX_VERSION, "entries": self._entries or [], "totals": self._totals}
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.index_path)
+        except Exception:
+            pass
+
+    def _match(self, key: str, phash: Optional[int], scope: str, near_dup: bool = True) -> Optional[Dict[str, Any]]:
+        if self.max_distance < 0:
+            return None
+        for entry in self._load():
+            if entry.get("scope") != scope:
+                continue
+            if not near_dup:
+                if entry.get("sha1") == key:
+                    return entry
+            elif phash is not None and entry.get("phash") is not None:
+                if hamming(phash, int(entry["phash"], 16)) <= self.max_distance:
+                    return entry
+            elif entry.get("sha1") == key:
+                return entry
+        return None
+
+    def _encode(self, png: bytes) -> Tuple[bytes, str]:
+        if self.fmt == "webp" and Image:
+            try:
+                with Image.open(io.BytesIO(png)) as img:
+                    out = io.BytesIO()
+                    img.save(out, format="WEBP", quality=self.quality, method=4)
+                data = out.getvalue()
+                if len(data) < len(png):
+                    return data, ".webp"
+            except Exception:
+                pass
+        return png, ".png"
+
+    def save(self, png: bytes, dest: Path, *, scope: Optional[str] = None, near_dup: bool = True) -> Path:
+        """
+        Store `png` at `dest` (suffix follows the encoding) or return the path
+        of a near-duplicate saved under the same `scope` (an exact duplicate
+        when `near_dup` is False).
+        """
+        scope = str(scope) if scope is not None else Path(dest).name
+        sha1 = hashlib.sha1(png).hexdigest()
+        if not Image:
+            _warn_fallback()
+        try:
+            phash = dhash(png)
+        except Exception:
+            phash = None
+        with _lock:
+            self._load()
+            self.stats["bytes_in"] += len(png)
+            self._totals["bytes_in"] = self._totals.get("bytes_in", 0) + len(png)
+            match = self._match(sha1, phash, scope, near_dup)
+            if match is not None:
+                self.stats["deduped"] += 1
+                self._totals["deduped"] = self._totals.get("deduped", 0) + 1
+                self._totals["bytes_saved"] = self._totals.get("bytes_saved", 0) + len(png)
+                self._persist()
+                return Path(match["path"])
+        data, suffix = self._encode(png)
+        path = Path(dest).with_suffix(suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        with _lock:
+            self.stats["saved"] += 1
+            self.stats["bytes_out"] += len(data)
+            self._totals["saved"] = self._totals.get("saved", 0) + 1
+            self._totals["bytes_out"] = self._totals.get("bytes_out", 0) + len(data)
+            self._totals["bytes_saved"] = self._totals.get("bytes_saved", 0) + len(png) - len(data)
+            entries = self._load()
+            entries[:] = [e for e in entries if e.get("path") != str(path)]
+            entries.append(
+                {
+                    "path": str(path),
+                    "scope": scope,
+                    "sha1": sha1,
+                    "phash": f"{phash:016x}" if phash is not None else None,
+                    "bytes": len(data),
+                    "ts": round(time.time(), 3),
+                }
+            )
+            self._persist()
+        return path
+
+    @property
+    def totals(self) -> Dict[str, int]:
+        with _lock:
+            self._load()
+            return dict(self._totals)
+
+
+def default_store(directory: Path) -> ScreenshotStore:
+    """Process-wide store for `directory`, configured from config.yml."""
+    key = str(Path(directory).resolve())
+    store = _STORES.get(key)
+    if store is not None:
+        return store
+    cfg: Dict[str, Any] = {}
+    try:
+        try:
+            from .config_loader import load_config  # type: ignore
+        except Exception:
+            from config_loader import load_config  # type: ignore
+        cfg = dict(load_config(ROOT) or {})
+    except Exception:
+        cfg = {}
+    try:
+        store = ScreenshotStore(
+            Path(directory),
+            fmt=str(cfg.get("screenshot_format", "png") or "png"),
+            quality=int(cfg.get("screenshot_webp_quality", 80) or 80),
+            max_distance=int(cfg.get("screenshot_phash_distance", 2)),
+        )
+    except (TypeError, ValueError):
+        store = ScreenshotStore(Path(directory))
+    return _STORES.setdefault(key, store)
+
+
+# ---------------------------------------------------------------------------
+# Savings ledger
+# ---------------------------------------------------------------------------
+
+
+def _load_ledger(path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            return data
+    except Exception:
+        pass
+    return {"video": {}, "scenarios": {}}
+
+
+def record_run(
+    *,
+    policy: str,
+    video_on: bool,
+    kept: bool,
+    video_bytes: int,
+    scenarios: Iterable[Tuple[str, float]],
+    failures: Iterable[str] = (),
+    path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Fold one browser context's outcome into the ledger: video bytes kept or
+    discarded, each scenario's wall time under video on/off (running means)
+    and when each failing scenario last failed.
+    """
+    path = Path(path or LEDGER_PATH)
+    with _lock:
+        ledger = _load_ledger(path)
+        video = ledger.setdefault("video", {})
+        video["policy"] = policy
+        bucket = "bytes_kept" if kept else "bytes_discarded"
+        video[bucket] = int(video.get(bucket, 0)) + int(video_bytes)
+        counter = "contexts_kept" if kept else ("contexts_discarded" if video_on else "contexts_unrecorded")
+        video[counter] = int(video.get(counter, 0)) + 1
+        table = ledger.setdefault("scenarios", {})
+        mode = "video_on" if video_on else "video_off"
+        for name, secs in scenarios:
+            row = table.setdefault(str(name), {})
+            stat = row.setdefault(mode, {"n": 0, "mean_s": 0.0})
+            stat["n"] = int(stat["n"]) + 1
+            stat["mean_s"] = round(float(stat["mean_s"]) + (float(secs) - float(stat["mean_s"])) / stat["n"], 4)
+            on, off = row.get("video_on"), row.get("video_off")
+            if on and off:
+                row["wall_saved_s"] = round(float(on["mean_s"]) - float(off["mean_s"]), 4)
+        now = time.time()
+        for name in failures:
+            table.setdefault(str(name), {})["last_failed_at"] = now
+        ledger["updated_at"] = now
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(ledger, ensure_ascii=False, indent=2), encoding="utf-8")
+            tmp.replace(path)
+        except Exception:
+            pass
+        return ledger
+
+
+def recently_failed(names: Iterable[str], days: float, path: Optional[Path] = None) -> List[str]:
+    """Scenarios among `names` that failed within `days` (flaky-policy video candidates)."""
+    cutoff = time.time() - float(days) * 86400.0
+    table = _load_ledger(Path(path or LEDGER_PATH)).get("scenarios") or {}
+    return [n for n in names if float((table.get(str(n)) or {}).get("last_failed_at") or 0) >= cutoff]
+
+
+def summarize(ledger_path: Optional[Path] = None, screenshot_dirs: Iterable[Path] = ()) -> Dict[str, Any]:
+    ledger = _load_ledger(Path(ledger_path or LEDGER_PATH))
+    shots: Dict[str, int] = {}
+    for d in screenshot_dirs:
+        for k, v in ScreenshotStore(Path(d)).totals.items():
+            shots[k] = shots.get(k, 0) + int(v)
+    scenarios = ledger.get("scenarios") or {}
+    saved = [row["wall_saved_s"] for row in scenarios.values() if "wall_saved_s" in row]
+    return {
+        "video": ledger.get("video") or {},
+        "screenshots": shots,
+        "scenarios_measured": len(saved),
+        "wall_saved_s_total": round(sum(saved), 3),
+        "wall_saved_s_mean": round(sum(saved) / len(saved), 3) if saved else 0.0,
+        "scenarios": scenarios,
+    }
+
+
+def main() -> int:
+    dirs = [ROOT / "storage" / "logs" / "captures", ROOT / ".bgl_core" / "logs" / "browser_reports"]
+    report = summarize(LEDGER_PATH, dirs)
+    video = report["video"]
+    shots = report["screenshots"]
+    print(f"video policy: {video.get('policy', 'n/a')}")
+    print(f"  discarded: {video.get('bytes_discarded', 0) / 1e6:.1f} MB ({video.get('contexts_discarded', 0)} contexts)")
+    print(f"  kept:      {video.get('bytes_kept', 0) / 1e6:.1f} MB ({video.get('contexts_kept', 0)} contexts)")
+    print(
+        f"screenshots: saved={shots.get('saved', 0)} deduped={shots.get('deduped', 0)} "
+        f"bytes_saved={shots.get('bytes_saved', 0) / 1e6:.2f} MB"
+    )
+    print(
+        f"wall time saved: {report['wall_saved_s_total']:.2f}s over {report['scenarios_measured']} scenarios "
+        f"(mean {report['wall_saved_s_mean']:.3f}s)"
+    )
+    for name, row in sorted(report["scenarios"].items(), key=lambda kv: -kv[1].get("wall_saved_s", 0.0))[:15]:
+        if "wall_saved_s" in row:
+            print(f"  {name:<48} {row['wall_saved_s']:+.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
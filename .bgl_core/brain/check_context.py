@@ -0,0 +1,129 @@
+"""
+check_context.py
+----------------
+Shared inputs and result memoization for agent_verify checks.
+
+Each module under checks/ may declare what it reads:
+
+    INPUTS = (".bgl_core/brain/css_inventory.json",)   # globs, relative to the project root
+    ENV = ("BGL_POLICY_STRICT",)                       # env vars that change the result
+    CACHEABLE = False                                  # result depends on DB/clock; never memoize
+
+`CheckContext` loads each artifact once per verification run and hands the
+same parsed object to every check (treat it as read-only). `InputDigest`
+hashes a check's declared inputs by content, reusing per-file hashes while
+(mtime_ns, size) is unchanged, so an untouched tree is verified from the
+memo with stat() calls only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class CheckContext:
+    """Per-run, thread-safe, load-once view over project artifacts."""
+
+    def __init__(self, project_root: Path):
+        self.project_root = Path(project_root)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, str], Any] = {}
+        self.loads = 0
+
+    def _load(self, kind: str, rel: str, loader) -> Any:
+        key = (kind, rel)
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+        path = self.project_root / rel
+        try:
+            value = loader(path)
+        except FileNotFoundError:
+            value = None
+        with self._lock:
+            self.loads += 1
+            return self._values.setdefault(key, value)
+
+    def json(self, rel: str) -> Any:
+        """Parsed JSON artifact (None when missing). Shared: do not mutate."""
+        return self._load("json", rel, lambda p: json.loads(p.read_text(encoding="utf-8")))
+
+    def text(self, rel: str) -> Optional[str]:
+        """File text (None when missing or unreadable)."""
+
+        def _read(path: Path) -> Optional[str]:
+            try:
+                return path.read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                return None
+
+        return self._load("text", rel, _read)
+
+
+def _has_magic(pattern: str) -> bool:
+    return any(ch in pattern for ch in "*?[")
+
+
+def expand_inputs(project_root: Path, patterns: Iterable[str]) -> List[Path]:
+    """Existing files matched by the declared globs (sorted, de-duplicated)."""
+    seen: Dict[str, Path] = {}
+    for pat in patterns:
+        pat = str(pat or "").strip()
+        if not pat:
+            continue
+        if not _has_magic(pat):
+            path = project_root / pat
+            if path.is_file():
+                seen[pat] = path
+            continue
+        for path in project_root.glob(pat):
+            if path.is_file() and "__pycache__" not in path.parts:
+                seen[path.relative_to(project_root).as_posix()] = path
+    return [seen[k] for k in sorted(seen)]
+
+
+class InputDigest:
+    """Content digests for check inputs with an (mtime_ns, size) -> sha1 file memo."""
+
+    def __init__(self, project_root: Path, file_hashes: Optional[Dict[str, List[Any]]] = None):
+        self.project_root = Path(project_root)
+        self.file_hashes: Dict[str, List[Any]] = dict(file_hashes or {})
+        self._lock = threading.Lock()
+
+    def file_hash(self, path: Path) -> str:
+        try:
+            st = path.stat()
+        except OSError:
+            return "missing"
+        key = str(path)
+        with self._lock:
+            cached = self.file_hashes.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return str(cached[2])
+        h = hashlib.sha1()
+        try:
+            with path.open("rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+        except OSError:
+            return "unreadable"
+        digest = h.hexdigest()
+        with self._lock:
+            self.file_hashes[key] = [st.st_mtime_ns, st.st_size, digest]
+        return digest
+
+    def digest(self, module_file: Optional[str], patterns: Iterable[str], env: Iterable[str]) -> str:
+        h = hashlib.sha1()
+        if module_file:
+            h.update(b"code:" + self.file_hash(Path(module_file)).encode())
+        for path in expand_inputs(self.project_root, patterns):
+            rel = path.relative_to(self.project_root).as_posix()
+            h.update(f"\0{rel}:{self.file_hash(path)}".encode("utf-8"))
+        for name in env:
+            h.update(f"\0env:{name}={os.getenv(name)}".encode("utf-8"))
+        return h.hexdigest()
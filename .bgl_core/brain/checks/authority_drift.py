@@ -1,6 +1,8 @@
 from pathlib import Path
 from typing import Dict, Any, List
 
+INPUTS = (".bgl_core/brain/**/*.py",)
+
 
 def _read_text(path: Path) -> str:
     try:
@@ -9,7 +11,7 @@ def _read_text(path: Path) -> str:
         return ""
 
 
-def run(project_root: Path) -> Dict[str, Any]:
+def run(project_root: Path, context=None) -> Dict[str, Any]:
     """
     Hard check:
     Prevent gate/approval drift by ensuring there is a *single* writer of the approval queue
@@ -20,6 +22,11 @@ def run(project_root: Path) -> Dict[str, Any]:
         return {"passed": True, "evidence": ["brain folder missing"], "scope": ["policy"]}
 
     violations: List[str] = []
+    read = _read_text
+    if context is not None:
+        # Shared per-run file cache: each module is read once across all three scans.
+        def read(path: Path) -> str:
+            return context.text(path.relative_to(project_root).as_posix()) or ""
 
     # 1) Only authority.py may write/update the approval queue (agent_permissions).
     perm_markers = [
@@ -30,7 +37,7 @@ def run(project_root: Path) -> Dict[str, Any]:
     for py in brain.rglob("*.py"):
         if py.name in ("authority.py", "authority_drift.py"):
             continue
-        text = _read_text(py)
+        text = read(py)
         for m in perm_markers:
             if m in text:
                 violations.append(f"{py.relative_to(project_root)}: {m}")
@@ -39,7 +46,7 @@ def run(project_root: Path) -> Dict[str, Any]:
     for py in brain.rglob("*.py"):
         if py.name in ("patcher.py", "authority_drift.py"):
             continue
-        text = _read_text(py)
+        text = read(py)
         if "patcher.php" in text:
             violations.append(f"{py.relative_to(project_root)}: patcher.php reference")
 
@@ -53,7 +60,7 @@ def run(project_root: Path) -> Dict[str, Any]:
     for py in brain.rglob("*.py"):
         if py.name in allow_raw:
             continue
-        text = _read_text(py)
+        text = read(py)
         for m in raw_sql_markers:
             if m in text:
                 violations.append(f"{py.relative_to(project_root)}: {m}")
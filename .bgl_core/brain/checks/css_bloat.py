@@ -1,7 +1,10 @@
 import json
 from pathlib import Path
 
-def run(project_root: Path):
+INPUTS = (".bgl_core/brain/css_inventory.json",)
+
+
+def run(project_root: Path, context=None):
     """
     Simple CSS bloat detector: flags files over size/line thresholds.
     Uses .bgl_core/brain/css_inventory.json generated by inventory step.
@@ -10,7 +13,10 @@ def run(project_root: Path):
     if not inv.exists():
         return {"passed": False, "evidence": ["css_inventory.json not found"], "scope": ["css"]}
 
-    data = json.loads(inv.read_text(encoding="utf-8"))
+    if context is not None:
+        data = context.json(INPUTS[0])
+    else:
+        data = json.loads(inv.read_text(encoding="utf-8"))
     findings = []
     for f in data:
         if f.get("bytes", 0) > 50_000 or f.get("lines", 0) > 1500:
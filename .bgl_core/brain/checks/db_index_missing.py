@@ -1,8 +1,10 @@
 import json
 from pathlib import Path
 
+INPUTS = (".bgl_core/brain/db_schema.json",)
 
-def run(project_root: Path):
+
+def run(project_root: Path, context=None):
     """
     Detect missing indexes on common filter/sort columns for reporting.
     Uses .bgl_core/brain/db_schema.json (generated from app.sqlite).
@@ -11,7 +13,10 @@ def run(project_root: Path):
     if not schema_path.exists():
         return {"passed": False, "evidence": ["db_schema.json not found"], "scope": ["db"]}
 
-    data = json.loads(schema_path.read_text(encoding="utf-8"))
+    if context is not None:
+        data = context.json(INPUTS[0])
+    else:
+        data = json.loads(schema_path.read_text(encoding="utf-8"))
     tables = {t["name"]: t for t in data.get("tables", [])}
 
     findings = []
@@ -4,8 +4,11 @@ from typing import Dict, Any, List
 
 from config_loader import load_config
 
+INPUTS = (".bgl_core/brain/*.py", ".bgl_core/config.yml", "storage/agent_flags.json")
+ENV = ("BGL_POLICY_STRICT",)
 
-def run(project_root: Path) -> Dict[str, Any]:
+
+def run(project_root: Path, context=None) -> Dict[str, Any]:
     """
     Advisory check:
     Ensure hypothesis handling and meta-reasoning are not merged in the same module.
@@ -40,13 +43,18 @@ def run(project_root: Path) -> Dict[str, Any]:
             "scope": ["policy"],
         }
 
+    def read(f: Path) -> str:
+        if context is not None:
+            return context.text(f.relative_to(project_root).as_posix()) or ""
+        return f.read_text(encoding="utf-8", errors="ignore")
+
     mixed: List[str] = []
     for f in hypo_files:
-        text = f.read_text(encoding="utf-8", errors="ignore").lower()
+        text = read(f).lower()
         if "meta_reason" in text or "metareason" in text:
             mixed.append(f"{f.name} references meta_reasoning")
     for f in meta_files:
-        text = f.read_text(encoding="utf-8", errors="ignore").lower()
+        text = read(f).lower()
         if "hypothesis" in text:
             mixed.append(f"{f.name} references hypothesis")
 
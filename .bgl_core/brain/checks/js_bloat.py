@@ -1,8 +1,10 @@
 import json
 from pathlib import Path
 
+INPUTS = (".bgl_core/brain/js_inventory.json",)
 
-def run(project_root: Path):
+
+def run(project_root: Path, context=None):
     """
     JS bloat detector: flags large/long files and reports top offenders.
     Uses .bgl_core/brain/js_inventory.json generated by inventory step.
@@ -11,7 +13,10 @@ def run(project_root: Path):
     if not inv.exists():
         return {"passed": False, "evidence": ["js_inventory.json not found"], "scope": ["js"]}
 
-    data = json.loads(inv.read_text(encoding="utf-8"))
+    if context is not None:
+        data = context.json(INPUTS[0])
+    else:
+        data = json.loads(inv.read_text(encoding="utf-8"))
     findings = []
     WARN_BYTES = 30_000
     FAIL_BYTES = 50_000
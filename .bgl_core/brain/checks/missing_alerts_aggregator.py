@@ -1,5 +1,7 @@
 from pathlib import Path
 
+INPUTS = ("app/Services/**/*.php", "app/Support/**/*.php", "api/**/*.php")
+
 
 def run(project_root: Path):
     scope = ["ops"]
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+INPUTS = ("app/Models/AuditLog.php", "database/migrations/*audit*.php")
+
 
 def run(project_root: Path):
     evidence = []
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+INPUTS = ("api/get_banks.php", "api/get_suppliers.php", "api/history.php")
+
 
 def run(project_root: Path):
     scope = ["reports"]
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+INPUTS = ("api/import*.php",)
+
 
 def run(project_root: Path):
     scope = ["api"]
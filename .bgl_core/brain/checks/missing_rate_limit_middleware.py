@@ -2,6 +2,8 @@ import os
 from pathlib import Path
 from typing import Dict, Any, List
 
+INPUTS = ("app/Support/autoload.php", "routes/web.php", "routes/api.php")
+
 
 def run(project_root: Path) -> Dict[str, Any]:
     """
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+INPUTS = ("app/Http/Requests/*.php", "app/Http/Controllers/**/*.php")
+
 
 def run(project_root: Path):
     evidence = []
@@ -7,6 +7,9 @@ try:
 except Exception:
     from db_utils import connect_db  # type: ignore
 
+# Reads knowledge.db over a rolling 7-day window: always re-run.
+CACHEABLE = False
+
 def run(project_root: Path) -> Dict[str, Any]:
     """
     Phase 3 integrity check:
@@ -4,6 +4,14 @@ from typing import Dict, Any, List
 
 from config_loader import load_config
 
+INPUTS = (
+    ".bgl_core/brain/decision_engine.py",
+    ".bgl_core/brain/execution_gate.py",
+    ".bgl_core/config.yml",
+    "storage/agent_flags.json",
+)
+ENV = ("BGL_POLICY_STRICT",)
+
 
 def run(project_root: Path) -> Dict[str, Any]:
     """
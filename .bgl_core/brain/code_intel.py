@@ -7,6 +7,11 @@ import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    from .db_utils import pooled_connection  # type: ignore
+except Exception:
+    from db_utils import pooled_connection  # type: ignore
+
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 DB_PATH = ROOT_DIR / ".bgl_core" / "brain" / "knowledge.db"
@@ -115,60 +120,48 @@ def _scan_js(paths: List[Path]) -> Dict[str, Any]:
 def _scan_php_from_db(db_path: Path) -> Dict[str, Any]:
     if not db_path.exists():
         return {"error": "db_missing"}
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
     files: Dict[str, Any] = {}
     try:
-        rows = conn.execute("SELECT id, path FROM files").fetchall()
-        for r in rows:
-            file_id = r["id"]
-            path = r["path"]
-            entities = conn.execute(
-                "SELECT id, name, type, extends, line FROM entities WHERE file_id=?",
-                (file_id,),
-            ).fetchall()
-            classes = {}
-            functions = []
-            for e in entities:
-                methods = conn.execute(
-                    "SELECT name, visibility, line FROM methods WHERE entity_id=?",
-                    (e["id"],),
+        with pooled_connection(db_path, row_factory=sqlite3.Row) as conn:
+            rows = conn.execute("SELECT id, path FROM files").fetchall()
+            for r in rows:
+                file_id = r["id"]
+                path = r["path"]
+                entities = conn.execute(
+                    "SELECT id, name, type, extends, line FROM entities WHERE file_id=?",
+                    (file_id,),
                 ).fetchall()
-                if e["type"] == "root":
-                    functions.extend([m["name"] for m in methods if m["name"]])
-                else:
-                    classes[e["name"]] = [m["name"] for m in methods if m["name"]]
-            files[path] = {
-                "classes": classes,
-                "functions": sorted(set(functions)),
-            }
+                classes = {}
+                functions = []
+                for e in entities:
+                    methods = conn.execute(
+                        "SELECT name, visibility, line FROM methods WHERE entity_id=?",
+                        (e["id"],),
+                    ).fetchall()
+                    if e["type"] == "root":
+                        functions.extend([m["name"] for m in methods if m["name"]])
+                    else:
+                        classes[e["name"]] = [m["name"] for m in methods if m["name"]]
+                files[path] = {
+                    "classes": classes,
+                    "functions": sorted(set(functions)),
+                }
     except Exception as exc:
         files = {"error": str(exc)}
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
     return files
 
 
 def _collect_routes(db_path: Path) -> List[Dict[str, Any]]:
     if not db_path.exists():
         return []
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
     routes: List[Dict[str, Any]] = []
     try:
-        rows = conn.execute("SELECT uri, http_method, controller, action, file_path FROM routes").fetchall()
+        with pooled_connection(db_path, row_factory=sqlite3.Row) as conn:
+            rows = conn.execute("SELECT uri, http_method, controller, action, file_path FROM routes").fetchall()
         for r in rows:
             routes.append(dict(r))
     except Exception:
         routes = []
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
     return routes
 
 
@@ -196,9 +189,8 @@ def build_code_intel(root_dir: Path = ROOT_DIR, db_path: Path = DB_PATH) -> Dict
             indexer.index_project()
             indexer.close()
         else:
-            conn = sqlite3.connect(str(db_path))
-            row = conn.execute("SELECT COUNT(*) FROM files").fetchone()
-            conn.close()
+            with pooled_connection(db_path) as conn:
+                row = conn.execute("SELECT COUNT(*) FROM files").fetchone()
             if row and int(row[0] or 0) == 0:
                 try:
                     from .indexer import EntityIndexer  # type: ignore
@@ -1,7 +1,99 @@
+import copy
 import json
-import yaml
+import os
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    from .lazy_imports import lazy_import  # type: ignore
+except Exception:
+    from lazy_imports import lazy_import  # type: ignore
+
+yaml = lazy_import("yaml")
+
+
+class FrozenConfig(dict):
+    """
+    Read-only dict returned by `load_config` (shared by every caller in the
+    process). Nested dicts are frozen too; `copy.deepcopy()` / `thaw()` give
+    a mutable plain-dict copy.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("config from load_config() is read-only; use thaw() for a mutable copy")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly  # type: ignore[assignment]
+    setdefault = update = pop = popitem = clear = _readonly  # type: ignore[assignment]
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def thaw(self) -> Dict[str, Any]:
+        return copy.deepcopy(self)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        frozen = FrozenConfig()
+        for k, v in value.items():
+            dict.__setitem__(frozen, k, _freeze(v))
+        return frozen
+    if isinstance(value, list):
+        return [_freeze(v) for v in value]
+    return value
+
+
+_EMPTY = FrozenConfig()
+# config.yml path -> (file signatures, light-mode env flag, its value, frozen config)
+_CACHE: Dict[str, Tuple[Tuple[Any, ...], Optional[str], Optional[str], FrozenConfig]] = {}
+_CACHE_LOCK = threading.Lock()
+_STATS = {"parses": 0, "hits": 0}
+_yaml_representer_registered = False
+
+
+def _file_sig(path: Path) -> Tuple[Any, ...]:
+    try:
+        st = path.stat()
+        return (str(path), st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (str(path), None, None)
+
+
+def _register_yaml_representer() -> None:
+    # Let yaml.safe_dump() serialize configs (or parts of them) like plain dicts.
+    global _yaml_representer_registered
+    if _yaml_representer_registered:
+        return
+    try:
+        yaml.SafeDumper.add_representer(FrozenConfig, yaml.SafeDumper.represent_dict)
+        yaml.Dumper.add_representer(FrozenConfig, yaml.Dumper.represent_dict)
+        _yaml_representer_registered = True
+    except Exception:
+        pass
+
+
+def invalidate(root_dir: Optional[Path] = None) -> None:
+    """Drop cached configs (all roots, or one) so the next load re-parses."""
+    with _CACHE_LOCK:
+        if root_dir is None:
+            _CACHE.clear()
+            return
+        target = (Path(root_dir) / ".bgl_core" / "config.yml").resolve()
+        for key in [k for k in _CACHE if Path(k).resolve() == target]:
+            del _CACHE[key]
+
+
+def cache_stats() -> Dict[str, int]:
+    return dict(_STATS)
 
 
 def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
@@ -47,21 +139,26 @@ def _get_path(data: Dict[str, Any], path: str, default: Any = None) -> Any:
     return cur
 
 
-def load_config(root_dir: Path) -> Dict[str, Any]:
-    cfg_path = root_dir / ".bgl_core" / "config.yml"
-    flags_path = root_dir / "storage" / "agent_flags.json"
+def _light_mode_flag(cfg: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    env_flag = cfg.get("agent_mode_bypass_env", "BGL_LIGHT_MODE")
+    if not env_flag:
+        return None, None
+    return str(env_flag), os.getenv(env_flag, "0")
+
+
+def _parse_config(cfg_path: Path, flags_path: Path) -> Tuple[Dict[str, Any], Optional[str], Optional[str]]:
+    _STATS["parses"] += 1
     if cfg_path.exists():
         try:
             cfg = yaml.safe_load(cfg_path.read_text()) or {}
+            _register_yaml_representer()
             # Light-mode: bypass heavy gating when env flag is set
-            env_flag = cfg.get("agent_mode_bypass_env", "BGL_LIGHT_MODE")
-            if env_flag and str(Path):
-                import os
-                if os.getenv(env_flag, "0") == "1":
-                    if cfg.get("agent_mode"):
-                        cfg["agent_mode"] = "auto"
-                    if cfg.get("decision", {}).get("mode"):
-                        cfg.setdefault("decision", {})["mode"] = "auto"
+            env_flag, env_value = _light_mode_flag(cfg)
+            if env_value == "1":
+                if cfg.get("agent_mode"):
+                    cfg["agent_mode"] = "auto"
+                if cfg.get("decision", {}).get("mode"):
+                    cfg.setdefault("decision", {})["mode"] = "auto"
             # Overlay runtime flags (agent_flags.json) if present
             if flags_path.exists():
                 try:
@@ -70,10 +167,35 @@ def load_config(root_dir: Path) -> Dict[str, Any]:
                         cfg = _deep_merge(cfg, flags)
                 except Exception:
                     pass
-            return cfg
+            return cfg, env_flag, env_value
         except Exception:
-            return {}
-    return {}
+            return {}, None, None
+    return {}, None, None
+
+
+def load_config(root_dir: Path) -> Dict[str, Any]:
+    """
+    Parsed config.yml + storage/agent_flags.json overlay, cached per process.
+    The cache is keyed on both files' (path, mtime_ns, size) and the light-mode
+    env flag, so edits are picked up on the next call. The result is a shared
+    read-only mapping (see FrozenConfig); call invalidate() after writing
+    either file if the change could land within the same mtime tick.
+    """
+    cfg_path = root_dir / ".bgl_core" / "config.yml"
+    flags_path = root_dir / "storage" / "agent_flags.json"
+    sig = (_file_sig(cfg_path), _file_sig(flags_path))
+    key = str(cfg_path)
+    cached = _CACHE.get(key)
+    if cached is not None and cached[0] == sig:
+        env_flag = cached[1]
+        if env_flag is None or os.getenv(env_flag, "0") == cached[2]:
+            _STATS["hits"] += 1
+            return cached[3]
+    cfg, env_flag, env_value = _parse_config(cfg_path, flags_path)
+    frozen = _freeze(cfg) if cfg else _EMPTY
+    with _CACHE_LOCK:
+        _CACHE[key] = (sig, env_flag, env_value, frozen)
+    return frozen
 
 
 def load_effective_config(root_dir: Path) -> Dict[str, Any]:
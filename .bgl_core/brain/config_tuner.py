@@ -13,9 +13,9 @@ from pathlib import Path
 from typing import Dict, Any
 
 try:
-    from .config_loader import load_config  # type: ignore
+    from .config_loader import invalidate as invalidate_config, load_config  # type: ignore
 except Exception:
-    from config_loader import load_config  # type: ignore
+    from config_loader import invalidate as invalidate_config, load_config  # type: ignore
 
 
 SAFE_KEYS = {
@@ -274,6 +274,7 @@ def apply_safe_config_tuning(root_dir: Path, diagnostic_map: Dict[str, Any]) ->
     for k, v in updates.items():
         existing[k] = v
     _write_json(flags_path, existing)
+    invalidate_config(root_dir)
 
     meta = _read_json(meta_path)
     history = meta.get("history") or []
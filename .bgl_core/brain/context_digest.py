@@ -15,14 +15,19 @@ import hashlib
 import json
 import subprocess
 import math
+import random
 from pathlib import Path
 from typing import List, Dict, Any, Callable, Optional
 
-from embeddings import add_text
+from embeddings import add_texts
 try:
-    from .db_utils import connect_db  # type: ignore
+    from .db_utils import connect_db, open_snapshot  # type: ignore
 except Exception:
-    from db_utils import connect_db  # type: ignore
+    from db_utils import connect_db, open_snapshot  # type: ignore
+try:
+    from .schema_migrations import ensure_schema, schema_current  # type: ignore
+except Exception:
+    from schema_migrations import ensure_schema, schema_current  # type: ignore
 
 try:
     from .config_loader import load_config  # type: ignore
@@ -355,26 +360,28 @@ def load_route_map(conn: sqlite3.Connection) -> Dict[str, Dict]:
     return {r["uri"]: dict(r) for r in rows}
 
 
+_DIGEST_SKIP_TYPES = {
+    "log_highlight",
+    "route_scan_meta",
+    "diagnostic_run_started",
+    "diagnostic_checkpoint",
+    "diagnostic_run_complete",
+    "diagnostic_delta",
+    "scenario_run_stats",
+    "context_digest_timeout",
+    "retention_preview",
+    "retention_pruned",
+    "retention_apply",
+    "retention_rewrite",
+}
+
+
 def summarize(events: List[sqlite3.Row], route_map: Dict[str, Dict]) -> List[Dict]:
     summaries = []
     grouped: Dict[str, Dict] = {}
     for e in events:
         etype = e["event_type"] or ""
-        skip_types = {
-            "log_highlight",
-            "route_scan_meta",
-            "diagnostic_run_started",
-            "diagnostic_checkpoint",
-            "diagnostic_run_complete",
-            "diagnostic_delta",
-            "scenario_run_stats",
-            "context_digest_timeout",
-            "retention_preview",
-            "retention_pruned",
-            "retention_apply",
-            "retention_rewrite",
-        }
-        if etype in skip_types:
+        if etype in _DIGEST_SKIP_TYPES:
             continue
         route = e["route"] or "/"
         g = grouped.setdefault(
@@ -423,34 +430,555 @@ def summarize(events: List[sqlite3.Row], route_map: Dict[str, Dict]) -> List[Dic
             else 0
         )
         lat_max = max(data["latencies"]) if data["latencies"] else 0
-        controller = route_map.get(route, {}).get("controller") or "unknown"
-        file_path = route_map.get(route, {}).get("file_path") or ""
-        summary = (
-            f"Route {route}: {data['count']} events, "
-            f"{data['http_calls']} HTTP calls ({data['http_fail']} failed), "
-            f"{len(data['js_errors'])} JS errors, "
-            f"{len(data['network_errors'])} network errors, "
-            f"avg latency {lat_avg} ms (max {lat_max} ms)."
-        )
-        related = file_path or controller
-        has_fail = data["http_fail"] or data["js_errors"] or data["network_errors"]
-        confidence = 0.85 if has_fail else 0.6
         summaries.append(
-            {
-                "scenario": route,
-                "summary": summary,
-                "related_files": related,
-                "confidence": confidence,
-                "evidence_count": data["count"],
-                "run_id": (data.get("ctx") or {}).get("run_id"),
-                "scenario_id": (data.get("ctx") or {}).get("scenario_id"),
-                "goal_id": (data.get("ctx") or {}).get("goal_id"),
-                "source_type": "runtime_event",
-            }
+            _route_experience(
+                route,
+                route_map,
+                count=data["count"],
+                http_calls=data["http_calls"],
+                http_fail=data["http_fail"],
+                js_errors=len(data["js_errors"]),
+                network_errors=len(data["network_errors"]),
+                lat_avg=lat_avg,
+                lat_max=lat_max,
+                ctx=data.get("ctx") or {},
+                evidence_count=data["count"],
+            )
         )
     return summaries
 
 
+def _route_experience(
+    route: str,
+    route_map: Dict[str, Dict],
+    *,
+    count: int,
+    http_calls: int,
+    http_fail: int,
+    js_errors: int,
+    network_errors: int,
+    lat_avg: float,
+    lat_max: float,
+    ctx: Dict[str, Any],
+    evidence_count: int,
+    lat_p95: Optional[float] = None,
+) -> Dict[str, Any]:
+    controller = route_map.get(route, {}).get("controller") or "unknown"
+    file_path = route_map.get(route, {}).get("file_path") or ""
+    latency = f"avg latency {lat_avg} ms (max {lat_max} ms)."
+    if lat_p95 is not None:
+        latency = f"avg latency {lat_avg} ms (p95 {lat_p95} ms, max {lat_max} ms)."
+    summary = (
+        f"Route {route}: {count} events, "
+        f"{http_calls} HTTP calls ({http_fail} failed), "
+        f"{js_errors} JS errors, "
+        f"{network_errors} network errors, "
+        f"{latency}"
+    )
+    related = file_path or controller
+    has_fail = http_fail or js_errors or network_errors
+    confidence = 0.85 if has_fail else 0.6
+    return {
+        "scenario": route,
+        "summary": summary,
+        "related_files": related,
+        "confidence": confidence,
+        "evidence_count": evidence_count,
+        "run_id": ctx.get("run_id"),
+        "scenario_id": ctx.get("scenario_id"),
+        "goal_id": ctx.get("goal_id"),
+        "source_type": "runtime_event",
+    }
+
+
+# ---------------------------------------------------------------------------
+# Incremental digest: stream runtime_events past a persisted high-water mark
+# (last processed id) and fold them into per-route running aggregates, so a
+# digest costs O(new events) instead of O(lookback window).
+# ---------------------------------------------------------------------------
+
+_DIGEST_WATERMARK = "runtime_events"
+_STREAM_COLUMNS = (
+    "id, timestamp, run_id, scenario_id, goal_id, event_type, route, "
+    "payload, status, latency_ms, error"
+)
+
+
+def _ensure_digest_aggregates(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
+    try:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS digest_route_aggregates (
+                route TEXT PRIMARY KEY,
+                event_count INTEGER DEFAULT 0,
+                http_calls INTEGER DEFAULT 0,
+                http_fail INTEGER DEFAULT 0,
+                js_errors INTEGER DEFAULT 0,
+                network_errors INTEGER DEFAULT 0,
+                ui_events INTEGER DEFAULT 0,
+                latency_count INTEGER DEFAULT 0,
+                latency_sum REAL DEFAULT 0,
+                latency_max REAL DEFAULT 0,
+                latency_reservoir TEXT,
+                last_ts REAL DEFAULT 0,
+                last_event_id INTEGER DEFAULT 0,
+                last_ctx TEXT,
+                emitted_json TEXT,
+                emitted_at REAL,
+                updated_at REAL,
+                emit_pending INTEGER DEFAULT 0
+            )
+            """
+        )
+        cols = {r[1] for r in conn.execute("PRAGMA table_info(digest_route_aggregates)").fetchall()}
+        if "emit_pending" not in cols:
+            conn.execute("ALTER TABLE digest_route_aggregates ADD COLUMN emit_pending INTEGER DEFAULT 0")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS digest_watermarks (
+                name TEXT PRIMARY KEY,
+                last_id INTEGER DEFAULT 0,
+                last_ts REAL DEFAULT 0,
+                updated_at REAL
+            )
+            """
+        )
+        conn.commit()
+    except Exception:
+        pass
+
+
+def read_watermark(conn: sqlite3.Connection, name: str = _DIGEST_WATERMARK) -> Optional[int]:
+    try:
+        row = conn.execute(
+            "SELECT last_id FROM digest_watermarks WHERE name=?", (name,)
+        ).fetchone()
+    except Exception:
+        return None
+    return int(row[0] or 0) if row else None
+
+
+def _bootstrap_watermark(conn: sqlite3.Connection, cutoff: float) -> int:
+    """First incremental run: start at the lookback window instead of id 0."""
+    try:
+        row = conn.execute(
+            "SELECT MIN(id) FROM runtime_events WHERE timestamp >= ?", (cutoff,)
+        ).fetchone()
+        if row and row[0] is not None:
+            return int(row[0]) - 1
+        row = conn.execute("SELECT MAX(id) FROM runtime_events").fetchone()
+        return int(row[0] or 0) if row else 0
+    except Exception:
+        return 0
+
+
+def iter_events_since(
+    conn: sqlite3.Connection,
+    last_id: int,
+    *,
+    max_events: int = 0,
+    batch_size: int = 500,
+):
+    """
+    Yield runtime_events rows with id > last_id in id order without
+    materializing the result set. Uses keyset pagination so each batch is an
+    index range scan on the primary key.
+    """
+    cur = conn.cursor()
+    cur.row_factory = sqlite3.Row
+    seen = 0
+    while True:
+        take = batch_size
+        if max_events and max_events > 0:
+            take = min(batch_size, max_events - seen)
+            if take <= 0:
+                return
+        rows = cur.execute(
+            f"SELECT {_STREAM_COLUMNS} FROM runtime_events WHERE id > ? ORDER BY id LIMIT ?",
+            (int(last_id), int(take)),
+        ).fetchall()
+        if not rows:
+            return
+        for row in rows:
+            yield row
+        seen += len(rows)
+        last_id = int(rows[-1]["id"])
+        if len(rows) < take:
+            return
+
+
+def _load_route_aggregate(conn: sqlite3.Connection, route: str) -> Dict[str, Any]:
+    agg: Dict[str, Any] = {
+        "route": route,
+        "event_count": 0,
+        "http_calls": 0,
+        "http_fail": 0,
+        "js_errors": 0,
+        "network_errors": 0,
+        "ui_events": 0,
+        "latency_count": 0,
+        "latency_sum": 0.0,
+        "latency_max": 0.0,
+        "reservoir": [],
+        "last_ts": 0.0,
+        "last_event_id": 0,
+        "ctx": {},
+        "emitted": {},
+    }
+    try:
+        row = conn.execute(
+            """
+            SELECT event_count, http_calls, http_fail, js_errors, network_errors, ui_events,
+                   latency_count, latency_sum, latency_max, latency_reservoir,
+                   last_ts, last_event_id, last_ctx, emitted_json
+            FROM digest_route_aggregates WHERE route=?
+            """,
+            (route,),
+        ).fetchone()
+    except Exception:
+        row = None
+    if not row:
+        return agg
+    keys = (
+        "event_count",
+        "http_calls",
+        "http_fail",
+        "js_errors",
+        "network_errors",
+        "ui_events",
+        "latency_count",
+    )
+    for idx, key in enumerate(keys):
+        agg[key] = int(row[idx] or 0)
+    agg["latency_sum"] = float(row[7] or 0)
+    agg["latency_max"] = float(row[8] or 0)
+    agg["reservoir"] = [float(v) for v in (_safe_list(row[9]))]
+    agg["last_ts"] = float(row[10] or 0)
+    agg["last_event_id"] = int(row[11] or 0)
+    agg["ctx"] = _safe_json(row[12]) if row[12] else {}
+    agg["emitted"] = _safe_json(row[13]) if row[13] else {}
+    return agg
+
+
+def _safe_list(raw) -> List[Any]:
+    if not raw:
+        return []
+    try:
+        val = json.loads(raw)
+    except Exception:
+        return []
+    return val if isinstance(val, list) else []
+
+
+def _fold_event(agg: Dict[str, Any], e: sqlite3.Row, reservoir_size: int) -> None:
+    """Update one route aggregate with a single event (mirrors summarize())."""
+    etype = e["event_type"] or ""
+    agg["event_count"] += 1
+    status = e["status"] or 0
+    if etype in ("api_call", "http_error", "route"):
+        agg["http_calls"] += 1
+        if status >= 400 or status == 0:
+            agg["http_fail"] += 1
+        if e["latency_ms"] is not None:
+            try:
+                lat = float(e["latency_ms"])
+            except Exception:
+                lat = None
+            if lat is not None:
+                agg["latency_count"] += 1
+                agg["latency_sum"] += lat
+                agg["latency_max"] = max(float(agg["latency_max"]), lat)
+                # Reservoir sampling (Algorithm R) keeps a bounded, uniform
+                # latency sample for percentiles. One RNG per route, seeded by
+                # route and position, so replays are deterministic.
+                reservoir = agg["reservoir"]
+                n = agg["latency_count"]
+                if len(reservoir) < reservoir_size:
+                    reservoir.append(lat)
+                else:
+                    rng = agg.get("rng")
+                    if rng is None:
+                        rng = agg["rng"] = random.Random(f"{agg['route']}:{n}")
+                    slot = rng.randrange(n)
+                    if slot < reservoir_size:
+                        reservoir[slot] = lat
+    elif etype in ("ui_click", "ui_input"):
+        agg["ui_events"] += 1
+    elif etype in ("js_error", "console_error"):
+        if e["error"]:
+            agg["js_errors"] += 1
+    elif etype in ("network_fail",):
+        if e["error"]:
+            agg["network_errors"] += 1
+    try:
+        ts = float(e["timestamp"] or 0)
+    except Exception:
+        ts = 0.0
+    if ts >= float(agg.get("last_ts") or 0):
+        agg["last_ts"] = ts
+        agg["ctx"] = _row_context(e)
+    agg["last_event_id"] = max(int(agg.get("last_event_id") or 0), int(e["id"] or 0))
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(math.ceil(pct * len(ordered))) - 1))
+    return round(ordered[idx], 2)
+
+
+def _aggregate_snapshot(agg: Dict[str, Any]) -> Dict[str, Any]:
+    lat_count = int(agg.get("latency_count") or 0)
+    return {
+        "count": int(agg["event_count"]),
+        "http_fail": int(agg["http_fail"]),
+        "js_errors": int(agg["js_errors"]),
+        "network_errors": int(agg["network_errors"]),
+        "lat_avg": round(float(agg["latency_sum"]) / lat_count, 2) if lat_count else 0,
+        "lat_p95": _percentile(agg.get("reservoir") or [], 0.95),
+    }
+
+
+def _materially_changed(
+    snap: Dict[str, Any],
+    emitted: Dict[str, Any],
+    *,
+    min_events: int,
+    ratio: float,
+) -> bool:
+    if not emitted:
+        return True
+    for key in ("http_fail", "js_errors", "network_errors"):
+        if int(snap.get(key) or 0) > int(emitted.get(key) or 0):
+            return True
+    prev_count = int(emitted.get("count") or 0)
+    grown = int(snap.get("count") or 0) - prev_count
+    if grown >= max(int(min_events), int(math.ceil(prev_count * ratio))):
+        return True
+    for key in ("lat_avg", "lat_p95"):
+        prev = float(emitted.get(key) or 0)
+        cur = float(snap.get(key) or 0)
+        if abs(cur - prev) >= 50 and abs(cur - prev) >= prev * ratio:
+            return True
+    return False
+
+
+def incremental_route_digest(
+    conn: sqlite3.Connection,
+    route_map_fn: Callable[[], Dict[str, Dict]],
+    *,
+    cutoff: float,
+    max_events: int = 0,
+    reservoir_size: int = 64,
+    min_events: int = 5,
+    ratio: float = 0.25,
+    time_left_fn: Optional[Callable[[], float]] = None,
+) -> Dict[str, Any]:
+    """
+    Fold runtime_events newer than the high-water mark into
+    digest_route_aggregates and return experiences for routes whose
+    aggregates changed materially since they were last emitted.
+
+    Side-channel events (log highlights, diagnostics, retention) are
+    returned in `side_events` (newest first) for the existing summarizers.
+    The watermark and aggregates are committed together. Emitting routes are
+    flagged emit_pending and returned in `emits` (route -> snapshot and
+    experience hash); their emitted snapshot only advances through
+    confirm_route_emits() once the experiences are stored, so a run that
+    stops before the upsert re-emits them.
+    """
+    _ensure_digest_aggregates(conn)
+    last_id = read_watermark(conn)
+    bootstrapped = last_id is None
+    if last_id is None:
+        last_id = _bootstrap_watermark(conn, cutoff)
+    touched: Dict[str, Dict[str, Any]] = {}
+    try:
+        for (route,) in conn.execute(
+            "SELECT route FROM digest_route_aggregates WHERE emit_pending = 1"
+        ).fetchall():
+            touched[route] = _load_route_aggregate(conn, route)
+    except Exception:
+        pass
+    side_events: List[sqlite3.Row] = []
+    processed = 0
+    high_id = int(last_id)
+    latest_ts = 0.0
+    for e in iter_events_since(conn, high_id, max_events=max_events):
+        processed += 1
+        high_id = int(e["id"])
+        try:
+            latest_ts = max(latest_ts, float(e["timestamp"] or 0))
+        except Exception:
+            pass
+        etype = e["event_type"] or ""
+        if etype in _DIGEST_SKIP_TYPES:
+            if etype != "context_digest_timeout":
+                side_events.append(e)
+        else:
+            route = e["route"] or "/"
+            agg = touched.get(route)
+            if agg is None:
+                agg = touched[route] = _load_route_aggregate(conn, route)
+            _fold_event(agg, e, reservoir_size)
+        if time_left_fn is not None and processed % 1000 == 0 and time_left_fn() < 10:
+            break
+
+    summaries: List[Dict[str, Any]] = []
+    emits: Dict[str, Dict[str, Any]] = {}
+    route_map = route_map_fn() if touched else {}
+    now = time.time()
+    rows = []
+    for route, agg in touched.items():
+        snap = _aggregate_snapshot(agg)
+        emitted = agg.get("emitted") or {}
+        pending = _materially_changed(snap, emitted, min_events=min_events, ratio=ratio)
+        if pending:
+            summaries.append(
+                _route_experience(
+                    route,
+                    route_map,
+                    count=snap["count"],
+                    http_calls=int(agg["http_calls"]),
+                    http_fail=snap["http_fail"],
+                    js_errors=snap["js_errors"],
+                    network_errors=snap["network_errors"],
+                    lat_avg=snap["lat_avg"],
+                    lat_max=round(float(agg["latency_max"]), 2),
+                    lat_p95=snap["lat_p95"] if agg.get("reservoir") else None,
+                    ctx=agg.get("ctx") or {},
+                    evidence_count=max(1, snap["count"] - int(emitted.get("count") or 0)),
+                )
+            )
+            emits[route] = {
+                "snapshot": snap,
+                "exp_hash": _exp_hash(summaries[-1]["scenario"], summaries[-1]["summary"]),
+            }
+        rows.append(
+            (
+                route,
+                int(agg["event_count"]),
+                int(agg["http_calls"]),
+                int(agg["http_fail"]),
+                int(agg["js_errors"]),
+                int(agg["network_errors"]),
+                int(agg["ui_events"]),
+                int(agg["latency_count"]),
+                float(agg["latency_sum"]),
+                float(agg["latency_max"]),
+                json.dumps(agg.get("reservoir") or []),
+                float(agg["last_ts"]),
+                int(agg["last_event_id"]),
+                json.dumps(agg.get("ctx") or {}, ensure_ascii=False),
+                1 if pending else 0,
+                now,
+            )
+        )
+    try:
+        if rows:
+            conn.executemany(
+                """
+                INSERT INTO digest_route_aggregates (
+                    route, event_count, http_calls, http_fail, js_errors, network_errors,
+                    ui_events, latency_count, latency_sum, latency_max, latency_reservoir,
+                    last_ts, last_event_id, last_ctx, emit_pending, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(route) DO UPDATE SET
+                    event_count=excluded.event_count,
+                    http_calls=excluded.http_calls,
+                    http_fail=excluded.http_fail,
+                    js_errors=excluded.js_errors,
+                    network_errors=excluded.network_errors,
+                    ui_events=excluded.ui_events,
+                    latency_count=excluded.latency_count,
+                    latency_sum=excluded.latency_sum,
+                    latency_max=excluded.latency_max,
+                    latency_reservoir=excluded.latency_reservoir,
+                    last_ts=excluded.last_ts,
+                    last_event_id=excluded.last_event_id,
+                    last_ctx=excluded.last_ctx,
+                    emit_pending=excluded.emit_pending,
+                    updated_at=excluded.updated_at
+                """,
+                rows,
+            )
+        if processed or bootstrapped:
+            conn.execute(
+                """
+                INSERT INTO digest_watermarks (name, last_id, last_ts, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    last_id=excluded.last_id,
+                    last_ts=MAX(digest_watermarks.last_ts, excluded.last_ts),
+                    updated_at=excluded.updated_at
+                """,
+                (_DIGEST_WATERMARK, int(high_id), float(latest_ts), now),
+            )
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        # Aggregates were not persisted; do not emit so the next run replays.
+        return {
+            "summaries": [],
+            "emits": {},
+            "side_events": [],
+            "events": 0,
+            "last_id": int(last_id),
+            "latest_ts": 0.0,
+            "routes_touched": 0,
+        }
+    side_events.reverse()
+    return {
+        "summaries": summaries,
+        "emits": emits,
+        "side_events": side_events,
+        "events": processed,
+        "last_id": int(high_id),
+        "latest_ts": latest_ts,
+        "routes_touched": len(touched),
+    }
+
+
+def confirm_route_emits(
+    conn: sqlite3.Connection,
+    emits: Dict[str, Dict[str, Any]],
+    stored: List[Dict],
+) -> int:
+    """
+    Advance emitted_json for routes whose experience is among `stored` (the
+    upsert_experiences() result) and clear their emit_pending flag. Routes
+    whose experience was dropped stay pending for the next run.
+    """
+    stored_hashes = {e.get("exp_hash") for e in stored or []}
+    now = time.time()
+    rows = [
+        (json.dumps(emit["snapshot"], ensure_ascii=False), now, route)
+        for route, emit in (emits or {}).items()
+        if emit.get("exp_hash") in stored_hashes
+    ]
+    if not rows:
+        return 0
+    try:
+        conn.executemany(
+            "UPDATE digest_route_aggregates SET emitted_json=?, emitted_at=?, emit_pending=0 WHERE route=?",
+            rows,
+        )
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        return 0
+    return len(rows)
+
+
 def _safe_json(raw) -> Dict:
     if raw is None:
         return {}
@@ -800,6 +1328,8 @@ def summarize_outcomes(outcomes: List[sqlite3.Row]) -> List[Dict]:
 
 
 def _ensure_experience_columns(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
     try:
         cols = {r[1] for r in conn.execute("PRAGMA table_info(experiences)").fetchall()}
     except Exception:
@@ -935,6 +1465,25 @@ def summarize_prod_ops(ops: List[sqlite3.Row]) -> List[Dict]:
     return summaries
 
 
+def _chunks(items: List[Any], size: int = 400):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _fetch_experience_rows(
+    cur: sqlite3.Cursor, hashes: List[str]
+) -> Dict[str, tuple]:
+    rows: Dict[str, tuple] = {}
+    for chunk in _chunks(hashes):
+        placeholders = ",".join("?" for _ in chunk)
+        for r in cur.execute(
+            f"SELECT exp_hash, id, seen_count, evidence_count, confidence FROM experiences WHERE exp_hash IN ({placeholders})",
+            chunk,
+        ).fetchall():
+            rows[str(r[0])] = (r[1], r[2], r[3], r[4])
+    return rows
+
+
 def upsert_experiences(
     conn: sqlite3.Connection,
     experiences: List[Dict],
@@ -943,30 +1492,31 @@ def upsert_experiences(
     min_embed_budget: float = 8.0,
 ):
     cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS experiences (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_at REAL NOT NULL,
-            updated_at REAL,
-            scenario TEXT,
-            summary TEXT,
-            related_files TEXT,
-            exp_hash TEXT UNIQUE,
-            seen_count INTEGER DEFAULT 0,
-            last_seen REAL,
-            confidence REAL,
-            evidence_count INTEGER DEFAULT 0,
-            value_score REAL,
-            suppressed INTEGER DEFAULT 0,
-            run_id TEXT,
-            scenario_id TEXT,
-            goal_id TEXT,
-            source_type TEXT
+    if not schema_current(conn):
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS experiences (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at REAL NOT NULL,
+                updated_at REAL,
+                scenario TEXT,
+                summary TEXT,
+                related_files TEXT,
+                exp_hash TEXT UNIQUE,
+                seen_count INTEGER DEFAULT 0,
+                last_seen REAL,
+                confidence REAL,
+                evidence_count INTEGER DEFAULT 0,
+                value_score REAL,
+                suppressed INTEGER DEFAULT 0,
+                run_id TEXT,
+                scenario_id TEXT,
+                goal_id TEXT,
+                source_type TEXT
+            )
+            """
         )
-        """
-    )
-    _ensure_experience_columns(conn)
+        _ensure_experience_columns(conn)
     now = time.time()
     try:
         max_items = int(
@@ -980,108 +1530,138 @@ def upsert_experiences(
         max_items = len(experiences)
     if max_items > 0 and len(experiences) > max_items:
         experiences = experiences[:max_items]
-    upserted: List[Dict] = []
-    processed: List[Dict] = []
-    for exp in experiences:
-        try:
-            if time_left_fn is not None and time_left_fn() < 3.0:
-                break
-        except Exception:
-            pass
-        scenario = exp["scenario"]
-        summary = exp["summary"]
-        exp_run_id = exp.get("run_id") or None
-        exp_scenario_id = exp.get("scenario_id") or None
-        exp_goal_id = exp.get("goal_id") or None
-        exp_source_type = exp.get("source_type") or None
-        exp_hash = _exp_hash(scenario, summary)
-        row = cur.execute(
-            "SELECT id, seen_count, evidence_count, confidence, value_score FROM experiences WHERE exp_hash=?",
-            (exp_hash,),
-        ).fetchone()
-        if row:
-            seen_count = int(row[1] or 0) + 1
-            evidence_total = int(row[2] or 0) + int(exp["evidence_count"] or 0)
-            prev_conf = float(row[3] or 0.5)
-            new_conf = (
-                (prev_conf + float(exp["confidence"] or 0.5) * max(1, int(exp["evidence_count"] or 1)))
-                / float(1 + max(1, int(exp["evidence_count"] or 1)))
-            )
-            value_score = _value_score(new_conf, evidence_total)
-            cur.execute(
-                """
-                UPDATE experiences
-                SET updated_at=?, last_seen=?, seen_count=?, evidence_count=?, confidence=?, value_score=?,
-                    run_id=COALESCE(?, run_id),
-                    scenario_id=COALESCE(?, scenario_id),
-                    goal_id=COALESCE(?, goal_id),
-                    source_type=COALESCE(?, source_type)
-                WHERE id=?
-                """,
+    try:
+        if time_left_fn is not None and time_left_fn() < 3.0:
+            experiences = []
+    except Exception:
+        pass
+
+    # Set-based upsert: hash everything up front, fetch existing rows in one
+    # IN (...) query, fold repeats in memory, then write with executemany.
+    hashes = [_exp_hash(exp["scenario"], exp["summary"]) for exp in experiences]
+    existing = _fetch_experience_rows(cur, list(dict.fromkeys(hashes)))
+    state: Dict[str, Dict[str, Any]] = {}
+    for exp, exp_hash in zip(experiences, hashes):
+        st = state.get(exp_hash)
+        if st is None and exp_hash in existing:
+            row = existing[exp_hash]
+            st = {
+                "id": row[0],
+                "seen_count": int(row[1] or 0),
+                "evidence_count": int(row[2] or 0),
+                "confidence": float(row[3] or 0.5),
+            }
+            state[exp_hash] = st
+        if st is None:
+            conf = float(exp["confidence"] or 0.5)
+            state[exp_hash] = {
+                "id": None,
+                "exp": exp,
+                "seen_count": 1,
+                "evidence_count": int(exp["evidence_count"] or 0),
+                "confidence": conf,
+            }
+        else:
+            weight = max(1, int(exp["evidence_count"] or 1))
+            st["seen_count"] += 1
+            st["evidence_count"] += int(exp["evidence_count"] or 0)
+            st["confidence"] = (
+                st["confidence"] + float(exp["confidence"] or 0.5) * weight
+            ) / float(1 + weight)
+        st = state[exp_hash]
+        # Latest non-empty attribution wins, matching COALESCE(?, col) on update.
+        for key in ("run_id", "scenario_id", "goal_id", "source_type"):
+            if exp.get(key):
+                st[key] = exp.get(key)
+
+    inserts = []
+    updates = []
+    for exp_hash, st in state.items():
+        value_score = _value_score(st["confidence"], st["evidence_count"])
+        if st["id"] is None:
+            exp = st["exp"]
+            inserts.append(
                 (
                     now,
                     now,
-                    seen_count,
-                    evidence_total,
-                    new_conf,
+                    exp["scenario"],
+                    exp["summary"],
+                    exp["related_files"],
+                    exp_hash,
+                    st["seen_count"],
+                    now,
+                    st["confidence"],
+                    st["evidence_count"],
                     value_score,
-                    exp_run_id,
-                    exp_scenario_id,
-                    exp_goal_id,
-                    exp_source_type,
-                    row[0],
-                ),
+                    st.get("run_id"),
+                    st.get("scenario_id"),
+                    st.get("goal_id"),
+                    st.get("source_type"),
+                )
             )
-            exp_id = row[0]
         else:
-            seen_count = 1
-            evidence_total = int(exp["evidence_count"] or 0)
-            conf = float(exp["confidence"] or 0.5)
-            value_score = _value_score(conf, evidence_total)
-            cur.execute(
-                """
-                INSERT INTO experiences (created_at, updated_at, scenario, summary, related_files, exp_hash, seen_count, last_seen, confidence, evidence_count, value_score, suppressed, run_id, scenario_id, goal_id, source_type)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
-                """,
+            updates.append(
                 (
                     now,
                     now,
-                    scenario,
-                    summary,
-                    exp["related_files"],
-                    exp_hash,
-                    seen_count,
-                    now,
-                    conf,
-                    evidence_total,
+                    st["seen_count"],
+                    st["evidence_count"],
+                    st["confidence"],
                     value_score,
-                    exp_run_id,
-                    exp_scenario_id,
-                    exp_goal_id,
-                    exp_source_type,
-                ),
+                    st.get("run_id"),
+                    st.get("scenario_id"),
+                    st.get("goal_id"),
+                    st.get("source_type"),
+                    st["id"],
+                )
             )
-            exp_id = cur.lastrowid
+    if updates:
+        cur.executemany(
+            """
+            UPDATE experiences
+            SET updated_at=?, last_seen=?, seen_count=?, evidence_count=?, confidence=?, value_score=?,
+                run_id=COALESCE(?, run_id),
+                scenario_id=COALESCE(?, scenario_id),
+                goal_id=COALESCE(?, goal_id),
+                source_type=COALESCE(?, source_type)
+            WHERE id=?
+            """,
+            updates,
+        )
+    if inserts:
+        cur.executemany(
+            """
+            INSERT INTO experiences (created_at, updated_at, scenario, summary, related_files, exp_hash, seen_count, last_seen, confidence, evidence_count, value_score, suppressed, run_id, scenario_id, goal_id, source_type)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?, ?)
+            """,
+            inserts,
+        )
+        inserted = _fetch_experience_rows(cur, [row[5] for row in inserts])
+        for exp_hash, row in inserted.items():
+            state[exp_hash]["id"] = row[0]
+    conn.commit()
+
+    upserted: List[Dict] = []
+    processed: List[Dict] = []
+    for exp, exp_hash in zip(experiences, hashes):
         upserted.append(
             {
-                "id": exp_id,
+                "id": state[exp_hash]["id"],
                 "created_at": now,
-                "scenario": scenario,
-                "summary": summary,
+                "scenario": exp["scenario"],
+                "summary": exp["summary"],
                 "related_files": exp["related_files"],
                 "confidence": exp["confidence"],
                 "evidence_count": exp["evidence_count"],
                 "exp_hash": exp_hash,
-                "run_id": exp_run_id,
-                "scenario_id": exp_scenario_id,
-                "goal_id": exp_goal_id,
-                "source_type": exp_source_type,
+                "run_id": exp.get("run_id") or None,
+                "scenario_id": exp.get("scenario_id") or None,
+                "goal_id": exp.get("goal_id") or None,
+                "source_type": exp.get("source_type") or None,
             }
         )
         processed.append(exp)
 
-    conn.commit()
-
     # Index into semantic memory AFTER commit to avoid locking
     skip_embeddings = False
     try:
@@ -1100,18 +1680,16 @@ def upsert_experiences(
             )
         except Exception:
             embed_limit = 160
-        embed_count = 0
-        for exp in processed:
-            if embed_limit > 0 and embed_count >= embed_limit:
-                break
-            try:
-                if time_left_fn is not None and time_left_fn() < float(min_embed_budget):
-                    break
-            except Exception:
-                pass
-            if exp["confidence"] >= 0.3:
-                add_text(f"[Experience] {exp['scenario']}", exp["summary"])
-                embed_count += 1
+        # One batched vectorization pass instead of a write per experience.
+        batch = [
+            (f"[Experience] {exp['scenario']}", exp["summary"])
+            for exp in processed
+            if exp["confidence"] >= 0.3
+        ]
+        if embed_limit > 0:
+            batch = batch[:embed_limit]
+        if batch:
+            add_texts(batch)
 
     # Unified memory index (best-effort, non-blocking)
     try:
@@ -1170,6 +1748,8 @@ def _exp_hash(scenario: str, summary: str) -> str:
 
 
 def _ensure_experience_actions(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS experience_actions (
@@ -1184,6 +1764,8 @@ def _ensure_experience_actions(conn: sqlite3.Connection) -> None:
 
 
 def _ensure_experience_links(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS experience_proposal_links (
@@ -1250,7 +1832,7 @@ def auto_promote_experiences(conn: sqlite3.Connection, experiences: List[Dict])
         summary = str(exp.get("summary") or "")
         if not scenario or not summary:
             continue
-        exp_hash = _exp_hash(scenario, summary)
+        exp_hash = exp.get("exp_hash") or _exp_hash(scenario, summary)
         if exp_hash in existing_actions:
             continue
         try:
@@ -1464,7 +2046,17 @@ def main():
         default=None,
         help="Max runtime seconds for this digest (0 disables limit)",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-summarize the whole lookback window instead of the incremental stream",
+    )
     args = parser.parse_args()
+    incremental = (not args.full) and _cfg_flag(
+        "BGL_CONTEXT_DIGEST_INCREMENTAL",
+        "context_digest_incremental",
+        True,
+    )
 
     fast_mode = _cfg_flag(
         "BGL_CONTEXT_DIGEST_FAST",
@@ -1525,6 +2117,7 @@ def main():
         "hours": float(args.hours),
         "limit": int(args.limit),
         "fast_mode": bool(fast_mode),
+        "incremental": bool(incremental),
     }
     _write_digest_state(state)
     timeout_cfg = _cfg_number(
@@ -1583,6 +2176,7 @@ def main():
         # Prefer incremental window (with overlap) to reduce heavy scans.
         cutoff = max(float(cutoff), float(prev_last_ts) - float(overlap_sec))
 
+    ensure_schema(DB_PATH)
     conn = connect_db(DB_PATH, timeout=30.0)
     try:
         conn.execute("PRAGMA journal_mode=WAL;")
@@ -1590,6 +2184,21 @@ def main():
     except Exception:
         pass
     _ensure_digest_indexes(conn)
+    conn.row_factory = sqlite3.Row
+    # Report reads share one pinned read-only snapshot; writes stay on `conn`.
+    try:
+        reader = open_snapshot(DB_PATH)
+    except Exception:
+        reader = conn
+
+    def _release_reader() -> None:
+        nonlocal reader
+        if reader is not conn:
+            try:
+                reader.close()
+            except Exception:
+                pass
+            reader = conn
 
     def _budget_guard(stage: str) -> bool:
         if not _expired():
@@ -1603,6 +2212,7 @@ def main():
         except Exception:
             pass
         _finalize_state("timeout", stage=stage, remaining_sec=round(_time_left(), 2))
+        _release_reader()
         try:
             conn.close()
         except Exception:
@@ -1610,15 +2220,16 @@ def main():
         print(f"Context digest: time budget exhausted at {stage}.")
         return True
 
-    def _guarded_fetch(stage: str, fn: Callable[[], Any]):
+    def _guarded_fetch(stage: str, fn: Callable[[], Any], target: Optional[sqlite3.Connection] = None):
         """
         Run a DB query with a progress guard so long queries don't exceed the time budget.
         Returns (result, aborted).
         """
+        target = target or conn
         if deadline is None:
             return fn(), False
         try:
-            conn.set_progress_handler(lambda: 1 if _expired() else 0, 10000)
+            target.set_progress_handler(lambda: 1 if _expired() else 0, 10000)
         except Exception:
             pass
         try:
@@ -1634,6 +2245,7 @@ def main():
                 except Exception:
                     pass
                 _finalize_state("timeout", stage=stage, remaining_sec=round(_time_left(), 2))
+                _release_reader()
                 try:
                     conn.close()
                 except Exception:
@@ -1643,43 +2255,95 @@ def main():
             raise
         finally:
             try:
-                conn.set_progress_handler(None, 0)
+                target.set_progress_handler(None, 0)
             except Exception:
                 pass
 
     # Runtime events (respect remaining time budget)
-    event_limit = int(args.limit)
-    try:
-        if _time_left() < 25:
-            event_limit = max(120, min(event_limit, int(_time_left() * 6)))
-    except Exception:
-        event_limit = int(args.limit)
-    events, aborted = _guarded_fetch(
-        "events_query", lambda: fetch_events(conn, cutoff, event_limit)
-    )
-    if aborted:
-        return
-    if events is None:
-        events = []
-    stats["events"] = len(events or [])
-    latest_ts = 0.0
-    try:
-        if events:
-            latest_ts = max(latest_ts, float(events[0]["timestamp"] or 0))
-    except Exception:
-        pass
     event_summaries: List[Dict] = []
     log_summaries: List[Dict] = []
     route_meta_summaries: List[Dict] = []
     diagnostic_summaries: List[Dict] = []
     retention_summaries: List[Dict] = []
+    route_emits: Dict[str, Dict[str, Any]] = {}
+    latest_ts = 0.0
+    if incremental:
+        max_events = int(
+            _cfg_number(
+                "BGL_CONTEXT_DIGEST_INCREMENTAL_MAX_EVENTS",
+                "context_digest_incremental_max_events",
+                20000,
+            )
+        )
+        result, aborted = _guarded_fetch(
+            "events_stream",
+            lambda: incremental_route_digest(
+                conn,
+                lambda: load_route_map(conn),
+                cutoff=cutoff,
+                max_events=max_events,
+                reservoir_size=int(
+                    _cfg_number(
+                        "BGL_CONTEXT_DIGEST_RESERVOIR",
+                        "context_digest_latency_reservoir",
+                        64,
+                    )
+                ),
+                min_events=int(
+                    _cfg_number(
+                        "BGL_CONTEXT_DIGEST_MATERIAL_MIN_EVENTS",
+                        "context_digest_material_min_events",
+                        5,
+                    )
+                ),
+                ratio=float(
+                    _cfg_number(
+                        "BGL_CONTEXT_DIGEST_MATERIAL_RATIO",
+                        "context_digest_material_ratio",
+                        0.25,
+                    )
+                ),
+                time_left_fn=_time_left,
+            ),
+        )
+        if aborted:
+            return
+        result = result or {}
+        events = result.get("side_events") or []
+        event_summaries = result.get("summaries") or []
+        route_emits = result.get("emits") or {}
+        stats["events"] = int(result.get("events") or 0)
+        stats["routes_touched"] = int(result.get("routes_touched") or 0)
+        stats["last_event_id"] = int(result.get("last_id") or 0)
+        latest_ts = float(result.get("latest_ts") or 0)
+    else:
+        event_limit = int(args.limit)
+        try:
+            if _time_left() < 25:
+                event_limit = max(120, min(event_limit, int(_time_left() * 6)))
+        except Exception:
+            event_limit = int(args.limit)
+        events, aborted = _guarded_fetch(
+            "events_query", lambda: fetch_events(reader, cutoff, event_limit), reader
+        )
+        if aborted:
+            return
+        if events is None:
+            events = []
+        stats["events"] = len(events or [])
+        try:
+            if events:
+                latest_ts = max(latest_ts, float(events[0]["timestamp"] or 0))
+        except Exception:
+            pass
+        if events:
+            event_summaries = summarize(events, load_route_map(reader))
     if events:
-        route_map = load_route_map(conn)
-        event_summaries = summarize(events, route_map)
         log_summaries = summarize_log_highlights(events)
         route_meta_summaries = summarize_route_scan_meta(events)
         diagnostic_summaries = summarize_diagnostic_events(events)
         retention_summaries = summarize_retention_events(events)
+    event_count = int(stats["events"])
     if _budget_guard("events"):
         return
 
@@ -1691,7 +2355,7 @@ def main():
     except Exception:
         outcome_limit = int(args.limit)
     outcomes, aborted = _guarded_fetch(
-        "outcomes_query", lambda: fetch_outcomes(conn, cutoff, outcome_limit)
+        "outcomes_query", lambda: fetch_outcomes(reader, cutoff, outcome_limit), reader
     )
     if aborted:
         return
@@ -1720,7 +2384,7 @@ def main():
             pass
         prod_cutoff = 0.0 if prod_ops_full or prod_ops_hours <= 0 else (time.time() - prod_ops_hours * 3600)
         prod_ops, aborted = _guarded_fetch(
-            "prod_ops_query", lambda: fetch_prod_ops(conn, prod_cutoff, prod_ops_limit)
+            "prod_ops_query", lambda: fetch_prod_ops(reader, prod_cutoff, prod_ops_limit), reader
         )
         if aborted:
             return
@@ -1735,6 +2399,7 @@ def main():
         prod_summaries = summarize_prod_ops(prod_ops) if prod_ops else []
         if _budget_guard("prod_ops"):
             return
+    _release_reader()
 
     runtime_contract_summaries: List[Dict[str, Any]] = []
     if _cfg_flag(
@@ -1766,6 +2431,8 @@ def main():
 
     inserted = upsert_experiences(conn, experiences, time_left_fn=_time_left)
     stats["experiences"] = len(inserted or [])
+    if route_emits:
+        confirm_route_emits(conn, route_emits, inserted)
     if _budget_guard("experiences"):
         return
 
@@ -1813,7 +2480,7 @@ def main():
         except Exception:
             pass
     print(
-        f"Stored {len(experiences)} experience(s) from {len(events)} event(s) "
+        f"Stored {len(experiences)} experience(s) from {event_count} event(s) "
         f"+ {len(outcomes)} outcome(s) and {len(prod_ops)} prod op(s). "
         f"Auto proposals: {len(proposal_ids)}"
     )
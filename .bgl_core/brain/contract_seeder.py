@@ -6,7 +6,12 @@ import os
 from typing import Dict, Any, List, Tuple
 import time
 
-import yaml  # type: ignore
+try:
+    from .lazy_imports import lazy_import  # type: ignore
+except Exception:
+    from lazy_imports import lazy_import  # type: ignore
+
+yaml = lazy_import("yaml")
 
 ROOT = Path(__file__).resolve().parents[2]
 MANUAL = ROOT / "docs" / "openapi.manual.yaml"
@@ -1,15 +1,241 @@
+import hashlib
+import json
+import os
 import subprocess
 import sys
 import shutil
 import importlib.util
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
+try:
+    from .check_context import InputDigest  # type: ignore
+    from .config_loader import load_config  # type: ignore
+    from .lazy_imports import lazy_import  # type: ignore
+except Exception:
+    from check_context import InputDigest  # type: ignore
+    from config_loader import load_config  # type: ignore
+    from lazy_imports import lazy_import  # type: ignore
 
-def run_contract_suite(root: Path) -> List[Dict[str, Any]]:
+yaml = lazy_import("yaml")
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+SCHEMATHESIS_ARGS = [
+    "--stateful=links",
+    "--checks=all",
+    "--hypothesis-deadline=750",
+    "--max-examples=50",
+]
+
+
+def _schemathesis_cmd(spec: Path) -> List[str]:
+    # Prefer running via the current Python interpreter to avoid PATH issues.
+    if importlib.util.find_spec("schemathesis") is not None:
+        return [sys.executable, "-m", "schemathesis", "run", str(spec), *SCHEMATHESIS_ARGS]
+    schemathesis_cli = shutil.which("schemathesis")
+    if not schemathesis_cli:
+        raise FileNotFoundError("schemathesis not installed")
+    return [schemathesis_cli, "run", str(spec), *SCHEMATHESIS_ARGS]
+
+
+def _state_dir(root: Path) -> Path:
+    return root / ".bgl_core" / "logs" / "contract_shards"
+
+
+def _load_state(root: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads((_state_dir(root) / "state.json").read_text(encoding="utf-8"))
+        if isinstance(data, dict) and data.get("version") == 1:
+            return data
+    except Exception:
+        pass
+    return {"version": 1, "files": {}, "green": {}}
+
+
+def _save_json(path: Path, data: Dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(path)
+    except Exception:
+        pass
+
+
+def _operations(
+    root: Path, spec: Dict[str, Any], digests: InputDigest
+) -> List[Tuple[str, str, str, str]]:
+    """
+    (op_id, path, method, fingerprint) for every operation in the spec.
+    The fingerprint covers the operation's OpenAPI fragment (plus path-level
+    keys and shared components) and the content of its PHP handler, if any.
+    """
+    shared = hashlib.sha1(
+        json.dumps(spec.get("components") or {}, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    ops: List[Tuple[str, str, str, str]] = []
+    for path, item in (spec.get("paths") or {}).items():
+        if not isinstance(item, dict):
+            continue
+        path_level = {k: v for k, v in item.items() if k not in HTTP_METHODS}
+        handler = root / str(path).lstrip("/") if str(path).endswith(".php") else None
+        for method, op in item.items():
+            if method not in HTTP_METHODS:
+                continue
+            h = hashlib.sha1(
+                json.dumps([path_level, op, shared], sort_keys=True, default=str).encode("utf-8")
+            )
+            if handler is not None:
+                h.update(f"\0handler:{digests.file_hash(handler)}".encode("utf-8"))
+            ops.append((f"{method.upper()} {path}", str(path), method, h.hexdigest()))
+    return ops
+
+
+def _shard_spec(spec: Dict[str, Any], ops: List[Tuple[str, str, str, str]]) -> Dict[str, Any]:
+    doc = {k: v for k, v in spec.items() if k != "paths"}
+    paths: Dict[str, Any] = {}
+    for _op_id, path, method, _fp in ops:
+        item = spec["paths"][path]
+        entry = paths.setdefault(path, {k: v for k, v in item.items() if k not in HTTP_METHODS})
+        entry[method] = item[method]
+    doc["paths"] = paths
+    return doc
+
+
+def _as_text(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value or ""
+
+
+def _run_shard(
+    root: Path, index: int, spec: Dict[str, Any], ops: List[Tuple[str, str, str, str]], timeout: float
+) -> Dict[str, Any]:
+    """Run one shard in its own subprocess; its result file survives other shards timing out."""
+    folder = _state_dir(root)
+    spec_path = folder / f"shard_{index}.yaml"
+    result: Dict[str, Any] = {
+        "shard": index,
+        "operations": [op[0] for op in ops],
+        "passed": False,
+        "timed_out": False,
+    }
+    started = time.monotonic()
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        spec_path.write_text(yaml.safe_dump(_shard_spec(spec, ops), sort_keys=False, allow_unicode=True), encoding="utf-8")
+        r = subprocess.run(_schemathesis_cmd(spec_path), capture_output=True, text=True, cwd=root, timeout=timeout)
+        result["passed"] = r.returncode == 0
+        result["returncode"] = r.returncode
+        result["details"] = r.stdout[-2000:]
+    except subprocess.TimeoutExpired as e:
+        result["timed_out"] = True
+        result["details"] = _as_text(e.stdout)[-2000:]
+    except Exception as e:
+        result["details"] = f"schemathesis error: {e}"
+    result["duration_s"] = round(time.monotonic() - started, 3)
+    _save_json(folder / f"shard_{index}.json", result)
+    return result
+
+
+def _run_openapi_contracts(
+    root: Path, openapi: Path, *, timeout: Optional[float] = None, scope: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Schemathesis over the OpenAPI spec, sharded across worker subprocesses.
+
+    Operations are split round-robin into up to `contract_workers` shards that
+    run concurrently, each with its own timeout and result file under
+    .bgl_core/logs/contract_shards/. With scope "changed" (default) only
+    operations whose fragment or handler changed since they last passed are
+    run; "all" runs the whole spec.
+    """
+    cfg = load_config(root) or {}
+    try:
+        workers = int(os.getenv("BGL_CONTRACT_WORKERS", cfg.get("contract_workers", 4)) or 4)
+    except Exception:
+        workers = 4
+    try:
+        shard_timeout = float(
+            os.getenv("BGL_CONTRACT_SHARD_TIMEOUT", cfg.get("contract_shard_timeout_sec", 90)) or 90
+        )
+    except Exception:
+        shard_timeout = 90.0
+    if timeout:
+        shard_timeout = min(shard_timeout, float(timeout))
+    scope = str(scope or os.getenv("BGL_CONTRACT_SCOPE", cfg.get("contract_scope", "changed")) or "changed")
+
+    entry: Dict[str, Any] = {"id": "GAP_CONTRACT_OPENAPI", "scope": ["api"]}
+    try:
+        _schemathesis_cmd(openapi)
+    except FileNotFoundError:
+        entry.update(passed=True, evidence=["schemathesis not installed; skipped"])  # pass/skip to avoid noise
+        return entry
+    try:
+        spec = yaml.safe_load(openapi.read_text(encoding="utf-8")) or {}
+    except Exception as e:
+        entry.update(passed=False, evidence=[f"schemathesis error: {e}"])
+        return entry
+
+    state = _load_state(root)
+    digests = InputDigest(root, state.get("files") or {})
+    green: Dict[str, str] = state.get("green") or {}
+    ops = _operations(root, spec, digests)
+    selected = ops if scope == "all" else [op for op in ops if green.get(op[0]) != op[3]]
+
+    shard_count = max(1, min(workers, len(selected)))
+    shards = [selected[i::shard_count] for i in range(shard_count)] if selected else []
+    shard_results: List[Dict[str, Any]] = []
+    for stale in _state_dir(root).glob("shard_*"):
+        try:
+            stale.unlink()
+        except Exception:
+            pass
+    if shards:
+        with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+            futures = [pool.submit(_run_shard, root, i, spec, shard, shard_timeout) for i, shard in enumerate(shards)]
+            shard_results = [f.result() for f in futures]
+
+    live = {op[0] for op in ops}
+    green = {k: v for k, v in green.items() if k in live}
+    for shard, res in zip(shards, shard_results):
+        for op_id, _path, _method, fp in shard:
+            if res.get("passed"):
+                green[op_id] = fp
+            else:
+                green.pop(op_id, None)
+    state.update(files=digests.file_hashes, green=green, updated_at=time.time())
+    _save_json(_state_dir(root) / "state.json", state)
+
+    evidence = [openapi.name]
+    if not selected:
+        evidence.append("no operations changed since last green run")
+    for res in shard_results:
+        if res.get("timed_out"):
+            evidence.append(f"shard {res['shard']} timed out after {shard_timeout:g}s: " + ", ".join(res["operations"]))
+        elif not res.get("passed"):
+            evidence.append(f"shard {res['shard']} failed: " + ", ".join(res["operations"]))
+    entry.update(
+        passed=all(res.get("passed") for res in shard_results),
+        evidence=evidence,
+        details="\n".join(res.get("details", "") for res in shard_results if not res.get("passed"))[-2000:],
+        operations_total=len(ops),
+        operations_run=len(selected),
+        operations_skipped=len(ops) - len(selected),
+        shards=[{k: v for k, v in res.items() if k != "details"} for res in shard_results],
+    )
+    return entry
+
+
+def run_contract_suite(
+    root: Path, *, timeout: Optional[float] = None, scope: Optional[str] = None
+) -> List[Dict[str, Any]]:
     """
     Runs optional API contract/property tests if specs exist.
-    - Schemathesis: looks for openapi.(yaml|json) under public/ or api/.
+    - Schemathesis: looks for openapi.(yaml|json) under docs/, public/ or api/;
+      sharded and change-scoped (see _run_openapi_contracts).
     - Dredd: looks for api.apib
     Returns a list of gap-like results to merge into diagnostic["gap_tests"].
     """
@@ -28,63 +254,7 @@ def run_contract_suite(root: Path) -> List[Dict[str, Any]]:
             break
 
     if openapi:
-        try:
-            # Prefer running via the current Python interpreter to avoid PATH issues.
-            schemathesis_module = importlib.util.find_spec("schemathesis")
-            if schemathesis_module is not None:
-                cmd = [
-                    sys.executable,
-                    "-m",
-                    "schemathesis",
-                    "run",
-                    str(openapi),
-                    "--stateful=links",
-                    "--checks=all",
-                    "--hypothesis-deadline=750",
-                    "--max-examples=50",
-                ]
-            else:
-                schemathesis_cli = shutil.which("schemathesis")
-                if not schemathesis_cli:
-                    raise FileNotFoundError("schemathesis not installed")
-                cmd = [
-                    schemathesis_cli,
-                    "run",
-                    str(openapi),
-                    "--stateful=links",
-                    "--checks=all",
-                    "--hypothesis-deadline=750",
-                    "--max-examples=50",
-                ]
-            r = subprocess.run(cmd, capture_output=True, text=True, cwd=root, timeout=120)
-            passed = r.returncode == 0
-            results.append(
-                {
-                    "id": "GAP_CONTRACT_OPENAPI",
-                    "passed": passed,
-                    "evidence": [openapi.name],
-                    "scope": ["api"],
-                    "details": r.stdout[-2000:],
-                }
-            )
-        except FileNotFoundError:
-            results.append(
-                {
-                    "id": "GAP_CONTRACT_OPENAPI",
-                    "passed": True,  # mark as pass/skip to avoid noise when schemathesis not installed
-                    "evidence": ["schemathesis not installed; skipped"],
-                    "scope": ["api"],
-                }
-            )
-        except Exception as e:
-            results.append(
-                {
-                    "id": "GAP_CONTRACT_OPENAPI",
-                    "passed": False,
-                    "evidence": [f"schemathesis error: {e}"],
-                    "scope": ["api"],
-                }
-            )
+        results.append(_run_openapi_contracts(root, openapi, timeout=timeout, scope=scope))
 
     apib = root / "api" / "api.apib"
     if apib.exists():
@@ -1,6 +1,12 @@
+import atexit
+import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import quote
 
 
 def connect_db(
@@ -28,3 +34,465 @@ def connect_db(
     except Exception:
         pass
     return conn
+
+
+# ---------------------------------------------------------------------------
+# Process-wide connection pool
+# ---------------------------------------------------------------------------
+# One writer connection per database (serialized by a re-entrant lock) plus one
+# reader connection per thread. Connections stay open for the life of the
+# process so page cache and statement cache stay warm across brain modules.
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def _apply_pool_pragmas(conn: sqlite3.Connection, *, foreign_keys: bool) -> None:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA busy_timeout={_env_int('BGL_SQLITE_BUSY_TIMEOUT_MS', 15000)}",
+        "PRAGMA synchronous=NORMAL",
+        # Negative cache_size is KiB rather than pages.
+        f"PRAGMA cache_size=-{_env_int('BGL_SQLITE_CACHE_KB', 16384)}",
+        f"PRAGMA mmap_size={_env_int('BGL_SQLITE_MMAP_MB', 128) * 1024 * 1024}",
+        "PRAGMA temp_store=MEMORY",
+        # Shrink the -wal file back to this size after each checkpoint.
+        f"PRAGMA journal_size_limit={_env_int('BGL_SQLITE_JOURNAL_LIMIT_MB', 64) * 1024 * 1024}",
+        f"PRAGMA foreign_keys={'ON' if foreign_keys else 'OFF'}",
+    ]
+    for stmt in pragmas:
+        try:
+            conn.execute(stmt)
+        except Exception:
+            pass
+
+
+class _PoolEntry:
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.writer: Optional[sqlite3.Connection] = None
+        self.writer_lock = threading.RLock()
+        # Per-thread nesting depth of writer() on this DB; only the outermost commits.
+        self.local = threading.local()
+        self.readers: Dict[int, sqlite3.Connection] = {}
+        self.stats: Dict[str, float] = {
+            "writer_acquisitions": 0,
+            "writer_contended": 0,
+            "writer_wait_ms_total": 0.0,
+            "writer_wait_ms_max": 0.0,
+            "reader_connections": 0,
+            "readers_pruned": 0,
+        }
+
+
+class ConnectionPool:
+    """
+    Pooled SQLite connections keyed by resolved DB path.
+    Use `pooled_connection()` rather than touching this class directly.
+    """
+
+    def __init__(self, *, foreign_keys: bool = False, cached_statements: int = 256):
+        self.foreign_keys = foreign_keys
+        self.cached_statements = cached_statements
+        self._entries: Dict[str, _PoolEntry] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def _key(self, db_path: Any) -> str:
+        try:
+            return str(Path(db_path).resolve())
+        except Exception:
+            return str(db_path)
+
+    def _entry(self, db_path: Any) -> _PoolEntry:
+        if os.getpid() != self._pid:
+            # Forked child: never reuse the parent's sqlite handles.
+            self._entries = {}
+            self._pid = os.getpid()
+        key = self._key(db_path)
+        entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = _PoolEntry(key)
+                    self._entries[key] = entry
+        return entry
+
+    def _open(self, db_path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            db_path,
+            timeout=_env_int("BGL_SQLITE_BUSY_TIMEOUT_MS", 15000) / 1000.0,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        _apply_pool_pragmas(conn, foreign_keys=self.foreign_keys)
+        return conn
+
+    @contextmanager
+    def writer(self, db_path: Any) -> Iterator[sqlite3.Connection]:
+        entry = self._entry(db_path)
+        started = time.perf_counter()
+        contended = not entry.writer_lock.acquire(blocking=False)
+        if contended:
+            entry.writer_lock.acquire()
+        waited_ms = (time.perf_counter() - started) * 1000.0
+        depth = getattr(entry.local, "depth", 0)
+        entry.local.depth = depth + 1
+        try:
+            st = entry.stats
+            st["writer_acquisitions"] += 1
+            if contended:
+                st["writer_contended"] += 1
+            st["writer_wait_ms_total"] += waited_ms
+            st["writer_wait_ms_max"] = max(st["writer_wait_ms_max"], waited_ms)
+            if entry.writer is None:
+                entry.writer = self._open(entry.db_path)
+            conn = entry.writer
+            try:
+                yield conn
+            except BaseException:
+                if depth == 0:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+                raise
+            else:
+                if depth == 0:
+                    conn.commit()
+        finally:
+            entry.local.depth = depth
+            entry.writer_lock.release()
+
+    @contextmanager
+    def reader(self, db_path: Any) -> Iterator[sqlite3.Connection]:
+        entry = self._entry(db_path)
+        tid = threading.get_ident()
+        conn = entry.readers.get(tid)
+        if conn is None:
+            conn = self._open(entry.db_path)
+            with self._lock:
+                # Readers are per-thread; drop those of threads that have exited.
+                live = {t.ident for t in threading.enumerate()}
+                stale = [entry.readers.pop(t) for t in list(entry.readers) if t not in live]
+                entry.readers[tid] = conn
+                entry.stats["reader_connections"] = len(entry.readers)
+                entry.stats["readers_pruned"] += len(stale)
+            for old in stale:
+                try:
+                    old.close()
+                except Exception:
+                    pass
+        try:
+            yield conn
+        finally:
+            # Release the read snapshot so WAL checkpoints are never pinned.
+            if conn.in_transaction:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+
+    def stats(self, db_path: Any = None) -> Dict[str, Any]:
+        if db_path is not None:
+            entry = self._entries.get(self._key(db_path))
+            return dict(entry.stats) if entry else {}
+        return {key: dict(e.stats) for key, e in self._entries.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                for conn in [entry.writer, *entry.readers.values()]:
+                    if conn is None:
+                        continue
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            self._entries = {}
+
+
+_POOL = ConnectionPool()
+atexit.register(_POOL.close)
+
+
+@contextmanager
+def pooled_connection(
+    db_path: Any,
+    *,
+    write: bool = False,
+    row_factory: Any = None,
+) -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a warm connection from the process-wide pool.
+
+    write=True serializes through the single writer connection and commits on
+    clean exit (rolls back on exception); nested writer blocks in the same thread
+    share the outer transaction. Readers are per-thread and never hold a snapshot
+    past the block.
+    """
+    ctx = _POOL.writer(db_path) if write else _POOL.reader(db_path)
+    with ctx as conn:
+        previous = conn.row_factory
+        conn.row_factory = row_factory
+        try:
+            yield conn
+        finally:
+            conn.row_factory = previous
+
+
+def pool_stats(db_path: Any = None) -> Dict[str, Any]:
+    """Writer wait-time instrumentation (per DB path, or all paths)."""
+    return _POOL.stats(db_path)
+
+
+def close_pool() -> None:
+    _POOL.close()
+
+
+# ---------------------------------------------------------------------------
+# Analytics read path: pinned read-only snapshots
+# ---------------------------------------------------------------------------
+# Long reports (coverage, digest, retention) read through a dedicated
+# read-only connection that pins ONE WAL snapshot for the whole block, so
+# every query sees the same state while scenario_runner keeps writing.
+# The snapshot is released on exit; callers should fetch rows inside the
+# block and do Python-side processing after it, so checkpoints are never
+# held back by a report.
+
+_SNAPSHOT_STATS: Dict[str, float] = {
+    "opened": 0,
+    "held_ms_total": 0.0,
+    "held_ms_max": 0.0,
+}
+
+
+def _ro_uri(db_path: Any, *, immutable: bool = False) -> str:
+    path = Path(db_path).resolve().as_posix()
+    uri = f"file:{quote(path, safe='/:')}?mode=ro"
+    if immutable:
+        uri += "&immutable=1"
+    return uri
+
+
+def _has_wal_sidecar(db_path: Any) -> bool:
+    p = str(db_path)
+    return Path(p + "-wal").exists() or Path(p + "-shm").exists()
+
+
+def open_snapshot(
+    db_path: Any,
+    *,
+    row_factory: Any = sqlite3.Row,
+    immutable: bool = False,
+) -> sqlite3.Connection:
+    """
+    Read-only connection (mode=ro, query_only) already holding a single
+    consistent snapshot; `conn.close()` releases it.
+
+    immutable=True adds `immutable=1` (no locking, no change detection) for
+    files nobody writes, e.g. runtime_events archives. It is ignored when the
+    database has WAL sidecar files, i.e. is live.
+    """
+    if immutable and _has_wal_sidecar(db_path):
+        immutable = False
+    conn = sqlite3.connect(
+        _ro_uri(db_path, immutable=bool(immutable)),
+        uri=True,
+        timeout=_env_int("BGL_SQLITE_BUSY_TIMEOUT_MS", 15000) / 1000.0,
+        check_same_thread=False,
+    )
+    conn.row_factory = row_factory
+    for stmt in (
+        "PRAGMA query_only=ON",
+        f"PRAGMA cache_size=-{_env_int('BGL_SQLITE_CACHE_KB', 16384)}",
+        f"PRAGMA mmap_size={_env_int('BGL_SQLITE_MMAP_MB', 128) * 1024 * 1024}",
+        "PRAGMA temp_store=MEMORY",
+    ):
+        try:
+            conn.execute(stmt)
+        except Exception:
+            pass
+    try:
+        # BEGIN is lazy; the first read pins the WAL snapshot.
+        conn.execute("BEGIN")
+        conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone()
+    except Exception:
+        conn.close()
+        raise
+    _SNAPSHOT_STATS["opened"] += 1
+    return conn
+
+
+@contextmanager
+def snapshot_connection(
+    db_path: Any,
+    *,
+    row_factory: Any = sqlite3.Row,
+    immutable: bool = False,
+) -> Iterator[sqlite3.Connection]:
+    """`open_snapshot` as a block; records how long the snapshot was held."""
+    conn = open_snapshot(db_path, row_factory=row_factory, immutable=immutable)
+    started = time.perf_counter()
+    try:
+        yield conn
+    finally:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception:
+            pass
+        conn.close()
+        held = (time.perf_counter() - started) * 1000.0
+        _SNAPSHOT_STATS["held_ms_total"] += held
+        _SNAPSHOT_STATS["held_ms_max"] = max(_SNAPSHOT_STATS["held_ms_max"], held)
+
+
+def snapshot_stats() -> Dict[str, float]:
+    return dict(_SNAPSHOT_STATS)
+
+
+# ---------------------------------------------------------------------------
+# WAL checkpoint scheduler
+# ---------------------------------------------------------------------------
+
+
+def wal_size_bytes(db_path: Any) -> int:
+    try:
+        return os.path.getsize(str(db_path) + "-wal")
+    except OSError:
+        return 0
+
+
+def checkpoint_now(db_path: Any, mode: str = "PASSIVE", *, busy_timeout_ms: int = 2000) -> Dict[str, Any]:
+    """
+    Run `PRAGMA wal_checkpoint(<mode>)` on a short-lived connection.
+    PASSIVE never waits; TRUNCATE waits up to busy_timeout_ms for readers.
+    """
+    mode = str(mode or "PASSIVE").upper()
+    if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+        mode = "PASSIVE"
+    out: Dict[str, Any] = {"mode": mode, "wal_before": wal_size_bytes(db_path)}
+    try:
+        conn = sqlite3.connect(str(db_path), timeout=busy_timeout_ms / 1000.0)
+        try:
+            conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+            row = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        finally:
+            conn.close()
+        if row:
+            out.update({"busy": int(row[0]), "log_frames": int(row[1]), "checkpointed": int(row[2])})
+    except Exception as exc:
+        out["error"] = str(exc)
+    out["wal_after"] = wal_size_bytes(db_path)
+    return out
+
+
+class WalCheckpointer:
+    """
+    Background thread that keeps a database's -wal file bounded during long
+    audits: PASSIVE checkpoints once the WAL passes `passive_mb`, TRUNCATE
+    past `truncate_mb` (readers hold it back for at most busy_timeout).
+    """
+
+    def __init__(
+        self,
+        db_path: Any,
+        *,
+        interval_sec: float = 30.0,
+        passive_mb: float = 16.0,
+        truncate_mb: float = 256.0,
+    ):
+        self.db_path = str(db_path)
+        self.interval_sec = max(1.0, float(interval_sec))
+        self.passive_bytes = int(float(passive_mb) * 1024 * 1024)
+        self.truncate_bytes = int(float(truncate_mb) * 1024 * 1024)
+        self.stats: Dict[str, Any] = {"passive": 0, "truncate": 0, "busy": 0, "last": None}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def tick(self) -> Optional[Dict[str, Any]]:
+        size = wal_size_bytes(self.db_path)
+        if self.truncate_bytes and size >= self.truncate_bytes:
+            mode = "TRUNCATE"
+        elif size >= self.passive_bytes:
+            mode = "PASSIVE"
+        else:
+            return None
+        res = checkpoint_now(self.db_path, mode)
+        self.stats[mode.lower()] += 1
+        if res.get("busy"):
+            self.stats["busy"] += 1
+        self.stats["last"] = res
+        return res
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            try:
+                self.tick()
+            except Exception:
+                pass
+
+    def start(self) -> "WalCheckpointer":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="bgl-wal-checkpoint", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+
+_CHECKPOINTERS: Dict[str, WalCheckpointer] = {}
+
+
+def start_checkpoint_scheduler(db_path: Any, cfg: Optional[Dict[str, Any]] = None) -> Optional[WalCheckpointer]:
+    """
+    Start (once per process and DB) the automatic WAL checkpoint thread.
+    Reads wal_checkpoint_* keys from cfg; BGL_WAL_CHECKPOINT=0 disables it.
+    """
+    cfg = cfg or {}
+    enabled = os.getenv("BGL_WAL_CHECKPOINT", str(cfg.get("wal_checkpoint_enabled", 1)))
+    if str(enabled).strip().lower() in ("0", "false", "no", "off"):
+        return None
+    try:
+        key = str(Path(db_path).resolve())
+    except Exception:
+        key = str(db_path)
+    existing = _CHECKPOINTERS.get(key)
+    if existing is not None:
+        return existing.start()
+    try:
+        cp = WalCheckpointer(
+            key,
+            interval_sec=float(cfg.get("wal_checkpoint_interval_sec", 30) or 30),
+            passive_mb=float(cfg.get("wal_checkpoint_passive_mb", 16) or 16),
+            truncate_mb=float(cfg.get("wal_checkpoint_truncate_mb", 256) or 0),
+        )
+    except Exception:
+        return None
+    _CHECKPOINTERS[key] = cp
+    return cp.start()
+
+
+def stop_checkpoint_schedulers() -> None:
+    for cp in list(_CHECKPOINTERS.values()):
+        try:
+            cp.stop()
+        except Exception:
+            pass
+    _CHECKPOINTERS.clear()
+
+
+atexit.register(stop_checkpoint_schedulers)
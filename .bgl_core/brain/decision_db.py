@@ -8,6 +8,10 @@ try:
     from .db_utils import connect_db  # type: ignore
 except Exception:
     from db_utils import connect_db  # type: ignore
+try:
+    from .schema_migrations import schema_current  # type: ignore
+except Exception:
+    from schema_migrations import schema_current  # type: ignore
 
 
 def init_db(db_path: Path, schema_path: Path):
@@ -24,6 +28,8 @@ def _connect(db_path: Path):
 
 
 def _ensure_outcome_columns(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
     try:
         cols = {r[1] for r in conn.execute("PRAGMA table_info(outcomes)").fetchall()}
     except Exception:
@@ -40,6 +46,8 @@ def _ensure_outcome_columns(conn: sqlite3.Connection) -> None:
 
 
 def _ensure_decision_trace(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
     try:
         conn.execute(
             """
@@ -6,11 +6,15 @@ Avoids external dependencies; not high-precision but accelerates similarity sear
 import re
 import json
 import math
-import sqlite3
 from collections import Counter
 from pathlib import Path
 from typing import List, Tuple, Dict
 
+try:
+    from .db_utils import pooled_connection  # type: ignore
+except Exception:
+    from db_utils import pooled_connection  # type: ignore
+
 ROOT = Path(__file__).resolve().parents[2]
 DB = ROOT / ".bgl_core" / "brain" / "knowledge.db"
 
@@ -36,36 +40,51 @@ def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
     return num / (da * db)
 
 
+_TABLE_READY = False
+
+
 def _ensure_table():
-    conn = sqlite3.connect(DB, timeout=30.0)
-    conn.execute("PRAGMA journal_mode=WAL;")
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS embeddings(
-          id INTEGER PRIMARY KEY AUTOINCREMENT,
-          label TEXT UNIQUE,
-          text TEXT,
-          vector TEXT
+    global _TABLE_READY
+    if _TABLE_READY:
+        return
+    with pooled_connection(DB, write=True) as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings(
+              id INTEGER PRIMARY KEY AUTOINCREMENT,
+              label TEXT UNIQUE,
+              text TEXT,
+              vector TEXT
+            )
+            """
         )
-        """
-    )
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_label ON embeddings(label)")
-    conn.commit()
-    conn.close()
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_label ON embeddings(label)")
+    _TABLE_READY = True
 
 
 def add_text(label: str, text: str):
     _ensure_table()
     vec = _vectorize(text)
-    conn = sqlite3.connect(DB, timeout=30.0)
-    conn.execute("PRAGMA journal_mode=WAL;")
-    # Use INSERT OR REPLACE (UPSERT) to prevent Silent Duplication
-    conn.execute(
-        "INSERT OR REPLACE INTO embeddings (label, text, vector) VALUES (?, ?, ?)",
-        (label, text, json.dumps(vec)),
-    )
-    conn.commit()
-    conn.close()
+    with pooled_connection(DB, write=True) as conn:
+        # Use INSERT OR REPLACE (UPSERT) to prevent Silent Duplication
+        conn.execute(
+            "INSERT OR REPLACE INTO embeddings (label, text, vector) VALUES (?, ?, ?)",
+            (label, text, json.dumps(vec)),
+        )
+
+
+def add_texts(items: List[Tuple[str, str]]) -> int:
+    """Vectorize a batch of (label, text) pairs and upsert them in one transaction."""
+    if not items:
+        return 0
+    _ensure_table()
+    rows = [(label, text, json.dumps(_vectorize(text))) for label, text in items]
+    with pooled_connection(DB, write=True) as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (label, text, vector) VALUES (?, ?, ?)",
+            rows,
+        )
+    return len(rows)
 
 
 # Simple LRU-like cache: { "query:top_k": results_list }
@@ -82,11 +101,9 @@ def search(query: str, top_k: int = 5) -> List[Tuple[str, float, str]]:
 
     _ensure_table()
     qv = _vectorize(query)
-    conn = sqlite3.connect(DB, timeout=30.0)
-    conn.execute("PRAGMA journal_mode=WAL;")
     # TODO: In the future, load full table into memory only once if small, or use proper Vector DB
-    rows = conn.execute("SELECT label, vector, text FROM embeddings").fetchall()
-    conn.close()
+    with pooled_connection(DB) as conn:
+        rows = conn.execute("SELECT label, vector, text FROM embeddings").fetchall()
     scored = []
     for label, vjson, text in rows:
         try:
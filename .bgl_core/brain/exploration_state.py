@@ -0,0 +1,300 @@
+"""
+exploration_state.py
+--------------------
+Per-run in-memory store for exploration state: selector cooldowns
+(selector_cooldowns), novelty counters (exploration_novelty) and recently
+explored selectors (exploration_history).
+
+The store is loaded once at scenario start; lookups are dict hits, and
+writes update memory immediately and are queued for a write-behind flush
+(one transaction) at step/scenario boundaries. Novelty counters are flushed
+as increments so concurrent runners do not overwrite each other's counts.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class ExplorationState:
+    def __init__(self, db_path: Path, *, history_limit: int = 2000):
+        self.db_path = Path(db_path)
+        self.history_limit = int(history_limit)
+        self.loaded_at = 0.0
+        self._lock = threading.RLock()
+        self.cooldowns: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.novelty_by_key: Dict[str, Dict[str, Any]] = {}
+        self.novelty_by_selector: Dict[str, Dict[str, Any]] = {}
+        self.explored: Set[str] = set()
+        self._dirty_cooldowns: Set[Tuple[str, str]] = set()
+        self._dirty_novelty: Dict[int, Dict[str, Any]] = {}
+        self._pending_history: List[Tuple[str, str, str, float]] = []
+        self._pending_memory: List[Dict[str, Any]] = []
+        self.stats: Dict[str, int] = {"flushes": 0, "rows_written": 0}
+
+    # -- load --------------------------------------------------------------
+
+    def load(self, db: sqlite3.Connection) -> None:
+        with self._lock:
+            self.cooldowns.clear()
+            self.novelty_by_key.clear()
+            self.novelty_by_selector.clear()
+            self.explored.clear()
+            try:
+                for sk, rk, fail_count, last_seen, until, reason in db.execute(
+                    "SELECT selector_key, route_key, fail_count, last_seen, cooldown_until, last_reason FROM selector_cooldowns"
+                ).fetchall():
+                    self.cooldowns[(str(sk), str(rk))] = {
+                        "fail_count": int(fail_count or 0),
+                        "cooldown_until": float(until or 0),
+                        "last_reason": str(reason or ""),
+                        "last_seen": float(last_seen or 0),
+                    }
+            except Exception:
+                pass
+            try:
+                rows = db.execute(
+                    "SELECT id, selector, selector_key, seen_count, last_seen, last_score_delta FROM exploration_novelty ORDER BY id ASC"
+                ).fetchall()
+            except Exception:
+                rows = []
+            for rid, selector, key, seen_count, last_seen, delta in rows:
+                row = {
+                    "id": int(rid),
+                    "selector": str(selector or ""),
+                    "selector_key": str(key or ""),
+                    "seen_count": int(seen_count or 0),
+                    "last_seen": float(last_seen or 0),
+                    "last_score_delta": float(delta or 0.0),
+                }
+                # First row wins, matching `SELECT ... WHERE ... ` + fetchone().
+                if row["selector_key"]:
+                    self.novelty_by_key.setdefault(row["selector_key"], row)
+                self.novelty_by_selector.setdefault(row["selector"], row)
+            try:
+                for sel, href in db.execute(
+                    "SELECT selector, href FROM exploration_history ORDER BY created_at DESC LIMIT ?",
+                    (self.history_limit,),
+                ).fetchall():
+                    if sel:
+                        self.explored.add(str(sel))
+                    if href:
+                        self.explored.add(str(href))
+            except Exception:
+                pass
+            self.loaded_at = time.time()
+
+    # -- selector cooldowns ------------------------------------------------
+
+    def get_cooldown(self, selector_key: str, route_key: str) -> Optional[Dict[str, Any]]:
+        entry = self.cooldowns.get((selector_key, route_key))
+        return dict(entry) if entry else None
+
+    def put_cooldown(self, selector_key: str, route_key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.cooldowns[(selector_key, route_key)] = dict(entry)
+            self._dirty_cooldowns.add((selector_key, route_key))
+
+    # -- novelty -----------------------------------------------------------
+
+    def novelty_row(self, selector: str, selector_key: str = "") -> Optional[Dict[str, Any]]:
+        key = str(selector_key or "").strip()
+        if key:
+            return self.novelty_by_key.get(key)
+        return self.novelty_by_selector.get(selector)
+
+    def record_outcome(
+        self,
+        *,
+        selector: str,
+        selector_key: str,
+        href_base: str,
+        route: str,
+        result: str,
+        delta_score: float,
+    ) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            row = self.novelty_row(selector, selector_key)
+            if row is None:
+                row = {"id": None, "selector": selector, "seen_count": 0, "pending_seen": 0}
+                if selector_key:
+                    self.novelty_by_key[selector_key] = row
+                self.novelty_by_selector.setdefault(selector, row)
+            row["seen_count"] = int(row.get("seen_count") or 0) + 1
+            row["pending_seen"] = int(row.get("pending_seen") or 0) + 1
+            row.update(
+                selector_key=selector_key,
+                href_base=href_base,
+                route=route,
+                last_seen=now,
+                last_result=result,
+                last_score_delta=float(delta_score),
+            )
+            self._dirty_novelty[id(row)] = row
+            return row
+
+    def queue_memory_item(self, item: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending_memory.append(item)
+
+    def take_memory_items(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items, self._pending_memory = self._pending_memory, []
+            return items
+
+    # -- explored selectors ------------------------------------------------
+
+    def record_explored(self, selector: str, href: str, tag: str) -> None:
+        with self._lock:
+            if selector:
+                self.explored.add(str(selector))
+            if href:
+                self.explored.add(str(href))
+            self._pending_history.append((selector, href, tag, time.time()))
+
+    # -- write-behind ------------------------------------------------------
+
+    def pending(self) -> int:
+        return len(self._dirty_cooldowns) + len(self._dirty_novelty) + len(self._pending_history)
+
+    def flush(self, db: sqlite3.Connection) -> int:
+        """Write queued changes in one transaction; returns rows written."""
+        with self._lock:
+            if not self.pending():
+                return 0
+            written = 0
+            cooldowns = [(k, self.cooldowns[k]) for k in self._dirty_cooldowns if k in self.cooldowns]
+            novelty = list(self._dirty_novelty.values())
+            history = list(self._pending_history)
+            with db:
+                for (sk, rk), entry in cooldowns:
+                    db.execute(
+                        """
+                        INSERT INTO selector_cooldowns (selector_key, route_key, fail_count, last_seen, cooldown_until, last_reason, last_run_id)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(selector_key, route_key) DO UPDATE SET
+                            fail_count=excluded.fail_count,
+                            last_seen=excluded.last_seen,
+                            cooldown_until=excluded.cooldown_until,
+                            last_reason=COALESCE(excluded.last_reason, selector_cooldowns.last_reason),
+                            last_run_id=COALESCE(excluded.last_run_id, selector_cooldowns.last_run_id)
+                        """,
+                        (
+                            sk,
+                            rk,
+                            int(entry.get("fail_count") or 0),
+                            float(entry.get("last_seen") or time.time()),
+                            float(entry.get("cooldown_until") or 0),
+                            entry.get("last_reason") or None,
+                            entry.get("last_run_id") or None,
+                        ),
+                    )
+                    written += 1
+                for row in novelty:
+                    rid = row.get("id")
+                    if rid is None:
+                        # Another runner may have inserted the same selector meanwhile.
+                        key = row.get("selector_key") or ""
+                        if key:
+                            found = db.execute(
+                                "SELECT id FROM exploration_novelty WHERE selector_key=?", (key,)
+                            ).fetchone()
+                        else:
+                            found = db.execute(
+                                "SELECT id FROM exploration_novelty WHERE selector=?", (row["selector"],)
+                            ).fetchone()
+                        rid = int(found[0]) if found else None
+                    values = (
+                        row.get("last_seen"),
+                        row.get("last_result"),
+                        row.get("href_base"),
+                        row.get("route"),
+                        row.get("last_score_delta"),
+                        row.get("selector_key"),
+                    )
+                    if rid is None:
+                        cur = db.execute(
+                            "INSERT INTO exploration_novelty (seen_count, last_seen, last_result, href_base, route, last_score_delta, selector_key, selector) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (int(row.get("pending_seen") or 0), *values, row["selector"]),
+                        )
+                        rid = cur.lastrowid
+                    else:
+                        db.execute(
+                            "UPDATE exploration_novelty SET seen_count=COALESCE(seen_count, 0)+?, last_seen=?, last_result=?, href_base=?, route=?, last_score_delta=?, selector_key=? WHERE id=?",
+                            (int(row.get("pending_seen") or 0), *values, rid),
+                        )
+                    row["id"] = rid
+                    row["pending_seen"] = 0
+                    written += 1
+                if history:
+                    db.executemany(
+                        "INSERT INTO exploration_history (selector, href, tag, created_at) VALUES (?, ?, ?, ?)",
+                        history,
+                    )
+                    written += len(history)
+            self._dirty_cooldowns.clear()
+            self._dirty_novelty.clear()
+            del self._pending_history[: len(history)]
+            self.stats["flushes"] += 1
+            self.stats["rows_written"] += written
+            return written
+
+
+_ACTIVE: Dict[str, Tuple[ExplorationState, int]] = {}
+_ACTIVE_LOCK = threading.Lock()
+_KEYS: Dict[str, str] = {}
+
+
+def _key(db_path: Any) -> str:
+    raw = str(db_path)
+    k = _KEYS.get(raw)
+    if k is None:
+        try:
+            k = str(Path(raw).resolve())
+        except Exception:
+            k = raw
+        _KEYS[raw] = k
+    return k
+
+
+def activate(db_path: Path, loader) -> ExplorationState:
+    """
+    Register (or re-enter) the run store for `db_path`. `loader(state)` is
+    called once, when the outermost scope opens. Pair with `deactivate()`.
+    """
+    k = _key(db_path)
+    with _ACTIVE_LOCK:
+        current = _ACTIVE.get(k)
+        if current is not None:
+            _ACTIVE[k] = (current[0], current[1] + 1)
+            return current[0]
+        state = ExplorationState(Path(db_path))
+        _ACTIVE[k] = (state, 1)
+    loader(state)
+    return state
+
+
+def deactivate(db_path: Path) -> Optional[ExplorationState]:
+    """Leave one scope; returns the store when the outermost scope closed."""
+    k = _key(db_path)
+    with _ACTIVE_LOCK:
+        current = _ACTIVE.get(k)
+        if current is None:
+            return None
+        if current[1] > 1:
+            _ACTIVE[k] = (current[0], current[1] - 1)
+            return None
+        _ACTIVE.pop(k, None)
+        return current[0]
+
+
+def active_state(db_path: Path) -> Optional[ExplorationState]:
+    if not _ACTIVE:
+        return None
+    current = _ACTIVE.get(_key(db_path))
+    return current[0] if current else None
@@ -0,0 +1,383 @@
+"""
+flow_index.py
+-------------
+Indexed ordered-subsequence matching over observed session route sequences.
+
+Each session keeps an inverted index (route -> sorted positions), so checking
+whether a documented flow (a list of endpoint steps) occurs in order becomes a
+chain of binary-search jumps instead of a scan per flow. A route -> sessions
+posting list prunes sessions that cannot match at all.
+
+`FlowSessionIndex.refresh()` is incremental: it reads only runtime_events /
+ui_flow_transitions rows past the last ingested ids, re-indexes just the
+sessions they touch, and trims rows that fell out of the time window. Indexes
+are shared per (database, name) via `shared_index()`, so a resident process
+(warm diagnostic daemon, exploration loop) pays the full load once.
+"""
+
+from __future__ import annotations
+
+import bisect
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# (timestamp, row id, sub-order, route, payload)
+_Entry = Tuple[float, int, int, str, Any]
+
+
+class RouteSequence:
+    """One ordered route list with route -> sorted positions."""
+
+    __slots__ = ("routes", "positions")
+
+    def __init__(self, routes: Iterable[str]):
+        self.routes: List[str] = [r for r in routes if r]
+        self.positions: Dict[str, List[int]] = {}
+        for i, r in enumerate(self.routes):
+            self.positions.setdefault(r, []).append(i)
+
+    def next_position(self, candidates: Iterable[str], after: int) -> int:
+        """Smallest position > `after` holding any of `candidates` (-1 if none)."""
+        best = -1
+        for r in candidates:
+            pos = self.positions.get(r)
+            if not pos:
+                continue
+            i = bisect.bisect_right(pos, after)
+            if i < len(pos) and (best < 0 or pos[i] < best):
+                best = pos[i]
+        return best
+
+    def contains_in_order(self, step_routes: Sequence[Set[str]]) -> bool:
+        """
+        True when the steps occur in order (not necessarily contiguous); each
+        step is the set of concrete routes that satisfy it.
+        """
+        if not step_routes:
+            return False
+        at = -1
+        for routes in step_routes:
+            at = self.next_position(routes, at)
+            if at < 0:
+                return False
+        return True
+
+
+def resolve_steps(
+    vocabulary: Iterable[str], predicates: Sequence[Callable[[str], bool]]
+) -> List[Set[str]]:
+    """Map each step predicate to the set of vocabulary routes it accepts."""
+    vocab = list(vocabulary)
+    out: List[Set[str]] = []
+    for pred in predicates:
+        hits: Set[str] = set()
+        for r in vocab:
+            try:
+                if pred(r):
+                    hits.add(r)
+            except Exception:
+                pass
+        out.append(hits)
+    return out
+
+
+class _Session:
+    __slots__ = ("events", "transitions", "seq", "dirty")
+
+    def __init__(self) -> None:
+        self.events: List[_Entry] = []
+        self.transitions: List[_Entry] = []
+        self.seq: Optional[RouteSequence] = None
+        self.dirty = True
+
+    def order_key(self) -> Tuple[int, float, int]:
+        # Sessions seen in runtime_events come first (by first event), then
+        # transition-only sessions, mirroring a scan of events then transitions.
+        if self.events:
+            e = self.events[0]
+            return (0, e[0], e[1])
+        if self.transitions:
+            t = self.transitions[0]
+            return (1, t[0], t[1])
+        return (2, 0.0, 0)
+
+    def sequence(self) -> RouteSequence:
+        if self.seq is None or self.dirty:
+            self.seq = RouteSequence(e[3] for e in self.events + self.transitions)
+            self.dirty = False
+        return self.seq
+
+
+class FlowSessionIndex:
+    """
+    Incremental per-session route index fed from knowledge.db.
+
+    normalize: route/URL normalizer applied to every stored route.
+    action_types: runtime_events types that contribute to session sequences.
+    include_events: False indexes ui_flow_transitions only (flow bias).
+    """
+
+    def __init__(
+        self,
+        normalize: Callable[[str], str],
+        *,
+        action_types: Optional[Iterable[str]] = None,
+        include_events: bool = True,
+    ):
+        self.normalize = normalize
+        self.action_types = sorted(set(action_types or []))
+        self.include_events = include_events and bool(self.action_types)
+        self._lock = threading.RLock()
+        self.stats: Dict[str, Any] = {"refreshes": 0, "rows_ingested": 0, "sessions_reindexed": 0, "rebuilds": 0}
+        self.reset()
+
+    def reset(self) -> None:
+        self.sessions: Dict[str, _Session] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        self._indexed_routes: Dict[str, Set[str]] = {}
+        self._transition_routes: Counter = Counter()
+        self._outgoing: Dict[str, Counter] = {}
+        self.last_event_id = 0
+        self.last_transition_id = 0
+        self.floor_ts: Optional[float] = None
+
+    # -- ingestion ---------------------------------------------------------
+
+    def _norm(self, value: Any) -> str:
+        try:
+            return self.normalize(str(value or "")) or ""
+        except Exception:
+            return ""
+
+    def _session(self, name: str) -> _Session:
+        sess = self.sessions.get(name)
+        if sess is None:
+            sess = _Session()
+            self.sessions[name] = sess
+        return sess
+
+    def _count_transition(self, entry: _Entry, delta: int) -> None:
+        route, payload = entry[3], entry[4]
+        self._transition_routes[route] += delta
+        if self._transition_routes[route] <= 0:
+            del self._transition_routes[route]
+        if payload is not None:
+            out = self._outgoing.setdefault(route, Counter())
+            out[payload] += delta
+            if out[payload] <= 0:
+                del out[payload]
+
+    def _max_id(self, conn: sqlite3.Connection, table: str) -> int:
+        try:
+            row = conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()
+            return int((row[0] if row else 0) or 0)
+        except Exception:
+            return 0
+
+    def refresh(self, conn: sqlite3.Connection, cutoff: float) -> Dict[str, Any]:
+        """Ingest rows newer than the watermarks and drop rows older than `cutoff`."""
+        with self._lock:
+            rebuilt = False
+            if (
+                self.floor_ts is None
+                or cutoff < self.floor_ts
+                or (self.include_events and self._max_id(conn, "runtime_events") < self.last_event_id)
+                or self._max_id(conn, "ui_flow_transitions") < self.last_transition_id
+            ):
+                # First load, wider window than loaded, or the tables were reset.
+                self.reset()
+                self.floor_ts = cutoff
+                rebuilt = True
+                self.stats["rebuilds"] += 1
+            touched: Set[str] = set()
+            ingested = 0
+
+            if self.include_events:
+                placeholders = ",".join("?" for _ in self.action_types)
+                try:
+                    rows = conn.execute(
+                        f"""
+                        SELECT id, session, route, timestamp
+                        FROM runtime_events
+                        WHERE id > ? AND timestamp >= ? AND route IS NOT NULL
+                          AND event_type IN ({placeholders})
+                        ORDER BY id ASC
+                        """,
+                        (self.last_event_id, cutoff, *self.action_types),
+                    ).fetchall()
+                except Exception:
+                    rows = []
+                for rid, sess, route, ts in rows:
+                    self.last_event_id = max(self.last_event_id, int(rid))
+                    norm = self._norm(route)
+                    if not norm:
+                        continue
+                    name = str(sess or "")
+                    self._session(name).events.append((float(ts or 0), int(rid), 0, norm, None))
+                    touched.add(name)
+                    ingested += 1
+
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT id, session, from_url, to_url, action, selector, created_at
+                    FROM ui_flow_transitions
+                    WHERE id > ? AND created_at >= ?
+                    ORDER BY id ASC
+                    """,
+                    (self.last_transition_id, cutoff),
+                ).fetchall()
+            except Exception:
+                rows = []
+            for rid, sess, from_url, to_url, action, selector, ts in rows:
+                self.last_transition_id = max(self.last_transition_id, int(rid))
+                name = str(sess or "")
+                src = self._norm(from_url)
+                dst = self._norm(to_url)
+                stamp = float(ts or 0)
+                for sub, route, payload in (
+                    (0, src, (dst, str(action or ""), str(selector or ""))),
+                    (1, dst, None),
+                ):
+                    if not route:
+                        continue
+                    entry = (stamp, int(rid), sub, route, payload)
+                    self._session(name).transitions.append(entry)
+                    self._count_transition(entry, 1)
+                    touched.add(name)
+                ingested += 1
+
+            # Keep segments time-ordered; out-of-order inserts are rare.
+            for name in touched:
+                sess = self.sessions[name]
+                sess.events.sort()
+                sess.transitions.sort()
+                sess.dirty = True
+
+            # Slide the window: trim entries older than cutoff.
+            if self.floor_ts is not None and cutoff > self.floor_ts:
+                for name, sess in list(self.sessions.items()):
+                    changed = False
+                    if sess.events and sess.events[0][0] < cutoff:
+                        cut = bisect.bisect_left(sess.events, (cutoff,))
+                        del sess.events[:cut]
+                        changed = True
+                    if sess.transitions and sess.transitions[0][0] < cutoff:
+                        cut = bisect.bisect_left(sess.transitions, (cutoff,))
+                        for entry in sess.transitions[:cut]:
+                            self._count_transition(entry, -1)
+                        del sess.transitions[:cut]
+                        changed = True
+                    if changed:
+                        sess.dirty = True
+                        touched.add(name)
+                self.floor_ts = cutoff
+
+            for name in touched:
+                self._reindex(name)
+            self.stats["refreshes"] += 1
+            self.stats["rows_ingested"] += ingested
+            self.stats["sessions_reindexed"] += len(touched)
+            return {
+                "rebuilt": rebuilt,
+                "rows_ingested": ingested,
+                "sessions_reindexed": len(touched),
+                "sessions": len(self.sessions),
+            }
+
+    def _reindex(self, name: str) -> None:
+        sess = self.sessions.get(name)
+        old = self._indexed_routes.pop(name, set())
+        if sess is None or (not sess.events and not sess.transitions):
+            self.sessions.pop(name, None)
+            new: Set[str] = set()
+        else:
+            new = set(sess.sequence().positions)
+            self._indexed_routes[name] = new
+        for r in old - new:
+            holders = self.postings.get(r)
+            if holders is not None:
+                holders.discard(name)
+                if not holders:
+                    del self.postings[r]
+        for r in new - old:
+            self.postings.setdefault(r, set()).add(name)
+
+    # -- queries -----------------------------------------------------------
+
+    def session_count(self) -> int:
+        return len(self.sessions)
+
+    def routes(self) -> Set[str]:
+        """All routes present in any indexed session."""
+        return set(self.postings)
+
+    def transition_routes(self) -> Set[str]:
+        """Routes seen as from/to of a ui_flow_transition inside the window."""
+        return set(self._transition_routes)
+
+    def first_match(self, step_routes: Sequence[Set[str]]) -> Optional[str]:
+        """
+        First session (scan order) whose route sequence contains the steps in
+        order; `step_routes` as produced by `resolve_steps(index.routes(), ...)`.
+        """
+        if not step_routes or any(not s for s in step_routes):
+            return None
+        with self._lock:
+            candidates: Optional[Set[str]] = None
+            # Narrowest step first keeps the intersection small.
+            for routes in sorted(step_routes, key=len):
+                holders: Set[str] = set()
+                for r in routes:
+                    holders |= self.postings.get(r, set())
+                candidates = holders if candidates is None else candidates & holders
+                if not candidates:
+                    return None
+            for name in sorted(candidates or (), key=lambda n: self.sessions[n].order_key()):
+                if self.sessions[name].sequence().contains_in_order(step_routes):
+                    return name
+        return None
+
+    def transitions_from(self, route: str, limit: int = 6) -> List[Dict[str, Any]]:
+        """Most frequent outgoing transitions from `route`: [{to, action, selector, count}]."""
+        with self._lock:
+            out = self._outgoing.get(route)
+            if not out:
+                return []
+            ranked = out.most_common()
+        result: List[Dict[str, Any]] = []
+        for (dst, action, selector), count in ranked:
+            result.append({"to": dst, "action": action, "selector": selector, "count": int(count)})
+            if limit and len(result) >= limit:
+                break
+        return result
+
+
+_SHARED: Dict[Tuple[str, str], FlowSessionIndex] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_index(
+    db_path: Any,
+    name: str,
+    normalize: Callable[[str], str],
+    *,
+    action_types: Optional[Iterable[str]] = None,
+    include_events: bool = True,
+) -> FlowSessionIndex:
+    """Process-wide index per (database, name), reused across audits."""
+    try:
+        key = (str(Path(db_path).resolve()), name)
+    except Exception:
+        key = (str(db_path), name)
+    with _SHARED_LOCK:
+        idx = _SHARED.get(key)
+        if idx is None:
+            idx = FlowSessionIndex(normalize, action_types=action_types, include_events=include_events)
+            _SHARED[key] = idx
+        else:
+            idx.normalize = normalize
+        return idx
@@ -1,38 +1,155 @@
+import copy
+import hashlib
 import json
+import os
 import time
 from pathlib import Path
-import yaml  # type: ignore
+from typing import Any, Dict, List, Optional, Tuple
+try:
+    from .lazy_imports import lazy_import  # type: ignore
+    from .check_context import InputDigest  # type: ignore
+except Exception:
+    from lazy_imports import lazy_import  # type: ignore
+    from check_context import InputDigest  # type: ignore
 
-def generate(root: Path) -> Path:
+yaml = lazy_import("yaml")
+
+# Bump when the per-route derivation changes so cached fragments are rebuilt.
+FRAGMENT_VERSION = 2
+_PATHS_SENTINEL = "__bgl_openapi_paths__"
+
+
+def _cache_path(root: Path) -> Path:
+    return root / ".bgl_core" / "logs" / "openapi_fragments.json"
+
+
+def _empty_cache() -> Dict[str, Any]:
+    return {"version": FRAGMENT_VERSION, "files": {}, "fragments": {}, "manual": {}}
+
+
+def _load_cache(root: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(_cache_path(root).read_text(encoding="utf-8"))
+        if isinstance(data, dict) and data.get("version") == FRAGMENT_VERSION:
+            return data
+    except Exception:
+        pass
+    return _empty_cache()
+
+
+def _save_cache(root: Path, cache: Dict[str, Any]) -> None:
+    try:
+        path = _cache_path(root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+    except Exception:
+        pass
+
+
+_DUMPER: Any = None
+
+
+def _no_alias_dumper() -> Any:
+    # Anchors/aliases depend on what else is in the same dump, so a fragment
+    # rendered alone could differ from the full document; always inline them.
+    global _DUMPER
+    if _DUMPER is None:
+        class _NoAliasDumper(yaml.SafeDumper):
+            def ignore_aliases(self, data: Any) -> bool:
+                return True
+
+        _DUMPER = _NoAliasDumper
+    return _DUMPER
+
+
+def _dump(data: Any) -> str:
+    return yaml.dump(data, Dumper=_no_alias_dumper(), sort_keys=False, allow_unicode=True)
+
+
+def _path_fragment(uri: str, ops: Any) -> str:
+    """
+    YAML text of one `paths` entry, exactly as it appears inside a full dump
+    (same nesting depth, so indentation and line wrapping match).
+    """
+    text = _dump({"paths": {uri: ops}})
+    if not text.startswith("paths:\n"):
+        raise ValueError("unexpected fragment layout")
+    return text[len("paths:\n"):]
+
+
+def _render(doc: Dict[str, Any], fragments: List[str]) -> str:
+    """Dump `doc` with its `paths` mapping spliced in from pre-rendered fragments."""
+    if fragments:
+        head = dict(doc)
+        head["paths"] = _PATHS_SENTINEL
+        text = _dump(head)
+        marker = f"paths: {_PATHS_SENTINEL}\n"
+        if text.count(marker) == 1:
+            return text.replace(marker, "paths:\n" + "".join(fragments), 1)
+    return _dump(doc)
+
+
+def _route_groups(routes_db: Path) -> List[Tuple[str, List[str]]]:
+    """(uri, http methods) per uri, in routes-table order."""
+    groups: Dict[str, List[str]] = {}
+    if not routes_db.exists():
+        return []
+    import sqlite3
+    conn = sqlite3.connect(str(routes_db))
+    try:
+        rows = conn.execute("SELECT uri, http_method FROM routes").fetchall()
+    finally:
+        conn.close()
+    for uri, http_method in rows:
+        groups.setdefault(uri, []).append(http_method or "")
+    return list(groups.items())
+
+
+def _derive_operations(methods: List[str]) -> Dict[str, Any]:
+    ops: Dict[str, Any] = {}
+    for raw in methods:
+        method = (raw or "get").lower()
+        for m in (["get", "post"] if method == "any" else [method]):
+            ops[m] = {
+                "responses": {"200": {"description": "OK"}},
+            }
+    return ops
+
+
+def generate(root: Path, *, stats: Optional[Dict[str, Any]] = None) -> Path:
     """
     Generates a minimal OpenAPI spec from indexed routes (knowledge.db -> routes table).
     Merges manual seed if present.
+
+    Each route's `paths` entry is cached as rendered YAML, keyed on its uri and
+    methods (the only inputs of the derivation); only changed routes are
+    re-derived and the output is byte-identical to a full rebuild. Both paths
+    dump without YAML aliases, so shared nodes render the same either way.
+    BGL_OPENAPI_CACHE=0 forces a full rebuild. Hit/rebuilt counts go to `stats`.
     """
     out = root / "docs" / "openapi.generated.yaml"
     manual = root / "docs" / "openapi.manual.yaml"
     merged = root / "docs" / "openapi.yaml"
 
-    routes_db = root / ".bgl_core" / "brain" / "knowledge.db"
-    paths = {}
-    if routes_db.exists():
-        import sqlite3
-        conn = sqlite3.connect(str(routes_db))
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute("SELECT uri, http_method FROM routes").fetchall()
-        for r in rows:
-            uri = r["uri"]
-            method = (r["http_method"] or "get").lower()
-            if method == "any":
-                methods = ["get", "post"]
-            else:
-                methods = [method]
-            if uri not in paths:
-                paths[uri] = {}
-            for m in methods:
-                paths[uri][m] = {
-                    "responses": {"200": {"description": "OK"}},
-                }
-        conn.close()
+    use_cache = os.getenv("BGL_OPENAPI_CACHE", "1") != "0"
+    cache = _load_cache(root) if use_cache else _empty_cache()
+    digests = InputDigest(root, cache.get("files") or {})
+    old_fragments: Dict[str, Any] = cache.get("fragments") or {}
+    fragments: Dict[str, Dict[str, str]] = {}
+    counts = {"fragments_hit": 0, "fragments_rebuilt": 0, "manual_cached": False}
+
+    for uri, methods in _route_groups(root / ".bgl_core" / "brain" / "knowledge.db"):
+        key = hashlib.sha1(json.dumps([FRAGMENT_VERSION, uri, methods], ensure_ascii=False).encode("utf-8")).hexdigest()
+        cached = old_fragments.get(uri)
+        if isinstance(cached, dict) and cached.get("key") == key and isinstance(cached.get("text"), str):
+            fragments[uri] = cached
+            counts["fragments_hit"] += 1
+            continue
+        fragments[uri] = {"key": key, "text": _path_fragment(uri, _derive_operations(methods))}
+        counts["fragments_rebuilt"] += 1
+
     stamp = time.strftime("%Y-%m-%d %H:%M:%S")
     spec = {
         "openapi": "3.0.0",
@@ -41,24 +158,51 @@ def generate(root: Path) -> Path:
             "version": "0.1",
             "x-bgl-generated-at": stamp,
         },
-        "paths": paths,
+        "paths": {},
     }
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(yaml.safe_dump(spec, sort_keys=False, allow_unicode=True), encoding="utf-8")
+    out.write_text(_render(spec, [f["text"] for f in fragments.values()]), encoding="utf-8")
 
-    # Merge manual + generated (manual overrides)
+    # Merge manual + generated (manual overrides). The parsed seed is cached as
+    # (header, ordered path fragments) keyed on the manual file's content hash.
     base = {"openapi": "3.0.0", "info": {"title": "BGL3 API", "version": "0.1"}, "paths": {}}
+    manual_paths: Dict[str, str] = {}
     if manual.exists():
-        try:
-            base = yaml.safe_load(manual.read_text(encoding="utf-8")) or base
-        except Exception:
-            pass
+        manual_key = digests.file_hash(manual)
+        seed = cache.get("manual") or {}
+        if seed.get("key") == manual_key and isinstance(seed.get("base"), dict):
+            base = copy.deepcopy(seed["base"])
+            manual_paths = dict(seed.get("paths") or {})
+            counts["manual_cached"] = True
+        else:
+            try:
+                base = yaml.safe_load(manual.read_text(encoding="utf-8")) or base
+            except Exception:
+                pass
+            if isinstance(base, dict):
+                manual_paths = {
+                    uri: _path_fragment(uri, value) for uri, value in (base.get("paths") or {}).items()
+                }
+                base = dict(base)
+                base["paths"] = {}
+                try:
+                    # Only cache headers that survive the JSON round-trip unchanged.
+                    if json.loads(json.dumps(base)) == base:
+                        cache["manual"] = {"key": manual_key, "base": copy.deepcopy(base), "paths": manual_paths}
+                except Exception:
+                    pass
     base.setdefault("info", {})
     base["info"].setdefault("x-bgl-merged-at", stamp)
-    merged_paths = spec["paths"]
-    merged_paths.update(base.get("paths", {}))
-    base["paths"] = merged_paths
-    merged.write_text(yaml.safe_dump(base, sort_keys=False, allow_unicode=True), encoding="utf-8")
+    merged_paths = {uri: f["text"] for uri, f in fragments.items()}
+    merged_paths.update(manual_paths)
+    merged.write_text(_render(base, list(merged_paths.values())), encoding="utf-8")
+
+    if use_cache:
+        cache["files"] = digests.file_hashes
+        cache["fragments"] = fragments
+        _save_cache(root, cache)
+    if stats is not None:
+        stats.update(counts)
     return merged
 
 
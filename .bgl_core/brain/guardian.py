@@ -7,14 +7,27 @@ import urllib.request
 import urllib.parse
 import urllib.error
 from pathlib import Path
-from typing import List, Dict, Any, cast
+from typing import List, Dict, Any, Callable, Set, cast
 import re
 import sys
-import yaml  # type: ignore
 try:
-    from .db_utils import connect_db  # type: ignore
+    from .lazy_imports import lazy_import  # type: ignore
 except Exception:
-    from db_utils import connect_db  # type: ignore
+    from lazy_imports import lazy_import  # type: ignore
+
+yaml = lazy_import("yaml")
+try:
+    from .db_utils import connect_db, open_snapshot  # type: ignore
+except Exception:
+    from db_utils import connect_db, open_snapshot  # type: ignore
+try:
+    from .flow_index import RouteSequence, resolve_steps, shared_index  # type: ignore
+except Exception:
+    from flow_index import RouteSequence, resolve_steps, shared_index  # type: ignore
+try:
+    from .tracing import traced  # type: ignore
+except Exception:
+    from tracing import traced  # type: ignore
 
 try:
     from .safety import SafetyNet  # type: ignore
@@ -131,6 +144,7 @@ class BGLGuardian:
         except Exception:
             pass
 
+    @traced("guardian.full_audit")
     async def perform_full_audit(self) -> Dict[str, Any]:
         """
         Scans all indexed routes and provides a proactive health report.
@@ -2424,9 +2438,21 @@ class BGLGuardian:
             return 0
 
     def _normalize_route(self, route: str) -> str:
-        """Normalize route/URL to a path for coverage comparison."""
+        """Normalize route/URL to a path for coverage comparison (memoized)."""
         if not route:
             return ""
+        memo = getattr(self, "_route_norm_memo", None)
+        if memo is None or self._route_norm_base != self.base_url or len(memo) > 50000:
+            memo = {}
+            self._route_norm_memo = memo
+            self._route_norm_base = self.base_url
+        norm = memo.get(route)
+        if norm is None:
+            norm = self._normalize_route_uncached(route)
+            memo[route] = norm
+        return norm
+
+    def _normalize_route_uncached(self, route: str) -> str:
         try:
             if "://" in route:
                 parsed = urllib.parse.urlparse(route)
@@ -2603,6 +2629,82 @@ class BGLGuardian:
             )
         return flows
 
+    def _count_semantic_changes(self, conn: sqlite3.Connection, cutoff: float) -> int:
+        """
+        Number of ui_flow_transitions since `cutoff` whose semantic delta has a
+        truthy "changed". Rows without the key are filtered in SQL, so only
+        candidate payloads are JSON-decoded.
+        """
+        count = 0
+        rows = conn.execute(
+            """
+            SELECT semantic_delta_json FROM ui_flow_transitions
+            WHERE created_at >= ? AND semantic_delta_json LIKE '%"changed"%'
+            """,
+            (cutoff,),
+        ).fetchall()
+        for row in rows:
+            try:
+                payload = json.loads(row[0] or "{}")
+            except Exception:
+                payload = {}
+            if isinstance(payload, dict) and payload.get("changed"):
+                count += 1
+        return count
+
+    def _endpoint_pattern(self, ep: str) -> re.Pattern:
+        """Compiled (and cached) matcher for a flow endpoint with {id}/:id placeholders."""
+        cache = getattr(self, "_endpoint_pattern_cache", None)
+        if cache is None:
+            cache = {}
+            self._endpoint_pattern_cache = cache
+        raw = str(ep or "")
+        pattern = cache.get(raw)
+        if pattern is not None:
+            return pattern
+        try:
+            ep = self._normalize_route(raw)
+        except Exception:
+            ep = raw
+        # Replace placeholders like {id} or :id with wildcard segment.
+        try:
+            ep = re.sub(r"\{[^/]+\}", "[^/]+", ep)
+            ep = re.sub(r":[A-Za-z0-9_]+", "[^/]+", ep)
+        except Exception:
+            pass
+        ep = ep.replace("*", ".*")
+        try:
+            pattern = re.compile("^" + ep + "$")
+        except Exception:
+            pattern = re.compile(re.escape(ep))
+        cache[raw] = pattern
+        return pattern
+
+    def _endpoint_matcher(self, ep: str) -> Callable[[str], bool]:
+        """Predicate accepting normalized routes that satisfy a flow endpoint (pattern or nested prefix)."""
+        cache = getattr(self, "_endpoint_matcher_cache", None)
+        if cache is None:
+            cache = {}
+            self._endpoint_matcher_cache = cache
+        raw = str(ep or "")
+        matcher = cache.get(raw)
+        if matcher is not None:
+            return matcher
+        pattern = self._endpoint_pattern(raw)
+        try:
+            ep_norm = self._normalize_route(raw)
+        except Exception:
+            ep_norm = ""
+        nested = ep_norm.rstrip("/") + "/" if ep_norm else ""
+
+        def matcher(route: str) -> bool:
+            if pattern.match(route):
+                return True
+            return bool(ep_norm) and (route == ep_norm or route.startswith(nested))
+
+        cache[raw] = matcher
+        return matcher
+
     def _sequence_matches(
         self, route_list: List[str], endpoints: List[str], *, any_order: bool = False
     ) -> bool:
@@ -2623,71 +2725,13 @@ class BGLGuardian:
         if not norm_routes:
             return False
 
-        def _compile_endpoint(ep: str) -> re.Pattern:
-            try:
-                ep = self._normalize_route(str(ep or ""))
-            except Exception:
-                ep = str(ep or "")
-            # Replace placeholders like {id} or :id with wildcard segment.
-            try:
-                ep = re.sub(r"\{[^/]+\}", "[^/]+", ep)
-                ep = re.sub(r":[A-Za-z0-9_]+", "[^/]+", ep)
-            except Exception:
-                pass
-            ep = ep.replace("*", ".*")
-            try:
-                return re.compile("^" + ep + "$")
-            except Exception:
-                return re.compile(re.escape(ep))
-
-        compiled = [_compile_endpoint(e) for e in endpoints if e]
-        if not compiled:
+        matchers = [self._endpoint_matcher(e) for e in endpoints if e]
+        if not matchers:
             return False
-
+        steps = resolve_steps(set(norm_routes), matchers)
         if any_order:
-            for idx, pattern in enumerate(compiled):
-                matched = False
-                for r in norm_routes:
-                    try:
-                        if pattern.match(r):
-                            matched = True
-                            break
-                    except Exception:
-                        pass
-                    try:
-                        ep_raw = endpoints[idx]
-                        ep_norm = self._normalize_route(str(ep_raw or ""))
-                        if ep_norm and (r == ep_norm or r.startswith(ep_norm.rstrip("/") + "/")):
-                            matched = True
-                            break
-                    except Exception:
-                        pass
-                if not matched:
-                    return False
-            return True
-
-        idx = 0
-        for r in norm_routes:
-            if idx >= len(compiled):
-                break
-            pattern = compiled[idx]
-            # Exact/pattern match
-            try:
-                if pattern.match(r):
-                    idx += 1
-                    continue
-            except Exception:
-                pass
-            # Prefix match for nested routes
-            try:
-                ep_raw = endpoints[idx]
-                ep_norm = self._normalize_route(str(ep_raw or ""))
-                if ep_norm and (r == ep_norm or r.startswith(ep_norm.rstrip("/") + "/")):
-                    idx += 1
-                    continue
-            except Exception:
-                pass
-        return idx >= len(compiled)
+            return all(steps)
+        return RouteSequence(norm_routes).contains_in_order(steps)
 
     def _generate_gap_scenarios(
         self, coverage_payload: Dict[str, Any], limit: int = 6
@@ -3059,6 +3103,7 @@ class BGLGuardian:
             "hot_routes": hot_routes,
         }
 
+    @traced("guardian.flow_coverage")
     def _compute_flow_coverage(self, days: int = 14, limit: int = 10) -> Dict[str, Any]:
         """
         Compute flow coverage based on docs/flows vs runtime_events.
@@ -3082,7 +3127,7 @@ class BGLGuardian:
         action_route_seen: set[str] = set()
         events_seen: set[str] = set()
         route_event_types: Dict[str, set[str]] = {}
-        session_routes: Dict[str, List[str]] = {}
+        flow_index = None
         flow_gap_hits: Dict[str, int] = {}
         flow_gap_total = 0
         flow_gap_changed = 0
@@ -3090,19 +3135,9 @@ class BGLGuardian:
         semantic_change_count = 0
         event_count = 0
         try:
-            conn = connect_db(str(self.db_path))
-            conn.row_factory = sqlite3.Row
+            # Pinned read-only snapshot: never blocks scenario_runner writes or checkpoints.
+            conn = open_snapshot(self.db_path)
             cur = conn.cursor()
-            rows = cur.execute(
-                """
-                SELECT session, route, event_type, timestamp
-                FROM runtime_events
-                WHERE timestamp >= ? AND (route IS NOT NULL OR event_type IS NOT NULL)
-                ORDER BY timestamp ASC
-                """,
-                (cutoff,),
-            ).fetchall()
-            event_count = len(rows)
             action_event_types = {
                 "api_call",
                 "http_error",
@@ -3121,43 +3156,51 @@ class BGLGuardian:
                 "ui_semantic_snapshot",
                 "ui_semantic_change",
             }
+            # Columnar pass: one row per distinct (route, event_type) instead of
+            # one per event; each distinct route is normalized once (memoized).
+            rows = cur.execute(
+                """
+                SELECT route, event_type, COUNT(*) AS n
+                FROM runtime_events
+                WHERE timestamp >= ? AND (route IS NOT NULL OR event_type IS NOT NULL)
+                GROUP BY route, event_type
+                """,
+                (cutoff,),
+            ).fetchall()
             for r in rows:
-                route = r["route"] or ""
-                norm = self._normalize_route(route)
+                event_count += int(r["n"] or 0)
+                norm = self._normalize_route(r["route"] or "")
+                ev = str(r["event_type"] or "")
+                is_action = ev in action_event_types
                 if norm:
                     route_seen.add(norm)
-                    sess = r["session"] or ""
-                    if str(r["event_type"] or "") in action_event_types:
-                        session_routes.setdefault(str(sess), []).append(norm)
-                ev = str(r["event_type"] or "")
-                if ev and ev in action_event_types:
+                    if is_action:
+                        action_route_seen.add(norm)
+                    if ev:
+                        route_event_types.setdefault(norm, set()).add(ev)
+                if ev and is_action:
                     events_seen.add(ev)
-                if norm and str(r["event_type"] or "") in action_event_types:
-                    action_route_seen.add(norm)
-                if norm and ev:
-                    route_event_types.setdefault(norm, set()).add(ev)
+            # Ordered per-session route sequences live in a shared incremental
+            # index: only rows past the last audit's watermark are read here.
+            flow_index = shared_index(
+                self.db_path,
+                "flow_coverage",
+                self._normalize_route,
+                action_types=action_event_types,
+            )
+            flow_index.refresh(conn, cutoff)
             # Include UI flow transitions as operational evidence
             try:
-                rows_flow = cur.execute(
-                    """
-                    SELECT session, from_url, to_url, created_at
-                    FROM ui_flow_transitions
-                    WHERE created_at >= ?
-                    ORDER BY created_at ASC
-                    """,
+                row_flow = cur.execute(
+                    "SELECT 1 FROM ui_flow_transitions WHERE created_at >= ? LIMIT 1",
                     (cutoff,),
-                ).fetchall()
-                for r in rows_flow:
-                    sess = r["session"] or ""
-                    for url in (r["from_url"] or "", r["to_url"] or ""):
-                        norm = self._normalize_route(url)
-                        if not norm:
-                            continue
-                        route_seen.add(norm)
-                        action_route_seen.add(norm)
-                        session_routes.setdefault(str(sess), []).append(norm)
-                        route_event_types.setdefault(norm, set()).add("ui_flow_transition")
+                ).fetchone()
+                if row_flow:
                     events_seen.add("ui_flow_transition")
+                for norm in flow_index.transition_routes():
+                    route_seen.add(norm)
+                    action_route_seen.add(norm)
+                    route_event_types.setdefault(norm, set()).add("ui_flow_transition")
             except Exception:
                 pass
             # Include UI semantic snapshots as operational evidence + semantic change tracking
@@ -3210,17 +3253,7 @@ class BGLGuardian:
                 pass
             # Count semantic changes from UI flow transitions.
             try:
-                rows_delta = cur.execute(
-                    "SELECT semantic_delta_json FROM ui_flow_transitions WHERE created_at >= ?",
-                    (cutoff,),
-                ).fetchall()
-                for row in rows_delta:
-                    try:
-                        payload = json.loads(row[0] or "{}")
-                    except Exception:
-                        payload = {}
-                    if isinstance(payload, dict) and payload.get("changed"):
-                        semantic_change_count += 1
+                semantic_change_count += self._count_semantic_changes(conn, cutoff)
             except Exception:
                 semantic_change_count = 0
             # Fallback: count semantic change runtime events if still zero.
@@ -3239,8 +3272,13 @@ class BGLGuardian:
                     pass
             # Flow gap scenario evidence (explicit link between flow gaps and coverage)
             try:
+                # Only payloads mentioning flow_gap can qualify; skip decoding the rest.
                 rows_gap = cur.execute(
-                    "SELECT timestamp, payload FROM runtime_events WHERE event_type='gap_scenario_done' AND timestamp >= ?",
+                    """
+                    SELECT timestamp, payload FROM runtime_events
+                    WHERE event_type='gap_scenario_done' AND timestamp >= ?
+                      AND payload LIKE '%flow_gap%'
+                    """,
                     (cutoff,),
                 ).fetchall()
                 for ts, payload in rows_gap:
@@ -3271,7 +3309,7 @@ class BGLGuardian:
             route_seen = set()
             action_route_seen = set()
             events_seen = set()
-            session_routes = {}
+            flow_index = None
             flow_gap_hits = {}
             flow_gap_total = 0
             flow_gap_last_ts = 0.0
@@ -3310,6 +3348,16 @@ class BGLGuardian:
             )
         except Exception:
             infer_sequence = True
+        # Endpoint -> matching routes, resolved once per audit and shared by all flows.
+        index_routes = flow_index.routes() if flow_index is not None else set()
+        index_steps: Dict[str, Set[str]] = {}
+        seen_steps: Dict[str, Set[str]] = {}
+
+        def _resolve(ep: str, vocabulary: Set[str], cache: Dict[str, Set[str]]) -> Set[str]:
+            if ep not in cache:
+                cache[ep] = resolve_steps(vocabulary, [self._endpoint_matcher(ep)])[0]
+            return cache[ep]
+
         for flow in flows:
             endpoints = list(flow.get("endpoints") or [])
             events = list(flow.get("events") or [])
@@ -3369,15 +3417,19 @@ class BGLGuardian:
             sequence_inferred = False
             sequence_session = ""
             sequence_from_gap = bool(gap_runs and endpoints)
-            if endpoints and session_routes:
-                for sess, routes in session_routes.items():
-                    if self._sequence_matches(routes, endpoints):
-                        sequence_covered = True
-                        sequence_session = sess
-                        break
+            if endpoints and flow_index is not None and flow_index.session_count():
+                try:
+                    steps = [_resolve(e, index_routes, index_steps) for e in endpoints if e]
+                    match = flow_index.first_match(steps)
+                except Exception:
+                    match = None
+                if match is not None:
+                    sequence_covered = True
+                    sequence_session = match
             if endpoints:
                 try:
-                    sequence_inferred = self._sequence_matches(list(route_seen), endpoints, any_order=True)
+                    seen = [_resolve(e, route_seen, seen_steps) for e in endpoints if e]
+                    sequence_inferred = bool(seen) and all(seen)
                 except Exception:
                     sequence_inferred = False
             if sequence_from_gap:
@@ -3466,6 +3518,7 @@ class BGLGuardian:
             "reliability_reason": reason,
         }
 
+    @traced("guardian.scenario_coverage")
     def _compute_scenario_coverage(self, days: int = 7, limit: int = 12) -> Dict[str, Any]:
         """
         Compute lightweight scenario coverage based on runtime_events vs routes.
@@ -3485,8 +3538,7 @@ class BGLGuardian:
         gap_runs = 0
         gap_last_ts = 0.0
         try:
-            conn = connect_db(str(self.db_path))
-            conn.row_factory = sqlite3.Row
+            conn = open_snapshot(self.db_path)
             cur = conn.cursor()
             # Build normalized route set (avoid double-counting / query noise)
             rows_known = cur.execute("SELECT uri FROM routes").fetchall()
@@ -3529,39 +3581,40 @@ class BGLGuardian:
 
             # Count semantic changes from UI flow transitions (operational coverage signal).
             try:
-                rows_flow = cur.execute(
-                    "SELECT semantic_delta_json FROM ui_flow_transitions WHERE created_at >= ?",
-                    (cutoff,),
-                ).fetchall()
-                for row in rows_flow:
-                    try:
-                        payload = json.loads(row[0] or "{}")
-                    except Exception:
-                        payload = {}
-                    if isinstance(payload, dict) and payload.get("changed"):
-                        semantic_change_count += 1
+                semantic_change_count += self._count_semantic_changes(conn, cutoff)
             except Exception:
                 semantic_change_count = 0
 
             # Gap scenario execution stats (explicit link between gaps and coverage).
             try:
-                gap_rows = cur.execute(
-                    "SELECT timestamp, payload FROM runtime_events WHERE event_type='gap_scenario_done' AND timestamp >= ?",
+                gap_row = cur.execute(
+                    """
+                    SELECT COUNT(*), MAX(timestamp) FROM runtime_events
+                    WHERE event_type='gap_scenario_done' AND timestamp >= ?
+                    """,
                     (cutoff,),
-                ).fetchall()
-                gap_runs = len(gap_rows)
+                ).fetchone()
+                gap_runs = int(gap_row[0] or 0) if gap_row else 0
+                try:
+                    gap_last_ts = max(gap_last_ts, float((gap_row[1] if gap_row else 0) or 0))
+                except Exception:
+                    pass
                 gap_changed = 0
-                for ts, payload in gap_rows:
+                changed_rows = cur.execute(
+                    """
+                    SELECT payload FROM runtime_events
+                    WHERE event_type='gap_scenario_done' AND timestamp >= ?
+                      AND payload LIKE '%"changed"%'
+                    """,
+                    (cutoff,),
+                ).fetchall()
+                for (payload,) in changed_rows:
                     try:
                         obj = json.loads(payload) if isinstance(payload, str) else (payload or {})
                     except Exception:
                         obj = {}
                     if bool(obj.get("changed")):
                         gap_changed += 1
-                    try:
-                        gap_last_ts = max(gap_last_ts, float(ts or 0))
-                    except Exception:
-                        pass
             except Exception:
                 gap_runs = 0
                 gap_changed = 0
@@ -3628,6 +3681,7 @@ class BGLGuardian:
             "reliability_reason": reason,
         }
 
+    @traced("guardian.ui_action_coverage")
     def _compute_ui_action_coverage(self, days: int = 7, limit: int = 12) -> Dict[str, Any]:
         """
         Compute UI action coverage using stored UI action snapshots vs exploration history.
@@ -3639,8 +3693,7 @@ class BGLGuardian:
         uncovered_sample: List[Dict[str, Any]] = []
         gaps: List[Dict[str, Any]] = []
         try:
-            conn = connect_db(str(self.db_path))
-            conn.row_factory = sqlite3.Row
+            conn = open_snapshot(self.db_path)
             tables = {
                 row[0]
                 for row in conn.execute(
@@ -3720,17 +3773,7 @@ class BGLGuardian:
                 pass
             # Count semantic changes from UI flow transitions to enforce operational coverage.
             try:
-                rows_flow = conn.execute(
-                    "SELECT semantic_delta_json FROM ui_flow_transitions WHERE created_at >= ?",
-                    (cutoff,),
-                ).fetchall()
-                for row in rows_flow:
-                    try:
-                        payload = json.loads(row[0] or "{}")
-                    except Exception:
-                        payload = {}
-                    if isinstance(payload, dict) and payload.get("changed"):
-                        semantic_change_count += 1
+                semantic_change_count += self._count_semantic_changes(conn, cutoff)
             except Exception:
                 semantic_change_count = 0
             # Fallback: detect semantic changes from ui_semantic_snapshots digests.
@@ -3779,8 +3822,13 @@ class BGLGuardian:
             gap_selector_keys_global: set[str] = set()
             gap_selectors_global: set[str] = set()
             try:
+                # A qualifying payload names a ui_action origin or carries a selector.
                 rows_gap = conn.execute(
-                    "SELECT timestamp, payload FROM runtime_events WHERE event_type='gap_scenario_done' AND timestamp >= ?",
+                    """
+                    SELECT timestamp, payload FROM runtime_events
+                    WHERE event_type='gap_scenario_done' AND timestamp >= ?
+                      AND (payload LIKE '%ui_action%' OR payload LIKE '%"selector"%')
+                    """,
                     (cutoff,),
                 ).fetchall()
                 for ts, payload in rows_gap:
@@ -4220,6 +4268,7 @@ class BGLGuardian:
             print(f"    [!] Guardian Bridge Error: {e}")
             return []
 
+    @traced("guardian.proxied_routes")
     def _get_proxied_routes(self) -> List[Dict[str, Any]]:
         if not self.db_path.exists():
             return []
@@ -4358,6 +4407,7 @@ class BGLGuardian:
     def _is_api_route(self, uri: str) -> bool:
         return uri.startswith("/api/") or "/api/" in uri
 
+    @traced("guardian.scan_api_route")
     def _scan_api_route(
         self,
         uri: str,
@@ -0,0 +1,421 @@
+"""
+hotpath_bench.py
+----------------
+Microbenchmarks for the brain's own hot paths, run against a synthetic
+knowledge.db fixture (never the live database).
+
+Each case is set up once, warmed up, then timed for a number of rounds; the
+median and p90 are reported. Results are upserted as `hotpath:<case>` records
+in the tracked .bgl_core/logs/benchmark_results.json, each carrying its
+`baseline_median_ms`. A case whose median exceeds its baseline by more than
+`hotpath_bench_regression_pct` (and by at least `hotpath_bench_min_delta_ms`)
+is a REGRESSION and the run exits non-zero. The first run of a case, or
+`--update-baseline`, records the baseline.
+
+Usage:
+    python .bgl_core/brain/hotpath_bench.py
+    python .bgl_core/brain/hotpath_bench.py --case log_event --rounds 50
+    python .bgl_core/brain/hotpath_bench.py --max-regression 15
+    python .bgl_core/brain/hotpath_bench.py --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from .config_loader import load_config  # type: ignore
+    from .schema_migrations import ensure_schema  # type: ignore
+except Exception:
+    from config_loader import load_config  # type: ignore
+    from schema_migrations import ensure_schema  # type: ignore
+
+ROOT = Path(__file__).resolve().parents[2]
+BRAIN_DIR = ROOT / ".bgl_core" / "brain"
+BENCHMARK_PATH = ROOT / ".bgl_core" / "logs" / "benchmark_results.json"
+SCENARIOS_DIR = BRAIN_DIR / "scenarios"
+
+_ROUTES = [
+    "/",
+    "/views/index.php",
+    "/views/banks.php",
+    "/views/suppliers.php",
+    "/api/create-guarantee.php",
+    "/api/extend-guarantee.php",
+    "/api/reduce-guarantee.php",
+    "/api/release.php",
+    "/api/export-suppliers.php",
+    "/api/get-history-snapshot.php",
+]
+_EVENT_TYPES = ["api_call", "http_error", "ui_click", "route_check", "js_error", "network_fail", "scenario_step_done"]
+_WORDS = "guarantee bank supplier extend release reduce batch import export history letter amount expiry".split()
+
+
+# ---------------------------------------------------------------------------
+# Fixture
+# ---------------------------------------------------------------------------
+
+
+def build_fixture(base: Path, *, events: int = 5000, embeddings: int = 1500, seed: int = 7) -> Path:
+    """
+    Create a throwaway project root under `base`: config, flow docs and a
+    migrated knowledge.db filled with deterministic synthetic rows.
+    """
+    root = Path(base)
+    brain = root / ".bgl_core" / "brain"
+    brain.mkdir(parents=True, exist_ok=True)
+    for rel in (".bgl_core/config.yml", ".bgl_core/brain/decision_schema.sql"):
+        src = ROOT / rel
+        if src.exists():
+            shutil.copy2(src, root / rel)
+    flows = ROOT / "docs" / "flows"
+    if flows.exists():
+        shutil.copytree(flows, root / "docs" / "flows", dirs_exist_ok=True)
+
+    db_path = brain / "knowledge.db"
+    ensure_schema(db_path)
+    rnd = random.Random(seed)
+    now = time.time()
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.executemany(
+            "INSERT OR IGNORE INTO routes (uri, http_method, file_path) VALUES (?, ?, ?)",
+            [(r, "GET", r.lstrip("/") or "index.php") for r in _ROUTES],
+        )
+        rows = []
+        for i in range(events):
+            etype = rnd.choice(_EVENT_TYPES)
+            failed = etype in ("http_error", "network_fail")
+            rows.append(
+                (
+                    now - rnd.random() * 86400 * 7,
+                    f"s{rnd.randint(0, 60)}",
+                    f"run{i % 12}",
+                    etype,
+                    rnd.choice(_ROUTES),
+                    rnd.choice(["GET", "POST"]),
+                    json.dumps({"selector": f"#b{i % 40}"}) if etype == "ui_click" else None,
+                    500 if failed else 200,
+                    rnd.random() * 400,
+                    "boom" if etype == "js_error" else None,
+                )
+            )
+        conn.executemany(
+            """
+            INSERT INTO runtime_events (timestamp, session, run_id, event_type, route, method, payload, status, latency_ms, error)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        conn.executemany(
+            "INSERT INTO ui_flow_transitions (created_at, session, from_url, to_url, action, selector) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (now - rnd.random() * 86400 * 7, f"s{rnd.randint(0, 60)}", rnd.choice(_ROUTES), rnd.choice(_ROUTES), "click", f"#b{i % 40}")
+                for i in range(events // 10)
+            ],
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings(id INTEGER PRIMARY KEY AUTOINCREMENT, label TEXT UNIQUE, text TEXT, vector TEXT)"
+        )
+        emb = []
+        for i in range(embeddings):
+            words = [rnd.choice(_WORDS) for _ in range(rnd.randint(8, 40))]
+            total = float(len(words))
+            vec: Dict[str, float] = {}
+            for w in words:
+                vec[w] = vec.get(w, 0.0) + 1.0 / total
+            emb.append((f"doc{i}", " ".join(words), json.dumps(vec)))
+        conn.executemany("INSERT INTO embeddings (label, text, vector) VALUES (?, ?, ?)", emb)
+        conn.commit()
+    finally:
+        conn.close()
+    return root
+
+
+# ---------------------------------------------------------------------------
+# Cases: setup(root) -> (call, teardown)
+# ---------------------------------------------------------------------------
+
+
+def _case_log_event(root: Path):
+    import scenario_runner  # type: ignore
+
+    db_path = root / ".bgl_core" / "brain" / "knowledge.db"
+    event = {"event_type": "api_call", "route": "/api/release.php", "method": "POST", "status": 200, "latency_ms": 12.5, "payload": {"k": 1}}
+    return (lambda: scenario_runner.log_event(db_path, "bench", event)), None
+
+
+def _case_embeddings_search(root: Path):
+    import embeddings  # type: ignore
+
+    saved = (embeddings.DB, embeddings._TABLE_READY)
+    embeddings.DB = root / ".bgl_core" / "brain" / "knowledge.db"
+    embeddings._TABLE_READY = False
+
+    def call():
+        embeddings._search_cache.clear()  # time the search, not the query memo
+        embeddings.search("extend guarantee bank expiry", top_k=5)
+
+    def teardown():
+        embeddings.DB, embeddings._TABLE_READY = saved
+        embeddings._search_cache.clear()
+
+    return call, teardown
+
+
+def _case_context_digest_summarize(root: Path):
+    import context_digest  # type: ignore
+
+    conn = sqlite3.connect(str(root / ".bgl_core" / "brain" / "knowledge.db"))
+    events = context_digest.fetch_events(conn, 0, 2000)
+    route_map = context_digest.load_route_map(conn)
+    conn.close()
+    return (lambda: context_digest.summarize(events, route_map)), None
+
+
+def _case_guardian_flow_coverage(root: Path):
+    import guardian  # type: ignore
+
+    g = guardian.BGLGuardian(root)
+    return (lambda: g._compute_flow_coverage()), None
+
+
+def _case_select_scenarios(root: Path):
+    import scenario_scheduler  # type: ignore
+
+    files = sorted(SCENARIOS_DIR.rglob("*.yaml"))
+    db_path = root / ".bgl_core" / "brain" / "knowledge.db"
+    cfg = dict(load_config(root) or {})
+    # Keep the scheduler's state files inside the fixture.
+    saved = (scenario_scheduler.STATE_PATH, scenario_scheduler.RETENTION_STATE_PATH)
+    logs = root / ".bgl_core" / "logs"
+    scenario_scheduler.STATE_PATH = logs / saved[0].name
+    scenario_scheduler.RETENTION_STATE_PATH = logs / saved[1].name
+
+    def teardown():
+        scenario_scheduler.STATE_PATH, scenario_scheduler.RETENTION_STATE_PATH = saved
+
+    return (lambda: scenario_scheduler.select_scenarios(files, db_path, cfg, limit=40)), teardown
+
+
+def _case_load_config(root: Path):
+    return (lambda: load_config(root)), None
+
+
+CASES: Dict[str, Callable[[Path], Tuple[Callable[[], Any], Optional[Callable[[], None]]]]] = {
+    "log_event": _case_log_event,
+    "embeddings_search": _case_embeddings_search,
+    "context_digest_summarize": _case_context_digest_summarize,
+    "guardian_flow_coverage": _case_guardian_flow_coverage,
+    "select_scenarios": _case_select_scenarios,
+    "load_config": _case_load_config,
+}
+
+
+# ---------------------------------------------------------------------------
+# Timing and gating
+# ---------------------------------------------------------------------------
+
+
+def time_call(
+    call: Callable[[], Any],
+    *,
+    rounds: int = 20,
+    warmup: int = 2,
+    max_time_sec: float = 5.0,
+    min_rounds: int = 3,
+) -> Dict[str, Any]:
+    """
+    Run `call` `warmup` times, then time up to `rounds` calls; slow cases stop
+    once `max_time_sec` is spent (but never before `min_rounds`). Stats in ms.
+    """
+    for _ in range(max(0, warmup)):
+        call()
+    samples: List[float] = []
+    started = time.perf_counter()
+    while len(samples) < max(1, rounds):
+        if len(samples) >= min_rounds and max_time_sec and (time.perf_counter() - started) >= max_time_sec:
+            break
+        t0 = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    ordered = sorted(samples)
+    return {
+        "rounds": len(samples),
+        "median_ms": round(statistics.median(ordered), 4),
+        "p90_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))], 4),
+        "min_ms": round(ordered[0], 4),
+        "mean_ms": round(statistics.fmean(ordered), 4),
+    }
+
+
+def evaluate(
+    median_ms: float,
+    baseline_ms: Optional[float],
+    *,
+    max_regression_pct: float,
+    min_delta_ms: float = 0.0,
+) -> Tuple[str, float]:
+    """(status, change_pct) for a median against its baseline."""
+    if not baseline_ms or baseline_ms <= 0:
+        return "BASELINE", 0.0
+    change = (median_ms - baseline_ms) / baseline_ms * 100.0
+    if change > max_regression_pct and (median_ms - baseline_ms) >= min_delta_ms:
+        return "REGRESSION", round(change, 1)
+    return "SUCCESS", round(change, 1)
+
+
+def _load_results(path: Path) -> List[Dict[str, Any]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+        return data if isinstance(data, list) else []
+    except Exception:
+        return []
+
+
+def upsert_results(path: Path, records: List[Dict[str, Any]]) -> None:
+    """
+    Replace or append `records` in benchmark_results.json by their `case`,
+    keeping every other suite's entries in place.
+    """
+    existing = _load_results(path)
+    by_case = {r.get("case"): i for i, r in enumerate(existing) if isinstance(r, dict)}
+    for rec in records:
+        idx = by_case.get(rec["case"])
+        if idx is None:
+            by_case[rec["case"]] = len(existing)
+            existing.append(rec)
+        else:
+            existing[idx] = rec
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(existing, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    tmp.replace(path)
+
+
+def _gate_settings(cfg: Dict[str, Any]) -> Tuple[float, float]:
+    try:
+        pct = float(os.getenv("BGL_BENCH_REGRESSION_PCT", cfg.get("hotpath_bench_regression_pct", 25)) or 25)
+    except Exception:
+        pct = 25.0
+    try:
+        floor = float(os.getenv("BGL_BENCH_MIN_DELTA_MS", cfg.get("hotpath_bench_min_delta_ms", 0.05)) or 0)
+    except Exception:
+        floor = 0.05
+    return pct, floor
+
+
+def run_bench(
+    cases: Optional[List[str]] = None,
+    *,
+    rounds: int = 20,
+    warmup: int = 2,
+    max_time_sec: float = 5.0,
+    update_baseline: bool = False,
+    max_regression_pct: Optional[float] = None,
+    results_path: Path = BENCHMARK_PATH,
+    write: bool = True,
+    fixture_events: int = 5000,
+) -> List[Dict[str, Any]]:
+    pct, floor = _gate_settings(load_config(ROOT) or {})
+    if max_regression_pct is not None:
+        pct = float(max_regression_pct)
+    existing = _load_results(results_path)
+    by_case = {r.get("case"): i for i, r in enumerate(existing) if isinstance(r, dict)}
+
+    records: List[Dict[str, Any]] = []
+    tmp = Path(tempfile.mkdtemp(prefix="bgl_hotpath_"))
+    try:
+        root = build_fixture(tmp / "root", events=fixture_events)
+        for name in cases or list(CASES):
+            if name not in CASES:
+                continue
+            key = f"hotpath:{name}"
+            prev = existing[by_case[key]] if key in by_case else {}
+            teardown = None
+            try:
+                call, teardown = CASES[name](root)
+                stats = time_call(call, rounds=rounds, warmup=warmup, max_time_sec=max_time_sec)
+                error = ""
+            except Exception as exc:
+                stats, error = {}, f"{type(exc).__name__}: {exc}"[:300]
+            finally:
+                if teardown:
+                    try:
+                        teardown()
+                    except Exception:
+                        pass
+            baseline = None if update_baseline else prev.get("baseline_median_ms")
+            if error:
+                status, change = "FAILED", 0.0
+            else:
+                status, change = evaluate(stats["median_ms"], baseline, max_regression_pct=pct, min_delta_ms=floor)
+            records.append(
+                {
+                    "case": key,
+                    "status": status,
+                    "latency_sec": round(stats["median_ms"] / 1000.0, 6) if stats else None,
+                    **stats,
+                    "baseline_median_ms": stats.get("median_ms") if status == "BASELINE" else baseline,
+                    "change_pct": change,
+                    "max_regression_pct": pct,
+                    "message": error,
+                }
+            )
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if write:
+        upsert_results(results_path, records)
+    return records
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark brain hot paths against a synthetic knowledge.db.")
+    ap.add_argument("--case", action="append", choices=sorted(CASES), help="Case(s) to run (default: all).")
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--warmup", type=int, default=2)
+    ap.add_argument("--max-time", type=float, default=5.0, help="Per-case timing budget in seconds (min 3 rounds).")
+    ap.add_argument("--update-baseline", action="store_true", help="Record current medians as the new baselines.")
+    ap.add_argument("--max-regression", type=float, default=None, help="Allowed median regression in percent.")
+    ap.add_argument("--no-write", action="store_true", help="Do not update benchmark_results.json.")
+    args = ap.parse_args()
+
+    records = run_bench(
+        args.case,
+        rounds=args.rounds,
+        warmup=args.warmup,
+        max_time_sec=args.max_time,
+        update_baseline=args.update_baseline,
+        max_regression_pct=args.max_regression,
+        write=not args.no_write,
+    )
+    failed = 0
+    for rec in records:
+        if rec["status"] in ("FAILED", "REGRESSION"):
+            failed += 1
+        if rec["status"] == "FAILED":
+            print(f"{rec['case']:<34} FAILED      {rec['message']}")
+            continue
+        print(
+            f"{rec['case']:<34} {rec['status']:<11} median={rec['median_ms']:.3f}ms p90={rec['p90_ms']:.3f}ms "
+            f"baseline={rec['baseline_median_ms']:.3f}ms change={rec['change_pct']:+.1f}%"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    if str(BRAIN_DIR) not in sys.path:
+        sys.path.insert(0, str(BRAIN_DIR))
+    raise SystemExit(main())
@@ -1,15 +1,62 @@
 import os
 import json
+import time
 import subprocess
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
 from memory import StructureMemory
 
+try:
+    from .config_loader import load_config  # type: ignore
+except Exception:
+    try:
+        from config_loader import load_config  # type: ignore
+    except Exception:
+        load_config = None  # type: ignore
+
+
+def _parse_file(cmd: List[str], abs_path: str, rel_path: str) -> Dict[str, Any]:
+    """
+    Parse worker (runs in a pool process): AST sensor -> JSON symbols.
+    Touches no database handle, so it is safe under spawn/fork alike.
+    """
+    try:
+        mtime = os.path.getmtime(abs_path)
+        result = subprocess.run(
+            cmd + [abs_path],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        output = json.loads(result.stdout)
+        if output.get("status") == "success":
+            return {
+                "ok": True,
+                "path": rel_path,
+                "mtime": mtime,
+                "symbols": output.get("data", []),
+            }
+        return {"ok": False, "path": rel_path, "error": f"Sensor error: {output.get('message')}"}
+    except Exception as e:
+        return {"ok": False, "path": rel_path, "error": str(e)}
+
 
 class EntityIndexer:
-    def __init__(self, root_dir: Path, db_path: Path):
+    def __init__(
+        self,
+        root_dir: Path,
+        db_path: Path,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
         self.root_dir = root_dir
         self.memory = StructureMemory(db_path)
         self.sensor_path = self.root_dir / ".bgl_core" / "sensors" / "ast_bridge.php"
+        self.sensor_cmd = ["php", str(self.sensor_path)]
         self.skip_dirs = {
             "vendor",
             "node_modules",
@@ -21,19 +68,56 @@ class EntityIndexer:
         self.skip_suffixes = {".bak", ".tmp"}
         self._closed = False
 
+        cfg: Dict[str, Any] = {}
+        try:
+            if load_config is not None:
+                cfg = load_config(root_dir) or {}
+        except Exception:
+            cfg = {}
+        # 0 = one parse process per CPU core.
+        if workers is None:
+            workers = int(os.getenv("BGL_INDEXER_WORKERS", cfg.get("indexer_workers", 0)) or 0)
+        self.workers = max(1, workers or (os.cpu_count() or 1))
+        if batch_size is None:
+            batch_size = int(os.getenv("BGL_INDEXER_BATCH", cfg.get("indexer_batch_size", 50)) or 50)
+        self.batch_size = max(1, batch_size)
+        # Bounded in-flight jobs: the walker blocks when parse workers fall behind.
+        self.queue_size = max(
+            self.workers, int(cfg.get("indexer_queue_per_worker", 4) or 4) * self.workers
+        )
+        self.progress = progress or self._print_progress
+        self.progress_every_sec = 2.0
+
     def update_impacted(self, rel_paths: list[str]):
         """
         Re-index only the provided relative paths (for targeted updates after patch).
         """
-        for rel in rel_paths:
-            abs_path = self.root_dir / rel
-            if abs_path.exists() and abs_path.suffix == ".php":
-                self._index_file(abs_path, rel)
+        jobs = [
+            (self.root_dir / rel, rel)
+            for rel in rel_paths
+            if (self.root_dir / rel).exists() and (self.root_dir / rel).suffix == ".php"
+        ]
+        self._run_pipeline(iter(jobs), workers=min(self.workers, max(1, len(jobs))))
         self.close()
 
     def index_project(self):
         print(f"[*] Starting indexing project at {self.root_dir}")
-        count = 0
+        stats = self._run_pipeline(self._walk())
+        print(
+            f"[+] Indexing complete. Processed {stats['indexed']} files "
+            f"({stats['failed']} failed, {stats['workers']} workers, {stats['elapsed_sec']:.1f}s)."
+        )
+        self.close()
+        return stats
+
+    def close(self):
+        if not self._closed:
+            self.memory.close()
+            self._closed = True
+
+    def _walk(self) -> Iterator[Tuple[Path, str]]:
+        """Walker stage: yield (abs, rel) for PHP files newer than the index."""
+        known = self.memory.file_mtimes()
         for root, dirs, files in os.walk(self.root_dir):
             # Skip hidden dirs and vendor
             dirs[:] = [
@@ -47,22 +131,17 @@ class EntityIndexer:
                     abs_path = Path(root) / file
                     rel_path = str(abs_path.relative_to(self.root_dir))
 
-                    if self._should_index(abs_path, rel_path):
-                        self._index_file(abs_path, rel_path)
-                        count += 1
-
-        print(f"[+] Indexing complete. Processed {count} files.")
-        self.close()
-
-    def close(self):
-        if not self._closed:
-            self.memory.close()
-            self._closed = True
+                    if self._should_index(abs_path, rel_path, known):
+                        yield abs_path, rel_path
 
-    def _should_index(self, abs_path: Path, rel_path: str) -> bool:
+    def _should_index(
+        self, abs_path: Path, rel_path: str, known: Optional[Dict[str, float]] = None
+    ) -> bool:
         """Only index if mtime differs from memory."""
         try:
             current_mtime = os.path.getmtime(abs_path)
+            if known is not None:
+                return current_mtime > known.get(rel_path, -1.0)
             stored = self.memory.get_file_info(rel_path)
             if not stored:
                 return True
@@ -71,27 +150,91 @@ class EntityIndexer:
             return True
 
     def _index_file(self, abs_path: Path, rel_path: str):
-        try:
-            # Run AST sensor
-            result = subprocess.run(
-                ["php", str(self.sensor_path), str(abs_path)],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-
-            output = json.loads(result.stdout)
-            if output.get("status") == "success":
-                mtime = os.path.getmtime(abs_path)
-                file_id = self.memory.register_file(rel_path, mtime)
-                self.memory.clear_file_data(file_id)
-                self.memory.store_nested_symbols(file_id, output.get("data", []))
-                # print(f"    Indexed: {rel_path}")
+        self._run_pipeline(iter([(abs_path, rel_path)]), workers=1)
+
+    def _run_pipeline(
+        self, jobs: Iterator[Tuple[Path, str]], workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        walker (jobs) -> N parse processes -> single batch writer (this process).
+        At most `queue_size` files are in flight; results are committed in
+        batches of `batch_size` files per transaction.
+        """
+        workers = max(1, workers or self.workers)
+        stats: Dict[str, Any] = {
+            "queued": 0,
+            "indexed": 0,
+            "failed": 0,
+            "workers": workers,
+            "started": time.time(),
+        }
+        pending_batch: List[Dict[str, Any]] = []
+        last_report = time.time()
+
+        def _write(flush: bool = False):
+            nonlocal pending_batch
+            if pending_batch and (flush or len(pending_batch) >= self.batch_size):
+                try:
+                    stats["indexed"] += self.memory.store_file_batch(pending_batch)
+                except Exception as e:
+                    stats["failed"] += len(pending_batch)
+                    print(f"    [!] Failed to store batch: {str(e)}")
+                pending_batch = []
+
+        def _collect(res: Dict[str, Any]):
+            nonlocal last_report
+            if res.get("ok"):
+                pending_batch.append(res)
             else:
-                print(f"    [!] Sensor error for {rel_path}: {output.get('message')}")
+                stats["failed"] += 1
+                print(f"    [!] Failed to index {res.get('path')}: {res.get('error')}")
+            _write()
+            now = time.time()
+            if now - last_report >= self.progress_every_sec:
+                last_report = now
+                self._report(stats)
+
+        if workers == 1:
+            for abs_path, rel_path in jobs:
+                stats["queued"] += 1
+                _collect(_parse_file(self.sensor_cmd, str(abs_path), rel_path))
+        else:
+            # spawn: workers never inherit the parent's SQLite handles or threads.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+                in_flight = set()
+                for abs_path, rel_path in jobs:
+                    if len(in_flight) >= self.queue_size:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for fut in done:
+                            _collect(fut.result())
+                    in_flight.add(pool.submit(_parse_file, self.sensor_cmd, str(abs_path), rel_path))
+                    stats["queued"] += 1
+                while in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        _collect(fut.result())
+        _write(flush=True)
+        stats["elapsed_sec"] = time.time() - stats.pop("started")
+        if stats["queued"]:
+            self._report(stats, final=True)
+        return stats
+
+    def _report(self, stats: Dict[str, Any], final: bool = False):
+        try:
+            self.progress(dict(stats, final=final))
+        except Exception:
+            pass
 
-        except Exception as e:
-            print(f"    [!] Failed to index {rel_path}: {str(e)}")
+    @staticmethod
+    def _print_progress(p: Dict[str, Any]):
+        if p.get("final"):
+            return
+        done = p["indexed"] + p["failed"]
+        elapsed = max(1e-6, time.time() - p.get("started", time.time()))
+        print(
+            f"    [*] indexed {done}/{p['queued']} queued files "
+            f"({done / elapsed:.1f} files/s, {p['workers']} workers)"
+        )
 
 
 if __name__ == "__main__":
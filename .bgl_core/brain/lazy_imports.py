@@ -0,0 +1,90 @@
+"""
+lazy_imports.py
+---------------
+Deferred module loading for heavy or optional dependencies (Playwright,
+YAML, NumPy, large brain modules).
+
+`lazy_import("yaml")` returns the real module if it is already loaded,
+otherwise a module object whose body executes on first attribute access.
+A missing dependency only raises (ModuleNotFoundError) when it is actually
+used, so API-only and report-only code paths start without it.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+import types
+from typing import Dict
+
+_MISSING: Dict[str, "MissingModule"] = {}
+
+
+class MissingModule(types.ModuleType):
+    """Placeholder for an uninstalled optional dependency."""
+
+    def __init__(self, name: str, error: BaseException):
+        super().__init__(name)
+        self.__dict__["_bgl_error"] = error
+
+    def __getattr__(self, attr: str):
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
+        raise ModuleNotFoundError(
+            f"optional dependency '{self.__name__}' is not installed "
+            f"(needed for '{attr}')"
+        ) from self.__dict__["_bgl_error"]
+
+    def __bool__(self) -> bool:
+        return False
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Return `name` as a lazily-executed module (importlib.util.LazyLoader).
+    Parent packages are imported eagerly (they are small for the modules we
+    defer); the target module body runs on first attribute access.
+    """
+    mod = sys.modules.get(name)
+    if mod is not None:
+        return mod
+    if name in _MISSING:
+        return _MISSING[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError) as exc:
+        spec = None
+        error: BaseException = exc
+    else:
+        error = ModuleNotFoundError(f"No module named '{name}'")
+    if spec is None or spec.loader is None:
+        missing = MissingModule(name, error)
+        _MISSING[name] = missing
+        return missing
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def is_available(name: str) -> bool:
+    """True when `name` can be imported (without importing it)."""
+    if name in _MISSING:
+        return False
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def is_loaded(name: str) -> bool:
+    """True when the module body has actually executed (not just a lazy stub)."""
+    mod = sys.modules.get(name)
+    if mod is None:
+        return False
+    return type(mod).__name__ != "_LazyModule"
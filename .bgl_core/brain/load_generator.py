@@ -0,0 +1,644 @@
+"""
+load_generator.py
+-----------------
+Open-loop HTTP load generator for the PHP app (replaces the threaded,
+closed-loop scripts/stress_test.py).
+
+Arrival times are computed up front from a target rate profile and every
+request is launched at its scheduled time whether or not earlier ones have
+finished, so a slow server cannot throttle the offered load. Latency is
+measured from the scheduled send time (correcting for coordinated omission);
+the service time from the actual send is recorded next to it.
+
+The route mix comes from the `routes` table of knowledge.db: GET routes,
+weighted by how often each appeared in runtime_events over the last week.
+Mutating methods are only sent in --shadow mode (X-Shadow-Mode header).
+
+Per-route latencies go into log-bucketed histograms (HDR-style, ~1% relative
+error) summarized as p50/p95/p99/p99.9. Each run writes
+.bgl_core/logs/load_test_report.json, `load_test_route` / `load_test_summary`
+runtime events, and `load:<METHOD> <uri>` records in benchmark_results.json
+whose p99 is gated against a baseline like the hotpath cases.
+
+Usage:
+    python .bgl_core/brain/load_generator.py --rps 50 --duration 60 --ramp 10
+    python .bgl_core/brain/load_generator.py --profile 0:5,30:80,90:80 --poisson
+    python .bgl_core/brain/load_generator.py --route /views/index.php=3 --route "POST /api/release.php" --shadow
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import os
+import random
+import sqlite3
+import ssl
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from .config_loader import load_config  # type: ignore
+    from .db_utils import pooled_connection  # type: ignore
+    from .hotpath_bench import evaluate, upsert_results  # type: ignore
+    from .schema_migrations import ensure_schema  # type: ignore
+except Exception:
+    from config_loader import load_config  # type: ignore
+    from db_utils import pooled_connection  # type: ignore
+    from hotpath_bench import evaluate, upsert_results  # type: ignore
+    from schema_migrations import ensure_schema  # type: ignore
+
+ROOT = Path(__file__).resolve().parents[2]
+DB_PATH = ROOT / ".bgl_core" / "brain" / "knowledge.db"
+REPORT_PATH = ROOT / ".bgl_core" / "logs" / "load_test_report.json"
+BENCHMARK_PATH = ROOT / ".bgl_core" / "logs" / "benchmark_results.json"
+
+SAFE_METHODS = ("GET", "HEAD")
+PERCENTILES = (("p50", 50.0), ("p95", 95.0), ("p99", 99.0), ("p999", 99.9))
+# Per-route p99 is too noisy to gate below this many samples.
+MIN_GATE_SAMPLES = 50
+
+
+# ---------------------------------------------------------------------------
+# Histogram
+# ---------------------------------------------------------------------------
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram: bucket i covers microsecond values around
+    (1 + precision) ** i, so any recorded value is reported within `precision`
+    relative error at constant memory per decade.
+    """
+
+    def __init__(self, precision: float = 0.01):
+        self.precision = float(precision)
+        self._log_base = math.log1p(self.precision)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0.0
+        self.min_us = math.inf
+        self.max_us = 0.0
+
+    def record(self, ms: float) -> None:
+        us = max(1.0, float(ms) * 1000.0)
+        idx = int(round(math.log(us) / self._log_base))
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+        self.count += 1
+        self.total_us += us
+        self.min_us = min(self.min_us, us)
+        self.max_us = max(self.max_us, us)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for idx, n in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + n
+        self.count += other.count
+        self.total_us += other.total_us
+        self.min_us = min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, pct: float) -> float:
+        """Value in ms at `pct` (0-100); 0.0 when empty."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(self.count * pct / 100.0)))
+        seen = 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= rank:
+                value = math.exp(idx * self._log_base)
+                return min(max(value, self.min_us), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def summary(self) -> Dict[str, float]:
+        out = {name: round(self.percentile(pct), 3) for name, pct in PERCENTILES}
+        out["min"] = round(self.min_us / 1000.0, 3) if self.count else 0.0
+        out["max"] = round(self.max_us / 1000.0, 3)
+        out["mean"] = round(self.total_us / self.count / 1000.0, 3) if self.count else 0.0
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "precision": self.precision,
+            "unit": "us",
+            "buckets": {str(idx): n for idx, n in sorted(self.buckets.items())},
+        }
+
+
+# ---------------------------------------------------------------------------
+# Schedule and route mix
+# ---------------------------------------------------------------------------
+
+
+def parse_profile(spec: str) -> List[Tuple[float, float]]:
+    """"t:rps,t:rps,..." breakpoints (seconds, requests/s); the rate is linear between them."""
+    points: List[Tuple[float, float]] = []
+    for part in str(spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        t, _, rps = part.partition(":")
+        points.append((float(t), float(rps)))
+    points.sort()
+    if len(points) < 2 or points[0][0] != 0.0:
+        raise ValueError(f"profile needs at least two breakpoints starting at t=0: {spec!r}")
+    if any(rps < 0 for _, rps in points):
+        raise ValueError("profile rates must be >= 0")
+    return points
+
+
+def build_profile(rps: float, duration: float, ramp: float = 0.0) -> List[Tuple[float, float]]:
+    """Linear ramp from 0 to `rps` over `ramp` seconds, then constant until `duration`."""
+    duration = max(0.001, float(duration))
+    ramp = min(max(0.0, float(ramp)), duration)
+    if ramp <= 0:
+        return [(0.0, float(rps)), (duration, float(rps))]
+    points = [(0.0, 0.0), (ramp, float(rps))]
+    if duration > ramp:
+        points.append((duration, float(rps)))
+    return points
+
+
+def rate_at(profile: Sequence[Tuple[float, float]], t: float) -> float:
+    for (t0, r0), (t1, r1) in zip(profile, profile[1:]):
+        if t0 <= t <= t1:
+            return r0 if t1 == t0 else r0 + (r1 - r0) * (t - t0) / (t1 - t0)
+    return 0.0
+
+
+def arrival_times(
+    profile: Sequence[Tuple[float, float]],
+    *,
+    poisson: bool = False,
+    seed: int = 0,
+    step: float = 0.001,
+) -> List[float]:
+    """
+    Send offsets (seconds) whose density follows the profile: evenly spaced by
+    default, exponential inter-arrivals (a Poisson process) with `poisson`.
+    """
+    rnd = random.Random(seed)
+    end = profile[-1][0]
+    out: List[float] = []
+    owed = 0.0
+    threshold = rnd.expovariate(1.0) if poisson else 1.0
+    for i in range(int(round(end / step))):
+        t = i * step
+        owed += rate_at(profile, t + step / 2.0) * step
+        # Tolerance keeps float drift from dropping the last arrival of a segment.
+        while owed >= threshold - 1e-9:
+            owed -= threshold
+            out.append(round(t, 6))
+            threshold = rnd.expovariate(1.0) if poisson else 1.0
+    return out
+
+
+def parse_route(spec: str) -> Tuple[str, str, float]:
+    """"[METHOD ]/uri[=weight]" -> (method, uri, weight); a query string needs an explicit weight."""
+    text = str(spec).strip()
+    weight = 1.0
+    head, sep, tail = text.rpartition("=")
+    # In "/x.php?id=1" the "=" belongs to the query; "/x.php?id=1=2" has a weight.
+    query = head.partition("?")[2] if "?" in head else None
+    if sep and (query is None or "=" in query):
+        try:
+            weight = float(tail)
+            text = head
+        except ValueError:
+            pass
+    method, uri = "GET", text.strip()
+    if " " in uri:
+        method, _, uri = uri.partition(" ")
+    return method.strip().upper(), uri.strip(), weight
+
+
+def _route_path(route: str) -> str:
+    """runtime_events.route may be a full URL or carry a query; reduce it to the path."""
+    path = urlsplit(str(route or "").strip().replace("\\", "/")).path or "/"
+    if not path.startswith("/"):
+        path = "/" + path
+    if path != "/" and path.endswith("/"):
+        path = path.rstrip("/")
+    return path
+
+
+def route_mix(db_path: Path, *, include_writes: bool = False, days: float = 7.0) -> List[Tuple[str, str, float]]:
+    """
+    (method, uri, weight) for indexed routes; weight is 1 + recent runtime_events
+    hits so the mix follows real traffic. Parameterized URIs are skipped.
+    """
+    if not Path(db_path).exists():
+        return []
+    since = time.time() - days * 86400.0
+    with pooled_connection(db_path) as conn:
+        try:
+            rows = conn.execute("SELECT DISTINCT uri, http_method FROM routes").fetchall()
+        except sqlite3.Error:
+            return []
+        hits: Dict[str, int] = {}
+        try:
+            for route, count in conn.execute(
+                "SELECT route, COUNT(*) FROM runtime_events WHERE timestamp >= ? AND route IS NOT NULL GROUP BY route",
+                (since,),
+            ).fetchall():
+                path = _route_path(route)
+                hits[path] = hits.get(path, 0) + int(count or 0)
+        except sqlite3.Error:
+            hits = {}
+    mix: Dict[Tuple[str, str], float] = {}
+    for uri, method in rows:
+        uri = str(uri or "")
+        if not uri.startswith("/") or "{" in uri:
+            continue
+        method = str(method or "GET").upper()
+        methods = ["GET", "POST"] if method == "ANY" else [method]
+        for m in methods:
+            if m not in SAFE_METHODS and not include_writes:
+                continue
+            mix[(m, uri)] = 1.0 + float(hits.get(_route_path(uri), 0))
+    return [(m, uri, w) for (m, uri), w in sorted(mix.items())]
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+
+async def _http_request(
+    scheme: str,
+    host: str,
+    port: int,
+    method: str,
+    path: str,
+    headers: Dict[str, str],
+    body: bytes,
+    ssl_ctx: Optional[ssl.SSLContext],
+) -> int:
+    """One HTTP/1.1 request on a fresh connection; returns the status after reading the full body."""
+    reader, writer = await asyncio.open_connection(host, port, ssl=ssl_ctx if scheme == "https" else None)
+    try:
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host}:{port}", "Connection: close", "User-Agent: bgl-load/1"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        if body or method not in SAFE_METHODS:
+            lines.append(f"Content-Length: {len(body)}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        parts = status_line.split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith(b"HTTP/"):
+            raise ConnectionError(f"bad status line: {status_line[:80]!r}")
+        status = int(parts[1])
+        while await reader.read(65536):
+            pass
+        return status
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+
+class _RouteStats:
+    def __init__(self, method: str, uri: str, weight: float):
+        self.method = method
+        self.uri = uri
+        self.weight = weight
+        self.latency = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self.errors = 0
+        self.status_counts: Dict[str, int] = {}
+
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.uri}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "uri": self.uri,
+            "weight": self.weight,
+            "count": self.latency.count,
+            "errors": self.errors,
+            "status_counts": dict(sorted(self.status_counts.items())),
+            "latency_ms": self.latency.summary(),
+            "service_ms": self.service.summary(),
+            "histogram": self.latency.to_dict(),
+        }
+
+
+async def run_load(
+    base_url: str,
+    routes: Sequence[Tuple[str, str, float]],
+    profile: Sequence[Tuple[float, float]],
+    *,
+    poisson: bool = False,
+    seed: int = 0,
+    timeout: float = 10.0,
+    max_inflight: int = 256,
+    shadow: bool = False,
+) -> Dict[str, Any]:
+    """Drive the schedule against `base_url` and return the report dict (nothing is written)."""
+    if not routes:
+        raise ValueError("empty route mix")
+    parts = urlsplit(base_url)
+    scheme = parts.scheme or "http"
+    host = parts.hostname or "localhost"
+    port = parts.port or (443 if scheme == "https" else 80)
+    prefix = (parts.path or "").rstrip("/")
+    ssl_ctx = ssl.create_default_context() if scheme == "https" else None
+
+    stats = [_RouteStats(m, u, w) for m, u, w in routes]
+    cumulative: List[float] = []
+    acc = 0.0
+    for s in stats:
+        acc += max(0.0, s.weight)
+        cumulative.append(acc)
+    rnd = random.Random(seed)
+    schedule = arrival_times(profile, poisson=poisson, seed=seed)
+    headers_read = {"Accept": "*/*"}
+    headers_write = {"Accept": "*/*", "Content-Type": "application/json"}
+    if shadow:
+        headers_read["X-Shadow-Mode"] = "true"
+        headers_write["X-Shadow-Mode"] = "true"
+
+    gate = asyncio.Semaphore(max(1, int(max_inflight)))
+    loop = asyncio.get_running_loop()
+    inflight = 0
+    peak_inflight = 0
+    late_sends = 0
+
+    async def fire(route: _RouteStats, scheduled: float) -> None:
+        nonlocal inflight, peak_inflight
+        async with gate:
+            sent = loop.time()
+            inflight += 1
+            peak_inflight = max(peak_inflight, inflight)
+            write = route.method not in SAFE_METHODS
+            try:
+                status = await asyncio.wait_for(
+                    _http_request(
+                        scheme,
+                        host,
+                        port,
+                        route.method,
+                        prefix + route.uri,
+                        headers_write if write else headers_read,
+                        b"{}" if write else b"",
+                        ssl_ctx,
+                    ),
+                    timeout=timeout,
+                )
+                label = str(status)
+                failed = status >= 500
+            except asyncio.TimeoutError:
+                label, failed = "timeout", True
+            except Exception as exc:
+                label, failed = type(exc).__name__, True
+            finally:
+                inflight -= 1
+        done = loop.time()
+        route.latency.record((done - scheduled) * 1000.0)
+        route.service.record((done - sent) * 1000.0)
+        route.status_counts[label] = route.status_counts.get(label, 0) + 1
+        if failed:
+            route.errors += 1
+
+    started_at = time.time()
+    t0 = loop.time()
+    tasks: List[asyncio.Task] = []
+    for offset in schedule:
+        due = t0 + offset
+        delay = due - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif delay < -0.01:
+            late_sends += 1
+        pick = bisect.bisect_right(cumulative, rnd.random() * acc) if acc > 0 else 0
+        route = stats[min(pick, len(stats) - 1)]
+        tasks.append(asyncio.create_task(fire(route, due)))
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    wall = max(loop.time() - t0, 1e-9)
+
+    overall = LatencyHistogram()
+    service = LatencyHistogram()
+    for s in stats:
+        overall.merge(s.latency)
+        service.merge(s.service)
+    requests = overall.count
+    errors = sum(s.errors for s in stats)
+    duration = profile[-1][0]
+    return {
+        "base_url": base_url,
+        "started_at": started_at,
+        "profile": [list(p) for p in profile],
+        "poisson": poisson,
+        "shadow": shadow,
+        "scheduled": len(schedule),
+        "requests": requests,
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "offered_rps": round(len(schedule) / duration, 3) if duration else 0.0,
+        "achieved_rps": round(requests / wall, 3),
+        "wall_sec": round(wall, 3),
+        "peak_inflight": peak_inflight,
+        "late_sends": late_sends,
+        "overall": {"latency_ms": overall.summary(), "service_ms": service.summary()},
+        "routes": {s.key: s.to_dict() for s in stats if s.latency.count},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
+def log_report_events(db_path: Path, run_id: str, report: Dict[str, Any]) -> int:
+    """One `load_test_route` event per route plus a `load_test_summary`; best-effort."""
+    if not Path(db_path).exists() or not ensure_schema(db_path):
+        return 0
+    now = time.time()
+    rows = []
+    for route in report.get("routes", {}).values():
+        latency = route.get("latency_ms") or {}
+        payload = {k: route[k] for k in ("count", "errors", "status_counts", "latency_ms", "service_ms")}
+        rows.append(
+            (now, run_id, "load_generator", "load_test_route", route["uri"], route["method"],
+             json.dumps(payload, ensure_ascii=False), latency.get("p99"), None)
+        )
+    summary = {k: v for k, v in report.items() if k != "routes"}
+    rows.append(
+        (now, run_id, "load_generator", "load_test_summary", None, None,
+         json.dumps(summary, ensure_ascii=False), (report.get("overall") or {}).get("latency_ms", {}).get("p99"),
+         f"{report.get('errors')} errors" if report.get("errors") else None)
+    )
+    try:
+        with pooled_connection(db_path, write=True) as conn:
+            conn.executemany(
+                """
+                INSERT INTO runtime_events (timestamp, run_id, source, event_type, route, method, payload, latency_ms, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+    except Exception:
+        return 0
+    return len(rows)
+
+
+def _gate_settings(cfg: Dict[str, Any]) -> Tuple[float, float]:
+    try:
+        pct = float(cfg.get("load_test_regression_pct", 30) or 30)
+    except (TypeError, ValueError):
+        pct = 30.0
+    try:
+        floor = float(cfg.get("load_test_min_delta_ms", 5) or 0)
+    except (TypeError, ValueError):
+        floor = 5.0
+    return pct, floor
+
+
+def benchmark_records(
+    report: Dict[str, Any],
+    existing: List[Dict[str, Any]],
+    *,
+    max_regression_pct: float,
+    min_delta_ms: float,
+    update_baseline: bool = False,
+) -> List[Dict[str, Any]]:
+    """`load:*` records comparing each p99 against the baseline in `existing`."""
+    prev = {r.get("case"): r for r in existing if isinstance(r, dict)}
+    entries = [("load:all", report.get("requests", 0), report.get("errors", 0), report["overall"]["latency_ms"])]
+    for key, route in report.get("routes", {}).items():
+        entries.append((f"load:{key}", route["count"], route["errors"], route["latency_ms"]))
+    records = []
+    for case, count, errors, latency in entries:
+        baseline = None if update_baseline else (prev.get(case) or {}).get("baseline_p99_ms")
+        if case != "load:all" and count < MIN_GATE_SAMPLES:
+            status, change = "LOW_SAMPLES", 0.0
+        else:
+            status, change = evaluate(latency["p99"], baseline, max_regression_pct=max_regression_pct, min_delta_ms=min_delta_ms)
+        records.append(
+            {
+                "case": case,
+                "status": status,
+                "latency_sec": round(latency["p99"] / 1000.0, 6),
+                "count": count,
+                "errors": errors,
+                **{f"{name}_ms": latency[name] for name, _ in PERCENTILES},
+                "baseline_p99_ms": latency["p99"] if status == "BASELINE" else baseline,
+                "change_pct": change,
+                "max_regression_pct": max_regression_pct,
+                "offered_rps": report.get("offered_rps"),
+                "message": "",
+            }
+        )
+    return records
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    cfg = dict(load_config(ROOT) or {})
+    ap = argparse.ArgumentParser(description="Open-loop HTTP load test against the PHP app.")
+    ap.add_argument("--base-url", default=str(cfg.get("base_url") or "http://localhost:8000"))
+    ap.add_argument("--rps", type=float, default=float(cfg.get("load_test_rps", 20) or 20))
+    ap.add_argument("--duration", type=float, default=float(cfg.get("load_test_duration_sec", 30) or 30))
+    ap.add_argument("--ramp", type=float, default=float(cfg.get("load_test_ramp_sec", 5) or 0), help="Seconds to ramp from 0 to --rps.")
+    ap.add_argument("--profile", help="Rate breakpoints 't:rps,...' (overrides --rps/--duration/--ramp).")
+    ap.add_argument("--poisson", action="store_true", help="Exponential inter-arrival times instead of even spacing.")
+    ap.add_argument("--route", action="append", default=[], help="'[METHOD ]/uri[=weight]' (repeatable; default: routes table).")
+    ap.add_argument("--shadow", action="store_true", help="Send X-Shadow-Mode and include mutating routes.")
+    ap.add_argument("--timeout", type=float, default=float(cfg.get("load_test_timeout_sec", 10) or 10))
+    ap.add_argument("--max-inflight", type=int, default=int(cfg.get("load_test_max_inflight", 256) or 256))
+    ap.add_argument("--max-error-rate", type=float, default=0.0, help="Fail when the error rate exceeds this fraction.")
+    ap.add_argument("--max-regression", type=float, default=None, help="Allowed p99 regression in percent.")
+    ap.add_argument("--update-baseline", action="store_true")
+    ap.add_argument("--no-write", action="store_true", help="Print only; no report, events or benchmark records.")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--db", default=str(DB_PATH))
+    args = ap.parse_args(argv)
+
+    profile = parse_profile(args.profile) if args.profile else build_profile(args.rps, args.duration, args.ramp)
+    if args.route:
+        routes = [parse_route(r) for r in args.route]
+        if not args.shadow:
+            routes = [r for r in routes if r[0] in SAFE_METHODS]
+    else:
+        routes = route_mix(Path(args.db), include_writes=args.shadow)
+    if not routes:
+        routes = [("GET", "/", 1.0)]
+
+    run_id = os.getenv("BGL_DIAGNOSTIC_RUN_ID") or f"load_{int(time.time())}"
+    print(f"--- Open-loop load test {run_id}: {len(routes)} routes, profile {profile} ---")
+    report = asyncio.run(
+        run_load(
+            args.base_url,
+            routes,
+            profile,
+            poisson=args.poisson,
+            seed=args.seed,
+            timeout=args.timeout,
+            max_inflight=args.max_inflight,
+            shadow=args.shadow,
+        )
+    )
+    report["run_id"] = run_id
+
+    pct, floor = _gate_settings(cfg)
+    if args.max_regression is not None:
+        pct = float(args.max_regression)
+    try:
+        existing = json.loads(BENCHMARK_PATH.read_text(encoding="utf-8")) if BENCHMARK_PATH.exists() else []
+    except Exception:
+        existing = []
+    records = benchmark_records(
+        report,
+        existing if isinstance(existing, list) else [],
+        max_regression_pct=pct,
+        min_delta_ms=floor,
+        update_baseline=args.update_baseline,
+    )
+    report["benchmark"] = records
+    if not args.no_write:
+        REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = REPORT_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(REPORT_PATH)
+        log_report_events(Path(args.db), run_id, report)
+        upsert_results(BENCHMARK_PATH, records)
+
+    overall = report["overall"]["latency_ms"]
+    print(
+        f"requests={report['requests']} errors={report['errors']} offered={report['offered_rps']}rps "
+        f"achieved={report['achieved_rps']}rps peak_inflight={report['peak_inflight']}"
+    )
+    print(f"{'route':<48} {'n':>6} {'err':>4} {'p50':>9} {'p95':>9} {'p99':>9} {'p99.9':>9}")
+    for key, route in sorted(report["routes"].items(), key=lambda kv: -kv[1]["latency_ms"]["p99"]):
+        lat = route["latency_ms"]
+        print(
+            f"{key[:48]:<48} {route['count']:>6} {route['errors']:>4} {lat['p50']:>9.1f} {lat['p95']:>9.1f} "
+            f"{lat['p99']:>9.1f} {lat['p999']:>9.1f}"
+        )
+    print(f"{'overall':<48} {report['requests']:>6} {report['errors']:>4} {overall['p50']:>9.1f} "
+          f"{overall['p95']:>9.1f} {overall['p99']:>9.1f} {overall['p999']:>9.1f}")
+
+    failed = False
+    if report["error_rate"] > args.max_error_rate:
+        print(f"❌ error rate {report['error_rate']:.2%} exceeds {args.max_error_rate:.2%}")
+        failed = True
+    for rec in records:
+        if rec["status"] == "REGRESSION":
+            print(f"❌ {rec['case']}: p99 {rec['p99_ms']:.1f}ms vs baseline {rec['baseline_p99_ms']:.1f}ms ({rec['change_pct']:+.1f}%)")
+            failed = True
+    if not failed:
+        print("✅ Load test within limits.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,6 +5,14 @@ import time
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
+try:
+    from .db_utils import checkpoint_now  # type: ignore
+except Exception:
+    try:
+        from db_utils import checkpoint_now  # type: ignore
+    except Exception:
+        checkpoint_now = None  # type: ignore
+
 
 def _as_bool(value: Any, default: bool = False) -> bool:
     if value is None:
@@ -93,6 +101,7 @@ def run_cleanup(
     now = time.time()
     deleted: List[str] = []
     skipped: List[str] = []
+    checkpointed: List[str] = []
     for kind, path in candidates:
         try:
             if not path.exists():
@@ -101,6 +110,18 @@ def run_cleanup(
             if not (_within(path, core_dir) or _within(path, root_dir / "storage")):
                 skipped.append(f"{kind}:{path} (outside roots)")
                 continue
+            if kind == "db_temp":
+                owner = path.with_name(path.name[: -len("-wal")])  # strip -wal / -shm
+                if owner.exists():
+                    # Live database: unlinking -wal would drop committed frames.
+                    # Fold the WAL back into the main file instead.
+                    if path.name.endswith("-wal") and checkpoint_now is not None and not dry_run:
+                        res = checkpoint_now(owner, "TRUNCATE")
+                        checkpointed.append(
+                            f"{owner.name}: {res.get('wal_before', 0)}->{res.get('wal_after', 0)} bytes"
+                            + (" (busy)" if res.get("busy") or res.get("error") else "")
+                        )
+                    continue
             if dry_run:
                 deleted.append(f"{kind}:{path}")
                 continue
@@ -119,10 +140,12 @@ def run_cleanup(
 
     report["deleted"] = deleted
     report["skipped"] = skipped
+    report["checkpointed"] = checkpointed
     report["counts"] = {
         "candidates": len(candidates),
         "deleted": len(deleted),
         "skipped": len(skipped),
+        "checkpointed": len(checkpointed),
     }
     try:
         log_path = core_dir / "logs" / "cleanup_report.json"
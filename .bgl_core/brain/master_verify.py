@@ -10,6 +10,7 @@ import sqlite3
 import time
 import ctypes
 import socket
+from contextlib import contextmanager
 from typing import Any, Dict, List
 
 # Runtime globals for report finalization (used by exit fallback).
@@ -183,6 +184,7 @@ from auto_insights import audit_auto_insights, write_auto_insights_status  # noq
 from schema_check import check_schema  # noqa: E402
 from run_ledger import start_run, finish_run  # noqa: E402
 from run_lock import acquire_lock, release_lock, describe_lock, refresh_lock  # noqa: E402
+import tracing  # noqa: E402
 try:
     from priority_loop import run_priority_loop  # noqa: E402
 except Exception:
@@ -458,6 +460,35 @@ def _run_post_finalize(root: Path, cfg: Dict[str, Any], run_id: str | None = Non
         except Exception:
             pass
 
+    if _cfg_bool(cfg.get("runtime_events_archive_enabled", 0)):
+        try:
+            from .runtime_partitions import archive_runtime_events  # type: ignore
+        except Exception:
+            try:
+                from runtime_partitions import archive_runtime_events  # type: ignore
+            except Exception:
+                archive_runtime_events = None  # type: ignore
+        if archive_runtime_events:
+            try:
+                payload = archive_runtime_events(
+                    root / ".bgl_core" / "brain" / "knowledge.db",
+                    hot_days=float(cfg.get("runtime_events_hot_days", 30) or 30),
+                    batch_size=int(cfg.get("runtime_events_archive_batch", 5000) or 5000),
+                )
+                if payload.get("archived") or payload.get("error"):
+                    _log_runtime_event(
+                        root,
+                        {
+                            "timestamp": time.time(),
+                            "run_id": rid,
+                            "event_type": "runtime_events_archived",
+                            "source": "master_verify",
+                            "payload": payload,
+                        },
+                    )
+            except Exception:
+                pass
+
 
 def _read_lock_status(lock_path: Path) -> dict:
     try:
@@ -1777,6 +1808,56 @@ def _apply_profile_env(profile: str, cfg: dict) -> dict:
     return overrides
 
 
+def prepare_run_environment(root_path: Path) -> Dict[str, Any]:
+    """
+    Apply profile/env defaults for a diagnostic run and return the loaded config.
+    Shared by the CLI entry point and the warm diagnostic daemon worker.
+    """
+    cfg = load_config(root_path)
+    diag_profile_env = str(os.getenv("BGL_DIAGNOSTIC_PROFILE", "")).strip().lower()
+    fast_cfg = str(cfg.get("fast_verify", "0")).strip().lower() in ("1", "true", "yes", "on")
+    if os.getenv("BGL_FAST_VERIFY", "0") == "1" or fast_cfg or diag_profile_env == "fast":
+        os.environ["BGL_RUN_SCENARIOS"] = "0"
+        os.environ["BGL_AUTO_CONTEXT_DIGEST"] = "0"
+        os.environ["BGL_AUTO_APPLY"] = "0"
+        os.environ["BGL_AUTO_PLAN"] = "0"
+        os.environ["BGL_AUTO_VERIFY"] = "0"
+        os.environ["BGL_AUTO_PATCH_ON_ERRORS"] = "0"
+        os.environ["BGL_SKIP_DREAM"] = "1"
+        os.environ["BGL_MAX_AUTO_INSIGHTS"] = "0"
+    elif diag_profile_env == "full":
+        # Avoid env leakage from previous fast runs in persistent shells.
+        respect_env = str(os.getenv("BGL_RESPECT_RUN_SCENARIOS_ENV", "0")).strip().lower() in (
+            "1",
+            "true",
+            "yes",
+            "on",
+        )
+        if not respect_env:
+            os.environ["BGL_RUN_SCENARIOS"] = str(cfg.get("run_scenarios", 1))
+            os.environ["BGL_AUTO_RUN_GAP_SCENARIOS"] = str(
+                cfg.get("auto_run_gap_scenarios", 1)
+            )
+    os.environ.setdefault(
+        "BGL_HEADLESS", os.environ.get("BGL_HEADLESS", str(cfg.get("headless", 1)))
+    )
+    os.environ.setdefault(
+        "BGL_RUN_SCENARIOS",
+        os.environ.get("BGL_RUN_SCENARIOS", str(cfg.get("run_scenarios", 1))),
+    )
+    os.environ.setdefault(
+        "BGL_BASE_URL",
+        os.environ.get(
+            "BGL_BASE_URL", cfg.get("base_url", "http://localhost:8000")
+        ),
+    )
+    os.environ.setdefault(
+        "BGL_KEEP_BROWSER",
+        os.environ.get("BGL_KEEP_BROWSER", str(cfg.get("keep_browser", 0))),
+    )
+    return cfg
+
+
 async def master_assurance_diagnostic():
     """
     Main entry point for Master Technical Assurance.
@@ -1893,6 +1974,16 @@ async def master_assurance_diagnostic():
     except Exception:
         lock_heartbeat_stop = None
 
+    # Long audits keep knowledge.db-wal bounded via periodic checkpoints.
+    try:
+        try:
+            from .db_utils import start_checkpoint_scheduler  # type: ignore
+        except Exception:
+            from db_utils import start_checkpoint_scheduler  # type: ignore
+        start_checkpoint_scheduler(ROOT / ".bgl_core" / "brain" / "knowledge.db", cfg)
+    except Exception:
+        pass
+
     try:
         _write_status(
             status_path,
@@ -2194,6 +2285,7 @@ async def master_assurance_diagnostic():
     _STATUS_PATH = status_path
     _LAST_REPORT_SNAPSHOT = last_report if isinstance(last_report, dict) else {}
     _CFG_SNAPSHOT = cfg
+    tracing.set_run(run_id)
     try:
         atexit.register(_exit_report_fallback)
     except Exception:
@@ -2234,11 +2326,18 @@ async def master_assurance_diagnostic():
     except Exception:
         pass
 
+    phase_spans: dict = {}
+
     def _phase_start(name: str, extra: dict | None = None) -> float:
         ts = time.time()
         payload = {"phase": name}
         if extra:
             payload.update(extra)
+        phase_span = tracing.start_span(f"master_verify.{name}").set(**(extra or {}))
+        phase_spans[name] = phase_span
+        if phase_span.span_id:
+            # Subprocesses launched during the phase parent their spans on it.
+            os.environ["BGL_TRACE_PARENT"] = phase_span.span_id
         _log_runtime_event(
             ROOT,
             {
@@ -2260,6 +2359,11 @@ async def master_assurance_diagnostic():
         if extra:
             payload.update(extra)
         phase_timings.append(payload)
+        phase_span = phase_spans.pop(name, None)
+        if phase_span is not None:
+            phase_span.set(**{k: v for k, v in payload.items() if k not in ("phase", "duration_s", "status")})
+            phase_span.end(status)
+            os.environ.pop("BGL_TRACE_PARENT", None)
         _log_runtime_event(
             ROOT,
             {
@@ -2270,14 +2374,34 @@ async def master_assurance_diagnostic():
                 "payload": payload,
             },
         )
+
+    @contextmanager
+    def _phase(name: str, timeout_reason: str = ""):
+        """
+        Bracket a phase so its span and BGL_TRACE_PARENT are released even when
+        the phase raises. Callers may put end-of-phase attributes in the yielded
+        dict under "extra".
+        """
+        outcome: dict = {}
+        start_ts = _phase_start(name)
+        try:
+            yield outcome
+        except asyncio.TimeoutError:
+            reason = timeout_reason or f"{name}_timeout"
+            _phase_end(name, start_ts, status="timeout", reason=reason, extra=outcome.get("extra"))
+            raise
+        except BaseException as exc:
+            _phase_end(name, start_ts, status="error", reason=type(exc).__name__, extra=outcome.get("extra"))
+            raise
+        _phase_end(name, start_ts, extra=outcome.get("extra"))
+
     try:
         start_run(ROOT / ".bgl_core" / "brain" / "knowledge.db", run_id=run_id, mode="master_verify")
     except Exception:
         pass
     try:
-        phase_ts = _phase_start("full_diagnostic")
-        diagnostic = await asyncio.wait_for(core.run_full_diagnostic(), timeout=timeout)
-        _phase_end("full_diagnostic", phase_ts)
+        with _phase("full_diagnostic", timeout_reason="diagnostic_timeout"):
+            diagnostic = await asyncio.wait_for(core.run_full_diagnostic(), timeout=timeout)
         try:
             diagnostic["diagnostic_profile"] = profile
             diagnostic["diagnostic_profile_reason"] = profile_reason
@@ -2290,10 +2414,6 @@ async def master_assurance_diagnostic():
     except asyncio.TimeoutError:
         print(f"[CRITICAL] Diagnostic timed out after {timeout}s.")
         timeout_report = None
-        try:
-            _phase_end("full_diagnostic", phase_ts, status="timeout", reason="diagnostic_timeout")
-        except Exception:
-            pass
         try:
             _write_status(
                 status_path,
@@ -2426,29 +2546,45 @@ async def master_assurance_diagnostic():
     else:
         # Build callgraph for reporting/reference
         callgraph_timeout = _scaled_timeout(cfg.get("callgraph_timeout_sec", 60) or 60, floor=15)
-        _cg_start = _phase_start("callgraph_builder")
-        diagnostic["findings"]["callgraph_meta"] = _run_with_timeout(
-            "callgraph_builder", lambda: build_callgraph(ROOT), callgraph_timeout, {}
-        )
-        _phase_end("callgraph_builder", _cg_start)
+        with _phase("callgraph_builder"):
+            diagnostic["findings"]["callgraph_meta"] = _run_with_timeout(
+                "callgraph_builder", lambda: build_callgraph(ROOT), callgraph_timeout, {}
+            )
 
         # Generate OpenAPI (merged) for contract tests and reference
         openapi_timeout = _scaled_timeout(cfg.get("openapi_timeout_sec", 60) or 60, floor=15)
-        _oa_start = _phase_start("openapi_generate")
-        openapi_path = _run_with_timeout(
-            "openapi_generate", lambda: generate_openapi(ROOT), openapi_timeout, None
-        )
-        _phase_end("openapi_generate", _oa_start)
+        openapi_stats: dict = {}
+        with _phase("openapi_generate") as _oa_phase:
+            openapi_path = _run_with_timeout(
+                "openapi_generate",
+                lambda: generate_openapi(ROOT, stats=openapi_stats),
+                openapi_timeout,
+                None,
+            )
+            _oa_phase["extra"] = dict(openapi_stats)
         diagnostic["openapi_path"] = str(openapi_path) if openapi_path else ""
 
         # Optional: run API contract/property tests (Schemathesis/Dredd) if enabled
         if cfg.get("run_api_contract", 0):
             contract_timeout = _scaled_timeout(cfg.get("contract_timeout_sec", 120) or 120, floor=30)
-            _ct_start = _phase_start("contract_suite")
-            contract_results = _run_with_timeout(
-                "contract_suite", lambda: run_contract_suite(ROOT), contract_timeout, []
-            )
-            _phase_end("contract_suite", _ct_start)
+            with _phase("contract_suite") as _ct_phase:
+                # Shards get the phase budget as their own timeout; the slack lets
+                # finished shards report even when one of them runs out of time.
+                contract_results = _run_with_timeout(
+                    "contract_suite",
+                    lambda: run_contract_suite(ROOT, timeout=contract_timeout),
+                    contract_timeout + 30,
+                    [],
+                )
+                _ct_meta = next(
+                    (r for r in contract_results if isinstance(r, dict) and r.get("id") == "GAP_CONTRACT_OPENAPI"),
+                    {},
+                )
+                _ct_phase["extra"] = {
+                    k: _ct_meta[k]
+                    for k in ("operations_total", "operations_run", "operations_skipped")
+                    if k in _ct_meta
+                }
             diagnostic.setdefault("gap_tests", []).extend(contract_results)
             diagnostic.setdefault("findings", {}).setdefault("gap_tests", []).extend(contract_results)
 
@@ -2475,13 +2611,14 @@ async def master_assurance_diagnostic():
     try:
         db_path = ROOT / ".bgl_core" / "brain" / "knowledge.db"
         if db_path.exists():
+            try:
+                from .runtime_partitions import hot_meta  # type: ignore
+            except Exception:
+                from runtime_partitions import hot_meta  # type: ignore
             conn = sqlite3.connect(str(db_path), timeout=30.0)
             conn.execute("PRAGMA journal_mode=WAL;")
-            cur = conn.cursor()
-            cur.execute("SELECT COUNT(*) FROM runtime_events")
-            runtime_meta["count"] = int(cur.fetchone()[0] or 0)
-            cur.execute("SELECT MAX(timestamp) FROM runtime_events")
-            runtime_meta["last_timestamp"] = cur.fetchone()[0]
+            # Hot partition only; archived history is reported from the archive index.
+            runtime_meta.update(hot_meta(conn))
             conn.close()
     except Exception:
         pass
@@ -2509,16 +2646,15 @@ async def master_assurance_diagnostic():
                 _update_status_stage(status_path, "auto_insights", run_id=run_id)
             except Exception:
                 pass
-            _ai_start = _phase_start("auto_insights")
-            auto_insights_status = _run_with_timeout(
-                "auto_insights",
-                lambda: audit_auto_insights(
-                    ROOT, allow_legacy=allow_legacy, max_insights=max_insights
-                ),
-                insights_timeout,
-                {},
-            )
-            _phase_end("auto_insights", _ai_start)
+            with _phase("auto_insights"):
+                auto_insights_status = _run_with_timeout(
+                    "auto_insights",
+                    lambda: audit_auto_insights(
+                        ROOT, allow_legacy=allow_legacy, max_insights=max_insights
+                    ),
+                    insights_timeout,
+                    {},
+                )
             diagnostic["findings"]["auto_insights_status"] = auto_insights_status
             write_auto_insights_status(ROOT, auto_insights_status)
             try:
@@ -2947,9 +3083,8 @@ async def master_assurance_diagnostic():
                 pass
         else:
             try:
-                _br_start = _phase_start("build_report")
-                build_report(data, template, output)
-                _phase_end("build_report", _br_start)
+                with _phase("build_report"):
+                    build_report(data, template, output)
             except Exception:
                 pass
             try:
@@ -3044,6 +3179,7 @@ async def master_assurance_diagnostic():
 
     # Log completion for dashboard
     log_activity(ROOT, "master_verify_complete", {"run_id": run_id})
+    tracing.flush()
 
 
 if __name__ == "__main__":
@@ -3076,48 +3212,7 @@ if __name__ == "__main__":
 
         # Allow overriding headless and scenario run via env for visibility/CI
         ROOT = Path(__file__).parent.parent.parent
-        cfg = load_config(ROOT)
-        diag_profile_env = str(os.getenv("BGL_DIAGNOSTIC_PROFILE", "")).strip().lower()
-        fast_cfg = str(cfg.get("fast_verify", "0")).strip().lower() in ("1", "true", "yes", "on")
-        if os.getenv("BGL_FAST_VERIFY", "0") == "1" or fast_cfg or diag_profile_env == "fast":
-            os.environ["BGL_RUN_SCENARIOS"] = "0"
-            os.environ["BGL_AUTO_CONTEXT_DIGEST"] = "0"
-            os.environ["BGL_AUTO_APPLY"] = "0"
-            os.environ["BGL_AUTO_PLAN"] = "0"
-            os.environ["BGL_AUTO_VERIFY"] = "0"
-            os.environ["BGL_AUTO_PATCH_ON_ERRORS"] = "0"
-            os.environ["BGL_SKIP_DREAM"] = "1"
-            os.environ["BGL_MAX_AUTO_INSIGHTS"] = "0"
-        elif diag_profile_env == "full":
-            # Avoid env leakage from previous fast runs in persistent shells.
-            respect_env = str(os.getenv("BGL_RESPECT_RUN_SCENARIOS_ENV", "0")).strip().lower() in (
-                "1",
-                "true",
-                "yes",
-                "on",
-            )
-            if not respect_env:
-                os.environ["BGL_RUN_SCENARIOS"] = str(cfg.get("run_scenarios", 1))
-                os.environ["BGL_AUTO_RUN_GAP_SCENARIOS"] = str(
-                    cfg.get("auto_run_gap_scenarios", 1)
-                )
-        os.environ.setdefault(
-            "BGL_HEADLESS", os.environ.get("BGL_HEADLESS", str(cfg.get("headless", 1)))
-        )
-        os.environ.setdefault(
-            "BGL_RUN_SCENARIOS",
-            os.environ.get("BGL_RUN_SCENARIOS", str(cfg.get("run_scenarios", 1))),
-        )
-        os.environ.setdefault(
-            "BGL_BASE_URL",
-            os.environ.get(
-                "BGL_BASE_URL", cfg.get("base_url", "http://localhost:8000")
-            ),
-        )
-        os.environ.setdefault(
-            "BGL_KEEP_BROWSER",
-            os.environ.get("BGL_KEEP_BROWSER", str(cfg.get("keep_browser", 0))),
-        )
+        cfg = prepare_run_environment(ROOT)
         log_run_audit(ROOT)
 
         async def _run_with_cleanup():
@@ -3,6 +3,11 @@ import os
 from pathlib import Path
 from typing import Dict, Any, List
 
+try:
+    from .schema_migrations import ensure_schema  # type: ignore
+except Exception:
+    from schema_migrations import ensure_schema  # type: ignore
+
 
 class StructureMemory:
     def __init__(self, db_path: Path):
@@ -23,6 +28,10 @@ class StructureMemory:
         return conn
 
     def _init_schema_once(self):
+        # The migration registry owns the canonical schema; the inline DDL below
+        # only runs when it cannot (e.g. read-only or foreign databases).
+        if ensure_schema(self.db_path):
+            return
         conn = self._connect()
         cursor = conn.cursor()
 
@@ -227,7 +236,56 @@ class StructureMemory:
     def store_nested_symbols(self, file_id: int, symbols: List[Dict[str, Any]]):
         conn = self._connect()
         cursor = conn.cursor()
+        self._insert_symbols(cursor, file_id, symbols)
+        conn.commit()
+        conn.close()
+
+    def file_mtimes(self) -> Dict[str, float]:
+        """All indexed paths -> last_modified, in one query (for bulk staleness checks)."""
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT path, last_modified FROM files").fetchall()
+        finally:
+            conn.close()
+        return {r["path"]: float(r["last_modified"] or 0) for r in rows}
 
+    def store_file_batch(self, batch: List[Dict[str, Any]]) -> int:
+        """
+        Register, clear and re-populate several parsed files in one transaction.
+        Each item: {"path", "mtime", "symbols"}. Returns the number stored.
+        """
+        if not batch:
+            return 0
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            for item in batch:
+                mtime = item["mtime"]
+                cursor.execute(
+                    """
+                    INSERT INTO files (path, last_modified)
+                    VALUES (?, ?)
+                    ON CONFLICT(path) DO UPDATE SET last_modified=?
+                """,
+                    (item["path"], mtime, mtime),
+                )
+                row = cursor.execute(
+                    "SELECT id FROM files WHERE path=?", (item["path"],)
+                ).fetchone()
+                file_id = row["id"]
+                cursor.execute("DELETE FROM entities WHERE file_id=?", (file_id,))
+                self._insert_symbols(cursor, file_id, item.get("symbols") or [])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return len(batch)
+
+    def _insert_symbols(
+        self, cursor: sqlite3.Cursor, file_id: int, symbols: List[Dict[str, Any]]
+    ):
         for item in symbols:
             if item["type"] in ["class", "root"]:
                 entity_name = item.get("name", "global")
@@ -282,9 +340,6 @@ class StructureMemory:
                         method_id = int(cursor.lastrowid)
                         self._store_calls(cursor, method_id, item.get("calls", []))
 
-        conn.commit()
-        conn.close()
-
     def _store_calls(
         self, cursor: sqlite3.Cursor, method_id: int, calls: List[Dict[str, Any]]
     ):
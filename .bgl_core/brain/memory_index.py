@@ -7,19 +7,23 @@ import time
 import sqlite3
 from pathlib import Path
 from typing import Any, Dict, Optional
+try:
+    from .schema_migrations import schema_current  # type: ignore
+except Exception:
+    from schema_migrations import schema_current  # type: ignore
+try:
+    from .db_utils import pooled_connection  # type: ignore
+except Exception:
+    from db_utils import pooled_connection  # type: ignore
 
 
-def _connect(db_path: Path) -> sqlite3.Connection:
-    conn = sqlite3.connect(str(db_path), timeout=30.0)
-    conn.row_factory = sqlite3.Row
-    try:
-        conn.execute("PRAGMA journal_mode=WAL;")
-    except Exception:
-        pass
-    return conn
+def _connect(db_path: Path, *, write: bool = True):
+    return pooled_connection(db_path, write=write, row_factory=sqlite3.Row)
 
 
 def _ensure_tables(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS memory_index (
@@ -117,88 +121,84 @@ def upsert_memory_item(
     key_hash = _hash_key(kind, key_text, summary)
     now = time.time()
     try:
-        conn = _connect(db_path)
-        _ensure_tables(conn)
-        row = conn.execute(
-            "SELECT id, seen_count, evidence_count, confidence, value_score, suppressed FROM memory_index WHERE key_hash=?",
-            (key_hash,),
-        ).fetchone()
-        if row:
-            seen_count = int(row["seen_count"] or 0) + 1
-            evidence_total = int(row["evidence_count"] or 0) + int(
-                evidence_count or 0
-            )
-            conf = _merge_confidence(row["confidence"], confidence, evidence_count or 1)
-            score = (
-                float(value_score)
-                if value_score is not None
-                else _value_score(conf, evidence_total)
-            )
+        with _connect(db_path) as conn:
+            _ensure_tables(conn)
+            row = conn.execute(
+                "SELECT id, seen_count, evidence_count, confidence, value_score, suppressed FROM memory_index WHERE key_hash=?",
+                (key_hash,),
+            ).fetchone()
+            if row:
+                seen_count = int(row["seen_count"] or 0) + 1
+                evidence_total = int(row["evidence_count"] or 0) + int(
+                    evidence_count or 0
+                )
+                conf = _merge_confidence(row["confidence"], confidence, evidence_count or 1)
+                score = (
+                    float(value_score)
+                    if value_score is not None
+                    else _value_score(conf, evidence_total)
+                )
+                meta_json = json.dumps(meta or {}, ensure_ascii=False)
+                conn.execute(
+                    """
+                    UPDATE memory_index
+                    SET updated_at=?, last_seen=?, seen_count=?, evidence_count=?, confidence=?, value_score=?, meta_json=?
+                    WHERE id=?
+                    """,
+                    (
+                        now,
+                        now,
+                        seen_count,
+                        evidence_total,
+                        conf,
+                        score,
+                        meta_json,
+                        int(row["id"]),
+                    ),
+                )
+                return {
+                    "id": int(row["id"]),
+                    "key_hash": key_hash,
+                    "seen_count": seen_count,
+                    "evidence_count": evidence_total,
+                    "confidence": conf,
+                    "value_score": score,
+                }
+            conf = float(confidence or 0.5)
+            score = float(value_score) if value_score is not None else _value_score(conf, evidence_count)
             meta_json = json.dumps(meta or {}, ensure_ascii=False)
-            conn.execute(
+            cur = conn.execute(
                 """
-                UPDATE memory_index
-                SET updated_at=?, last_seen=?, seen_count=?, evidence_count=?, confidence=?, value_score=?, meta_json=?
-                WHERE id=?
+                INSERT INTO memory_index
+                (kind, key_hash, key_text, summary, created_at, updated_at, last_seen, seen_count, evidence_count, confidence, value_score, suppressed, source_table, source_id, meta_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?)
                 """,
                 (
+                    kind,
+                    key_hash,
+                    key_text,
+                    summary,
+                    now,
                     now,
                     now,
-                    seen_count,
-                    evidence_total,
+                    1,
+                    int(evidence_count or 0),
                     conf,
                     score,
+                    source_table,
+                    int(source_id) if source_id else None,
                     meta_json,
-                    int(row["id"]),
                 ),
             )
-            conn.commit()
-            conn.close()
+            mem_id = cur.lastrowid
             return {
-                "id": int(row["id"]),
+                "id": int(mem_id or 0),
                 "key_hash": key_hash,
-                "seen_count": seen_count,
-                "evidence_count": evidence_total,
+                "seen_count": 1,
+                "evidence_count": int(evidence_count or 0),
                 "confidence": conf,
                 "value_score": score,
             }
-        conf = float(confidence or 0.5)
-        score = float(value_score) if value_score is not None else _value_score(conf, evidence_count)
-        meta_json = json.dumps(meta or {}, ensure_ascii=False)
-        cur = conn.execute(
-            """
-            INSERT INTO memory_index
-            (kind, key_hash, key_text, summary, created_at, updated_at, last_seen, seen_count, evidence_count, confidence, value_score, suppressed, source_table, source_id, meta_json)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?, ?)
-            """,
-            (
-                kind,
-                key_hash,
-                key_text,
-                summary,
-                now,
-                now,
-                now,
-                1,
-                int(evidence_count or 0),
-                conf,
-                score,
-                source_table,
-                int(source_id) if source_id else None,
-                meta_json,
-            ),
-        )
-        mem_id = cur.lastrowid
-        conn.commit()
-        conn.close()
-        return {
-            "id": int(mem_id or 0),
-            "key_hash": key_hash,
-            "seen_count": 1,
-            "evidence_count": int(evidence_count or 0),
-            "confidence": conf,
-            "value_score": score,
-        }
     except Exception:
         return None
 
@@ -214,14 +214,12 @@ def record_relation(
     if not db_path or not db_path.exists():
         return
     try:
-        conn = _connect(db_path)
-        _ensure_tables(conn)
-        conn.execute(
-            "INSERT INTO memory_relations (parent_hash, child_hash, relation, created_at, notes) VALUES (?, ?, ?, ?, ?)",
-            (parent_hash, child_hash, relation, time.time(), notes),
-        )
-        conn.commit()
-        conn.close()
+        with _connect(db_path) as conn:
+            _ensure_tables(conn)
+            conn.execute(
+                "INSERT INTO memory_relations (parent_hash, child_hash, relation, created_at, notes) VALUES (?, ?, ?, ?, ?)",
+                (parent_hash, child_hash, relation, time.time(), notes),
+            )
     except Exception:
         return
 
@@ -237,14 +235,12 @@ def record_action(
     if not db_path or not db_path.exists():
         return
     try:
-        conn = _connect(db_path)
-        _ensure_tables(conn)
-        conn.execute(
-            "INSERT INTO memory_actions (key_hash, action, actor, created_at, notes) VALUES (?, ?, ?, ?, ?)",
-            (key_hash, action, actor, time.time(), notes),
-        )
-        conn.commit()
-        conn.close()
+        with _connect(db_path) as conn:
+            _ensure_tables(conn)
+            conn.execute(
+                "INSERT INTO memory_actions (key_hash, action, actor, created_at, notes) VALUES (?, ?, ?, ?, ?)",
+                (key_hash, action, actor, time.time(), notes),
+            )
     except Exception:
         return
 
@@ -253,14 +249,12 @@ def suppress_memory_item(db_path: Path, key_hash: str, reason: str = "") -> None
     if not db_path or not db_path.exists() or not key_hash:
         return
     try:
-        conn = _connect(db_path)
-        _ensure_tables(conn)
-        conn.execute(
-            "UPDATE memory_index SET suppressed=1, updated_at=? WHERE key_hash=?",
-            (time.time(), key_hash),
-        )
-        conn.commit()
-        conn.close()
+        with _connect(db_path) as conn:
+            _ensure_tables(conn)
+            conn.execute(
+                "UPDATE memory_index SET suppressed=1, updated_at=? WHERE key_hash=?",
+                (time.time(), key_hash),
+            )
         record_action(db_path, key_hash=key_hash, action="suppressed", actor="auto", notes=reason)
     except Exception:
         return
@@ -270,14 +264,12 @@ def unsuppress_memory_item(db_path: Path, key_hash: str) -> None:
     if not db_path or not db_path.exists() or not key_hash:
         return
     try:
-        conn = _connect(db_path)
-        _ensure_tables(conn)
-        conn.execute(
-            "UPDATE memory_index SET suppressed=0, updated_at=? WHERE key_hash=?",
-            (time.time(), key_hash),
-        )
-        conn.commit()
-        conn.close()
+        with _connect(db_path) as conn:
+            _ensure_tables(conn)
+            conn.execute(
+                "UPDATE memory_index SET suppressed=0, updated_at=? WHERE key_hash=?",
+                (time.time(), key_hash),
+            )
         record_action(db_path, key_hash=key_hash, action="unsuppressed", actor="auto", notes="")
     except Exception:
         return
@@ -304,27 +296,26 @@ def auto_curate_memory(
     if not db_path or not db_path.exists():
         return stats
     try:
-        conn = _connect(db_path)
-        _ensure_tables(conn)
-        cur = conn.cursor()
-        # Avoid repeatedly splitting same items
-        split_done = {
-            r[0]
-            for r in cur.execute(
-                "SELECT key_hash FROM memory_actions WHERE action='split'"
+        with _connect(db_path) as conn:
+            _ensure_tables(conn)
+            cur = conn.cursor()
+            # Avoid repeatedly splitting same items
+            split_done = {
+                r[0]
+                for r in cur.execute(
+                    "SELECT key_hash FROM memory_actions WHERE action='split'"
+                ).fetchall()
+            }
+            rows = cur.execute(
+                """
+                SELECT id, kind, key_hash, key_text, summary, confidence, evidence_count, value_score
+                FROM memory_index
+                WHERE suppressed=0 AND kind NOT LIKE '%_group'
+                ORDER BY updated_at DESC
+                LIMIT ?
+                """,
+                (int(merge_limit),),
             ).fetchall()
-        }
-        rows = cur.execute(
-            """
-            SELECT id, kind, key_hash, key_text, summary, confidence, evidence_count, value_score
-            FROM memory_index
-            WHERE suppressed=0 AND kind NOT LIKE '%_group'
-            ORDER BY updated_at DESC
-            LIMIT ?
-            """,
-            (int(merge_limit),),
-        ).fetchall()
-        conn.close()
     except Exception:
         return stats
 
@@ -372,16 +363,14 @@ def auto_curate_memory(
             stats["merged_groups"] += 1
             # Existing relations for this group
             try:
-                conn = _connect(db_path)
-                _ensure_tables(conn)
-                existing = {
-                    r[0]
-                    for r in conn.execute(
-                        "SELECT child_hash FROM memory_relations WHERE parent_hash=? AND relation='merged'",
-                        (group_hash,),
-                    ).fetchall()
-                }
-                conn.close()
+                with _connect(db_path, write=False) as conn:
+                    existing = {
+                        r[0]
+                        for r in conn.execute(
+                            "SELECT child_hash FROM memory_relations WHERE parent_hash=? AND relation='merged'",
+                            (group_hash,),
+                        ).fetchall()
+                    }
             except Exception:
                 existing = set()
             for it in items:
@@ -12,25 +12,77 @@ class MouseState:
     invalid_target = "invalid_target"
 
 
+class MotorMode:
+    human = "human"  # HandProfile-driven trajectory, one mouse.move + sleep per step
+    fast = "fast"  # whole trajectory dispatched in one in-page batch
+    direct = "direct"  # no trajectory: single move to the target
+
+
+# Replays a trajectory as synthetic pointer/mouse moves in one evaluate so
+# hover listeners (and the visual cursor overlay) still see the path.
+_TRAJECTORY_JS = r"""
+(points) => {
+  let last = null;
+  for (const [x, y] of points) {
+    const el = document.elementFromPoint(x, y) || document.body;
+    if (!el) continue;
+    const init = { bubbles: true, cancelable: true, clientX: x, clientY: y, view: window };
+    if (el !== last) {
+      if (last) last.dispatchEvent(new MouseEvent('mouseout', { ...init, relatedTarget: el }));
+      el.dispatchEvent(new MouseEvent('mouseover', { ...init, relatedTarget: last }));
+      last = el;
+    }
+    try { el.dispatchEvent(new PointerEvent('pointermove', init)); } catch (e) {}
+    el.dispatchEvent(new MouseEvent('mousemove', init));
+  }
+  return points.length;
+}
+"""
+
+
 class Motor:
     """
     طبقة الحركة الفيزيائية: تحوّل أمر "اذهب هنا" إلى مسار بشري نسبي.
+    mode=fast/direct: مسار مختصر للسيناريوهات التراجعية حيث لا تهم الحركة البشرية.
     """
 
-    def __init__(self, profile: HandProfile):
+    def __init__(self, profile: HandProfile, mode: str = MotorMode.human):
         self.profile = profile
+        self.mode = mode if mode in (MotorMode.human, MotorMode.fast, MotorMode.direct) else MotorMode.human
         self.mouse_state = MouseState.idle
         self.last_pos: Tuple[float, float] | None = None
+        self._viewport: Tuple[int, float, float] | None = None
+
+    async def _viewport_size(self, page) -> Tuple[float, float]:
+        """
+        أبعاد نافذة العرض مخزنة لكل صفحة (بدون رحلة للمتصفح عند توفر viewport_size).
+        """
+        if self._viewport is not None and self._viewport[0] == id(page):
+            return self._viewport[1], self._viewport[2]
+        size = None
+        try:
+            size = page.viewport_size
+        except Exception:
+            size = None
+        if size:
+            w, h = float(size["width"]), float(size["height"])
+        else:
+            dims = await page.evaluate("() => ({ w: window.innerWidth, h: window.innerHeight })")
+            w, h = float(dims["w"]), float(dims["h"])
+        self._viewport = (id(page), w, h)
+        return w, h
 
     async def move_to(self, page, x: float, y: float, danger: bool = False):
         """
         ينفّذ حركة محسوبة مع تسارع/تباطؤ، overshoot بسيط، وجيتّر خفيف.
         """
+        if self.mode != MotorMode.human:
+            return await self._move_fast(page, x, y)
         try:
             # احصل على آخر موضع معروف أو مركز الشاشة
+            vw, vh = await self._viewport_size(page)
             if self.last_pos is None:
-                pos = await page.evaluate("() => ({ x: window.innerWidth/2, y: window.innerHeight/2 })")
-                self.last_pos = (float(pos["x"]), float(pos["y"]))
+                self.last_pos = (vw / 2, vh / 2)
             sx, sy = self.last_pos
             dx, dy = x - sx, y - sy
             dist = math.hypot(dx, dy)
@@ -53,9 +105,8 @@ class Motor:
                 tx += math.cos(angle) * overshoot
                 ty += math.sin(angle) * overshoot
 
-            # عدد الخطوات نسبة للمسافة وقطر الشاشة (يُحسب داخل المتصفح)
-            diag = await page.evaluate("() => Math.hypot(window.innerWidth, window.innerHeight)")
-            diag = max(diag, 1)
+            # عدد الخطوات نسبة للمسافة وقطر الشاشة (من أبعاد النافذة المخزنة)
+            diag = max(math.hypot(vw, vh), 1)
             # 4..10 خطوات حسب نسبة المسافة للقطر
             ratio = dist / diag
             steps = max(4, min(10, int(4 + ratio * 12)))
@@ -83,7 +134,33 @@ class Motor:
 
             self.last_pos = (x, y)
             self.mouse_state = MouseState.at_target
-            return {"status": "at_target", "correction": used_correction}
+            return {"status": "at_target", "correction": used_correction, "mode": self.mode, "steps": steps}
+        except Exception:
+            self.mouse_state = MouseState.invalid_target
+            return {"status": "invalid_target", "correction": False}
+
+    async def _move_fast(self, page, x: float, y: float):
+        """
+        مسار سريع: كل نقاط المسار في استدعاء واحد ثم حركة حقيقية واحدة للهدف (بدون انتظار).
+        """
+        try:
+            steps = 0
+            if self.mode == MotorMode.fast:
+                vw, vh = await self._viewport_size(page)
+                sx, sy = self.last_pos if self.last_pos is not None else (vw / 2, vh / 2)
+                dist = math.hypot(x - sx, y - sy)
+                if dist >= 5:
+                    steps = max(2, min(10, int(2 + dist / max(math.hypot(vw, vh), 1) * 8)))
+                    points = []
+                    for i in range(1, steps):
+                        t = i / steps
+                        ease = t * t * (3 - 2 * t)
+                        points.append([sx + (x - sx) * ease, sy + (y - sy) * ease])
+                    await page.evaluate(_TRAJECTORY_JS, points)
+            await page.mouse.move(x, y, steps=1)
+            self.last_pos = (x, y)
+            self.mouse_state = MouseState.at_target
+            return {"status": "at_target", "correction": False, "mode": self.mode, "steps": steps + 1}
         except Exception:
             self.mouse_state = MouseState.invalid_target
             return {"status": "invalid_target", "correction": False}
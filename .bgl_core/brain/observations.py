@@ -16,9 +16,36 @@ import sqlite3
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional
+try:
+    from .schema_migrations import schema_current  # type: ignore
+except Exception:
+    from schema_migrations import schema_current  # type: ignore
+try:
+    from .db_utils import pooled_connection  # type: ignore
+except Exception:
+    from db_utils import pooled_connection  # type: ignore
+
+
+# (db_path, ensure fn) pairs whose DDL already ran through the writer.
+_READ_DDL_DONE: set = set()
+
+
+def _ensure_for_read(db_path: Path, ensure) -> None:
+    """
+    Run a legacy `_ensure_*` helper for a read path through the pooled writer,
+    once per process, so reader connections never issue DDL.
+    """
+    key = (str(db_path), ensure.__name__)
+    if key in _READ_DDL_DONE:
+        return
+    with pooled_connection(db_path, write=True) as conn:
+        ensure(conn)
+    _READ_DDL_DONE.add(key)
 
 
 def _ensure_tables(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS env_snapshots (
@@ -38,6 +65,8 @@ def _ensure_tables(conn: sqlite3.Connection) -> None:
 
 
 def _ensure_ui_semantic_tables(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS ui_semantic_snapshots (
@@ -57,6 +86,8 @@ def _ensure_ui_semantic_tables(conn: sqlite3.Connection) -> None:
 
 
 def _ensure_ui_action_tables(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS ui_action_snapshots (
@@ -85,7 +116,7 @@ def store_env_snapshot(
     created_at: Optional[float] = None,
 ) -> None:
     created_at = float(created_at if created_at is not None else time.time())
-    with sqlite3.connect(str(db_path)) as conn:
+    with pooled_connection(db_path, write=True) as conn:
         _ensure_tables(conn)
         conn.execute(
             """
@@ -124,8 +155,7 @@ def store_ui_semantic_snapshot(
         ).hexdigest()
     except Exception:
         digest = ""
-    with sqlite3.connect(str(db_path)) as conn:
-        conn.row_factory = sqlite3.Row
+    with pooled_connection(db_path, write=True, row_factory=sqlite3.Row) as conn:
         _ensure_ui_semantic_tables(conn)
         try:
             prev = conn.execute(
@@ -173,8 +203,7 @@ def store_ui_action_snapshot(
         ).hexdigest()
     except Exception:
         digest = ""
-    with sqlite3.connect(str(db_path)) as conn:
-        conn.row_factory = sqlite3.Row
+    with pooled_connection(db_path, write=True, row_factory=sqlite3.Row) as conn:
         _ensure_ui_action_tables(conn)
         try:
             prev = conn.execute(
@@ -204,9 +233,8 @@ def store_ui_action_snapshot(
 def latest_ui_semantic_snapshot(
     db_path: Path, *, url: Optional[str] = None
 ) -> Optional[Dict[str, Any]]:
-    with sqlite3.connect(str(db_path)) as conn:
-        conn.row_factory = sqlite3.Row
-        _ensure_ui_semantic_tables(conn)
+    _ensure_for_read(db_path, _ensure_ui_semantic_tables)
+    with pooled_connection(db_path, row_factory=sqlite3.Row) as conn:
         if url:
             row = conn.execute(
                 """
@@ -253,9 +281,8 @@ def previous_ui_semantic_snapshot(
 ) -> Optional[Dict[str, Any]]:
     if url is not None and not url:
         return None
-    with sqlite3.connect(str(db_path)) as conn:
-        conn.row_factory = sqlite3.Row
-        _ensure_ui_semantic_tables(conn)
+    _ensure_for_read(db_path, _ensure_ui_semantic_tables)
+    with pooled_connection(db_path, row_factory=sqlite3.Row) as conn:
         if url:
             row = conn.execute(
                 """
@@ -414,6 +441,8 @@ def compute_ui_semantic_delta(
 
 
 def _ensure_ui_flow_tables(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS ui_flow_transitions (
@@ -452,7 +481,7 @@ def record_ui_flow_transition(
     if not (from_url or to_url):
         return
     created_at = float(created_at if created_at is not None else time.time())
-    with sqlite3.connect(str(db_path)) as conn:
+    with pooled_connection(db_path, write=True) as conn:
         _ensure_ui_flow_tables(conn)
         conn.execute(
             """
@@ -476,9 +505,8 @@ def record_ui_flow_transition(
 def latest_env_snapshot(
     db_path: Path, *, kind: Optional[str] = None
 ) -> Optional[Dict[str, Any]]:
-    with sqlite3.connect(str(db_path)) as conn:
-        conn.row_factory = sqlite3.Row
-        _ensure_tables(conn)
+    _ensure_for_read(db_path, _ensure_tables)
+    with pooled_connection(db_path, row_factory=sqlite3.Row) as conn:
         if kind:
             row = conn.execute(
                 """
@@ -589,9 +617,8 @@ def compute_diagnostic_delta(prev_payload: Dict[str, Any], curr_payload: Dict[st
 def _previous_env_snapshot(
     db_path: Path, *, kind: str, before_ts: float
 ) -> Optional[Dict[str, Any]]:
-    with sqlite3.connect(str(db_path)) as conn:
-        conn.row_factory = sqlite3.Row
-        _ensure_tables(conn)
+    _ensure_for_read(db_path, _ensure_tables)
+    with pooled_connection(db_path, row_factory=sqlite3.Row) as conn:
         row = conn.execute(
             """
             SELECT * FROM env_snapshots
@@ -623,7 +650,7 @@ def _count_runtime_events(
     db_path: Path, *, start_ts: float, end_ts: float
 ) -> int:
     try:
-        with sqlite3.connect(str(db_path)) as conn:
+        with pooled_connection(db_path) as conn:
             cur = conn.cursor()
             row = cur.execute(
                 """
@@ -642,7 +669,7 @@ def _count_internal_writes(
     db_path: Path, *, start_ts: float, end_ts: float
 ) -> int:
     try:
-        with sqlite3.connect(str(db_path)) as conn:
+        with pooled_connection(db_path) as conn:
             cur = conn.cursor()
             row = cur.execute(
                 """
@@ -0,0 +1,217 @@
+"""
+page_settle.py
+--------------
+Event-driven "page is stable" detection for Playwright pages.
+
+A small monitor is injected once per page (init script + current document).
+It tracks DOM mutations, in-flight fetch/XHR requests, running Web Animations
+and animation frames so callers can await a single `wait_for_settle(page, max_ms)`
+that returns as soon as the page is quiet. The old fixed delays become an upper bound only.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    from .config_loader import load_config  # type: ignore
+except Exception:
+    try:
+        from config_loader import load_config  # type: ignore
+    except Exception:
+        load_config = None  # type: ignore
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+SETTLE_MONITOR_JS = r"""
+(() => {
+  if (window.__bglSettle) return;
+  const s = { pending: 0, mutations: 0, lastMutation: performance.now(), lastNetwork: performance.now() };
+  window.__bglSettle = s;
+  const observe = () => {
+    try {
+      new MutationObserver((recs) => {
+        s.mutations += recs.length;
+        s.lastMutation = performance.now();
+      }).observe(document.documentElement || document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+      });
+    } catch (e) {}
+  };
+  if (document.documentElement) observe();
+  else document.addEventListener('DOMContentLoaded', observe, { once: true });
+  const begin = () => { s.pending += 1; s.lastNetwork = performance.now(); };
+  const done = () => { s.pending = Math.max(0, s.pending - 1); s.lastNetwork = performance.now(); };
+  try {
+    const origFetch = window.fetch;
+    if (origFetch) {
+      window.fetch = function (...args) {
+        begin();
+        let p;
+        try { p = origFetch.apply(this, args); } catch (e) { done(); throw e; }
+        Promise.resolve(p).then(done, done);
+        return p;
+      };
+    }
+  } catch (e) {}
+  try {
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+      begin();
+      this.addEventListener('loadend', done, { once: true });
+      try { return send.apply(this, args); } catch (e) { done(); throw e; }
+    };
+  } catch (e) {}
+})()
+"""
+
+WAIT_SETTLE_JS = r"""
+(opts) => new Promise((resolve) => {
+  const s = window.__bglSettle;
+  const t0 = performance.now();
+  if (!s) { resolve({ settled: false, reason: 'no_monitor', waited_ms: 0 }); return; }
+  // Finite CSS transitions/animations still playing (document.getAnimations);
+  // infinite loops (spinners, pulses) would otherwise pin every wait to max_ms.
+  const running = () => {
+    try {
+      if (typeof document === 'undefined' || !document.getAnimations) return 0;
+      return document.getAnimations().filter((a) => {
+        if (a.playState !== 'running') return false;
+        try { return a.effect.getComputedTiming().iterations !== Infinity; } catch (e) { return true; }
+      }).length;
+    } catch (e) { return 0; }
+  };
+  let finished = false;
+  const finish = (ok, reason) => {
+    if (finished) return;
+    finished = true;
+    resolve({
+      settled: ok, reason, waited_ms: Math.round(performance.now() - t0),
+      pending: s.pending, mutations: s.mutations, animations: running()
+    });
+  };
+  setTimeout(() => finish(false, 'max_wait'), Math.max(0, opts.max_ms));
+  // Two frames with no new mutations; a timer covers hidden tabs where rAF stalls.
+  const frameIdle = (seq, next) => {
+    let fired = false;
+    const go = () => { if (fired) return; fired = true; next(s.mutations === seq); };
+    requestAnimationFrame(() => requestAnimationFrame(go));
+    setTimeout(go, 60);
+  };
+  const check = () => {
+    if (finished) return;
+    const now = performance.now();
+    // Quiet is measured from the later of the wait start and the last mutation, so a
+    // stale lastMutation cannot resolve before a just-triggered update lands.
+    const domQuiet = (now - Math.max(t0, s.lastMutation)) >= opts.quiet_ms;
+    const netQuiet = s.pending === 0 || (now - s.lastNetwork) >= opts.long_poll_ms;
+    const animQuiet = running() === 0;
+    if ((now - t0) >= opts.min_ms && domQuiet && netQuiet && animQuiet) {
+      frameIdle(s.mutations, (idle) => idle ? finish(true, 'quiet') : setTimeout(check, opts.tick_ms));
+      return;
+    }
+    setTimeout(check, opts.tick_ms);
+  };
+  check();
+})
+"""
+
+def _settings() -> Dict[str, Any]:
+    # load_config is cached per process and revalidated on file changes.
+    cfg: Dict[str, Any] = {}
+    try:
+        if load_config is not None:
+            cfg = load_config(ROOT_DIR) or {}
+    except Exception:
+        cfg = {}
+
+    def _num(env_key: str, cfg_key: str, default: int) -> int:
+        raw = os.getenv(env_key)
+        if raw is None:
+            raw = cfg.get(cfg_key, default)
+        try:
+            return int(float(raw))
+        except Exception:
+            return default
+
+    enabled_raw = os.getenv("BGL_PAGE_SETTLE")
+    if enabled_raw is None:
+        enabled_raw = cfg.get("page_settle_enabled", 1)
+    return {
+        "enabled": str(enabled_raw).strip().lower() in ("1", "true", "yes", "on"),
+        "quiet_ms": _num("BGL_PAGE_SETTLE_QUIET_MS", "page_settle_quiet_ms", 80),
+        "long_poll_ms": _num("BGL_PAGE_SETTLE_LONG_POLL_MS", "page_settle_long_poll_ms", 1500),
+        "tick_ms": _num("BGL_PAGE_SETTLE_TICK_MS", "page_settle_tick_ms", 20),
+    }
+
+
+async def install_settle_monitor(page) -> bool:
+    """
+    Inject the monitor once per page: as an init script for future
+    navigations and into the current document.
+    """
+    if getattr(page, "_bgl_settle_installed", False):
+        return True
+    try:
+        await page.add_init_script(SETTLE_MONITOR_JS)
+        await page.evaluate(SETTLE_MONITOR_JS)
+        page._bgl_settle_installed = True  # type: ignore[attr-defined]
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_settle(
+    page,
+    max_ms: int,
+    *,
+    quiet_ms: Optional[int] = None,
+    min_ms: int = 0,
+) -> Dict[str, Any]:
+    """
+    Resolve as soon as the page is quiet (no DOM mutations for `quiet_ms`,
+    no in-flight fetch/XHR, no running finite animations, an idle animation
+    frame) or after `max_ms`.
+    Falls back to a fixed `max_ms` sleep when disabled or not injectable.
+    """
+    max_ms = max(0, int(max_ms or 0))
+    cfg = _settings()
+    started = time.perf_counter()
+    if max_ms <= 0:
+        return {"settled": True, "reason": "no_wait", "waited_ms": 0}
+    if not cfg["enabled"] or not await install_settle_monitor(page):
+        await page.wait_for_timeout(max_ms)
+        return {"settled": False, "reason": "fixed", "waited_ms": max_ms}
+    opts = {
+        "max_ms": max_ms,
+        "min_ms": max(0, min(int(min_ms or 0), max_ms)),
+        "quiet_ms": int(cfg["quiet_ms"] if quiet_ms is None else quiet_ms),
+        "long_poll_ms": int(cfg["long_poll_ms"]),
+        "tick_ms": max(5, int(cfg["tick_ms"])),
+    }
+    try:
+        res = await page.evaluate(WAIT_SETTLE_JS, opts)
+        if isinstance(res, dict):
+            if res.get("reason") != "no_monitor":
+                return res
+            # Monitor missing (e.g. document replaced before the init script ran).
+            page._bgl_settle_installed = False  # type: ignore[attr-defined]
+            await page.evaluate(SETTLE_MONITOR_JS)
+            page._bgl_settle_installed = True  # type: ignore[attr-defined]
+            return await page.evaluate(WAIT_SETTLE_JS, opts)
+    except Exception:
+        # Context destroyed by a navigation: wait for the new document within budget.
+        remaining = max_ms - int((time.perf_counter() - started) * 1000)
+        if remaining > 0:
+            try:
+                await page.wait_for_load_state("domcontentloaded", timeout=remaining)
+            except Exception:
+                pass
+    return {
+        "settled": False,
+        "reason": "navigated",
+        "waited_ms": int((time.perf_counter() - started) * 1000),
+    }
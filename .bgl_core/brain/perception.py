@@ -1,14 +1,15 @@
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import re
+try:
+    from .capture_store import default_store  # type: ignore
+except Exception:
+    from capture_store import default_store  # type: ignore
 
 
-UI_MAP_JS = r"""
-(limit) => {
-  const elements = Array.from(
-    document.querySelectorAll('button, a, input, select, textarea, [role], [onclick]')
-  );
-
+# Shared per-element record builder. UI_MAP_JS and UI_CANDIDATES_JS both
+# inline it so every caller sees the same field set from a single evaluate.
+_ELEMENT_RECORD_JS = r"""
   function pickText(el) {
     const t = (el.innerText || '').trim();
     const v = (el.value || '').toString().trim();
@@ -17,11 +18,14 @@ UI_MAP_JS = r"""
     return (t || v || p || a || '').trim();
   }
 
-  return elements.slice(0, limit).map(el => {
+  function describe(el, raw) {
     const rect = el.getBoundingClientRect();
     const tag = (el.tagName || '').toLowerCase();
-    const text = pickText(el).slice(0, 120);
-    const href = (tag === 'a') ? (el.getAttribute('href') || '') : '';
+    const text = raw
+      ? (el.innerText || el.textContent || '').trim().slice(0, 120)
+      : pickText(el).slice(0, 120);
+    const hrefAttr = el.getAttribute('href') || '';
+    const href = (tag === 'a' || raw) ? hrefAttr : '';
     const onclick = el.getAttribute('onclick') || '';
     const dataTab = el.getAttribute('data-tab') || '';
     const dataTarget = el.getAttribute('data-target') || '';
@@ -31,7 +35,7 @@ UI_MAP_JS = r"""
     const ariaSelected = el.getAttribute('aria-selected') || '';
     const ariaExpanded = el.getAttribute('aria-expanded') || '';
     const ariaDisabled = el.getAttribute('aria-disabled') || '';
-    const disabled = el.disabled ? 'true' : '';
+    const disabled = (el.disabled || (raw && el.hasAttribute('disabled'))) ? 'true' : '';
     let testAttr = '';
     let testId = '';
     const testAttrs = ['data-testid', 'data-test', 'data-qa', 'data-cy'];
@@ -40,12 +44,12 @@ UI_MAP_JS = r"""
       if (v) { testId = v; testAttr = attr; break; }
     }
 
-    return {
+    const rec = {
       tag,
       role: el.getAttribute('role') || '',
       text,
       id: el.id || '',
-      classes: el.className || '',
+      classes: (typeof el.className === 'string') ? el.className : (el.getAttribute('class') || ''),
       type: el.type || (tag === 'a' ? 'link' : ''),
       href,
       onclick,
@@ -61,9 +65,80 @@ UI_MAP_JS = r"""
       testid: testId,
       testattr: testAttr,
       x: rect.x, y: rect.y, w: rect.width, h: rect.height,
-      z: getComputedStyle(el).zIndex || 'auto'
     };
-  });
+    if (raw) {
+      rec.desc = (el.getAttribute('title') || el.textContent || hrefAttr || '');
+    } else {
+      rec.z = getComputedStyle(el).zIndex || 'auto';
+    }
+    return rec;
+  }
+"""
+
+
+UI_MAP_JS = (
+    r"""
+(limit) => {
+"""
+    + _ELEMENT_RECORD_JS
+    + r"""
+  const elements = Array.from(
+    document.querySelectorAll('button, a, input, select, textarea, [role], [onclick]')
+  );
+  return elements.slice(0, limit).map(el => describe(el, false));
+}
+"""
+)
+
+
+CANDIDATE_SELECTOR = "button, a, [role='button'], [data-action], input, textarea, select"
+
+
+# Batched candidate harvesting: one evaluate returns compact records for every
+# interactive element (or the first match of each selector in `selectors`),
+# and parks the elements in-page so callers can resolve a handle by index
+# only for the element they actually act on.
+UI_CANDIDATES_JS = (
+    r"""
+(opts) => {
+"""
+    + _ELEMENT_RECORD_JS
+    + r"""
+  opts = opts || {};
+  const elements = [];
+  const items = [];
+  const push = (el, query) => {
+    const rec = describe(el, true);
+    rec.index = elements.length;
+    if (query) rec.query = query;
+    elements.push(el);
+    items.push(rec);
+  };
+  if (Array.isArray(opts.selectors)) {
+    for (const sel of opts.selectors) {
+      let el = null;
+      try { el = document.querySelector(sel); } catch (e) { el = null; }
+      if (el) push(el, sel);
+    }
+  } else {
+    Array.from(document.querySelectorAll(opts.selector))
+      .slice(0, opts.limit || 400)
+      .forEach(el => push(el, ''));
+  }
+  const gen = Date.now().toString(36) + Math.random().toString(36).slice(2, 8);
+  window.__bglCandidates = { gen, elements };
+  return { gen, items };
+}
+"""
+)
+
+
+_CANDIDATE_HANDLE_JS = r"""
+(ref) => {
+  const c = window.__bglCandidates;
+  if (!c || c.gen !== ref.gen) return null;
+  const el = c.elements[ref.index];
+  return (el && el.isConnected) ? el : null;
 }
 """
 
@@ -256,6 +331,61 @@ async def capture_ui_map(page, limit: int = 50):
         return []
 
 
+async def harvest_candidates(
+    page, selector: str = CANDIDATE_SELECTOR, limit: int = 400
+) -> List[Dict[str, Any]]:
+    """
+    Collect interactive-element records in a single round trip.
+    Each record carries `index`/`gen` for `candidate_handle`.
+    """
+    return await _harvest(page, {"selector": selector, "limit": int(limit)})
+
+
+async def match_selectors(page, selectors: List[str]) -> List[Dict[str, Any]]:
+    """
+    Resolve the first match of each selector in one round trip; selectors
+    with no match (or invalid syntax) are omitted. Records carry `query`.
+    """
+    if not selectors:
+        return []
+    return await _harvest(page, {"selectors": [str(s) for s in selectors]})
+
+
+async def _harvest(page, opts: Dict[str, Any]) -> List[Dict[str, Any]]:
+    try:
+        res = await page.evaluate(UI_CANDIDATES_JS, opts)
+    except Exception:
+        return []
+    if not isinstance(res, dict):
+        return []
+    gen = str(res.get("gen") or "")
+    items = [r for r in (res.get("items") or []) if isinstance(r, dict)]
+    for rec in items:
+        rec["gen"] = gen
+    return items
+
+
+async def candidate_handle(page, record: Dict[str, Any]):
+    """
+    Return the ElementHandle for a harvested record, or None when the page
+    was re-harvested or the element left the DOM since.
+    """
+    try:
+        handle = await page.evaluate_handle(
+            _CANDIDATE_HANDLE_JS,
+            {"gen": str(record.get("gen") or ""), "index": int(record.get("index") or 0)},
+        )
+    except Exception:
+        return None
+    el = handle.as_element()
+    if el is None:
+        try:
+            await handle.dispose()
+        except Exception:
+            pass
+    return el
+
+
 async def capture_semantic_map(page, limit: int = 12) -> Dict[str, Any]:
     """
     Return a compact semantic summary of the page:
@@ -411,8 +541,8 @@ async def capture_local_context(page, selector: Optional[str] = None, screenshot
                     safe_tag = tag or "target"
                     shot_path = screenshot_dir / f"{safe_tag}.png"
                     try:
-                        await el.screenshot(path=str(shot_path))
-                        data["screenshot"] = str(shot_path)
+                        png = await el.screenshot()
+                        data["screenshot"] = str(default_store(screenshot_dir).save(png, shot_path, scope=safe_tag))
                     except Exception:
                         pass
         except Exception:
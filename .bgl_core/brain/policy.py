@@ -3,6 +3,7 @@ from typing import Dict, Any
 import time
 from motor import Motor, MouseState
 from perception import capture_local_context
+from page_settle import wait_for_settle
 
 
 class Policy:
@@ -78,9 +79,9 @@ class Policy:
         # ابدأ مراقبة DOM قبل النقر لرصد أي تغيير يحدث فوراً أثناء الضغط
         await self._start_dom_watch(page)
 
-        await page.wait_for_timeout(hover_wait_ms)
+        await wait_for_settle(page, hover_wait_ms)
         await page.click(selector, timeout=5000)
-        await page.wait_for_timeout(post_click_ms)
+        await wait_for_settle(page, post_click_ms)
         self.motor.mouse_state = MouseState.idle
         move_to_click_ms = int((time.time() - t_start) * 1000)
         dom_change_ms = await self._wait_dom_change(page)
@@ -93,7 +94,11 @@ class Policy:
                     "event_type": "mouse_metrics",
                     "route": selector,
                     "method": "CLICK",
-                    "payload": f"move_to_click_ms={move_to_click_ms};dom_change_ms={dom_change_ms};correction={move_info.get('correction', False)}",
+                    "payload": (
+                        f"move_to_click_ms={move_to_click_ms};dom_change_ms={dom_change_ms};"
+                        f"correction={move_info.get('correction', False)};"
+                        f"mode={getattr(self.motor, 'mode', 'human')};steps={move_info.get('steps', '')}"
+                    ),
                 },
             )
         # سجل التعلم إن وُجد سجل
@@ -119,7 +124,7 @@ class Policy:
                 self.motor.mouse_state = MouseState.idle
                 return {"status": "download_started", "error": msg}
             raise
-        await page.wait_for_timeout(post_wait_ms)
+        await wait_for_settle(page, post_wait_ms)
         self.motor.mouse_state = MouseState.idle
         return {"status": "navigated"}
 
@@ -132,11 +137,14 @@ class Policy:
                 """(timeout) => {
                     const start = performance.now();
                     const state = { changed: false, delta: null, done: false };
+                    state.result = new Promise((resolve) => { state.resolve = resolve; });
                     const timer = setTimeout(() => {
                         if (state.done) return;
                         state.done = true;
                         state.delta = null;
                         state.changed = false;
+                        obs.disconnect();
+                        state.resolve(null);
                     }, timeout);
                     const obs = new MutationObserver(() => {
                         if (state.done) return;
@@ -145,6 +153,7 @@ class Policy:
                         state.delta = Math.round(performance.now() - start);
                         clearTimeout(timer);
                         obs.disconnect();
+                        state.resolve(state.delta);
                     });
                     obs.observe(document.body || document.documentElement, { childList: true, subtree: true, characterData: true, attributes: true });
                     window.__bgl_dom_watch = { state, obs };
@@ -154,24 +163,24 @@ class Policy:
         except Exception:
             return None
 
-    async def _wait_dom_change(self, page, poll_ms: int = 50, timeout_ms: int = 1500):
+    async def _wait_dom_change(self, page, timeout_ms: int = 1500):
         """
-        ينتظر نتيجة المراقبة المزروعة مسبقاً ويعيد delta ms أو None.
+        ينتظر نتيجة المراقبة المزروعة مسبقاً (وعد واحد بدل الاستطلاع) ويعيد delta ms أو None.
         """
         try:
-            start = time.time()
-            while (time.time() - start) * 1000 < timeout_ms:
-                result = await page.evaluate(
-                    """() => {
-                        const w = window.__bgl_dom_watch;
-                        if (!w || !w.state || w.state.done === undefined) return {done: true, delta: null};
-                        return {done: w.state.done, delta: w.state.delta};
-                    }"""
-                )
-                if result.get("done"):
-                    return result.get("delta")
-                await page.wait_for_timeout(poll_ms)
-            return None
+            return await page.evaluate(
+                """(timeout) => {
+                    const w = window.__bgl_dom_watch;
+                    if (!w || !w.state) return null;
+                    if (w.state.done) return w.state.delta;
+                    if (!w.state.result) return null;
+                    return Promise.race([
+                        w.state.result,
+                        new Promise((resolve) => setTimeout(() => resolve(null), timeout)),
+                    ]);
+                }""",
+                timeout_ms,
+            )
         except Exception:
             return None
 
@@ -10,9 +10,16 @@ import math
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-import yaml
+try:
+    from .lazy_imports import lazy_import  # type: ignore
+except Exception:
+    from lazy_imports import lazy_import  # type: ignore
+
+yaml = lazy_import("yaml")
 
 from run_lock import acquire_lock, release_lock
+from db_utils import pooled_connection, snapshot_connection
+from runtime_partitions import rollup_scenario_stats
 
 ROOT = Path(__file__).parent.parent.parent
 STATE_PATH = ROOT / ".bgl_core" / "logs" / "retention_state.json"
@@ -173,7 +180,7 @@ def _read_decision_links(limit: int = 500) -> Dict[str, Dict[str, Any]]:
     if not DB_PATH.exists():
         return links
     try:
-        with sqlite3.connect(str(DB_PATH)) as conn:
+        with snapshot_connection(DB_PATH, row_factory=None) as conn:
             tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()}
             if "decision_traces" not in tables:
                 return links
@@ -230,7 +237,7 @@ def _read_runtime_stats() -> Dict[str, Dict[str, Any]]:
     if not DB_PATH.exists():
         return _read_runtime_fallback_stats()
     try:
-        with sqlite3.connect(str(DB_PATH)) as conn:
+        with snapshot_connection(DB_PATH, row_factory=None) as conn:
             rows = conn.execute(
                 """
                 SELECT
@@ -251,6 +258,8 @@ def _read_runtime_stats() -> Dict[str, Dict[str, Any]]:
                 GROUP BY scenario_id
                 """
             ).fetchall()
+            # History moved out of the hot partition survives as rollups.
+            archived = rollup_scenario_stats(conn)
         for scenario_id, count, last_ts, timeout_count, error_count in rows:
             if scenario_id:
                 stats[str(scenario_id)] = {
@@ -261,10 +270,10 @@ def _read_runtime_stats() -> Dict[str, Dict[str, Any]]:
                 }
     except Exception:
         stats = {}
+        archived = {}
 
-    fallback = _read_runtime_fallback_stats()
-    if fallback:
-        for scenario_id, fstat in fallback.items():
+    for extra in (archived, _read_runtime_fallback_stats()):
+        for scenario_id, fstat in (extra or {}).items():
             if scenario_id in stats:
                 merged = stats[scenario_id]
                 merged["count"] = int(merged.get("count") or 0) + int(fstat.get("count") or 0)
@@ -333,8 +342,7 @@ def _log_runtime_event(event_type: str, payload: Dict[str, Any]) -> None:
     if not DB_PATH.exists():
         return
     try:
-        with sqlite3.connect(str(DB_PATH), timeout=5.0) as conn:
-            conn.execute("PRAGMA journal_mode=WAL;")
+        with pooled_connection(DB_PATH, write=True) as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS runtime_events (
@@ -373,7 +381,6 @@ def _log_runtime_event(event_type: str, payload: Dict[str, Any]) -> None:
                     json.dumps(payload, ensure_ascii=False),
                 ),
             )
-            conn.commit()
     except Exception:
         return
 
@@ -586,8 +593,7 @@ def _collect_snapshots(limit_per_kind: int) -> List[Dict[str, Any]]:
     if not DB_PATH.exists():
         return out
     try:
-        with sqlite3.connect(str(DB_PATH)) as conn:
-            conn.row_factory = sqlite3.Row
+        with snapshot_connection(DB_PATH) as conn:
             env_rows = conn.execute(
                 """
                 SELECT id, created_at, run_id, kind, source, payload_json
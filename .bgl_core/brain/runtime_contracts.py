@@ -0,0 +1,196 @@
+"""
+runtime_contracts.py
+--------------------
+Indexed view of the runtime evidence in analysis/code_contracts.json.
+
+Authority gates look up runtime stats by file (exact or suffix match) and by
+route. Instead of every process parsing the whole JSON into memory, the
+runtime blocks are materialized into the `runtime_contracts` table of
+knowledge.db (re-materialized when the JSON's mtime/size changes) and each
+lookup is an indexed point or range query. Suffix matches use a reversed key
+so they become prefix range scans.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from .db_utils import pooled_connection  # type: ignore
+    from .schema_migrations import schema_current  # type: ignore
+except Exception:
+    from db_utils import pooled_connection  # type: ignore
+    from schema_migrations import schema_current  # type: ignore
+
+
+SOURCE = "code_contracts.json"
+# Greater than any encoded character: closes a prefix range on the reversed key.
+_RANGE_END = "\U0010ffff"
+
+
+def _ensure_tables(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS runtime_contracts (
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            key_rev TEXT NOT NULL,
+            symbol TEXT,
+            ord INTEGER NOT NULL,
+            runtime_json TEXT NOT NULL,
+            PRIMARY KEY (kind, key)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_runtime_contracts_rev ON runtime_contracts(kind, key_rev)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS runtime_contracts_meta (
+            source TEXT PRIMARY KEY,
+            mtime_ns INTEGER,
+            size INTEGER,
+            rows INTEGER,
+            synced_at REAL
+        )
+        """
+    )
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (int(st.st_mtime_ns), int(st.st_size))
+
+
+def _extract(
+    data: Dict[str, Any],
+    normalize_route: Callable[[str], str],
+    normalize_path: Callable[[str], str],
+) -> Tuple[Dict[str, Tuple[str, Any]], Dict[str, Tuple[str, Any]]]:
+    """route -> (symbol, runtime) and file -> (symbol, runtime); last contract wins."""
+    routes: Dict[str, Tuple[str, Any]] = {}
+    files: Dict[str, Tuple[str, Any]] = {}
+    for c in data.get("contracts", []):
+        if not isinstance(c, dict):
+            continue
+        runtime = c.get("runtime") or {}
+        if not runtime:
+            continue
+        kind = str(c.get("kind") or "")
+        symbol = str(c.get("id") or "")
+        if kind == "api":
+            route = normalize_route(str(c.get("route") or ""))
+            if route:
+                routes[route] = (symbol, runtime)
+            file_path = normalize_path(str(c.get("file") or ""))
+            if file_path:
+                files[file_path] = (symbol, runtime)
+        elif kind == "php_module":
+            file_path = normalize_path(str(c.get("file") or ""))
+            if file_path:
+                files[file_path] = (symbol, runtime)
+    return routes, files
+
+
+class RuntimeContractIndex:
+    def __init__(
+        self,
+        db_path: Path,
+        contracts_path: Path,
+        *,
+        normalize_route: Callable[[str], str],
+        normalize_path: Callable[[str], str],
+    ):
+        self.db_path = Path(db_path)
+        self.contracts_path = Path(contracts_path)
+        self.normalize_route = normalize_route
+        self.normalize_path = normalize_path
+        self._synced: Optional[Tuple[int, int]] = None
+        self.stats: Dict[str, int] = {"syncs": 0, "rows": 0}
+
+    def sync(self) -> bool:
+        """
+        Make the table match the JSON on disk. A stat() when nothing changed;
+        another process that already materialized this version is reused.
+        Returns True when this call rewrote the table.
+        """
+        sig = _signature(self.contracts_path)
+        marker = sig or (-1, -1)
+        if marker == self._synced:
+            return False
+        with pooled_connection(self.db_path, write=True) as conn:
+            _ensure_tables(conn)
+            row = conn.execute(
+                "SELECT mtime_ns, size FROM runtime_contracts_meta WHERE source=?", (SOURCE,)
+            ).fetchone()
+            if row and (int(row[0]), int(row[1])) == marker:
+                self._synced = marker
+                return False
+            routes: Dict[str, Tuple[str, Any]] = {}
+            files: Dict[str, Tuple[str, Any]] = {}
+            if sig is not None:
+                try:
+                    data = json.loads(self.contracts_path.read_text(encoding="utf-8"))
+                    routes, files = _extract(data, self.normalize_route, self.normalize_path)
+                except Exception:
+                    routes, files = {}, {}
+            rows: List[Tuple[str, str, str, str, int, str]] = []
+            for kind, mapping in (("route", routes), ("file", files)):
+                for i, (key, (symbol, runtime)) in enumerate(mapping.items()):
+                    rows.append((kind, key, key[::-1], symbol, i, json.dumps(runtime, ensure_ascii=False)))
+            conn.execute("DELETE FROM runtime_contracts")
+            conn.executemany(
+                "INSERT INTO runtime_contracts (kind, key, key_rev, symbol, ord, runtime_json) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                """
+                INSERT INTO runtime_contracts_meta (source, mtime_ns, size, rows, synced_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(source) DO UPDATE SET
+                    mtime_ns=excluded.mtime_ns, size=excluded.size,
+                    rows=excluded.rows, synced_at=excluded.synced_at
+                """,
+                (SOURCE, marker[0], marker[1], len(rows), time.time()),
+            )
+        self._synced = marker
+        self.stats["syncs"] += 1
+        self.stats["rows"] = len(rows)
+        return True
+
+    def lookup_file(self, path: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(matched file, runtime) for an exact path, else the first indexed file ending with it."""
+        if not path:
+            return None
+        with pooled_connection(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT key, runtime_json FROM runtime_contracts WHERE kind='file' AND key=?", (path,)
+            ).fetchone()
+            if row is None:
+                rev = path[::-1]
+                row = conn.execute(
+                    """
+                    SELECT key, runtime_json FROM runtime_contracts
+                    WHERE kind='file' AND key_rev >= ? AND key_rev < ?
+                    ORDER BY ord LIMIT 1
+                    """,
+                    (rev, rev + _RANGE_END),
+                ).fetchone()
+        return (str(row[0]), json.loads(row[1])) if row else None
+
+    def lookup_route(self, route: str) -> Optional[Dict[str, Any]]:
+        if not route:
+            return None
+        with pooled_connection(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT runtime_json FROM runtime_contracts WHERE kind='route' AND key=?", (route,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
@@ -0,0 +1,350 @@
+"""
+Runtime Event Partitions
+------------------------
+Hot/cold storage for runtime_events.
+
+- Hot partition: `runtime_events` in knowledge.db keeps only the last N days, so
+  startup counts, digests and coverage scans stay proportional to recent activity.
+- Cold partitions: one SQLite file per month under `runtime_archive/`
+  (runtime_events_YYYYMM.db) with the same table layout and original ids.
+- Rollups: archived rows are compacted into `runtime_event_rollups`
+  (per day/scenario/event_type/route) so long-horizon aggregates survive archival.
+
+Use `full_history()` for the rare queries that need every event; it exposes a
+TEMP VIEW `runtime_events_all` over the hot table plus attached archives.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    from .schema_migrations import ensure_schema  # type: ignore
+except Exception:
+    from schema_migrations import ensure_schema  # type: ignore
+
+ARCHIVE_DIR = Path(__file__).parent / "runtime_archive"
+# SQLite allows 10 attached databases by default; keep one slot spare.
+MAX_ATTACHED = 9
+
+
+def _archive_dir(db_path: Path, archive_dir: Optional[Path]) -> Path:
+    if archive_dir is not None:
+        return Path(archive_dir)
+    return Path(db_path).parent / ARCHIVE_DIR.name
+
+
+def _month_key(ts: float) -> str:
+    return time.strftime("%Y%m", time.gmtime(float(ts or 0)))
+
+
+def ensure_partition_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS runtime_event_rollups (
+            day TEXT NOT NULL,
+            scenario_id TEXT NOT NULL DEFAULT '',
+            event_type TEXT NOT NULL,
+            route TEXT NOT NULL DEFAULT '',
+            event_count INTEGER DEFAULT 0,
+            error_count INTEGER DEFAULT 0,
+            timeout_count INTEGER DEFAULT 0,
+            http_fail_count INTEGER DEFAULT 0,
+            latency_sum REAL DEFAULT 0,
+            latency_max REAL DEFAULT 0,
+            first_ts REAL,
+            last_ts REAL,
+            PRIMARY KEY (day, scenario_id, event_type, route)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS runtime_archive_months (
+            month TEXT PRIMARY KEY,
+            db_file TEXT NOT NULL,
+            row_count INTEGER DEFAULT 0,
+            min_id INTEGER,
+            max_id INTEGER,
+            min_ts REAL,
+            max_ts REAL,
+            updated_at REAL
+        )
+        """
+    )
+
+
+def _event_columns(conn: sqlite3.Connection, schema: str = "main") -> List[str]:
+    return [r[1] for r in conn.execute(f"PRAGMA {schema}.table_info(runtime_events)").fetchall()]
+
+
+def _ensure_archive_table(conn: sqlite3.Connection, alias: str) -> None:
+    # Clone the hot table definition so archived rows keep identical columns and ids.
+    row = conn.execute(
+        "SELECT sql FROM main.sqlite_master WHERE type='table' AND name='runtime_events'"
+    ).fetchone()
+    ddl = str(row[0]) if row and row[0] else ""
+    if not ddl:
+        raise RuntimeError("runtime_events table missing")
+    ddl = re.sub(
+        r'^\s*CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?["`\[]?runtime_events["`\]]?',
+        f"CREATE TABLE IF NOT EXISTS {alias}.runtime_events",
+        ddl,
+        count=1,
+        flags=re.IGNORECASE,
+    )
+    conn.execute(ddl)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {alias}.idx_archive_events_ts ON runtime_events(timestamp)")
+
+
+def _rollup_batch(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        INSERT INTO runtime_event_rollups (
+            day, scenario_id, event_type, route, event_count, error_count, timeout_count,
+            http_fail_count, latency_sum, latency_max, first_ts, last_ts
+        )
+        SELECT
+            date(timestamp, 'unixepoch') AS day,
+            COALESCE(scenario_id, ''),
+            event_type,
+            COALESCE(route, ''),
+            COUNT(*),
+            SUM(
+                CASE
+                    WHEN event_type LIKE '%fail%' THEN 1
+                    WHEN error IS NOT NULL AND error != '' THEN 1
+                    WHEN COALESCE(status, 0) >= 400 THEN 1
+                    ELSE 0
+                END
+            ),
+            SUM(CASE WHEN event_type LIKE '%timeout%' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN COALESCE(status, 0) >= 400 THEN 1 ELSE 0 END),
+            COALESCE(SUM(latency_ms), 0),
+            COALESCE(MAX(latency_ms), 0),
+            MIN(timestamp),
+            MAX(timestamp)
+        FROM main.runtime_events
+        WHERE id IN (SELECT id FROM temp._archive_ids)
+        GROUP BY 1, 2, 3, 4
+        ON CONFLICT(day, scenario_id, event_type, route) DO UPDATE SET
+            event_count = event_count + excluded.event_count,
+            error_count = error_count + excluded.error_count,
+            timeout_count = timeout_count + excluded.timeout_count,
+            http_fail_count = http_fail_count + excluded.http_fail_count,
+            latency_sum = latency_sum + excluded.latency_sum,
+            latency_max = MAX(latency_max, excluded.latency_max),
+            first_ts = MIN(first_ts, excluded.first_ts),
+            last_ts = MAX(last_ts, excluded.last_ts)
+        """
+    )
+
+
+def archive_runtime_events(
+    db_path: Path,
+    *,
+    hot_days: float = 30,
+    batch_size: int = 5000,
+    max_batches: int = 40,
+    archive_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Move runtime_events older than `hot_days` into per-month archive databases
+    and roll them into runtime_event_rollups. Safe to re-run: archive inserts are
+    keyed by the original id and each batch commits before the next one starts.
+    """
+    stats: Dict[str, Any] = {"archived": 0, "batches": 0, "months": {}, "hot_days": hot_days}
+    db_path = Path(db_path)
+    if not db_path.exists() or hot_days <= 0:
+        return stats
+    ensure_schema(db_path)
+    cutoff = time.time() - float(hot_days) * 86400.0
+    stats["cutoff"] = cutoff
+    out_dir = _archive_dir(db_path, archive_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30.0)
+    try:
+        conn.execute("PRAGMA busy_timeout=15000")
+        ensure_partition_tables(conn)
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _archive_ids (id INTEGER PRIMARY KEY)")
+        conn.commit()
+        cols = ", ".join(_event_columns(conn))
+        for _ in range(max(1, int(max_batches))):
+            rows = conn.execute(
+                "SELECT id, timestamp FROM runtime_events WHERE timestamp < ? ORDER BY id LIMIT ?",
+                (cutoff, int(batch_size)),
+            ).fetchall()
+            if not rows:
+                break
+            by_month: Dict[str, List[int]] = {}
+            for rid, ts in rows:
+                by_month.setdefault(_month_key(ts), []).append(int(rid))
+            for month, ids in by_month.items():
+                archive_file = out_dir / f"runtime_events_{month}.db"
+                conn.execute("ATTACH DATABASE ? AS arc", (str(archive_file),))
+                try:
+                    _ensure_archive_table(conn, "arc")
+                    conn.execute("DELETE FROM temp._archive_ids")
+                    conn.executemany(
+                        "INSERT INTO temp._archive_ids (id) VALUES (?)", [(i,) for i in ids]
+                    )
+                    # Rows already in the archive (an earlier run whose archive write
+                    # landed but whose hot-table delete did not) are only removed from
+                    # the hot table; they were rolled up and counted the first time.
+                    already = [
+                        int(r[0])
+                        for r in conn.execute(
+                            "SELECT id FROM arc.runtime_events WHERE id IN (SELECT id FROM temp._archive_ids)"
+                        ).fetchall()
+                    ]
+                    if already:
+                        conn.executemany("DELETE FROM temp._archive_ids WHERE id = ?", [(i,) for i in already])
+                    before = conn.total_changes
+                    conn.execute(
+                        f"INSERT OR IGNORE INTO arc.runtime_events ({cols}) "
+                        f"SELECT {cols} FROM main.runtime_events WHERE id IN (SELECT id FROM temp._archive_ids)"
+                    )
+                    inserted = conn.total_changes - before
+                    if inserted:
+                        _rollup_batch(conn)
+                        bounds = conn.execute(
+                            "SELECT MIN(id), MAX(id), MIN(timestamp), MAX(timestamp) FROM main.runtime_events "
+                            "WHERE id IN (SELECT id FROM temp._archive_ids)"
+                        ).fetchone()
+                        conn.execute(
+                            """
+                            INSERT INTO runtime_archive_months (month, db_file, row_count, min_id, max_id, min_ts, max_ts, updated_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                            ON CONFLICT(month) DO UPDATE SET
+                                row_count = row_count + excluded.row_count,
+                                min_id = MIN(min_id, excluded.min_id),
+                                max_id = MAX(max_id, excluded.max_id),
+                                min_ts = MIN(min_ts, excluded.min_ts),
+                                max_ts = MAX(max_ts, excluded.max_ts),
+                                updated_at = excluded.updated_at
+                            """,
+                            (month, archive_file.name, inserted, bounds[0], bounds[1], bounds[2], bounds[3], time.time()),
+                        )
+                    conn.execute(
+                        "DELETE FROM main.runtime_events WHERE id IN (SELECT id FROM temp._archive_ids)"
+                    )
+                    if already:
+                        conn.executemany("DELETE FROM main.runtime_events WHERE id = ?", [(i,) for i in already])
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.execute("DETACH DATABASE arc")
+                stats["months"][month] = stats["months"].get(month, 0) + inserted
+                stats["archived"] += inserted
+                if already:
+                    stats["already_archived"] = stats.get("already_archived", 0) + len(already)
+            stats["batches"] += 1
+            if len(rows) < int(batch_size):
+                break
+    except Exception as exc:
+        stats["error"] = str(exc)
+    finally:
+        conn.close()
+    return stats
+
+
+def hot_meta(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    Startup-time runtime_events metadata. Touches only the hot table plus the
+    small archive index, never the archive files.
+    """
+    meta: Dict[str, Any] = {"count": 0, "last_timestamp": None, "archived_count": 0, "archive_months": 0}
+    row = conn.execute("SELECT COUNT(*), MAX(timestamp) FROM runtime_events").fetchone()
+    if row:
+        meta["count"] = int(row[0] or 0)
+        meta["last_timestamp"] = row[1]
+    try:
+        arow = conn.execute(
+            "SELECT COALESCE(SUM(row_count), 0), COUNT(*) FROM runtime_archive_months"
+        ).fetchone()
+        if arow:
+            meta["archived_count"] = int(arow[0] or 0)
+            meta["archive_months"] = int(arow[1] or 0)
+    except sqlite3.OperationalError:
+        pass
+    return meta
+
+
+def rollup_scenario_stats(conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
+    """Per-scenario totals from archived history (rollups only)."""
+    out: Dict[str, Dict[str, Any]] = {}
+    try:
+        rows = conn.execute(
+            """
+            SELECT scenario_id, SUM(event_count), MAX(last_ts), SUM(timeout_count), SUM(error_count)
+            FROM runtime_event_rollups
+            WHERE scenario_id != ''
+            GROUP BY scenario_id
+            """
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return out
+    for scenario_id, count, last_ts, timeout_count, error_count in rows:
+        out[str(scenario_id)] = {
+            "count": int(count or 0),
+            "last_ts": float(last_ts or 0.0),
+            "timeout_count": int(timeout_count or 0),
+            "error_count": int(error_count or 0),
+        }
+    return out
+
+
+@contextmanager
+def full_history(
+    db_path: Path,
+    *,
+    months: Optional[int] = None,
+    archive_dir: Optional[Path] = None,
+) -> Iterator[sqlite3.Connection]:
+    """
+    Open a dedicated connection exposing TEMP VIEW `runtime_events_all`
+    (hot table UNION ALL the most recent `months` archives, or every archive
+    when `months` is None). The newest MAX_ATTACHED months are attached;
+    older months are copied one at a time into a TEMP table, so the view is
+    never silently truncated by the attach limit. The connection is closed on exit.
+    """
+    db_path = Path(db_path)
+    conn = sqlite3.connect(str(db_path), timeout=30.0)
+    try:
+        cols = ", ".join(_event_columns(conn))
+        out_dir = _archive_dir(db_path, archive_dir)
+        files = sorted(out_dir.glob("runtime_events_*.db"), reverse=True) if out_dir.exists() else []
+        if months is not None:
+            files = files[: max(0, int(months))]
+        # Leave one attach slot free for copying the overflow months.
+        attached, overflow = (files, []) if len(files) <= MAX_ATTACHED else (files[: MAX_ATTACHED - 1], files[MAX_ATTACHED - 1 :])
+        selects = [f"SELECT {cols} FROM main.runtime_events"]
+        for idx, path in enumerate(attached):
+            alias = f"arc{idx}"
+            conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(path),))
+            selects.append(f"SELECT {cols} FROM {alias}.runtime_events")
+        if overflow:
+            conn.execute("DROP TABLE IF EXISTS temp._runtime_events_cold")
+            conn.execute(f"CREATE TEMP TABLE _runtime_events_cold AS SELECT {cols} FROM main.runtime_events WHERE 0")
+            for path in overflow:
+                conn.execute("ATTACH DATABASE ? AS cold", (str(path),))
+                try:
+                    conn.execute(
+                        f"INSERT INTO temp._runtime_events_cold ({cols}) SELECT {cols} FROM cold.runtime_events"
+                    )
+                    conn.commit()
+                finally:
+                    conn.execute("DETACH DATABASE cold")
+            selects.append(f"SELECT {cols} FROM temp._runtime_events_cold")
+        conn.execute("DROP VIEW IF EXISTS temp.runtime_events_all")
+        conn.execute("CREATE TEMP VIEW runtime_events_all AS " + " UNION ALL ".join(selects))
+        yield conn
+    finally:
+        conn.close()
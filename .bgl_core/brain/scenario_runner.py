@@ -13,6 +13,7 @@ Env overrides:
 
 import argparse
 import asyncio
+import copy
 import os
 from urllib.parse import urlparse, urljoin
 import subprocess
@@ -29,13 +30,38 @@ import sys
 from typing import Any, Dict, List, Optional, Tuple
 import atexit
 
-import yaml  # type: ignore
+try:
+    from .lazy_imports import lazy_import  # type: ignore
+except Exception:
+    from lazy_imports import lazy_import  # type: ignore
+
+yaml = lazy_import("yaml")
 from config_loader import load_config
-from browser_manager import BrowserManager
+from browser_manager import BrowserManager, shared_manager
+try:
+    from .db_utils import connect_db, start_checkpoint_scheduler  # type: ignore
+except Exception:
+    from db_utils import connect_db, start_checkpoint_scheduler  # type: ignore
+try:
+    from .flow_index import shared_index  # type: ignore
+except Exception:
+    from flow_index import shared_index  # type: ignore
+try:
+    from .tracing import current_span, traced  # type: ignore
+except Exception:
+    from tracing import current_span, traced  # type: ignore
 try:
-    from .db_utils import connect_db  # type: ignore
+    from .capture_store import recently_failed  # type: ignore
 except Exception:
-    from db_utils import connect_db  # type: ignore
+    from capture_store import recently_failed  # type: ignore
+try:
+    from . import exploration_state  # type: ignore
+except Exception:
+    import exploration_state  # type: ignore
+try:
+    from .schema_migrations import ensure_schema, schema_current  # type: ignore
+except Exception:
+    from schema_migrations import ensure_schema, schema_current  # type: ignore
 
 try:
     # Optional dependency: scenarios should still run without the visible cursor overlay.
@@ -72,11 +98,19 @@ except Exception:
 # تأكد من إمكانية استيراد الطبقات الداخلية عند التشغيل كسكربت
 sys.path.append(str(Path(__file__).parent))
 from hand_profile import HandProfile  # type: ignore
-from motor import Motor  # type: ignore
+from motor import Motor, MotorMode  # type: ignore
 from policy import Policy  # type: ignore
 from authority import Authority  # type: ignore
 from brain_types import ActionRequest, ActionKind  # type: ignore
-from perception import capture_ui_map, capture_semantic_map, summarize_semantic_map  # type: ignore
+from page_settle import wait_for_settle  # type: ignore
+from perception import (  # type: ignore
+    candidate_handle,
+    capture_semantic_map,
+    capture_ui_map,
+    harvest_candidates,
+    match_selectors,
+    summarize_semantic_map,
+)
 try:
     from .observations import (
         store_ui_semantic_snapshot,
@@ -151,6 +185,9 @@ _CURRENT_SCENARIO_ID = ""
 _CURRENT_SCENARIO_NAME = ""
 _CURRENT_GOAL_ID = ""
 _CURRENT_GOAL_NAME = ""
+# Step errors/timeouts logged so far; run_scenario diffs it to mark video failures.
+_SCENARIO_FAILURE_EVENTS = 0
+_FAILURE_EVENT_TYPES = frozenset({"scenario_step_error", "scenario_step_timeout"})
 _CONTEXT_ENV_KEYS = (
     "BGL_RUN_ID",
     "BGL_SCENARIO_ID",
@@ -594,7 +631,7 @@ async def _handle_ui_states(page, db_path: Path, session: str, *, reason: str =
                     await el.click()
                     actions.append(f"click:{sel}")
                     retry_needed = True
-                    await page.wait_for_timeout(120)
+                    await wait_for_settle(page, 120)
             except Exception:
                 continue
         # Fallback: click backdrop to close overlays when close buttons are missing.
@@ -605,22 +642,23 @@ async def _handle_ui_states(page, db_path: Path, session: str, *, reason: str =
                     await el.click()
                     actions.append(f"backdrop:{sel}")
                     retry_needed = True
-                    await page.wait_for_timeout(120)
+                    await wait_for_settle(page, 120)
                     break
             except Exception:
                 continue
 
     if ui_states.get("loading"):
+        # One bounded settle wait replaces the fixed 700ms + networkidle(1.5s) pair.
+        settle: Dict[str, Any] = {}
         try:
-            await page.wait_for_timeout(700)
+            settle = await wait_for_settle(page, 2200, min_ms=100)
             actions.append("wait_loading")
             retry_needed = True
         except Exception:
             pass
-        try:
-            await page.wait_for_load_state("networkidle", timeout=1500)
+        if settle.get("settled"):
             actions.append("wait_networkidle")
-        except Exception:
+        else:
             actions.append("loading_persist")
 
     # Attempt gentle recovery for common error/empty states (safe actions only).
@@ -663,7 +701,7 @@ async def _handle_ui_states(page, db_path: Path, session: str, *, reason: str =
                 await el.click()
                 actions.append(f"recover:{sel}")
                 retry_needed = True
-                await page.wait_for_timeout(150)
+                await wait_for_settle(page, 150)
                 # Only one recovery click to avoid accidental cascades.
                 break
             except Exception:
@@ -834,7 +872,7 @@ async def _attempt_semantic_shift(page, db_path: Path, session: str) -> bool:
             try:
                 if not meta or _candidate_needs_hover(meta):
                     await el.hover()
-                    await page.wait_for_timeout(120)
+                    await wait_for_settle(page, 120)
             except Exception:
                 pass
             try:
@@ -842,7 +880,7 @@ async def _attempt_semantic_shift(page, db_path: Path, session: str) -> bool:
             except Exception:
                 # Some selectors are hover-only; ignore click errors.
                 pass
-            await page.wait_for_timeout(240)
+            await wait_for_settle(page, 240)
             after_hash = await _dom_state_hash(page)
             changed = bool(before_hash and after_hash and before_hash != after_hash)
             last_attempt = {
@@ -952,101 +990,8 @@ async def exploratory_action(
     try:
         safe_action_candidates: List[Dict[str, Any]] = []
         last_attempt: Dict[str, Any] = {}
-        candidates = await page.query_selector_all(
-            "button, a, [role='button'], [data-action], input, textarea, select"
-        )
-        candidate_meta = []
-        for el in candidates:
-            try:
-                tag = (
-                    await el.evaluate("el => (el.tagName || '').toLowerCase()")
-                ) or ""
-                text = (
-                    await el.evaluate(
-                        "el => (el.innerText || el.textContent || '').trim().slice(0, 120)"
-                    )
-                ) or ""
-                role = await el.get_attribute("role") or ""
-                onclick = await el.get_attribute("onclick") or ""
-                data_tab = await el.get_attribute("data-tab") or ""
-                data_target = await el.get_attribute("data-target") or ""
-                data_bs_target = await el.get_attribute("data-bs-target") or ""
-                data_target_attr = (
-                    "data-bs-target" if data_bs_target else ("data-target" if data_target else "")
-                )
-                aria_controls = await el.get_attribute("aria-controls") or ""
-                classes = await el.get_attribute("class") or ""
-                elem_id = await el.get_attribute("id") or ""
-                elem_name = await el.get_attribute("name") or ""
-                testid = ""
-                testattr = ""
-                for attr in ("data-testid", "data-test", "data-qa", "data-cy"):
-                    try:
-                        val = await el.get_attribute(attr)
-                    except Exception:
-                        val = None
-                    if val:
-                        testid = str(val)
-                        testattr = attr
-                        break
-                aria_selected = await el.get_attribute("aria-selected") or ""
-                aria_expanded = await el.get_attribute("aria-expanded") or ""
-                aria_disabled = await el.get_attribute("aria-disabled") or ""
-                try:
-                    disabled_prop = await el.evaluate("el => !!el.disabled")
-                except Exception:
-                    disabled_prop = False
-                disabled_attr = await el.get_attribute("disabled")
-                disabled = "true" if disabled_prop or disabled_attr is not None else ""
-                meta = {
-                    "element": el,
-                    "tag": tag,
-                    "role": role,
-                    "classes": classes,
-                    "text": text,
-                    "href": await el.get_attribute("href") or "",
-                    "selector": _selector_from_element(
-                        {
-                            "tag": tag,
-                            "id": elem_id,
-                            "name": elem_name,
-                            "classes": classes,
-                            "href": await el.get_attribute("href") or "",
-                            "type": await el.get_attribute("type") or "",
-                            "text": text,
-                            "role": role,
-                            "onclick": onclick,
-                            "datatab": data_tab,
-                            "datatarget": data_bs_target or data_target,
-                            "datatarget_attr": data_target_attr,
-                            "ariacontrols": aria_controls,
-                            "aria_selected": aria_selected,
-                            "aria_expanded": aria_expanded,
-                            "aria_disabled": aria_disabled,
-                            "disabled": disabled,
-                            "testid": testid,
-                            "testattr": testattr,
-                        }
-                    )
-                    or "",
-                    "id": elem_id,
-                    "name": elem_name,
-                    "testid": testid,
-                    "testattr": testattr,
-                    "onclick": onclick,
-                    "datatab": data_tab,
-                    "datatarget": data_bs_target or data_target,
-                    "datatarget_attr": data_target_attr,
-                    "ariacontrols": aria_controls,
-                    "aria_selected": aria_selected,
-                    "aria_expanded": aria_expanded,
-                    "aria_disabled": aria_disabled,
-                    "disabled": disabled,
-                }
-                meta["selector_key"] = _stable_selector_key(meta)
-                candidate_meta.append(meta)
-            except Exception:
-                continue
+        # One in-page pass instead of ~20 CDP round trips per element.
+        candidate_meta = _build_selector_candidates(await harvest_candidates(page))
 
         if candidate_meta:
             candidate_meta = [
@@ -1136,7 +1081,7 @@ async def exploratory_action(
                         page._bgl_last_non_write_attempt = last_attempt  # type: ignore[attr-defined]
                     except Exception:
                         pass
-                    await page.wait_for_timeout(300)
+                    await wait_for_settle(page, 300)
                     after_hash = await _dom_state_hash(page)
                     seen.add(hash(f"search:{term}"))
                     with open(learn_log, "a", encoding="utf-8") as f:
@@ -1202,14 +1147,8 @@ async def exploratory_action(
                     pass
 
         for m in candidate_meta:
-            el = m["element"]
-            desc = (
-                await el.get_attribute("title")
-                or await el.text_content()
-                or await el.get_attribute("href")
-                or ""
-            )
-            href = await el.get_attribute("href") or ""
+            desc = str(m.get("desc") or "")
+            href = str(m.get("href") or "")
             href_norm = href.strip().lower()
             # Avoid repeatedly hovering/clicking home links
             if (
@@ -1220,6 +1159,9 @@ async def exploratory_action(
             h = hash(desc)
             if h in seen:
                 continue
+            el = await candidate_handle(page, m)
+            if el is None:
+                continue
             box = await el.bounding_box()
             if box:
                 x = box["x"] + box["width"] / 2
@@ -1234,7 +1176,7 @@ async def exploratory_action(
                 except Exception:
                     pass
                 await motor.move_to(page, x, y, danger=False)
-                await page.wait_for_timeout(80)
+                await wait_for_settle(page, 80)
                 seen.add(h)
                 _record_explored_selector(
                     ROOT_DIR / ".bgl_core" / "brain" / "knowledge.db",
@@ -1544,7 +1486,7 @@ async def run_step(
                 db_path=db_path,
             )
             if extra_wait_ms:
-                await page.wait_for_timeout(int(extra_wait_ms))
+                await wait_for_settle(page, int(extra_wait_ms))
         except Exception:
             if not step.get("optional"):
                 raise
@@ -1554,7 +1496,7 @@ async def run_step(
             selector = str(step.get("selector", ""))
             if selector:
                 await page.hover(selector)
-                await page.wait_for_timeout(int(step.get("hover_wait_ms", 120)))
+                await wait_for_settle(page, int(step.get("hover_wait_ms", 120)))
         except Exception:
             if not step.get("optional"):
                 raise
@@ -1836,7 +1778,7 @@ async def run_step(
         dx = int(step.get("dx", 0))
         dy = int(step.get("dy", 400))
         await page.mouse.wheel(dx, dy)
-        await page.wait_for_timeout(int(step.get("post_wait_ms", 200)))
+        await wait_for_settle(page, int(step.get("post_wait_ms", 200)))
     else:
         print(f"[!] Unknown action in scenario: {action}")
     if is_interactive and step.get("track_outcome", True):
@@ -2195,25 +2137,8 @@ def _write_runtime_fallback(session: str, event: Dict[str, Any], error: str) ->
         pass
 
 
-def log_event(db_path: Path, session: str, event: Dict[str, Any]):
-    try:
-        timeout = float(os.getenv("BGL_EVENT_DB_TIMEOUT", "5"))
-    except Exception:
-        timeout = 5.0
-    if os.getenv("BGL_TRACE_SCENARIO", "0") == "1":
-        _trace(f"log_event: start type={event.get('event_type')} session={session}")
-    try:
-        db = connect_db(str(db_path), timeout=timeout)
-        db.execute("PRAGMA journal_mode=WAL;")
-        try:
-            db.execute(f"PRAGMA busy_timeout={int(timeout * 1000)};")
-        except Exception:
-            pass
-    except Exception as e:
-        if os.getenv("BGL_TRACE_SCENARIO", "0") == "1":
-            _trace(f"log_event: db open error {e}")
-        _write_runtime_fallback(session, event, f"db_open_failed:{e}")
-        return
+def _ensure_runtime_events_table(db: sqlite3.Connection) -> bool:
+    """Legacy per-connection DDL, used only when the migration registry could not run."""
     try:
         db.execute(
             """
@@ -2240,11 +2165,7 @@ def log_event(db_path: Path, session: str, event: Dict[str, Any]):
     except Exception as e:
         if os.getenv("BGL_TRACE_SCENARIO", "0") == "1":
             _trace(f"log_event: table error {e}")
-        try:
-            db.close()
-        except Exception:
-            pass
-        return
+        return False
     try:
         cols = {r[1] for r in db.execute("PRAGMA table_info(runtime_events)").fetchall()}
         if "run_id" not in cols:
@@ -2259,6 +2180,36 @@ def log_event(db_path: Path, session: str, event: Dict[str, Any]):
             db.execute("ALTER TABLE runtime_events ADD COLUMN step_id TEXT")
     except Exception:
         pass
+    return True
+
+
+def log_event(db_path: Path, session: str, event: Dict[str, Any]):
+    global _SCENARIO_FAILURE_EVENTS
+    if event.get("event_type") in _FAILURE_EVENT_TYPES:
+        _SCENARIO_FAILURE_EVENTS += 1
+    try:
+        timeout = float(os.getenv("BGL_EVENT_DB_TIMEOUT", "5"))
+    except Exception:
+        timeout = 5.0
+    if os.getenv("BGL_TRACE_SCENARIO", "0") == "1":
+        _trace(f"log_event: start type={event.get('event_type')} session={session}")
+    try:
+        db = connect_db(str(db_path), timeout=timeout)
+        try:
+            db.execute(f"PRAGMA busy_timeout={int(timeout * 1000)};")
+        except Exception:
+            pass
+    except Exception as e:
+        if os.getenv("BGL_TRACE_SCENARIO", "0") == "1":
+            _trace(f"log_event: db open error {e}")
+        _write_runtime_fallback(session, event, f"db_open_failed:{e}")
+        return
+    if not ensure_schema(db_path) and not _ensure_runtime_events_table(db):
+        try:
+            db.close()
+        except Exception:
+            pass
+        return
     payload = event.get("payload")
     meta = event.get("meta")
     if isinstance(payload, dict):
@@ -2310,6 +2261,8 @@ def log_event(db_path: Path, session: str, event: Dict[str, Any]):
 
 
 def _ensure_outcomes_tables(db: sqlite3.Connection) -> None:
+    if schema_current(db):
+        return
     db.execute(
         """
         CREATE TABLE IF NOT EXISTS exploration_outcomes (
@@ -2384,14 +2337,17 @@ def _log_outcome(
     try:
         if not db_path.exists():
             return None
+        migrated = ensure_schema(db_path)
         db = connect_db(str(db_path), timeout=30.0)
-        db.execute("PRAGMA journal_mode=WAL;")
-        _ensure_outcomes_tables(db)
+        if migrated:
+            cols = {"run_id", "scenario_id", "goal_id"}
+        else:
+            _ensure_outcomes_tables(db)
+            cols = {
+                r[1]
+                for r in db.execute("PRAGMA table_info(exploration_outcomes)").fetchall()
+            }
         payload_json = json.dumps(payload or {}, ensure_ascii=False)
-        cols = {
-            r[1]
-            for r in db.execute("PRAGMA table_info(exploration_outcomes)").fetchall()
-        }
         run_id = str(_CURRENT_RUN_ID or os.getenv("BGL_RUN_ID") or "")
         scenario_id = str(_CURRENT_SCENARIO_ID or os.getenv("BGL_SCENARIO_ID") or "")
         goal_id = str(_CURRENT_GOAL_ID or os.getenv("BGL_GOAL_ID") or "")
@@ -2670,42 +2626,47 @@ def _reward_exploration_from_outcomes(db_path: Path, since_ts: float) -> None:
             (since_ts,),
         ).fetchall()
         db.close()
-        for event_type, payload, route in rows:
-            sel = _last_selector_from_payload(str(payload or ""))
-            if event_type in ("dom_no_change", "search_no_change"):
-                penalty = -0.6
-                try:
-                    # Increase penalty if selector is repeatedly unproductive
-                    if sel and _novelty_score(db_path, sel) < 0.2:
-                        penalty = -1.0
-                except Exception:
-                    pass
-                _apply_exploration_reward(db_path, sel, penalty)
-                # If repeated no-change, push a gap-deepen goal
-                try:
-                    if penalty <= -1.0:
-                        term = ""
-                        if str(payload or "").startswith("term:"):
-                            term = str(payload or "").split("term:", 1)[1].strip()
-                        _write_autonomy_goal(
-                            db_path,
-                            goal="gap_deepen",
-                            payload={
-                                "uri": str(route or ""),
-                                "kind": "gap",
-                                "value": event_type,
-                                "score": float(penalty),
-                                "search_term": term,
-                            },
-                            source="stall_guard",
-                            ttl_days=5,
-                        )
-                except Exception:
-                    pass
-            elif event_type in ("http_error", "network_fail"):
-                _apply_exploration_reward(db_path, sel, -0.3)
-            elif event_type == "api_call":
-                _apply_exploration_reward(db_path, sel, 0.4)
+        # One store load and one write-behind flush instead of a round trip per row.
+        _begin_exploration_state(db_path)
+        try:
+            for event_type, payload, route in rows:
+                sel = _last_selector_from_payload(str(payload or ""))
+                if event_type in ("dom_no_change", "search_no_change"):
+                    penalty = -0.6
+                    try:
+                        # Increase penalty if selector is repeatedly unproductive
+                        if sel and _novelty_score(db_path, sel) < 0.2:
+                            penalty = -1.0
+                    except Exception:
+                        pass
+                    _apply_exploration_reward(db_path, sel, penalty)
+                    # If repeated no-change, push a gap-deepen goal
+                    try:
+                        if penalty <= -1.0:
+                            term = ""
+                            if str(payload or "").startswith("term:"):
+                                term = str(payload or "").split("term:", 1)[1].strip()
+                            _write_autonomy_goal(
+                                db_path,
+                                goal="gap_deepen",
+                                payload={
+                                    "uri": str(route or ""),
+                                    "kind": "gap",
+                                    "value": event_type,
+                                    "score": float(penalty),
+                                    "search_term": term,
+                                },
+                                source="stall_guard",
+                                ttl_days=5,
+                            )
+                    except Exception:
+                        pass
+                elif event_type in ("http_error", "network_fail"):
+                    _apply_exploration_reward(db_path, sel, -0.3)
+                elif event_type == "api_call":
+                    _apply_exploration_reward(db_path, sel, 0.4)
+        finally:
+            _end_exploration_state(db_path)
     except Exception:
         return
 
@@ -3009,6 +2970,24 @@ def _autonomous_enabled() -> bool:
         return False
 
 
+def _motor_mode_for_scenario(name: str, origin: str, is_gap: bool) -> str:
+    """
+    human: HandProfile trajectories (default for authored scenarios).
+    fast/direct: throughput-oriented motion for gap/regression runs.
+    """
+    mode = os.getenv("BGL_MOTOR_MODE") or str(_cfg_value("motor_mode", "auto") or "auto")
+    mode = mode.strip().lower()
+    if mode in (MotorMode.human, MotorMode.fast, MotorMode.direct):
+        return mode
+    fast_style = str(_cfg_value("motor_fast_style", MotorMode.fast) or MotorMode.fast).strip().lower()
+    if fast_style not in (MotorMode.fast, MotorMode.direct):
+        fast_style = MotorMode.fast
+    lowered = str(name or "").lower()
+    if is_gap or "regression" in str(origin or "") or lowered.startswith("regression"):
+        return fast_style
+    return MotorMode.human
+
+
 def _routes_table_count(db_path: Path) -> int:
     try:
         if not db_path.exists():
@@ -3164,6 +3143,25 @@ def _maybe_reindex_after_exploration(root: Path, db_path: Path) -> None:
         return
 
 
+_SCENARIO_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+def _load_scenario_data(path: Path) -> Dict[str, Any]:
+    """
+    Parsed scenario YAML, cached by (mtime_ns, size) so resident workers and
+    repeated filters do not re-parse the catalog. Returns a private copy.
+    """
+    key = str(path)
+    st = path.stat()
+    sig = (int(st.st_mtime_ns), int(st.st_size))
+    hit = _SCENARIO_CACHE.get(key)
+    if hit is None or hit[0] != sig:
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        hit = (sig, data if isinstance(data, dict) else {})
+        _SCENARIO_CACHE[key] = hit
+    return copy.deepcopy(hit[1])
+
+
 def _cfg_value(key: str, default: Any = None) -> Any:
     try:
         cfg = load_config(ROOT_DIR)
@@ -3629,35 +3627,26 @@ def _load_ui_flow_bias(
     cutoff = time.time() - (days * 86400)
     out: List[Dict[str, Any]] = []
     try:
+        # Incremental per-route transition counts, kept warm across calls;
+        # aggregated by normalized route so selector-less rows never crowd out the top N.
+        index = shared_index(db_path, "ui_flow_bias", _normalize_route_path, include_events=False)
         db = connect_db(str(db_path), timeout=30.0)
-        db.row_factory = sqlite3.Row
-        rows = db.execute(
-            """
-            SELECT from_url, to_url, action, selector, COUNT(*) as c
-            FROM ui_flow_transitions
-            WHERE created_at >= ?
-            GROUP BY from_url, to_url, action, selector
-            ORDER BY c DESC
-            LIMIT ?
-            """,
-            (cutoff, int(limit) * 4),
-        ).fetchall()
-        db.close()
+        try:
+            index.refresh(db, cutoff)
+        finally:
+            db.close()
+        transitions = index.transitions_from(norm, limit=0)
     except Exception:
         return []
-    for r in rows:
-        from_url = _normalize_route_path(str(r["from_url"] or ""))
-        if from_url != norm:
-            continue
-        selector = str(r["selector"] or "")
-        if not selector:
+    for t in transitions:
+        if not t.get("selector"):
             continue
         out.append(
             {
-                "selector": selector,
-                "to": _normalize_route_path(str(r["to_url"] or "")),
-                "action": str(r["action"] or ""),
-                "count": int(r["c"] or 0),
+                "selector": t["selector"],
+                "to": t["to"],
+                "action": t["action"],
+                "count": t["count"],
             }
         )
         if len(out) >= limit:
@@ -4169,6 +4158,34 @@ def _text_hints_from_context(ctx: Dict[str, Any], limit: int = 3) -> List[str]:
     return _unique_order(texts)[: max(1, int(limit or 1))]
 
 
+# Playwright-only selector syntax; document.querySelector rejects these.
+_PLAYWRIGHT_SELECTOR_MARKERS = (":has-text(", ":text(", ":text-is(", ":text-matches(", ":visible", ">>", "text=", "xpath=", "css=")
+
+
+def _is_plain_css(selector: str) -> bool:
+    sel = str(selector or "")
+    return not any(marker in sel for marker in _PLAYWRIGHT_SELECTOR_MARKERS)
+
+
+async def _present_selectors(page, selectors: List[str]) -> set:
+    """
+    Selectors that currently match an element: plain CSS in one
+    match_selectors() round trip, Playwright-only syntax (:has-text, text=)
+    through page.query_selector.
+    """
+    css = [s for s in selectors if _is_plain_css(s)]
+    present = {str(rec.get("query") or "") for rec in await match_selectors(page, css)} if css else set()
+    for sel in selectors:
+        if sel in present or _is_plain_css(sel):
+            continue
+        try:
+            if await page.query_selector(sel):
+                present.add(sel)
+        except Exception:
+            continue
+    return present
+
+
 def _text_reveal_selectors(text_hints: List[str]) -> List[str]:
     selectors: List[str] = []
     for raw in text_hints:
@@ -4387,15 +4404,15 @@ async def _attempt_self_heal(
         limit = 3
     clicked: List[str] = []
     combined_reveals = reveal_selectors + text_reveals
+    present = await _present_selectors(page, combined_reveals[: max(1, limit)])
     for sel in combined_reveals[: max(1, limit)]:
         try:
-            el = await page.query_selector(sel)
-            if not el:
+            if sel not in present:
                 continue
             await page.click(sel, timeout=1200)
             clicked.append(sel)
             actions.append({"kind": "click_reveal", "selector": sel})
-            await page.wait_for_timeout(120)
+            await wait_for_settle(page, 120)
         except Exception:
             continue
 
@@ -4421,7 +4438,7 @@ async def _attempt_self_heal(
 
     if actions:
         try:
-            await page.wait_for_timeout(180)
+            await wait_for_settle(page, 180)
         except Exception:
             pass
     post = await _probe_element_state(page, action, selector)
@@ -4602,7 +4619,7 @@ async def _attempt_search_submit(
     changed = False
     try:
         await page.press(selector, "Enter", timeout=2000)
-        await page.wait_for_timeout(250)
+        await wait_for_settle(page, 250)
     except Exception:
         pass
     after = await _dom_state_hash(page)
@@ -4623,7 +4640,7 @@ async def _attempt_search_submit(
     # Fallback: try clicking a search button
     try:
         if await _try_click_search_button(page):
-            await page.wait_for_timeout(250)
+            await wait_for_settle(page, 250)
             after2 = await _dom_state_hash(page)
             if before and after2 and before != after2:
                 changed = True
@@ -4672,7 +4689,7 @@ async def _attempt_form_submit(
     changed = False
     try:
         await page.press(selector, "Enter", timeout=2000)
-        await page.wait_for_timeout(250)
+        await wait_for_settle(page, 250)
     except Exception:
         pass
     after = await _dom_state_hash(page)
@@ -4706,12 +4723,16 @@ async def _attempt_form_submit(
 
 
 def _ensure_exploration_table(db: sqlite3.Connection) -> None:
+    if schema_current(db):
+        return
     db.execute(
         "CREATE TABLE IF NOT EXISTS exploration_history (id INTEGER PRIMARY KEY AUTOINCREMENT, selector TEXT, href TEXT, tag TEXT, created_at REAL)"
     )
 
 
 def _ensure_exploration_novelty_table(db: sqlite3.Connection) -> None:
+    if schema_current(db):
+        return
     db.execute(
         """
         CREATE TABLE IF NOT EXISTS exploration_novelty (
@@ -4742,6 +4763,9 @@ def _ensure_exploration_novelty_table(db: sqlite3.Connection) -> None:
 
 
 def _load_explored_selectors(db_path: Path, limit: int = 2000) -> set:
+    state = exploration_state.active_state(db_path)
+    if state is not None:
+        return set(state.explored)
     try:
         if not db_path.exists():
             return set()
@@ -4767,6 +4791,10 @@ def _load_explored_selectors(db_path: Path, limit: int = 2000) -> set:
 def _record_explored_selector(
     db_path: Path, selector: str, href: str, tag: str
 ) -> None:
+    state = exploration_state.active_state(db_path)
+    if state is not None:
+        state.record_explored(selector, href, tag)
+        return
     try:
         if not db_path.exists():
             return
@@ -4809,6 +4837,30 @@ def _record_exploration_outcome(
     delta_score: float = 0.0,
     selector_key: str | None = None,
 ) -> None:
+    state = exploration_state.active_state(db_path)
+    if state is not None:
+        key = str(selector_key or "").strip() or _selector_key_from_selector(selector)
+        state.record_outcome(
+            selector=selector,
+            selector_key=key,
+            href_base=_href_basename(href or "") if href else "",
+            route=route,
+            result=result,
+            delta_score=delta_score,
+        )
+        state.queue_memory_item(
+            {
+                "kind": "exploration",
+                "key_text": selector,
+                "summary": f"{result} on {route or 'unknown'}",
+                "evidence_count": 1,
+                "confidence": 0.55 if result == "changed" else 0.4,
+                "meta": {"href": href, "route": route, "delta_score": delta_score},
+                "source_table": "exploration_novelty",
+                "source_id": None,
+            }
+        )
+        return
     try:
         if not db_path.exists():
             return
@@ -4875,23 +4927,34 @@ def _record_exploration_outcome(
 
 def _novelty_score(db_path: Path, selector: str, selector_key: str = "") -> float:
     try:
-        if not db_path.exists() or (not selector and not selector_key):
+        if not selector and not selector_key:
             return 1.0
-        db = connect_db(str(db_path), timeout=30.0)
-        db.execute("PRAGMA journal_mode=WAL;")
-        _ensure_exploration_novelty_table(db)
-        key = str(selector_key or "").strip()
-        if key:
-            row = db.execute(
-                "SELECT seen_count, last_seen, last_score_delta FROM exploration_novelty WHERE selector_key=?",
-                (key,),
-            ).fetchone()
+        state = exploration_state.active_state(db_path)
+        if state is not None:
+            cached = state.novelty_row(selector, selector_key)
+            row = (
+                (cached["seen_count"], cached["last_seen"], cached["last_score_delta"])
+                if cached
+                else None
+            )
         else:
-            row = db.execute(
-                "SELECT seen_count, last_seen, last_score_delta FROM exploration_novelty WHERE selector=?",
-                (selector,),
-            ).fetchone()
-        db.close()
+            if not db_path.exists():
+                return 1.0
+            db = connect_db(str(db_path), timeout=30.0)
+            db.execute("PRAGMA journal_mode=WAL;")
+            _ensure_exploration_novelty_table(db)
+            key = str(selector_key or "").strip()
+            if key:
+                row = db.execute(
+                    "SELECT seen_count, last_seen, last_score_delta FROM exploration_novelty WHERE selector_key=?",
+                    (key,),
+                ).fetchone()
+            else:
+                row = db.execute(
+                    "SELECT seen_count, last_seen, last_score_delta FROM exploration_novelty WHERE selector=?",
+                    (selector,),
+                ).fetchone()
+            db.close()
         if not row:
             return 3.0
         seen_count, last_seen, last_score_delta = row
@@ -4923,6 +4986,8 @@ def _rank_exploration_candidate(meta: Dict[str, Any], explored: set) -> float:
 
 
 def _ensure_autonomy_goals_table(db: sqlite3.Connection) -> None:
+    if schema_current(db):
+        return
     db.execute(
         "CREATE TABLE IF NOT EXISTS autonomy_goals (id INTEGER PRIMARY KEY AUTOINCREMENT, goal TEXT, payload TEXT, source TEXT, created_at REAL, expires_at REAL)"
     )
@@ -5960,6 +6025,8 @@ def _goal_route_kind(uri: str) -> str:
 
 
 def _ensure_goal_strategy_table(db: sqlite3.Connection) -> None:
+    if schema_current(db):
+        return
     db.execute(
         "CREATE TABLE IF NOT EXISTS autonomy_goal_strategy (id INTEGER PRIMARY KEY AUTOINCREMENT, goal TEXT, route_kind TEXT, strategy TEXT, success INTEGER, fail INTEGER, updated_at REAL)"
     )
@@ -6506,6 +6573,8 @@ def _route_key_from_url(url: str) -> str:
 
 
 def _ensure_selector_cooldown_table(db: sqlite3.Connection) -> None:
+    if schema_current(db):
+        return
     try:
         db.execute(
             """
@@ -6526,7 +6595,12 @@ def _ensure_selector_cooldown_table(db: sqlite3.Connection) -> None:
 
 
 def _get_selector_cooldown(db_path: Path, selector_key: str, route_key: str) -> Optional[Dict[str, Any]]:
-    if not selector_key or not route_key or not db_path.exists():
+    if not selector_key or not route_key:
+        return None
+    state = exploration_state.active_state(db_path)
+    if state is not None:
+        return state.get_cooldown(selector_key, route_key)
+    if not db_path.exists():
         return None
     try:
         db = connect_db(str(db_path), timeout=3.0)
@@ -6552,6 +6626,32 @@ def _get_selector_cooldown(db_path: Path, selector_key: str, route_key: str) ->
         return None
 
 
+def _selector_cooldown_threshold() -> int:
+    try:
+        return int(_cfg_value("selector_cooldown_threshold", 3) or 3)
+    except Exception:
+        return 3
+
+
+def _next_selector_failure(fail_count: int, cooldown_until: float, now: float) -> Tuple[int, float]:
+    """Bump the failure count and extend the cooldown with linear backoff past the threshold."""
+    fail_count += 1
+    threshold = _selector_cooldown_threshold()
+    try:
+        base_minutes = float(_cfg_value("selector_cooldown_minutes", 10) or 10)
+    except Exception:
+        base_minutes = 10.0
+    try:
+        max_minutes = float(_cfg_value("selector_cooldown_max_minutes", 120) or 120)
+    except Exception:
+        max_minutes = 120.0
+    if fail_count >= threshold:
+        backoff_factor = 1.0 + max(0, fail_count - threshold)
+        cooldown_sec = min(max_minutes * 60.0, base_minutes * 60.0 * backoff_factor)
+        cooldown_until = max(cooldown_until, now + cooldown_sec)
+    return fail_count, cooldown_until
+
+
 def _record_selector_failure(
     db_path: Path,
     selector_key: str,
@@ -6560,9 +6660,32 @@ def _record_selector_failure(
     reason: str,
     run_id: str,
 ) -> Optional[Dict[str, Any]]:
-    if not selector_key or not route_key or not db_path.exists():
+    if not selector_key or not route_key:
         return None
     now = time.time()
+    state = exploration_state.active_state(db_path)
+    if state is not None:
+        prev = state.get_cooldown(selector_key, route_key) or {}
+        fail_count, cooldown_until = _next_selector_failure(
+            int(prev.get("fail_count") or 0), float(prev.get("cooldown_until") or 0), now
+        )
+        state.put_cooldown(
+            selector_key,
+            route_key,
+            {
+                "fail_count": fail_count,
+                "cooldown_until": cooldown_until,
+                "last_reason": reason,
+                "last_seen": now,
+                "last_run_id": run_id,
+            },
+        )
+        return {
+            "fail_count": fail_count,
+            "cooldown_until": cooldown_until,
+        }
+    if not db_path.exists():
+        return None
     try:
         db = connect_db(str(db_path), timeout=3.0)
         _ensure_selector_cooldown_table(db)
@@ -6574,25 +6697,9 @@ def _record_selector_failure(
             """,
             (selector_key, route_key),
         ).fetchone()
-        fail_count = int(row[0] or 0) if row else 0
-        fail_count += 1
-        try:
-            threshold = int(_cfg_value("selector_cooldown_threshold", 3) or 3)
-        except Exception:
-            threshold = 3
-        try:
-            base_minutes = float(_cfg_value("selector_cooldown_minutes", 10) or 10)
-        except Exception:
-            base_minutes = 10.0
-        try:
-            max_minutes = float(_cfg_value("selector_cooldown_max_minutes", 120) or 120)
-        except Exception:
-            max_minutes = 120.0
-        cooldown_until = float(row[1] or 0) if row else 0.0
-        if fail_count >= threshold:
-            backoff_factor = 1.0 + max(0, fail_count - threshold)
-            cooldown_sec = min(max_minutes * 60.0, base_minutes * 60.0 * backoff_factor)
-            cooldown_until = max(cooldown_until, now + cooldown_sec)
+        fail_count, cooldown_until = _next_selector_failure(
+            int(row[0] or 0) if row else 0, float(row[1] or 0) if row else 0.0, now
+        )
         db.execute(
             """
             INSERT INTO selector_cooldowns (selector_key, route_key, fail_count, last_seen, cooldown_until, last_reason, last_run_id)
@@ -6617,7 +6724,19 @@ def _record_selector_failure(
 
 
 def _record_selector_success(db_path: Path, selector_key: str, route_key: str) -> None:
-    if not selector_key or not route_key or not db_path.exists():
+    if not selector_key or not route_key:
+        return
+    state = exploration_state.active_state(db_path)
+    if state is not None:
+        entry = state.get_cooldown(selector_key, route_key)
+        if entry:
+            entry["fail_count"] = max(0, int(entry.get("fail_count") or 0) - 1)
+            if entry["fail_count"] < _selector_cooldown_threshold():
+                entry["cooldown_until"] = 0.0
+            entry["last_seen"] = time.time()
+            state.put_cooldown(selector_key, route_key, entry)
+        return
+    if not db_path.exists():
         return
     try:
         db = connect_db(str(db_path), timeout=3.0)
@@ -6632,11 +6751,7 @@ def _record_selector_success(db_path: Path, selector_key: str, route_key: str) -
         ).fetchone()
         if row:
             fail_count = max(0, int(row[0] or 0) - 1)
-            try:
-                threshold = int(_cfg_value("selector_cooldown_threshold", 3) or 3)
-            except Exception:
-                threshold = 3
-            cooldown_until = 0.0 if fail_count < threshold else None
+            cooldown_until = 0.0 if fail_count < _selector_cooldown_threshold() else None
             if cooldown_until is not None:
                 db.execute(
                     """
@@ -6661,6 +6776,79 @@ def _record_selector_success(db_path: Path, selector_key: str, route_key: str) -
         return
 
 
+def _begin_exploration_state(db_path: Path) -> None:
+    """Open (or re-enter) the per-run exploration store; loaded once per scenario."""
+    enabled = os.getenv("BGL_EXPLORATION_STATE_CACHE", str(_cfg_value("exploration_state_cache", 1)))
+    if not db_path.exists() or str(enabled).strip().lower() in ("0", "false"):
+        return
+
+    def _load(state: "exploration_state.ExplorationState") -> None:
+        try:
+            db = connect_db(str(db_path), timeout=30.0)
+            try:
+                _ensure_exploration_table(db)
+                _ensure_exploration_novelty_table(db)
+                _ensure_selector_cooldown_table(db)
+                state.load(db)
+            finally:
+                db.close()
+        except Exception:
+            pass
+
+    exploration_state.activate(db_path, _load)
+
+
+def _flush_exploration_state(db_path: Path, *, force: bool = False) -> None:
+    """Write-behind: persist queued cooldown/novelty/history rows in one transaction."""
+    state = exploration_state.active_state(db_path)
+    if state is None:
+        return
+    try:
+        batch = int(_cfg_value("exploration_state_flush_batch", 25) or 25)
+    except Exception:
+        batch = 25
+    if not force and state.pending() < batch:
+        return
+    for attempt in range(2):
+        try:
+            db = connect_db(str(db_path), timeout=3.0)
+            try:
+                db.execute("PRAGMA busy_timeout=3000;")
+                state.flush(db)
+            finally:
+                db.close()
+            break
+        except sqlite3.OperationalError as e:
+            if attempt == 0 and "locked" in str(e).lower():
+                time.sleep(0.08)
+                continue
+            break
+        except Exception:
+            break
+    for item in state.take_memory_items():
+        if not upsert_memory_item:
+            break
+        try:
+            upsert_memory_item(db_path, **item)
+        except Exception:
+            pass
+
+
+def _end_exploration_state(db_path: Path) -> None:
+    _flush_exploration_state(db_path, force=True)
+    state = exploration_state.deactivate(db_path)
+    if state is not None and state.pending():
+        # Outermost scope closed with rows still queued (e.g. DB locked): one last try.
+        try:
+            db = connect_db(str(db_path), timeout=30.0)
+            try:
+                state.flush(db)
+            finally:
+                db.close()
+        except Exception:
+            pass
+
+
 def _build_selector_candidates(ui_map: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     seen = set()
     out: List[Dict[str, Any]] = []
@@ -6668,9 +6856,13 @@ def _build_selector_candidates(ui_map: List[Dict[str, Any]]) -> List[Dict[str, A
         if not isinstance(el, dict):
             continue
         sel = _selector_from_element(el)
-        if not sel or sel in seen:
+        if not sel:
+            continue
+        # Harvested records identify the element; distinct elements may share a fallback selector.
+        identity = ("el", el.get("gen"), el.get("index")) if el.get("index") is not None else ("sel", sel)
+        if identity in seen:
             continue
-        seen.add(sel)
+        seen.add(identity)
         selector_key = _stable_selector_key({**el, "selector": sel})
         out.append(
             {
@@ -6697,6 +6889,10 @@ def _build_selector_candidates(ui_map: List[Dict[str, Any]]) -> List[Dict[str, A
                 "testattr": el.get("testattr"),
             }
         )
+        # Harvested records keep their in-page handle reference and geometry.
+        for key in ("index", "gen", "desc", "x", "y", "w", "h"):
+            if key in el:
+                out[-1][key] = el[key]
     return out
 
 
@@ -7306,7 +7502,7 @@ async def run_novel_probe(page, base_url: str, db_path: Path):
         )
     try:
         await page.goto(target, wait_until="domcontentloaded")
-        await page.wait_for_timeout(800)
+        await wait_for_settle(page, 800)
     except Exception:
         pass
     try:
@@ -7316,6 +7512,7 @@ async def run_novel_probe(page, base_url: str, db_path: Path):
     page._bgl_novelty_done = True  # type: ignore
 
 
+@traced("scenario.run")
 async def run_scenario(
     manager: BrowserManager,
     page,
@@ -7331,20 +7528,27 @@ async def run_scenario(
     scenario_name = scenario_path.stem
     scenario_id_local = ""
     try:
-        with open(scenario_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = _load_scenario_data(scenario_path)
         scenario_name = data.get("name", scenario_path.stem)
         scenario_id_local = str(scenario_id or data.get("id") or "")
     except Exception:
         data = None
     if not scenario_id_local:
         scenario_id_local = str(scenario_id or f"{scenario_name}:{int(time.time())}")
+    active_span = current_span()
+    if active_span is not None:
+        active_span.set(scenario=str(scenario_name), scenario_id=scenario_id_local)
     ctx_token = _push_context(
         scenario_id=scenario_id_local,
         scenario_name=str(scenario_name),
         goal_id=goal_id,
         goal_name=goal_name,
     )
+    # Cooldown/novelty/explored state lives in memory for the scenario; flushed write-behind.
+    _begin_exploration_state(db_path)
+    started = time.perf_counter()
+    failures_before = _SCENARIO_FAILURE_EVENTS
+    failed = False
     try:
         return await _run_scenario_impl(
             manager,
@@ -7358,8 +7562,41 @@ async def run_scenario(
             goal_id=goal_id,
             goal_name=goal_name,
         )
+    except BaseException:
+        failed = True
+        raise
     finally:
+        _end_exploration_state(db_path)
         _pop_context(ctx_token)
+        try:
+            # Video policy: a failing scenario keeps the context's recording.
+            manager.note_scenario(scenario_path.stem, time.perf_counter() - started)
+            if failed or _SCENARIO_FAILURE_EVENTS > failures_before:
+                manager.mark_failure(scenario_path.stem)
+        except Exception:
+            pass
+
+
+def _wants_video(paths: List[Path]) -> bool:
+    """
+    `flaky` video policy: record this run when a selected scenario is flagged
+    (`flaky: true` in its YAML or listed in browser_video_scenarios) or failed
+    within browser_video_recent_failure_days.
+    """
+    listed = {str(x) for x in (_cfg_value("browser_video_scenarios", []) or [])}
+    for path in paths:
+        if path.stem in listed:
+            return True
+        try:
+            if _load_scenario_data(path).get("flaky"):
+                return True
+        except Exception:
+            pass
+    try:
+        days = float(_cfg_value("browser_video_recent_failure_days", 3) or 0)
+    except (TypeError, ValueError):
+        days = 3.0
+    return bool(days > 0 and recently_failed([p.stem for p in paths], days))
 
 
 async def _run_scenario_impl(
@@ -7375,8 +7612,7 @@ async def _run_scenario_impl(
     goal_name: Optional[str] = None,
 ):
     _trace(f"scenario: load {scenario_path}")
-    with open(scenario_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    data = _load_scenario_data(scenario_path)
     steps: List[Dict[str, Any]] = data.get("steps", [])
     name = data.get("name", scenario_path.stem)
     _trace(f"scenario: {name} steps={len(steps)}")
@@ -7411,7 +7647,8 @@ async def _run_scenario_impl(
     if hand_profile is None:
         hand_profile = HandProfile.generate()
         manager._bgl_hand_profile = hand_profile  # type: ignore
-    motor: Motor = Motor(hand_profile)
+    motor_mode = _motor_mode_for_scenario(name, origin, is_gap)
+    motor: Motor = Motor(hand_profile, mode=motor_mode)
     policy = Policy(motor)
 
     # Shared authority instance (avoid rebuilding config/db handlers per scenario).
@@ -7663,6 +7900,7 @@ async def _run_scenario_impl(
         default_step_timeout = 45.0
 
     for idx, step in enumerate(steps):
+        _flush_exploration_state(db_path)
         _trace(f"scenario: {name} step[{idx}] action={step.get('action')} selector={step.get('selector')}")
         # prepend base_url for relative goto
         if step.get("action") == "goto" and step.get("url", "").startswith("/"):
@@ -7682,7 +7920,7 @@ async def _run_scenario_impl(
                 if page.is_closed():
                     page = await manager.new_page()
                     await ensure_cursor(page)
-                    motor = Motor(hand_profile)
+                    motor = Motor(hand_profile, mode=motor_mode)
                     policy = Policy(motor)
                 # Handle modal/loading/error UI states before executing steps.
                 try:
@@ -7701,7 +7939,7 @@ async def _run_scenario_impl(
                             pass
                         if ui_state_result and ui_state_result.get("retry") and state_retries < 1:
                             state_retries += 1
-                            await page.wait_for_timeout(180)
+                            await wait_for_settle(page, 180)
                             continue
                 except Exception:
                     pass
@@ -8102,7 +8340,7 @@ async def _run_scenario_impl(
                         raise
                     page = await manager.new_page()
                     await ensure_cursor(page)
-                    motor = Motor(hand_profile)
+                    motor = Motor(hand_profile, mode=motor_mode)
                     policy = Policy(motor)
                     continue
                 # تعافٍ اختياري بالرجوع للخلف عند اعتراض المودال للنقر (سلوك بشري محدود)
@@ -8366,7 +8604,7 @@ async def run_api_scenario(
     scenario_path: Path,
     db_path: Path,
 ):
-    data = yaml.safe_load(scenario_path.read_text(encoding="utf-8")) or {}
+    data = _load_scenario_data(scenario_path)
     steps: List[Dict[str, Any]] = data.get("steps", [])
     name = data.get("name", scenario_path.stem)
     meta = data.get("meta") or {}
@@ -8573,6 +8811,7 @@ async def run_api_scenario(
             pass
 
 
+@traced("scenario_runner.main")
 async def main(
     base_url: str,
     headless: bool,
@@ -8608,6 +8847,8 @@ async def main(
         _update_diagnostic_status_stage("scenario_runner_blocked")
         return {"status": "locked", "reason": reason, "run_id": _CURRENT_RUN_ID}
     _trace("main: lock acquired")
+    # Keep knowledge.db-wal bounded while this run writes events.
+    start_checkpoint_scheduler(DB_PATH, cfg)
     # Apply config defaults for exploration/novelty if env not set
     os.environ.setdefault("BGL_EXPLORATION", str(cfg.get("scenario_exploration", "1")))
     os.environ.setdefault("BGL_NOVELTY_AUTO", str(cfg.get("novelty_auto", "1")))
@@ -8688,7 +8929,7 @@ async def main(
                 filtered_api.append(p)
                 continue
             try:
-                data = yaml.safe_load(p.read_text(encoding="utf-8")) or {}
+                data = _load_scenario_data(p)
                 name = str(data.get("name") or p.stem)
                 meta = data.get("meta") or {}
                 origin = str(meta.get("origin") or "")
@@ -8709,7 +8950,7 @@ async def main(
     filtered = []
     for path in scenario_files:
         try:
-            data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+            data = _load_scenario_data(path)
             steps = data.get("steps", [])
             first = steps[0] if steps else {}
             url = first.get("url", "")
@@ -8878,7 +9119,7 @@ async def main(
         ui_scenarios = []
         for path in scenario_files:
             try:
-                data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+                data = _load_scenario_data(path)
                 if _is_api_scenario(data, path):
                     api_scenarios.append(path)
                 else:
@@ -8932,15 +9173,32 @@ async def main(
             except Exception:
                 pass
             try:
-                manager = BrowserManager(
-                    base_url=base_url,
-                    headless=headless,
-                    max_pages=max_pages,
-                    idle_timeout=idle_timeout,
-                    persist=True,
-                    slow_mo_ms=slow_mo,
-                    extra_http_headers=extra_headers,
-                )
+                warm_browser = os.getenv("BGL_WARM_BROWSER", "0") == "1"
+                video_policy = str(_cfg_value("browser_video_policy", "on_failure") or "on_failure")
+                if warm_browser:
+                    # Resident daemon worker: keep Chromium alive between cycles.
+                    manager = shared_manager(
+                        base_url=base_url,
+                        headless=headless,
+                        max_pages=max_pages,
+                        idle_timeout=idle_timeout,
+                        slow_mo_ms=slow_mo,
+                        extra_http_headers=extra_headers,
+                        video_policy=video_policy,
+                    )
+                else:
+                    manager = BrowserManager(
+                        base_url=base_url,
+                        headless=headless,
+                        max_pages=max_pages,
+                        idle_timeout=idle_timeout,
+                        persist=True,
+                        slow_mo_ms=slow_mo,
+                        extra_http_headers=extra_headers,
+                        video_policy=video_policy,
+                    )
+                if manager.video_policy == "flaky":
+                    manager.request_video(_wants_video(list(ui_scenarios)))
                 _trace("ui: browser manager created")
                 # إنشاء صفحة واحدة يعاد استخدامها لكل السيناريوهات لمنع فتح نوافذ متعددة
                 shared_page = await manager.new_page()
@@ -9023,7 +9281,11 @@ async def main(
                 await run_novel_probe(shared_page, base_url, db_path)
                 if not keep_open:
                     _trace("ui: closing browser manager")
-                    await manager.close()
+                    if warm_browser:
+                        await manager.release()
+                    else:
+                        await manager.close()
+                    ui_exploration_stats["video"] = dict(manager.video_stats, policy=manager.video_policy)
                 _trace("ui: done")
             finally:
                 ui_exploration_stats["ui_exploration_duration_s"] = round(
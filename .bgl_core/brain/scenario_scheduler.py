@@ -7,9 +7,15 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-import yaml
+try:
+    from .lazy_imports import lazy_import  # type: ignore
+except Exception:
+    from lazy_imports import lazy_import  # type: ignore
+
+yaml = lazy_import("yaml")
 
 from config_loader import load_config
+from db_utils import pooled_connection
 
 
 ROOT = Path(__file__).parent.parent.parent
@@ -209,8 +215,7 @@ def _collect_runtime_stats(
     stats: Dict[str, Dict[str, Any]] = {}
     if not db_path.exists():
         return stats
-    with sqlite3.connect(str(db_path)) as conn:
-        conn.row_factory = sqlite3.Row
+    with pooled_connection(db_path, row_factory=sqlite3.Row) as conn:
         rows = conn.execute(
             """
             SELECT scenario_id, event_type, timestamp, payload
@@ -420,7 +425,7 @@ def _collect_global_stats(db_path: Path, cutoff: float) -> Dict[str, float]:
     }
     if not db_path.exists():
         return stats
-    with sqlite3.connect(str(db_path)) as conn:
+    with pooled_connection(db_path) as conn:
         rows = conn.execute(
             """
             SELECT event_type, COUNT(*) c
@@ -450,7 +455,7 @@ def _collect_durations(
     durations: Dict[str, List[float]] = {}
     if not db_path.exists():
         return {}
-    with sqlite3.connect(str(db_path)) as conn:
+    with pooled_connection(db_path) as conn:
         rows = conn.execute(
             """
             SELECT run_id, scenario_id, MIN(timestamp) as min_ts, MAX(timestamp) as max_ts
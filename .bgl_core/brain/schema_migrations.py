@@ -0,0 +1,578 @@
+"""
+Schema Migrations
+-----------------
+Versioned DDL registry for knowledge.db.
+
+Brain modules historically ran `CREATE TABLE IF NOT EXISTS` + `PRAGMA table_info`
++ `ALTER TABLE` on every call. This module owns the canonical schema instead:
+`ensure_schema(db_path)` brings a database to `LATEST_VERSION` (tracked through
+`PRAGMA user_version`) once per process, and `schema_current(conn)` lets the
+legacy `_ensure_*` helpers skip their DDL entirely once the database is migrated.
+
+Migrations are append-only: never edit an applied migration, add a new one.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+DECISION_SCHEMA_PATH = Path(__file__).parent / "decision_schema.sql"
+
+_LOCK = threading.Lock()
+_MIGRATED: set = set()
+# Databases whose migration failed: key -> (retry_at, attempts). Callers fall
+# back to their own DDL until retry_at instead of re-running the chain on
+# every log_event/_log_outcome call.
+_FAILED: Dict[str, Tuple[float, int]] = {}
+FAILURE_BACKOFF_SEC = 30.0
+FAILURE_BACKOFF_MAX_SEC = 900.0
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    try:
+        return {r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+    except Exception:
+        return set()
+
+
+def _add_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> None:
+    existing = _columns(conn, table)
+    if not existing:
+        return
+    for name, decl in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+
+def _execute_script(conn: sqlite3.Connection, script: str) -> None:
+    """
+    Run a multi-statement script statement by statement.
+    Unlike executescript() this does not force a COMMIT, so the statements join
+    the transaction apply_migrations() opened for the migration.
+    """
+    buf = ""
+    for line in script.splitlines(keepends=True):
+        stripped = line.strip()
+        if not buf and (not stripped or stripped.startswith("--")):
+            continue
+        buf += line
+        if sqlite3.complete_statement(buf):
+            conn.execute(buf)
+            buf = ""
+    if buf.strip():
+        conn.execute(buf)
+
+
+def _m001_core_structure(conn: sqlite3.Connection) -> None:
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT UNIQUE NOT NULL,
+            last_modified REAL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS entities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            file_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL,
+            extends TEXT,
+            line INTEGER,
+            FOREIGN KEY (file_id) REFERENCES files (id) ON DELETE CASCADE,
+            UNIQUE(file_id, name)
+        );
+        CREATE TABLE IF NOT EXISTS methods (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            visibility TEXT,
+            line INTEGER,
+            FOREIGN KEY (entity_id) REFERENCES entities (id) ON DELETE CASCADE
+        );
+        CREATE TABLE IF NOT EXISTS calls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source_method_id INTEGER NOT NULL,
+            target_entity TEXT,
+            target_method TEXT,
+            type TEXT NOT NULL,
+            confidence TEXT DEFAULT 'MED',
+            evidence TEXT,
+            line INTEGER,
+            FOREIGN KEY (source_method_id) REFERENCES methods (id) ON DELETE CASCADE
+        );
+        CREATE TABLE IF NOT EXISTS routes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            uri TEXT NOT NULL,
+            http_method TEXT NOT NULL,
+            controller TEXT,
+            action TEXT,
+            file_path TEXT,
+            last_validated REAL DEFAULT 0,
+            status_score INTEGER DEFAULT 100,
+            UNIQUE(uri, http_method)
+        );
+        CREATE TABLE IF NOT EXISTS runtime_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp REAL NOT NULL,
+            session TEXT,
+            run_id TEXT,
+            scenario_id TEXT,
+            goal_id TEXT,
+            source TEXT,
+            event_type TEXT NOT NULL,
+            route TEXT,
+            method TEXT,
+            target TEXT,
+            step_id TEXT,
+            payload TEXT,
+            status INTEGER,
+            latency_ms REAL,
+            error TEXT
+        );
+        CREATE TABLE IF NOT EXISTS experiences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at REAL NOT NULL,
+            updated_at REAL,
+            scenario TEXT,
+            summary TEXT,
+            related_files TEXT,
+            exp_hash TEXT UNIQUE,
+            seen_count INTEGER DEFAULT 0,
+            last_seen REAL,
+            confidence REAL,
+            evidence_count INTEGER DEFAULT 0,
+            value_score REAL,
+            suppressed INTEGER DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS memory_index (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            key_hash TEXT UNIQUE NOT NULL,
+            key_text TEXT,
+            summary TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            last_seen REAL,
+            seen_count INTEGER DEFAULT 0,
+            evidence_count INTEGER DEFAULT 0,
+            confidence REAL,
+            value_score REAL,
+            suppressed INTEGER DEFAULT 0,
+            source_table TEXT,
+            source_id INTEGER,
+            meta_json TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_memory_index_kind ON memory_index(kind);
+        CREATE INDEX IF NOT EXISTS idx_memory_index_last_seen ON memory_index(last_seen DESC);
+        CREATE TABLE IF NOT EXISTS memory_relations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            parent_hash TEXT NOT NULL,
+            child_hash TEXT NOT NULL,
+            relation TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            notes TEXT
+        );
+        CREATE TABLE IF NOT EXISTS memory_actions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            key_hash TEXT NOT NULL,
+            action TEXT NOT NULL,
+            actor TEXT,
+            created_at REAL NOT NULL,
+            notes TEXT
+        );
+        CREATE TABLE IF NOT EXISTS learning_confirmations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_key TEXT NOT NULL,
+            item_type TEXT NOT NULL,
+            action TEXT NOT NULL,
+            notes TEXT,
+            timestamp REAL,
+            UNIQUE(item_key, item_type)
+        );
+        """,
+    )
+
+
+def _m002_decision_schema(conn: sqlite3.Connection) -> None:
+    if DECISION_SCHEMA_PATH.exists():
+        _execute_script(conn, DECISION_SCHEMA_PATH.read_text(encoding="utf-8"))
+
+
+def _m003_run_context_columns(conn: sqlite3.Connection) -> None:
+    # Older databases predate run/scenario/goal attribution columns.
+    _add_columns(
+        conn,
+        "runtime_events",
+        {
+            "run_id": "TEXT",
+            "scenario_id": "TEXT",
+            "goal_id": "TEXT",
+            "source": "TEXT",
+            "step_id": "TEXT",
+        },
+    )
+    _add_columns(
+        conn,
+        "exploration_outcomes",
+        {"run_id": "TEXT", "scenario_id": "TEXT", "goal_id": "TEXT"},
+    )
+    _add_columns(
+        conn,
+        "outcomes",
+        {"run_id": "TEXT", "scenario_id": "TEXT", "goal_id": "TEXT"},
+    )
+    _add_columns(
+        conn,
+        "exploration_novelty",
+        {
+            "selector_key": "TEXT",
+            "href_base": "TEXT",
+            "route": "TEXT",
+            "last_score_delta": "REAL",
+        },
+    )
+    _add_columns(
+        conn,
+        "experiences",
+        {
+            "exp_hash": "TEXT",
+            "seen_count": "INTEGER DEFAULT 0",
+            "last_seen": "REAL",
+            "updated_at": "REAL",
+            "value_score": "REAL",
+            "suppressed": "INTEGER DEFAULT 0",
+            "run_id": "TEXT",
+            "scenario_id": "TEXT",
+            "goal_id": "TEXT",
+            "source_type": "TEXT",
+        },
+    )
+
+
+def _m004_observations(conn: sqlite3.Connection) -> None:
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS env_snapshots (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          created_at REAL NOT NULL,
+          run_id TEXT NOT NULL,
+          kind TEXT NOT NULL,
+          source TEXT,
+          confidence REAL,
+          payload_json TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_env_snapshots_kind_time ON env_snapshots(kind, created_at DESC);
+        CREATE TABLE IF NOT EXISTS ui_semantic_snapshots (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          created_at REAL NOT NULL,
+          url TEXT NOT NULL,
+          source TEXT,
+          digest TEXT,
+          summary_json TEXT NOT NULL,
+          payload_json TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_ui_semantic_url_time ON ui_semantic_snapshots(url, created_at DESC);
+        CREATE TABLE IF NOT EXISTS ui_action_snapshots (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          created_at REAL NOT NULL,
+          url TEXT NOT NULL,
+          source TEXT,
+          digest TEXT,
+          candidates_json TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_ui_action_url_time ON ui_action_snapshots(url, created_at DESC);
+        CREATE TABLE IF NOT EXISTS ui_flow_transitions (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          created_at REAL NOT NULL,
+          session TEXT,
+          from_url TEXT,
+          to_url TEXT,
+          action TEXT,
+          selector TEXT,
+          semantic_delta_json TEXT,
+          ui_states_json TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_ui_flow_from_to_time ON ui_flow_transitions(from_url, to_url, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_ui_flow_session_time ON ui_flow_transitions(session, created_at DESC);
+        """,
+    )
+
+
+def _m005_exploration_and_digest(conn: sqlite3.Connection) -> None:
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS selector_cooldowns (
+            selector_key TEXT NOT NULL,
+            route_key TEXT NOT NULL,
+            fail_count INTEGER DEFAULT 0,
+            last_seen REAL,
+            cooldown_until REAL DEFAULT 0,
+            last_reason TEXT,
+            last_run_id TEXT,
+            PRIMARY KEY (selector_key, route_key)
+        );
+        CREATE TABLE IF NOT EXISTS experience_actions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            exp_hash TEXT UNIQUE,
+            action TEXT,
+            created_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS experience_proposal_links (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            exp_hash TEXT,
+            experience_id INTEGER,
+            proposal_id INTEGER,
+            created_at REAL,
+            source TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_runtime_events_ts ON runtime_events(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_runtime_events_type ON runtime_events(event_type);
+        CREATE INDEX IF NOT EXISTS idx_outcomes_ts ON outcomes(timestamp);
+        """,
+    )
+
+
+def _m006_digest_route_aggregates(conn: sqlite3.Connection) -> None:
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS digest_route_aggregates (
+            route TEXT PRIMARY KEY,
+            event_count INTEGER DEFAULT 0,
+            http_calls INTEGER DEFAULT 0,
+            http_fail INTEGER DEFAULT 0,
+            js_errors INTEGER DEFAULT 0,
+            network_errors INTEGER DEFAULT 0,
+            ui_events INTEGER DEFAULT 0,
+            latency_count INTEGER DEFAULT 0,
+            latency_sum REAL DEFAULT 0,
+            latency_max REAL DEFAULT 0,
+            latency_reservoir TEXT,
+            last_ts REAL DEFAULT 0,
+            last_event_id INTEGER DEFAULT 0,
+            last_ctx TEXT,
+            emitted_json TEXT,
+            emitted_at REAL,
+            updated_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS digest_watermarks (
+            name TEXT PRIMARY KEY,
+            last_id INTEGER DEFAULT 0,
+            last_ts REAL DEFAULT 0,
+            updated_at REAL
+        );
+        """,
+    )
+
+
+def _m007_source_hashes(conn: sqlite3.Connection) -> None:
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS source_hashes (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            digest TEXT NOT NULL,
+            hashed_at REAL
+        );
+        """,
+    )
+
+
+def _m008_runtime_contracts(conn: sqlite3.Connection) -> None:
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS runtime_contracts (
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            key_rev TEXT NOT NULL,
+            symbol TEXT,
+            ord INTEGER NOT NULL,
+            runtime_json TEXT NOT NULL,
+            PRIMARY KEY (kind, key)
+        );
+        CREATE INDEX IF NOT EXISTS idx_runtime_contracts_rev ON runtime_contracts(kind, key_rev);
+        CREATE TABLE IF NOT EXISTS runtime_contracts_meta (
+            source TEXT PRIMARY KEY,
+            mtime_ns INTEGER,
+            size INTEGER,
+            rows INTEGER,
+            synced_at REAL
+        );
+        """,
+    )
+
+
+def _m009_trace_spans(conn: sqlite3.Connection) -> None:
+    _execute_script(
+        conn,
+        """
+        CREATE TABLE IF NOT EXISTS trace_spans (
+            span_id TEXT PRIMARY KEY,
+            parent_id TEXT,
+            run_id TEXT,
+            name TEXT NOT NULL,
+            start_ts REAL NOT NULL,
+            duration_ms REAL NOT NULL,
+            status TEXT,
+            pid INTEGER,
+            thread TEXT,
+            attrs_json TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_trace_spans_run ON trace_spans(run_id, start_ts);
+        """,
+    )
+
+
+def _m010_digest_emit_pending(conn: sqlite3.Connection) -> None:
+    # Routes whose experience was produced but not yet stored; emitted_json
+    # only advances once the experience upsert succeeded.
+    _add_columns(conn, "digest_route_aggregates", {"emit_pending": "INTEGER DEFAULT 0"})
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_digest_route_emit_pending ON digest_route_aggregates(emit_pending)"
+    )
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "core_structure", _m001_core_structure),
+    (2, "decision_schema", _m002_decision_schema),
+    (3, "run_context_columns", _m003_run_context_columns),
+    (4, "observations", _m004_observations),
+    (5, "exploration_and_digest", _m005_exploration_and_digest),
+    (6, "digest_route_aggregates", _m006_digest_route_aggregates),
+    (7, "source_hashes", _m007_source_hashes),
+    (8, "runtime_contracts", _m008_runtime_contracts),
+    (9, "trace_spans", _m009_trace_spans),
+    (10, "digest_emit_pending", _m010_digest_emit_pending),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _key(db_path: Path | str) -> str:
+    try:
+        return str(Path(db_path).resolve())
+    except Exception:
+        return str(db_path)
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    try:
+        row = conn.execute("PRAGMA user_version").fetchone()
+        return int(row[0] or 0) if row else 0
+    except Exception:
+        return 0
+
+
+def schema_current(conn: sqlite3.Connection) -> bool:
+    """
+    Fast-path check for legacy `_ensure_*` helpers: True when the database behind
+    `conn` is already at LATEST_VERSION, so no DDL is needed.
+    `PRAGMA user_version` reads the header page only; it never touches sqlite_master.
+    """
+    return current_version(conn) >= LATEST_VERSION
+
+
+def is_migrated(db_path: Path | str) -> bool:
+    """True when ensure_schema() already succeeded for this path in this process."""
+    return _key(db_path) in _MIGRATED
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Apply every pending migration on an open connection.
+    Each migration runs inside an explicit BEGIN and commits together with its
+    user_version bump, so a failure rolls back its DDL too and leaves the
+    database at the last fully applied version. (The sqlite3 module only opens
+    implicit transactions before DML, so without BEGIN each CREATE/ALTER would
+    autocommit on its own.)
+    """
+    if conn.in_transaction:
+        conn.commit()
+    version = current_version(conn)
+    for number, _name, fn in MIGRATIONS:
+        if number <= version:
+            continue
+        try:
+            conn.execute("BEGIN")
+            fn(conn)
+            conn.execute(f"PRAGMA user_version={int(number)}")
+            conn.commit()
+            version = number
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+    return version
+
+
+def ensure_schema(db_path: Path | str, *, timeout: float = 30.0) -> bool:
+    """
+    Bring knowledge.db to LATEST_VERSION once per process.
+    Subsequent calls are a set lookup. Returns False when migration failed
+    (callers should then fall back to their own best-effort DDL); a failure is
+    remembered and only retried after an exponential backoff, and is logged
+    once per database.
+    """
+    key = _key(db_path)
+    if key in _MIGRATED:
+        return True
+    failed = _FAILED.get(key)
+    if failed is not None and time.time() < failed[0]:
+        return False
+    with _LOCK:
+        if key in _MIGRATED:
+            return True
+        failed = _FAILED.get(key)
+        if failed is not None and time.time() < failed[0]:
+            return False
+        try:
+            Path(key).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(key, timeout=timeout)
+        except Exception as exc:
+            _record_failure(key, exc)
+            return False
+        try:
+            try:
+                conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+            except Exception:
+                pass
+            if current_version(conn) < LATEST_VERSION:
+                apply_migrations(conn)
+            _MIGRATED.add(key)
+            _FAILED.pop(key, None)
+            return True
+        except Exception as exc:
+            _record_failure(key, exc)
+            return False
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+def _record_failure(key: str, exc: Exception) -> None:
+    attempts = _FAILED.get(key, (0.0, 0))[1] + 1
+    delay = min(FAILURE_BACKOFF_MAX_SEC, FAILURE_BACKOFF_SEC * (2 ** (attempts - 1)))
+    _FAILED[key] = (time.time() + delay, attempts)
+    if attempts == 1:
+        print(f"[!] schema_migrations: migrating {key} failed ({exc}); retrying with backoff")
+
+
+def reset_cache() -> None:
+    """Forget which databases were migrated or failed (tests / after restoring a backup)."""
+    with _LOCK:
+        _MIGRATED.clear()
+        _FAILED.clear()
@@ -0,0 +1,238 @@
+"""
+startup_profiler.py
+-------------------
+Import-time and startup profiling for brain entry points.
+
+Each entry point is started in a fresh interpreter with `-X importtime`.
+The profiler records the import tree (self/cumulative microseconds per
+module), the import wall time, and the time to first useful work (a cheap
+probe call such as loading config). Results are written to
+.bgl_core/logs/startup_profile.json and upserted as `startup:<entry>`
+cases in the tracked .bgl_core/logs/benchmark_results.json.
+
+Usage:
+    python .bgl_core/brain/startup_profiler.py
+    python .bgl_core/brain/startup_profiler.py --entry agent_verify --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+BRAIN_DIR = ROOT / ".bgl_core" / "brain"
+PROFILE_PATH = ROOT / ".bgl_core" / "logs" / "startup_profile.json"
+BENCHMARK_PATH = ROOT / ".bgl_core" / "logs" / "benchmark_results.json"
+
+# name -> module, optional path (relative to ROOT), probe expression, budget.
+# The probe is evaluated after the import with `mod` and `ROOT` in scope and
+# stands in for the entry point's first useful work.
+ENTRY_POINTS: Dict[str, Dict[str, Any]] = {
+    "agent_verify": {"module": "agent_verify", "probe": "mod._load_patterns(ROOT)", "budget_sec": 1.0},
+    "llm_status": {"module": "llm_status", "probe": "mod.LLMClient().cfg", "budget_sec": 1.0},
+    "config_loader": {"module": "config_loader", "probe": "mod.load_config(ROOT)", "budget_sec": 0.5},
+    "agency_core": {"module": "agency_core", "probe": None, "budget_sec": 3.0},
+    "guardian": {"module": "guardian", "probe": None, "budget_sec": 3.0},
+    "master_verify": {"module": "master_verify", "probe": None, "budget_sec": 3.0},
+    "scenario_runner": {"module": "scenario_runner", "probe": None, "budget_sec": 3.0},
+    "tool_server": {"module": "tool_server", "path": "scripts", "probe": None, "budget_sec": 2.0},
+}
+
+_DRIVER = r"""
+import json, sys, time, importlib
+from pathlib import Path
+t0 = time.perf_counter()
+ROOT = Path(sys.argv[1])
+sys.path.insert(0, sys.argv[2])
+out = {"ok": True}
+try:
+    mod = importlib.import_module(sys.argv[3])
+    out["import_sec"] = time.perf_counter() - t0
+    probe = sys.argv[4]
+    if probe:
+        eval(probe, {"mod": mod, "ROOT": ROOT})
+    out["first_work_sec"] = time.perf_counter() - t0
+except BaseException as exc:
+    out["ok"] = False
+    out["error"] = f"{type(exc).__name__}: {exc}"[:300]
+    out["import_sec"] = out.get("import_sec", time.perf_counter() - t0)
+heavy = ("playwright", "yaml", "numpy", "agency_core", "guardian", "scenario_runner", "master_verify")
+out["loaded_heavy"] = sorted(
+    n for n in heavy
+    if n in sys.modules and type(sys.modules[n]).__name__ != "_LazyModule"
+)
+sys.stdout.write("\nBGL_STARTUP " + json.dumps(out) + "\n")
+sys.stdout.flush()
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `-X importtime` lines into [{module, depth, self_us, cumulative_us}]."""
+    rows: List[Dict[str, Any]] = []
+    for line in (stderr or "").splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            _, rest = line.split(":", 1)
+            self_us, cum_us, name = rest.split("|", 2)
+            self_us_i = int(self_us.strip())
+            cum_us_i = int(cum_us.strip())
+        except Exception:
+            continue  # header line ("self [us] | cumulative | imported package")
+        stripped = name.lstrip()
+        depth = max(0, (len(name) - len(stripped) - 1) // 2)
+        rows.append(
+            {
+                "module": stripped.strip(),
+                "depth": depth,
+                "self_us": self_us_i,
+                "cumulative_us": cum_us_i,
+            }
+        )
+    return rows
+
+
+def _top_level(rows: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    top = [r for r in rows if r["depth"] == 0]
+    top.sort(key=lambda r: r["cumulative_us"], reverse=True)
+    return top[:limit]
+
+
+def profile_entry(name: str, spec: Dict[str, Any], *, top: int = 20, timeout: float = 60.0) -> Dict[str, Any]:
+    path = ROOT / spec["path"] if spec.get("path") else BRAIN_DIR
+    cmd = [
+        sys.executable,
+        "-X",
+        "importtime",
+        "-c",
+        _DRIVER,
+        str(ROOT),
+        str(path),
+        spec["module"],
+        spec.get("probe") or "",
+    ]
+    env = os.environ.copy()
+    started = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            cmd, cwd=str(ROOT), env=env, capture_output=True, text=True, timeout=timeout
+        )
+        stdout, stderr = proc.stdout, proc.stderr
+    except subprocess.TimeoutExpired:
+        stdout, stderr = "", ""
+    wall = time.perf_counter() - started
+
+    result: Dict[str, Any] = {"ok": False, "error": "no driver output"}
+    for line in reversed((stdout or "").splitlines()):
+        if line.startswith("BGL_STARTUP "):
+            try:
+                result = json.loads(line[len("BGL_STARTUP "):])
+            except Exception:
+                pass
+            break
+
+    rows = parse_importtime(stderr)
+    budget = float(spec.get("budget_sec") or 0)
+    first_work = result.get("first_work_sec")
+    if not result.get("ok"):
+        status = "FAILED"
+    elif budget and first_work is not None and first_work > budget:
+        status = "SLOW"
+    else:
+        status = "SUCCESS"
+    return {
+        "entry": name,
+        "module": spec["module"],
+        "status": status,
+        "error": result.get("error"),
+        "process_wall_sec": round(wall, 4),
+        "import_sec": round(float(result.get("import_sec") or 0), 4),
+        "first_work_sec": round(float(first_work), 4) if first_work is not None else None,
+        "budget_sec": budget or None,
+        "modules_imported": len(rows),
+        "import_total_us": sum(r["self_us"] for r in rows),
+        "loaded_heavy": result.get("loaded_heavy") or [],
+        "top_imports": _top_level(rows, top),
+        "tree": rows,
+    }
+
+
+def _upsert_benchmarks(results: List[Dict[str, Any]], path: Path = BENCHMARK_PATH) -> None:
+    try:
+        from .hotpath_bench import upsert_results  # type: ignore
+    except Exception:
+        from hotpath_bench import upsert_results  # type: ignore
+    records = [
+        {
+            "case": f"startup:{res['entry']}",
+            "status": res["status"],
+            "latency_sec": res["first_work_sec"] if res["first_work_sec"] is not None else res["import_sec"],
+            "import_sec": res["import_sec"],
+            "budget_sec": res["budget_sec"],
+            "modules_imported": res["modules_imported"],
+            "loaded_heavy": res["loaded_heavy"],
+            "message": res["error"] or "",
+        }
+        for res in results
+    ]
+    upsert_results(path, records)
+
+
+def run_profile(
+    entries: Optional[List[str]] = None,
+    *,
+    top: int = 20,
+    write: bool = True,
+    update_benchmarks: bool = True,
+) -> List[Dict[str, Any]]:
+    names = entries or list(ENTRY_POINTS)
+    results = [profile_entry(n, ENTRY_POINTS[n], top=top) for n in names if n in ENTRY_POINTS]
+    if write:
+        PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"timestamp": time.time(), "python": sys.version.split()[0], "entries": results}
+        PROFILE_PATH.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    if update_benchmarks:
+        _upsert_benchmarks(results)
+    return results
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Profile brain entry-point startup (-X importtime).")
+    ap.add_argument("--entry", action="append", choices=sorted(ENTRY_POINTS), help="Entry point(s) to profile (default: all).")
+    ap.add_argument("--top", type=int, default=10, help="Top-level imports to show per entry.")
+    ap.add_argument("--no-write", action="store_true", help="Do not write startup_profile.json.")
+    ap.add_argument("--no-benchmark", action="store_true", help="Do not update benchmark_results.json.")
+    args = ap.parse_args()
+
+    results = run_profile(
+        args.entry,
+        top=args.top,
+        write=not args.no_write,
+        update_benchmarks=not args.no_benchmark,
+    )
+    failed = 0
+    for res in results:
+        fw = res["first_work_sec"]
+        print(
+            f"{res['entry']:<16} {res['status']:<8} import={res['import_sec']:.3f}s "
+            f"first_work={'-' if fw is None else f'{fw:.3f}s'} modules={res['modules_imported']} "
+            f"heavy={','.join(res['loaded_heavy']) or '-'}"
+        )
+        if res["error"]:
+            print(f"    error: {res['error']}")
+        for row in res["top_imports"][: args.top]:
+            print(f"    {row['cumulative_us'] / 1000.0:8.1f}ms  {row['module']}")
+        if res["status"] != "SUCCESS":
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,501 @@
+"""
+tracing.py
+----------
+Structured tracing spans for master_verify, guardian audits and scenario runs.
+
+    with span("guardian.route_check", route=uri) as s:
+        ...
+        s.set(status_code=200)
+
+    @traced("scenario.run")
+    async def run_scenario(...): ...
+
+The active span lives in a contextvar, so nested spans in the same task, and
+in asyncio tasks created from it (they copy the context), get the right parent
+id. A process with no active span parents its root spans on BGL_TRACE_PARENT,
+which lets subprocesses hang off the phase that launched them. Spans are
+grouped by run id: set_run() if called, else BGL_DIAGNOSTIC_RUN_ID, else a
+per-process id.
+
+Finished spans are buffered in memory and written in batches to the
+`trace_spans` table of knowledge.db (when the batch fills, on flush() and at
+exit), next to runtime_events for the same run id. A failed write drops the
+batch; tracing never fails the traced code. BGL_TRACE=0 disables recording.
+
+Usage:
+    python .bgl_core/brain/tracing.py --list
+    python .bgl_core/brain/tracing.py diag_1760000000 --min-ms 5
+    python .bgl_core/brain/tracing.py diag_1760000000 --chrome trace.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .db_utils import pooled_connection  # type: ignore
+    from .schema_migrations import schema_current  # type: ignore
+except Exception:
+    from db_utils import pooled_connection  # type: ignore
+    from schema_migrations import schema_current  # type: ignore
+
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DB = ROOT / ".bgl_core" / "brain" / "knowledge.db"
+
+_CURRENT: ContextVar[Optional["Span"]] = ContextVar("bgl_trace_span", default=None)
+_RUN_ID: Optional[str] = None
+_PROCESS_RUN_ID = f"proc_{os.getpid()}_{int(time.time())}"
+
+_lock = threading.Lock()
+_buffer: List[Tuple[Any, ...]] = []
+_settings: Dict[str, Any] = {}
+_atexit_registered = False
+stats: Dict[str, int] = {"recorded": 0, "flushed": 0, "dropped": 0, "batches": 0}
+
+
+def _load_settings() -> Dict[str, Any]:
+    cfg: Dict[str, Any] = {}
+    try:
+        try:
+            from .config_loader import load_config  # type: ignore
+        except Exception:
+            from config_loader import load_config  # type: ignore
+        cfg = dict(load_config(ROOT) or {})
+    except Exception:
+        cfg = {}
+    enabled = str(os.getenv("BGL_TRACE", cfg.get("trace_enabled", "1"))).strip() not in ("0", "false", "False")
+    try:
+        batch = int(os.getenv("BGL_TRACE_FLUSH_BATCH") or cfg.get("trace_flush_batch", 200) or 200)
+    except (TypeError, ValueError):
+        batch = 200
+    return {"enabled": enabled, "batch": max(1, batch), "db_path": DEFAULT_DB}
+
+
+def _setting(key: str) -> Any:
+    if not _settings:
+        _settings.update(_load_settings())
+    return _settings[key]
+
+
+def configure(
+    *,
+    enabled: Optional[bool] = None,
+    db_path: Optional[Path] = None,
+    batch_size: Optional[int] = None,
+) -> None:
+    """Override config/env settings (pending spans are flushed to the old target first)."""
+    flush()
+    with _lock:
+        if not _settings:
+            _settings.update(_load_settings())
+        if enabled is not None:
+            _settings["enabled"] = bool(enabled)
+        if db_path is not None:
+            _settings["db_path"] = Path(db_path)
+        if batch_size is not None:
+            _settings["batch"] = max(1, int(batch_size))
+
+
+def reset() -> None:
+    """Drop buffered spans and settings (tests)."""
+    global _RUN_ID
+    with _lock:
+        _buffer.clear()
+        _settings.clear()
+        _RUN_ID = None
+        for key in stats:
+            stats[key] = 0
+
+
+def set_run(run_id: Optional[str]) -> None:
+    """Run id for spans recorded from now on in this process (None: back to the default)."""
+    global _RUN_ID
+    _RUN_ID = str(run_id) if run_id else None
+
+
+def current_run_id() -> str:
+    return _RUN_ID or os.getenv("BGL_DIAGNOSTIC_RUN_ID") or _PROCESS_RUN_ID
+
+
+def current_span() -> Optional["Span"]:
+    return _CURRENT.get()
+
+
+class Span:
+    __slots__ = ("span_id", "parent_id", "run_id", "name", "attrs", "start_ts", "duration_ms", "status", "_t0", "_token")
+
+    def __init__(self, name: str, parent_id: Optional[str], run_id: str, attrs: Dict[str, Any]):
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.run_id = run_id
+        self.name = name
+        self.attrs = attrs
+        self.start_ts = time.time()
+        self.duration_ms: Optional[float] = None
+        self.status = "ok"
+        self._t0 = time.perf_counter()
+        self._token: Any = None
+
+    def set(self, **attrs: Any) -> "Span":
+        self.attrs.update(attrs)
+        return self
+
+    def end(self, status: Optional[str] = None, **attrs: Any) -> None:
+        """Close the span (idempotent) and restore the previous active span."""
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = (time.perf_counter() - self._t0) * 1000.0
+        if status:
+            self.status = status
+        if attrs:
+            self.attrs.update(attrs)
+        if self._token is not None:
+            try:
+                _CURRENT.reset(self._token)
+            except ValueError:
+                # Ended from another context (e.g. a different task); nothing to restore there.
+                pass
+            self._token = None
+        _record(self)
+
+
+class _NoopSpan:
+    span_id = None
+    parent_id = None
+    run_id = ""
+    name = ""
+
+    def set(self, **attrs: Any) -> "_NoopSpan":
+        return self
+
+    def end(self, status: Optional[str] = None, **attrs: Any) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def start_span(name: str, **attrs: Any) -> Any:
+    """Open and activate a span; the caller must end() it. Prefer span()/traced()."""
+    if not _setting("enabled"):
+        return _NOOP
+    parent = _CURRENT.get()
+    parent_id = parent.span_id if parent is not None else (os.getenv("BGL_TRACE_PARENT") or None)
+    s = Span(name, parent_id, current_run_id(), attrs)
+    s._token = _CURRENT.set(s)
+    return s
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Any]:
+    """Time the enclosed block as a child of the active span."""
+    s = start_span(name, **attrs)
+    try:
+        yield s
+    except BaseException as exc:
+        status = "cancelled" if type(exc).__name__ == "CancelledError" else "error"
+        s.end(status, error=type(exc).__name__)
+        raise
+    else:
+        s.end()
+
+
+def traced(name: Optional[str] = None, **attrs: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator form of span() for sync and async functions."""
+
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(span_name, **attrs):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name, **attrs):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _record(s: Span) -> None:
+    global _atexit_registered
+    try:
+        attrs_json = json.dumps(s.attrs, ensure_ascii=False, default=str) if s.attrs else None
+    except Exception:
+        attrs_json = None
+    row = (
+        s.span_id,
+        s.parent_id,
+        s.run_id,
+        s.name,
+        s.start_ts,
+        round(float(s.duration_ms or 0.0), 3),
+        s.status,
+        os.getpid(),
+        threading.current_thread().name,
+        attrs_json,
+    )
+    with _lock:
+        _buffer.append(row)
+        stats["recorded"] += 1
+        full = len(_buffer) >= int(_settings.get("batch") or 200)
+        if not _atexit_registered:
+            atexit.register(flush)
+            _atexit_registered = True
+    if full:
+        flush()
+
+
+def _ensure_table(conn: sqlite3.Connection) -> None:
+    if schema_current(conn):
+        return
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS trace_spans (
+            span_id TEXT PRIMARY KEY,
+            parent_id TEXT,
+            run_id TEXT,
+            name TEXT NOT NULL,
+            start_ts REAL NOT NULL,
+            duration_ms REAL NOT NULL,
+            status TEXT,
+            pid INTEGER,
+            thread TEXT,
+            attrs_json TEXT
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trace_spans_run ON trace_spans(run_id, start_ts)")
+
+
+def flush() -> int:
+    """Write buffered spans in one transaction; returns the number written."""
+    with _lock:
+        if not _buffer:
+            return 0
+        rows = list(_buffer)
+        _buffer.clear()
+        db_path = _settings.get("db_path") or DEFAULT_DB
+    try:
+        with pooled_connection(db_path, write=True) as conn:
+            _ensure_table(conn)
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO trace_spans
+                    (span_id, parent_id, run_id, name, start_ts, duration_ms, status, pid, thread, attrs_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+    except Exception:
+        with _lock:
+            stats["dropped"] += len(rows)
+        return 0
+    with _lock:
+        stats["flushed"] += len(rows)
+        stats["batches"] += 1
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Reading / rendering
+# ---------------------------------------------------------------------------
+
+
+def load_spans(db_path: Path, run_id: str) -> List[Dict[str, Any]]:
+    with pooled_connection(db_path) as conn:
+        _ensure_table(conn)
+        rows = conn.execute(
+            """
+            SELECT span_id, parent_id, run_id, name, start_ts, duration_ms, status, pid, thread, attrs_json
+            FROM trace_spans WHERE run_id=? ORDER BY start_ts
+            """,
+            (run_id,),
+        ).fetchall()
+    spans = []
+    for r in rows:
+        try:
+            attrs = json.loads(r[9]) if r[9] else {}
+        except Exception:
+            attrs = {}
+        spans.append(
+            {
+                "span_id": r[0],
+                "parent_id": r[1],
+                "run_id": r[2],
+                "name": r[3],
+                "start_ts": float(r[4]),
+                "duration_ms": float(r[5]),
+                "status": r[6] or "ok",
+                "pid": int(r[7] or 0),
+                "thread": r[8] or "",
+                "attrs": attrs,
+            }
+        )
+    return spans
+
+
+def list_runs(db_path: Path, limit: int = 20) -> List[Dict[str, Any]]:
+    with pooled_connection(db_path) as conn:
+        _ensure_table(conn)
+        rows = conn.execute(
+            """
+            SELECT run_id, COUNT(*), MIN(start_ts), MAX(start_ts + duration_ms / 1000.0)
+            FROM trace_spans GROUP BY run_id ORDER BY MIN(start_ts) DESC LIMIT ?
+            """,
+            (int(limit),),
+        ).fetchall()
+    return [
+        {"run_id": r[0], "spans": int(r[1]), "start_ts": float(r[2]), "wall_ms": (float(r[3]) - float(r[2])) * 1000.0}
+        for r in rows
+    ]
+
+
+def flame_tree(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge spans into a call tree keyed by name path (siblings with the same
+    name are folded together, as in a flame graph). Each node carries total,
+    self (total minus children) and call count.
+    """
+    by_id = {s["span_id"]: s for s in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in spans:
+        parent = s["parent_id"] if s["parent_id"] in by_id else None
+        children.setdefault(parent, []).append(s)
+
+    def new_node(name: str) -> Dict[str, Any]:
+        return {"name": name, "total_ms": 0.0, "self_ms": 0.0, "count": 0, "errors": 0, "children": {}}
+
+    root = new_node("<run>")
+
+    def add(node: Dict[str, Any], s: Dict[str, Any]) -> None:
+        child = node["children"].setdefault(s["name"], new_node(s["name"]))
+        kids = children.get(s["span_id"], [])
+        child["total_ms"] += s["duration_ms"]
+        child["self_ms"] += max(0.0, s["duration_ms"] - sum(k["duration_ms"] for k in kids))
+        child["count"] += 1
+        if s["status"] != "ok":
+            child["errors"] += 1
+        for k in kids:
+            add(child, k)
+
+    for s in children.get(None, []):
+        add(root, s)
+    root["total_ms"] = sum(c["total_ms"] for c in root["children"].values())
+    return root
+
+
+def render_flame(spans: List[Dict[str, Any]], *, min_ms: float = 0.0, max_depth: int = 0, width: int = 30) -> str:
+    if not spans:
+        return "no spans"
+    start = min(s["start_ts"] for s in spans)
+    end = max(s["start_ts"] + s["duration_ms"] / 1000.0 for s in spans)
+    wall_ms = max((end - start) * 1000.0, 1e-9)
+    tree = flame_tree(spans)
+    lines = [
+        f"run {spans[0]['run_id']}: {len(spans)} spans, wall {wall_ms / 1000.0:.3f}s",
+        f"{'total_ms':>11} {'self_ms':>10} {'calls':>6} {'%wall':>6}  name",
+    ]
+
+    def walk(node: Dict[str, Any], depth: int) -> None:
+        ordered = sorted(node["children"].values(), key=lambda n: n["total_ms"], reverse=True)
+        for child in ordered:
+            if child["total_ms"] < min_ms:
+                continue
+            pct = 100.0 * child["total_ms"] / wall_ms
+            bar = "#" * max(1, int(round(width * min(pct, 100.0) / 100.0)))
+            err = f" !{child['errors']}" if child["errors"] else ""
+            lines.append(
+                f"{child['total_ms']:>11.1f} {child['self_ms']:>10.1f} {child['count']:>6} {pct:>5.1f}%  "
+                f"{'  ' * depth}{child['name']}{err}  {bar}"
+            )
+            if not max_depth or depth + 1 < max_depth:
+                walk(child, depth + 1)
+
+    walk(tree, 0)
+    return "\n".join(lines)
+
+
+def chrome_trace(spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Chrome trace-event JSON (chrome://tracing, Perfetto, speedscope)."""
+    events: List[Dict[str, Any]] = []
+    if not spans:
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+    t0 = min(s["start_ts"] for s in spans)
+    tids: Dict[Tuple[int, str], int] = {}
+    for s in spans:
+        key = (s["pid"], s["thread"])
+        if key not in tids:
+            tids[key] = len(tids) + 1
+            events.append(
+                {"name": "thread_name", "ph": "M", "pid": s["pid"], "tid": tids[key], "args": {"name": s["thread"]}}
+            )
+        args = dict(s["attrs"])
+        args.update({"span_id": s["span_id"], "parent_id": s["parent_id"], "status": s["status"]})
+        events.append(
+            {
+                "name": s["name"],
+                "cat": "bgl",
+                "ph": "X",
+                "ts": round((s["start_ts"] - t0) * 1e6, 1),
+                "dur": round(s["duration_ms"] * 1000.0, 1),
+                "pid": s["pid"],
+                "tid": tids[key],
+                "args": args,
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"run_id": spans[0]["run_id"], "start_ts": t0}}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Show trace spans recorded for a run.")
+    ap.add_argument("run_id", nargs="?", help="Run id (e.g. diag_1760000000).")
+    ap.add_argument("--db", default=str(DEFAULT_DB))
+    ap.add_argument("--list", action="store_true", help="List recent traced runs.")
+    ap.add_argument("--chrome", metavar="PATH", help="Write Chrome trace-event JSON instead of the breakdown.")
+    ap.add_argument("--min-ms", type=float, default=0.0, help="Hide nodes faster than this.")
+    ap.add_argument("--depth", type=int, default=0, help="Limit tree depth (0 = unlimited).")
+    args = ap.parse_args()
+
+    db_path = Path(args.db)
+    if args.list or not args.run_id:
+        for run in list_runs(db_path):
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["start_ts"]))
+            print(f"{run['run_id']:<32} {stamp}  spans={run['spans']:<6} wall={run['wall_ms'] / 1000.0:.3f}s")
+        return 0
+    spans = load_spans(db_path, args.run_id)
+    if not spans:
+        print(f"no spans for run {args.run_id}", file=sys.stderr)
+        return 1
+    if args.chrome:
+        out = Path(args.chrome)
+        out.write_text(json.dumps(chrome_trace(spans), ensure_ascii=False), encoding="utf-8")
+        print(f"wrote {len(spans)} spans to {out}")
+        return 0
+    print(render_flame(spans, min_ms=args.min_ms, max_depth=args.depth))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -43,6 +43,7 @@ def analyze_traces():
     interaction_stats = defaultdict(lambda: {"move": [], "dom": []})
     move_all = []
     dom_all = []
+    by_mode = defaultdict(lambda: {"move": [], "dom": []})
 
     for event_type, target, payload, timestamp in cursor:
         if event_type == "ui_click":
@@ -51,6 +52,7 @@ def analyze_traces():
         elif event_type == "mouse_metrics":
             # Parse payload
             parts = dict(p.split("=") for p in payload.split(";") if "=" in p)
+            mode = parts.get("mode") or "human"
 
             # Extract Move Time
             if "move_to_click_ms" in parts:
@@ -58,6 +60,7 @@ def analyze_traces():
                     val = int(parts["move_to_click_ms"])
                     interaction_stats[last_target]["move"].append(val)
                     move_all.append(val)
+                    by_mode[mode]["move"].append(val)
                 except ValueError:
                     pass
 
@@ -67,6 +70,7 @@ def analyze_traces():
                     val = int(parts["dom_change_ms"])
                     interaction_stats[last_target]["dom"].append(val)
                     dom_all.append(val)
+                    by_mode[mode]["dom"].append(val)
                 except ValueError:
                     pass
 
@@ -118,6 +122,13 @@ def analyze_traces():
                     "move_to_click_ms": compute_stats(move_all),
                     "click_to_dom_ms": compute_stats(dom_all),
                 },
+                "by_motor_mode": {
+                    mode: {
+                        "move_to_click_ms": compute_stats(m["move"]),
+                        "click_to_dom_ms": compute_stats(m["dom"]),
+                    }
+                    for mode, m in sorted(by_mode.items())
+                },
                 "per_target": final_report,
             },
             f,
@@ -2,12 +2,15 @@ import os
 import sys
 import time
 import subprocess
-from argparse import ArgumentParser
+from argparse import SUPPRESS, ArgumentParser
 from pathlib import Path
 
 
 ROOT = Path(__file__).resolve().parents[1]
 
+# Worker exit code asking the supervisor for an immediate recycle.
+RECYCLE_EXIT = 75
+
 
 def _preferred_python() -> str:
     candidates = [
@@ -22,17 +25,191 @@ def _preferred_python() -> str:
     return sys.executable
 
 
-def _run_once(profile: str | None) -> int:
+def _run_env(profile: str | None) -> dict:
     env = os.environ.copy()
     env["BGL_RUN_SOURCE"] = "diagnostic_daemon"
     env["BGL_RUN_TRIGGER"] = "diagnostic_daemon"
     if profile:
         env["BGL_DIAGNOSTIC_PROFILE"] = profile
-    cmd = [_preferred_python(), str(ROOT / ".bgl_core" / "brain" / "master_verify.py")]
+    return env
+
+
+def _popen_kwargs(env: dict) -> dict:
     kwargs = {"cwd": str(ROOT), "env": env}
     if os.name == "nt":
         kwargs["creationflags"] = 0x08000000  # CREATE_NO_WINDOW
-    return subprocess.call(cmd, **kwargs)
+    return kwargs
+
+
+def _run_once(profile: str | None) -> int:
+    cmd = [_preferred_python(), str(ROOT / ".bgl_core" / "brain" / "master_verify.py")]
+    return subprocess.call(cmd, **_popen_kwargs(_run_env(profile)))
+
+
+def _rss_mb_windows() -> float:
+    """Working set of this process via GetProcessMemoryInfo (no psutil needed)."""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    get_info = kernel32.K32GetProcessMemoryInfo
+    get_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+    get_info.restype = wintypes.BOOL
+    if not get_info(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return 0.0
+    return float(counters.WorkingSetSize) / (1024.0 * 1024.0)
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process in MB (0 if unknown)."""
+    if os.name == "nt":
+        try:
+            return _rss_mb_windows()
+        except Exception:
+            pass
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return float(line.split()[1]) / 1024.0
+    except Exception:
+        pass
+    try:
+        import psutil  # type: ignore
+
+        return float(psutil.Process().memory_info().rss) / (1024.0 * 1024.0)
+    except Exception:
+        return 0.0
+
+
+def _worker(args) -> int:
+    """
+    Resident worker: import the brain once and run master_assurance_diagnostic
+    in-process every interval. Interpreter, parsed scenario catalog, pooled DB
+    connections and (optionally) Chromium stay warm across cycles. Exits with
+    RECYCLE_EXIT after --max-runs cycles, past --max-rss-mb, or after repeated
+    failures so the supervisor can start a fresh process.
+    """
+    import asyncio
+    import atexit
+    import gc
+
+    brain = ROOT / ".bgl_core" / "brain"
+    sys.path.insert(0, str(brain))
+    os.chdir(str(ROOT))
+    os.environ.update(_run_env(args.profile.strip().lower() or None))
+    if args.warm_browser:
+        os.environ["BGL_WARM_BROWSER"] = "1"
+    # The CLI force-exits after a run in autonomous mode; a resident worker must not.
+    os.environ["BGL_FORCE_PROCESS_EXIT"] = "0"
+
+    import master_verify  # noqa: E402
+
+    interval = max(60, int(args.interval))
+    max_runs = max(1, int(args.max_runs))
+    max_rss = float(args.max_rss_mb or 0)
+    baseline_env = dict(os.environ)
+
+    async def _loop() -> int:
+        runs = 0
+        failures = 0
+        rss_warned = False
+        try:
+            while True:
+                started = time.time()
+                try:
+                    master_verify.prepare_run_environment(ROOT)
+                    master_verify.log_run_audit(ROOT)
+                    await master_verify.master_assurance_diagnostic()
+                    failures = 0
+                except Exception as exc:
+                    failures += 1
+                    print(f"[diagnostic_daemon] cycle failed: {exc}")
+                finally:
+                    # The CLI's exit-time report fallback only makes sense for a one-shot process.
+                    try:
+                        atexit.unregister(master_verify._exit_report_fallback)
+                    except Exception:
+                        pass
+                    # Isolation: drop env mutations made by the run (profile toggles etc.).
+                    os.environ.clear()
+                    os.environ.update(baseline_env)
+                    gc.collect()
+                runs += 1
+                rss = _rss_mb()
+                print(
+                    f"[diagnostic_daemon] cycle {runs}/{max_runs} "
+                    f"took {time.time() - started:.1f}s rss={rss:.0f}MB"
+                )
+                if max_rss and rss <= 0 and not rss_warned:
+                    rss_warned = True
+                    print(
+                        "[!] diagnostic_daemon: RSS unavailable on this platform; "
+                        f"--max-rss-mb ignored, recycling every {max_runs} runs."
+                    )
+                if args.once:
+                    return 0
+                if runs >= max_runs or (max_rss and rss >= max_rss) or failures >= 3:
+                    return RECYCLE_EXIT
+                await asyncio.sleep(interval)
+        finally:
+            try:
+                from browser_manager import close_shared_managers  # type: ignore
+
+                await close_shared_managers()
+            except Exception:
+                pass
+
+    return asyncio.run(_loop())
+
+
+def _supervise(args) -> int:
+    """Keep one resident worker alive, restarting it on recycle or crash."""
+    cmd = [
+        _preferred_python(),
+        str(Path(__file__).resolve()),
+        "--worker",
+        "--interval",
+        str(args.interval),
+        "--max-runs",
+        str(args.max_runs),
+        "--max-rss-mb",
+        str(args.max_rss_mb),
+    ]
+    if args.profile:
+        cmd += ["--profile", args.profile]
+    if args.warm_browser:
+        cmd.append("--warm-browser")
+    if args.once:
+        cmd.append("--once")
+    interval = max(60, int(args.interval))
+    while True:
+        code = subprocess.call(cmd, **_popen_kwargs(os.environ.copy()))
+        if args.once:
+            return code
+        if code == RECYCLE_EXIT:
+            time.sleep(interval)
+            continue
+        # Crash or unexpected exit: back off one interval before respawning.
+        print(f"[diagnostic_daemon] worker exited with {code}; restarting")
+        time.sleep(interval)
 
 
 def main() -> int:
@@ -40,8 +217,23 @@ def main() -> int:
     ap.add_argument("--interval", type=int, default=900, help="Seconds between runs.")
     ap.add_argument("--profile", type=str, default="", help="Override diagnostic profile (fast|medium|full).")
     ap.add_argument("--once", action="store_true", help="Run a single diagnostic and exit.")
+    ap.add_argument(
+        "--warm",
+        action="store_true",
+        default=os.getenv("BGL_DIAGNOSTIC_DAEMON_WARM", "0") == "1",
+        help="Run diagnostics in a resident worker process instead of a cold subprocess per cycle.",
+    )
+    ap.add_argument("--warm-browser", action="store_true", help="Keep Chromium alive between warm cycles.")
+    ap.add_argument("--max-runs", type=int, default=20, help="Recycle the warm worker after N cycles.")
+    ap.add_argument("--max-rss-mb", type=float, default=1536, help="Recycle the warm worker above this RSS (0 disables).")
+    ap.add_argument("--worker", action="store_true", help=SUPPRESS)
     args = ap.parse_args()
 
+    if args.worker:
+        return _worker(args)
+    if args.warm:
+        return _supervise(args)
+
     profile = args.profile.strip().lower() or None
     interval = max(60, int(args.interval))
 
@@ -6,7 +6,6 @@ import time
 import random
 from pathlib import Path
 import json
-import hashlib
 
 try:
     import psutil
@@ -18,10 +17,12 @@ sys.path.append(str(Path.cwd()))
 try:
     from .bgl_core.brain.inference import ReasoningEngine
     from .bgl_core.brain.embeddings import add_text
+    from .bgl_core.brain.auto_insights import SourceHashCache, _extract_meta
 except ImportError:
     sys.path.append(str(Path.cwd() / ".bgl_core" / "brain"))
     from inference import ReasoningEngine
     from embeddings import add_text
+    from auto_insights import SourceHashCache, _extract_meta
 
 
 def discover_files(root_path: Path):
@@ -129,13 +130,8 @@ async def dream_cycle(
         from brain_types import Intent, Context
 
     root_path = Path.cwd()
-
-    def get_file_hash(path):
-        hasher = hashlib.sha256()
-        with open(path, "rb") as f:
-            while chunk := f.read(8192):
-                hasher.update(chunk)
-        return hasher.hexdigest()
+    # Digests persist in knowledge.db; unchanged sources are never re-read.
+    source_hashes = SourceHashCache(root_path / ".bgl_core" / "brain" / "knowledge.db")
 
     for relative_path in files_to_analyze:
         # CHECK LIMITS
@@ -154,14 +150,15 @@ async def dream_cycle(
         if not full_path.exists():
             continue
 
-        source_hash = get_file_hash(full_path)
+        source_hash = source_hashes.digest(full_path)
         file_name = Path(relative_path).name
         insight_file = insights_dir / f"{file_name}.insight.md"
 
         if insight_file.exists():
             # Check for staleness
             existing_content = insight_file.read_text(encoding="utf-8")
-            if f"Source-Hash: {source_hash}" in existing_content:
+            _, stored_hash = _extract_meta(existing_content)
+            if stored_hash == source_hash:
                 continue  # Still valid
             else:
                 print(f"🔄 Source changed for {file_name}. Regenerating insight...")
@@ -214,6 +211,7 @@ async def dream_cycle(
 
             print(f"✨ Insight saved to {insight_file.name}")
             generated_count += 1
+            source_hashes.flush()
 
         except Exception as e:
             print(f"😴 Nightmare on {file_name}: {e}")
@@ -222,6 +220,8 @@ async def dream_cycle(
         if sleep_seconds and sleep_seconds > 0:
             time.sleep(float(sleep_seconds))
 
+    source_hashes.flush()
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
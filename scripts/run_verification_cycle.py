@@ -100,7 +100,8 @@ def main():
     run_shadow_phase()
 
     # 7. Concurrency Stress Test (Phase 4)
-    cmd_stress = [PYTHON_EXE, str(ROOT_DIR / "scripts" / "stress_test.py")]
+    # Open-loop load with shadow writes enabled (mutating routes hit the shadow DB).
+    cmd_stress = [PYTHON_EXE, str(ROOT_DIR / "scripts" / "stress_test.py"), "--shadow"]
     run_command(cmd_stress, "Running Concurrency Stress Test (Phase 4)")
 
     print("🏁 Verification Cycle Completed Successfully!")
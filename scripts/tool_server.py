@@ -41,10 +41,19 @@ PYTHON_EXE = _preferred_python()
 
 from llm_tools import dispatch  # type: ignore
 from intent_resolver import resolve_intent  # type: ignore
-from agency_core import AgencyCore
 import asyncio
 
-agency = AgencyCore(ROOT)
+_AGENCY = None
+
+
+def _agency():
+    """AgencyCore is heavy (DB, browser, brain modules); build it on first chat."""
+    global _AGENCY
+    if _AGENCY is None:
+        from agency_core import AgencyCore
+
+        _AGENCY = AgencyCore(ROOT)
+    return _AGENCY
 
 
 class Handler(BaseHTTPRequestHandler):
@@ -586,7 +595,7 @@ class Handler(BaseHTTPRequestHandler):
             try:
                 plan = asyncio.run(
                     asyncio.wait_for(
-                        agency.inference.chat(messages, target_url), timeout=20
+                        _agency().inference.chat(messages, target_url), timeout=20
                     )
                 )
             except Exception:
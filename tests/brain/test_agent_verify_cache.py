@@ -0,0 +1,60 @@
+import json
+import sys
+import time
+import types
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import agent_verify  # type: ignore
+
+
+def _project(tmp_path: Path, checks) -> Path:
+    brain = tmp_path / ".bgl_core" / "brain"
+    brain.mkdir(parents=True)
+    (brain / "inference_patterns.json").write_text(
+        json.dumps([{"id": c, "check": c, "scope": "db"} for c in checks])
+    )
+    schema = {"tables": [{"name": "guarantees", "columns": [{"name": "bank_id"}], "foreign_keys": [], "indexes": []}]}
+    (brain / "db_schema.json").write_text(json.dumps(schema))
+    return tmp_path
+
+
+def test_results_memoized_on_input_content(tmp_path: Path, monkeypatch):
+    root = _project(tmp_path, ["db_fk_missing", "db_index_missing"])
+    calls = []
+    real = agent_verify.CheckContext.json
+
+    def counting(self, rel):
+        calls.append(rel)
+        return real(self, rel)
+
+    monkeypatch.setattr(agent_verify.CheckContext, "json", counting)
+    first = agent_verify.run_all_checks(root)
+    assert [r["check"] for r in first["results"]] == ["db_fk_missing", "db_index_missing"]
+    assert "guarantees.bank_id missing FK -> banks.id" in first["results"][0]["evidence"]
+    assert len(calls) == 2  # both checks read db_schema.json from the shared context
+
+    calls.clear()
+    assert agent_verify.run_all_checks(root) == first
+    assert calls == []  # unchanged inputs: served from the memo
+
+    schema_path = root / ".bgl_core" / "brain" / "db_schema.json"
+    schema_path.write_text(json.dumps({"tables": []}))
+    third = agent_verify.run_all_checks(root)
+    assert third["results"][0]["evidence"] == ["table guarantees missing from schema"]
+
+
+def test_slow_check_times_out(tmp_path: Path, monkeypatch):
+    slow = types.ModuleType("checks.slow_probe")
+    slow.run = lambda project_root: time.sleep(2) or {"passed": True}
+    monkeypatch.setitem(sys.modules, "checks.slow_probe", slow)
+    monkeypatch.setenv("BGL_AGENT_VERIFY_TIMEOUT", "0.2")
+    root = _project(tmp_path, ["slow_probe", "db_fk_missing"])
+    started = time.monotonic()
+    out = agent_verify.run_all_checks(root)
+    assert time.monotonic() - started < 1.5
+    assert out["results"][0]["evidence"][0].startswith("timeout after")
+    assert out["results"][1]["check"] == "db_fk_missing"
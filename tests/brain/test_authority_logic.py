@@ -69,3 +69,38 @@ def test_gate_blocks_write_prod_in_sandbox_mode(tmp_path: Path):
     gate = auth.gate(req, source="test")
     assert gate.allowed is False
     assert gate.requires_human is True
+
+
+def test_runtime_hint_uses_indexed_contracts(tmp_path: Path):
+    import json
+    import os
+
+    root = _make_temp_root(tmp_path)
+    contracts = root / "analysis" / "code_contracts.json"
+    contracts.parent.mkdir(parents=True)
+    rt = lambda n, e: {"event_count": n, "error_count": e, "avg_latency_ms": 10.0, "last_ts": float(n)}
+    data = {
+        "contracts": [
+            {"id": "api:GET:/api/a.php", "kind": "api", "route": "/api/a.php", "file": "./api/a.php", "runtime": rt(4, 1)},
+            {"id": "php:app/x/Foo.php", "kind": "php_module", "file": "app/x/Foo.php", "runtime": rt(2, 0)},
+            {"id": "php:lib/Foo.php", "kind": "php_module", "file": "lib/Foo.php", "runtime": rt(6, 0)},
+            {"id": "php:app/y.php", "kind": "php_module", "file": "app/y.php", "runtime": {}},
+        ]
+    }
+    contracts.write_text(json.dumps(data), encoding="utf-8")
+    auth = Authority(root)
+
+    hint = auth._runtime_hint(["Foo.php"], {"url": "http://host/api/a.php"})
+    # Suffix match keeps the first contract in file order, as the JSON scan did.
+    assert hint["sources"] == ["file:app/x/Foo.php", "route:/api/a.php"]
+    assert (hint["event_count"], hint["error_count"]) == (6, 1)
+    assert auth._runtime_hint(["api/a.php", "app/y.php"], {})["sources"] == ["file:api/a.php"]
+    assert auth._runtime_hint(["nope.php"], {}) == {"has_evidence": False, "event_count": 0, "error_count": 0}
+
+    data["contracts"][2]["runtime"] = rt(9, 3)
+    data["contracts"].insert(0, data["contracts"].pop(2))
+    contracts.write_text(json.dumps(data), encoding="utf-8")
+    st = contracts.stat()
+    os.utime(contracts, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    hint = auth._runtime_hint(["Foo.php"], {})
+    assert hint["sources"] == ["file:lib/Foo.php"] and hint["error_count"] == 3
@@ -8,7 +8,7 @@ import sys
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
 
-from auto_insights import should_include_insight  # type: ignore
+from auto_insights import SourceHashCache, audit_auto_insights, should_include_insight  # type: ignore
 
 
 def _hash_file(path: Path) -> str:
@@ -42,3 +42,29 @@ def test_auto_insight_ttl_expired(tmp_path: Path, monkeypatch):
     ok, reason = should_include_insight(insight, project_root, allow_legacy=False)
     assert ok is False
     assert reason == "expired"
+
+
+def test_audit_reuses_persisted_source_hashes(tmp_path: Path, monkeypatch):
+    monkeypatch.delenv("BGL_AUTO_INSIGHTS_TTL_DAYS", raising=False)
+    project_root = tmp_path / "proj"
+    folder = project_root / ".bgl_core" / "knowledge" / "auto_insights"
+    folder.mkdir(parents=True)
+    db = project_root / ".bgl_core" / "brain" / "knowledge.db"
+    for name in ("A.php", "B.php"):
+        src = project_root / "app" / name
+        src.parent.mkdir(parents=True, exist_ok=True)
+        src.write_text(f"<?php // {name}", encoding="utf-8")
+        (folder / f"{name}.insight.md").write_text(
+            f"**Path**: `app/{name}`\n**Source-Hash**: {_hash_file(src)}\n", encoding="utf-8"
+        )
+
+    first = audit_auto_insights(project_root, hashes=SourceHashCache(db))
+    assert (first["loaded"], first["hash_computed"]) == (2, 2)
+    second = audit_auto_insights(project_root, hashes=SourceHashCache(db))
+    assert (second["loaded"], second["hash_reused"], second["hash_computed"]) == (2, 2, 0)
+
+    src = project_root / "app" / "A.php"
+    src.write_text("<?php // changed", encoding="utf-8")
+    os.utime(src, ns=(src.stat().st_atime_ns, src.stat().st_mtime_ns + 1_000_000))
+    third = audit_auto_insights(project_root, hashes=SourceHashCache(db))
+    assert (third["stale"], third["hash_computed"], third["hash_reused"]) == (1, 1, 1)
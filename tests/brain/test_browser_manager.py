@@ -0,0 +1,41 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import browser_manager  # type: ignore
+
+
+class _Proc:
+    returncode = None
+
+    def __init__(self):
+        self.killed = 0
+
+    def kill(self):
+        self.killed += 1
+        self.returncode = -9
+
+
+def test_manager_from_closed_loop_is_retired(monkeypatch):
+    monkeypatch.setattr(browser_manager, "_SHARED", {})
+    monkeypatch.setattr(browser_manager, "_SHARED_LOOPS", {})
+
+    async def get():
+        return browser_manager.shared_manager("http://localhost")
+
+    first = asyncio.run(get())
+    proc = _Proc()
+    transport = SimpleNamespace(_proc=proc)
+    first._playwright = SimpleNamespace(_impl_obj=SimpleNamespace(_connection=SimpleNamespace(_transport=transport)))
+    first._browser = object()
+
+    second = asyncio.run(get())
+    assert second is not first
+    assert proc.killed == 1
+    assert first._playwright is None and first._browser is None
+    assert list(browser_manager._SHARED.values()) == [second]
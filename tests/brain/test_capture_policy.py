@@ -0,0 +1,118 @@
+import io
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import browser_manager  # type: ignore
+import capture_store  # type: ignore
+
+
+def test_screenshot_store_dedups_and_tracks_bytes(tmp_path: Path):
+    store = capture_store.ScreenshotStore(tmp_path / "shots")
+    png = b"\x89PNG\r\n\x1a\n" + b"x" * 512
+    first = store.save(png, tmp_path / "shots" / "a.png", scope="/dash")
+    again = store.save(png, tmp_path / "shots" / "b.png", scope="/dash")
+    assert again == first and first.exists()
+    assert not (tmp_path / "shots" / "b.png").exists()
+    # Same pixels captured for another route keep their own evidence file.
+    elsewhere = store.save(png, tmp_path / "shots" / "d.png", scope="/settings")
+    assert elsewhere != first and elsewhere.exists()
+
+    reopened = capture_store.ScreenshotStore(tmp_path / "shots")
+    totals = reopened.totals
+    assert totals["deduped"] == 1 and totals["saved"] == 2
+    assert totals["bytes_saved"] >= len(png)
+    other = reopened.save(png + b"y", tmp_path / "shots" / "c.png", scope="/dash")
+    assert other != first
+
+
+def _png(shift: int = 0, flip: bool = False) -> bytes:
+    Image = pytest.importorskip("PIL.Image")
+    noise = random.Random(7)
+    img = Image.new("RGB", (320, 200))
+    pixels = []
+    for y in range(200):
+        for x in range(320):
+            level = 255 - x * 200 // 319 if flip else x * 200 // 319
+            pixels.append((min(255, level + shift + noise.randrange(40)), y, 128))
+    img.putdata(pixels)
+    out = io.BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+def test_dhash_near_duplicates_and_webp_output(tmp_path: Path):
+    base, nudged, other = _png(), _png(shift=1), _png(flip=True)
+    assert base != nudged
+    assert capture_store.hamming(capture_store.dhash(base), capture_store.dhash(nudged)) <= 2
+    assert capture_store.hamming(capture_store.dhash(base), capture_store.dhash(other)) > 2
+
+    store = capture_store.ScreenshotStore(tmp_path / "shots", fmt="webp", quality=80, max_distance=2)
+    first = store.save(base, tmp_path / "shots" / "a.png", scope="tag")
+    assert first.suffix == ".webp" and first.read_bytes()[8:12] == b"WEBP"
+    assert first.stat().st_size < len(base)
+    assert store.save(nudged, tmp_path / "shots" / "b.png", scope="tag") == first
+    assert store.save(other, tmp_path / "shots" / "c.png", scope="tag") != first
+    assert store.stats["deduped"] == 1 and store.stats["saved"] == 2
+
+    # Failure evidence only reuses byte-identical captures.
+    failing = store.save(nudged, tmp_path / "shots" / "e.png", scope="tag", near_dup=False)
+    assert failing != first and failing.exists()
+    assert store.save(nudged, tmp_path / "shots" / "f.png", scope="tag", near_dup=False) == failing
+
+
+def test_fallback_without_pillow_warns_once(tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.setattr(capture_store, "Image", None)
+    monkeypatch.setattr(capture_store, "_FALLBACK_WARNED", False)
+    store = capture_store.ScreenshotStore(tmp_path / "shots")
+    first = store.save(b"\x89PNG-a", tmp_path / "shots" / "a.png")
+    store.save(b"\x89PNG-b", tmp_path / "shots" / "b.png")
+    assert first.suffix == ".png"
+    assert capsys.readouterr().out.count("Pillow not installed") == 1
+
+
+def _manager(tmp_path: Path, monkeypatch, policy: str):
+    monkeypatch.setattr(browser_manager, "VIDEO_DIR", tmp_path / "video")
+    monkeypatch.setattr(capture_store, "LEDGER_PATH", tmp_path / "capture_savings.json")
+    return browser_manager.BrowserManager("http://localhost", video_policy=policy)
+
+
+def _fake_recording(manager, size: int) -> None:
+    manager._video_dir = manager._video_target()
+    manager._video_dir.mkdir(parents=True, exist_ok=True)
+    (manager._video_dir / "page.webm").write_bytes(b"v" * size)
+
+
+def test_video_kept_only_on_failure_and_wall_time_ledger(tmp_path: Path, monkeypatch):
+    manager = _manager(tmp_path, monkeypatch, "on_failure")
+    _fake_recording(manager, 1000)
+    manager.note_scenario("login", 2.5)
+    manager._finalize_video()
+    assert manager.video_stats == {"bytes_kept": 0, "bytes_discarded": 1000}
+    assert not list((tmp_path / "video").glob("*.webm"))
+
+    _fake_recording(manager, 300)
+    manager.note_scenario("login", 2.5)
+    manager.mark_failure("login")
+    manager._finalize_video()
+    assert manager.video_stats["bytes_kept"] == 300
+    assert (tmp_path / "video" / "page.webm").exists()
+    assert capture_store.recently_failed(["login", "other"], days=1) == ["login"]
+
+    flaky = _manager(tmp_path, monkeypatch, "flaky")
+    assert flaky._video_target() is None
+    flaky.note_scenario("login", 2.0)
+    flaky._finalize_video()
+    flaky.request_video(True)
+    assert flaky._video_target() is not None
+
+    report = capture_store.summarize(tmp_path / "capture_savings.json")
+    assert report["video"]["bytes_discarded"] == 1000
+    assert report["scenarios"]["login"]["wall_saved_s"] == 0.5
+    assert report["scenarios_measured"] == 1
@@ -0,0 +1,66 @@
+import copy
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import config_loader  # type: ignore
+
+
+def _count_parses(monkeypatch) -> list:
+    calls = []
+    real = config_loader._parse_config
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(config_loader, "_parse_config", counting)
+    return calls
+
+
+def test_cfg_value_parses_config_once(monkeypatch):
+    import scenario_runner  # type: ignore
+
+    config_loader.invalidate()
+    calls = _count_parses(monkeypatch)
+    for i in range(1000):
+        scenario_runner._cfg_value("selector_cooldown_threshold" if i % 2 else "base_url", None)
+    assert len(calls) == 1
+
+
+def test_reload_on_change_and_read_only(tmp_path: Path, monkeypatch):
+    (tmp_path / ".bgl_core").mkdir()
+    (tmp_path / "storage").mkdir()
+    cfg_path = tmp_path / ".bgl_core" / "config.yml"
+    flags_path = tmp_path / "storage" / "agent_flags.json"
+    cfg_path.write_text("a: 1\nnested:\n  b: 2\n")
+    calls = _count_parses(monkeypatch)
+
+    cfg = config_loader.load_config(tmp_path)
+    assert cfg["a"] == 1 and config_loader.load_config(tmp_path) is cfg
+    with pytest.raises(TypeError):
+        cfg["a"] = 2
+    with pytest.raises(TypeError):
+        cfg["nested"]["b"] = 3
+    mutable = copy.deepcopy(cfg)
+    mutable["nested"]["b"] = 3
+    assert json.loads(json.dumps(cfg)) == {"a": 1, "nested": {"b": 2}}
+    assert config_loader.yaml.safe_load(config_loader.yaml.safe_dump(cfg)) == {"a": 1, "nested": {"b": 2}}
+
+    flags_path.write_text(json.dumps({"a": 5}))
+    assert config_loader.load_config(tmp_path)["a"] == 5
+    # Same size, same mtime: only an explicit invalidate() picks it up.
+    st = flags_path.stat()
+    flags_path.write_text(json.dumps({"a": 6}))
+    os.utime(flags_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert config_loader.load_config(tmp_path)["a"] == 5
+    config_loader.invalidate(tmp_path)
+    assert config_loader.load_config(tmp_path)["a"] == 6
+    assert len(calls) == 3
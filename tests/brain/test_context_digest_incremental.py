@@ -0,0 +1,82 @@
+import sqlite3
+import time
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+from context_digest import (  # type: ignore
+    confirm_route_emits,
+    incremental_route_digest,
+    read_watermark,
+    upsert_experiences,
+)
+from schema_migrations import ensure_schema  # type: ignore
+
+
+def _insert(conn: sqlite3.Connection, rows):
+    conn.executemany(
+        "INSERT INTO runtime_events (timestamp, event_type, route, status, latency_ms) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+
+
+def _digest(conn: sqlite3.Connection, now: float, time_left_fn=None):
+    result = incremental_route_digest(conn, lambda: {}, cutoff=now - 3600)
+    stored = upsert_experiences(conn, result["summaries"], time_left_fn=time_left_fn)
+    confirm_route_emits(conn, result["emits"], stored)
+    return result
+
+
+def test_incremental_digest_only_emits_material_changes(tmp_path: Path):
+    db = tmp_path / "knowledge.db"
+    ensure_schema(db)
+    conn = sqlite3.connect(str(db))
+    now = time.time()
+    _insert(conn, [(now - i, "api_call", "/a", 200, 120.0) for i in range(50)])
+
+    first = _digest(conn, now)
+    assert first["events"] == 50
+    assert [s["scenario"] for s in first["summaries"]] == ["/a"]
+    assert read_watermark(conn) == first["last_id"]
+
+    # Nothing new: no rows scanned, nothing emitted.
+    again = _digest(conn, now)
+    assert again["events"] == 0 and again["summaries"] == []
+
+    # A couple of healthy events are not material; a new failure is.
+    _insert(conn, [(now, "api_call", "/a", 200, 120.0)] * 2)
+    assert _digest(conn, now)["summaries"] == []
+    _insert(conn, [(now, "api_call", "/a", 500, 120.0)])
+    changed = _digest(conn, now)
+    assert changed["events"] == 1
+    assert "53 events" in changed["summaries"][0]["summary"]
+    assert changed["summaries"][0]["evidence_count"] == 3
+    conn.close()
+
+
+def test_route_reemitted_when_upsert_is_skipped(tmp_path: Path):
+    db = tmp_path / "knowledge.db"
+    ensure_schema(db)
+    conn = sqlite3.connect(str(db))
+    now = time.time()
+    _insert(conn, [(now - i, "api_call", "/b", 500, 80.0) for i in range(20)])
+
+    # Budget runs out between the aggregate pass and the upsert: the
+    # watermark advances but the route stays pending.
+    first = _digest(conn, now, time_left_fn=lambda: 1.0)
+    assert [s["scenario"] for s in first["summaries"]] == ["/b"]
+    assert conn.execute("SELECT COUNT(*) FROM experiences").fetchone()[0] == 0
+    assert read_watermark(conn) == first["last_id"]
+
+    retry = _digest(conn, now)
+    assert retry["events"] == 0
+    assert [s["summary"] for s in retry["summaries"]] == [first["summaries"][0]["summary"]]
+    assert conn.execute("SELECT COUNT(*) FROM experiences").fetchone()[0] == 1
+
+    # Once stored, the route is no longer re-emitted.
+    assert _digest(conn, now)["summaries"] == []
+    conn.close()
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import contract_tests  # type: ignore
+
+SPEC = """openapi: 3.0.0
+info: {title: t, version: '0.1'}
+paths:
+  /api/a.php:
+    get: {responses: {'200': {description: OK}}}
+  /api/b.php:
+    get: {responses: {'200': {description: OK}}}
+    post: {responses: {'200': {description: OK}}}
+  /api/slow.php:
+    get: {responses: {'200': {description: OK}}}
+"""
+
+# Stand-in for the schemathesis CLI: hangs on shards containing /api/slow.php.
+FAKE = "import sys, time; spec = open(sys.argv[1]).read(); print(spec.count('.php:')); time.sleep(30 if 'slow' in spec else 0)"
+
+
+def test_sharded_change_scoped_run(tmp_path: Path, monkeypatch):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "api").mkdir()
+    (tmp_path / "docs" / "openapi.yaml").write_text(SPEC, encoding="utf-8")
+    for name in ("a", "b", "slow"):
+        (tmp_path / "api" / f"{name}.php").write_text(f"<?php // {name}", encoding="utf-8")
+    monkeypatch.setattr(contract_tests, "_schemathesis_cmd", lambda spec: [sys.executable, "-c", FAKE, str(spec)])
+    monkeypatch.setenv("BGL_CONTRACT_WORKERS", "2")
+    monkeypatch.setenv("BGL_CONTRACT_SHARD_TIMEOUT", "2")
+
+    first = contract_tests.run_contract_suite(tmp_path)[0]
+    assert (first["operations_total"], first["operations_run"]) == (4, 4)
+    assert first["passed"] is False
+    by_shard = {tuple(s["operations"]): s for s in first["shards"]}
+    # Round-robin: the slow shard times out, the other still reports green.
+    assert by_shard[("GET /api/a.php", "POST /api/b.php")]["passed"] is True
+    assert by_shard[("GET /api/b.php", "GET /api/slow.php")]["timed_out"] is True
+    assert (tmp_path / ".bgl_core" / "logs" / "contract_shards" / "shard_0.json").exists()
+
+    (tmp_path / "api" / "slow.php").write_text("<?php // fixed", encoding="utf-8")
+    monkeypatch.setattr(
+        contract_tests, "_schemathesis_cmd", lambda spec: [sys.executable, "-c", "print('ok')", str(spec)]
+    )
+    second = contract_tests.run_contract_suite(tmp_path)[0]
+    assert second["passed"] is True
+    assert sorted(op for s in second["shards"] for op in s["operations"]) == ["GET /api/b.php", "GET /api/slow.php"]
+
+    third = contract_tests.run_contract_suite(tmp_path)[0]
+    assert (third["passed"], third["operations_run"], third["shards"]) == (True, 0, [])
+    assert contract_tests.run_contract_suite(tmp_path, scope="all")[0]["operations_run"] == 4
@@ -0,0 +1,121 @@
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+from db_utils import WalCheckpointer, snapshot_connection, wal_size_bytes  # type: ignore
+
+
+def _seed(db: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE runtime_events (id INTEGER PRIMARY KEY, route TEXT)")
+    conn.execute("INSERT INTO runtime_events (route) VALUES ('/a')")
+    conn.commit()
+    return conn
+
+
+def test_snapshot_is_pinned_and_read_only(tmp_path: Path):
+    db = tmp_path / "knowledge.db"
+    writer = _seed(db)
+    with snapshot_connection(db) as snap:
+        before = snap.execute("SELECT COUNT(*) FROM runtime_events").fetchone()[0]
+        writer.execute("INSERT INTO runtime_events (route) VALUES ('/b')")
+        writer.commit()
+        after = snap.execute("SELECT COUNT(*) FROM runtime_events").fetchone()[0]
+        assert before == after == 1
+        with pytest.raises(sqlite3.OperationalError):
+            snap.execute("INSERT INTO runtime_events (route) VALUES ('/c')")
+    with snapshot_connection(db) as snap:
+        assert snap.execute("SELECT COUNT(*) FROM runtime_events").fetchone()[0] == 2
+    writer.close()
+
+
+def test_checkpointer_truncates_wal_past_threshold(tmp_path: Path):
+    db = tmp_path / "knowledge.db"
+    writer = _seed(db)
+    writer.executemany(
+        "INSERT INTO runtime_events (route) VALUES (?)", [(f"/r{i}" * 20,) for i in range(2000)]
+    )
+    writer.commit()
+    assert wal_size_bytes(db) > 0
+    cp = WalCheckpointer(db, passive_mb=0, truncate_mb=0.01)
+    res = cp.tick()
+    assert res and res["mode"] == "TRUNCATE"
+    assert wal_size_bytes(db) == 0
+    assert cp.stats["truncate"] == 1
+    writer.close()
+
+
+def test_nested_writers_on_different_dbs_each_commit(tmp_path: Path):
+    from db_utils import ConnectionPool  # type: ignore
+
+    pool = ConnectionPool()
+    a, b = tmp_path / "a.db", tmp_path / "b.db"
+    for db in (a, b):
+        _seed(db).close()
+    with pool.writer(a) as conn_a:
+        conn_a.execute("INSERT INTO runtime_events (route) VALUES ('/outer')")
+        with pool.writer(b) as conn_b:
+            conn_b.execute("INSERT INTO runtime_events (route) VALUES ('/inner')")
+        with pool.writer(a) as again:
+            again.execute("INSERT INTO runtime_events (route) VALUES ('/nested')")
+        # The inner writer on b committed on exit; a is still inside its outer block.
+        with sqlite3.connect(str(b)) as check:
+            assert check.execute("SELECT COUNT(*) FROM runtime_events").fetchone()[0] == 2
+        assert conn_a.in_transaction
+    with sqlite3.connect(str(a)) as check:
+        assert check.execute("SELECT COUNT(*) FROM runtime_events").fetchone()[0] == 3
+    pool.close()
+
+
+def test_readers_of_exited_threads_are_pruned(tmp_path: Path):
+    from db_utils import ConnectionPool  # type: ignore
+
+    pool = ConnectionPool()
+    db = tmp_path / "knowledge.db"
+    _seed(db).close()
+
+    def _read() -> None:
+        with pool.reader(db) as conn:
+            conn.execute("SELECT COUNT(*) FROM runtime_events").fetchone()
+
+    # Keep the workers alive together so each gets its own reader.
+    barrier = threading.Barrier(5)
+
+    def _worker() -> None:
+        _read()
+        barrier.wait()
+
+    threads = [threading.Thread(target=_worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert pool.stats(db)["reader_connections"] == 5
+    _read()
+    stats = pool.stats(db)
+    assert stats["reader_connections"] == 1
+    assert stats["readers_pruned"] == 5
+    pool.close()
+
+
+def test_observation_reads_run_legacy_ddl_through_the_writer(tmp_path: Path):
+    import db_utils  # type: ignore
+    import observations  # type: ignore
+
+    db = tmp_path / "fresh.db"
+    assert observations.latest_env_snapshot(db) is None
+    acquired = db_utils._POOL.stats(db)["writer_acquisitions"]
+    assert acquired == 1
+    with sqlite3.connect(str(db)) as check:
+        assert check.execute("SELECT name FROM sqlite_master WHERE name='env_snapshots'").fetchone()
+    # The DDL ran once; later reads only use the per-thread reader.
+    assert observations.latest_env_snapshot(db) is None
+    assert db_utils._POOL.stats(db)["writer_acquisitions"] == acquired
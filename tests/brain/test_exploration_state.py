@@ -0,0 +1,79 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import exploration_state  # type: ignore
+from exploration_state import ExplorationState  # type: ignore
+
+
+def _db(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path))
+    conn.executescript(
+        """
+        CREATE TABLE exploration_history (id INTEGER PRIMARY KEY AUTOINCREMENT, selector TEXT, href TEXT, tag TEXT, created_at REAL);
+        CREATE TABLE exploration_novelty (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, selector TEXT, selector_key TEXT, href_base TEXT, route TEXT,
+            seen_count INTEGER DEFAULT 0, last_seen REAL, last_result TEXT, last_score_delta REAL
+        );
+        CREATE TABLE selector_cooldowns (
+            selector_key TEXT NOT NULL, route_key TEXT NOT NULL, fail_count INTEGER DEFAULT 0, last_seen REAL,
+            cooldown_until REAL DEFAULT 0, last_reason TEXT, last_run_id TEXT, PRIMARY KEY (selector_key, route_key)
+        );
+        INSERT INTO exploration_history (selector, href, tag, created_at) VALUES ('#old', '/old.php', 'a', 1);
+        INSERT INTO exploration_novelty (selector, selector_key, seen_count, last_seen) VALUES ('#save', 'id=save', 2, 1);
+        INSERT INTO selector_cooldowns (selector_key, route_key, fail_count, cooldown_until, last_reason, last_run_id)
+            VALUES ('id=save', '/views', 1, 0, 'timeout', 'r0');
+        """
+    )
+    conn.commit()
+    return conn
+
+
+def test_write_behind_round_trip(tmp_path: Path):
+    conn = _db(tmp_path / "knowledge.db")
+    state = ExplorationState(tmp_path / "knowledge.db")
+    state.load(conn)
+    assert state.explored == {"#old", "/old.php"}
+    assert state.novelty_row("#save", "id=save")["seen_count"] == 2
+    assert state.get_cooldown("id=save", "/views")["fail_count"] == 1
+
+    state.record_outcome(selector="#save", selector_key="id=save", href_base="", route="/views", result="reward", delta_score=0.4)
+    state.record_outcome(selector="#new", selector_key="", href_base="", route="/views", result="changed", delta_score=0.0)
+    state.record_outcome(selector="#new", selector_key="", href_base="", route="/views", result="changed", delta_score=0.0)
+    state.record_explored("#new", "", "button")
+    state.put_cooldown("id=save", "/views", {"fail_count": 2, "cooldown_until": 5.0, "last_seen": 3.0})
+    # Nothing reaches the database until the flush.
+    assert conn.execute("SELECT seen_count FROM exploration_novelty WHERE selector='#save'").fetchone()[0] == 2
+    assert state.novelty_row("#new")["seen_count"] == 2
+
+    # A concurrent runner bumps the same counter; increments must not be lost.
+    conn.execute("UPDATE exploration_novelty SET seen_count=seen_count+5 WHERE selector='#save'")
+    conn.commit()
+    assert state.flush(conn) == 4
+    assert state.pending() == 0
+    rows = dict(conn.execute("SELECT selector, seen_count FROM exploration_novelty").fetchall())
+    assert rows == {"#save": 8, "#new": 2}
+    cd = conn.execute("SELECT fail_count, cooldown_until, last_reason, last_run_id FROM selector_cooldowns").fetchone()
+    assert cd == (2, 5.0, "timeout", "r0")
+    assert conn.execute("SELECT COUNT(*) FROM exploration_history").fetchone()[0] == 2
+
+    state.record_outcome(selector="#new", selector_key="", href_base="", route="/x", result="reward", delta_score=-0.3)
+    state.flush(conn)
+    assert conn.execute("SELECT seen_count, route FROM exploration_novelty WHERE selector='#new'").fetchone() == (3, "/x")
+    assert conn.execute("SELECT COUNT(*) FROM exploration_novelty").fetchone()[0] == 2
+
+
+def test_activate_is_reentrant(tmp_path: Path):
+    db = tmp_path / "knowledge.db"
+    loads = []
+    outer = exploration_state.activate(db, loads.append)
+    inner = exploration_state.activate(db, loads.append)
+    assert outer is inner and len(loads) == 1
+    assert exploration_state.active_state(db) is outer
+    assert exploration_state.deactivate(db) is None
+    assert exploration_state.deactivate(db) is outer
+    assert exploration_state.active_state(db) is None
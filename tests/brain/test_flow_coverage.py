@@ -0,0 +1,86 @@
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+from guardian import BGLGuardian  # type: ignore
+from schema_migrations import ensure_schema  # type: ignore
+
+
+FLOWS = [
+    {"title": "Login", "file": "login.md", "endpoints": ["/login", "/dashboard"], "events": [], "valid": True},
+    {"title": "Reports", "file": "reports.md", "endpoints": ["/reports"], "events": [], "valid": True},
+]
+
+
+def _seed(db: Path, deltas) -> None:
+    ensure_schema(db)
+    now = time.time()
+    conn = sqlite3.connect(str(db))
+    conn.executemany(
+        "INSERT INTO runtime_events (timestamp, session, event_type, route, status) VALUES (?, 's1', 'api_call', ?, 200)",
+        [(now - 60 + i, "/login" if i < 6 else "/dashboard") for i in range(12)]
+        + [(now - 30 * 86400, "/reports")],
+    )
+    conn.executemany(
+        "INSERT INTO ui_flow_transitions (created_at, session, from_url, to_url, action, semantic_delta_json) "
+        "VALUES (?, 's1', '/login', '/dashboard', 'click', ?)",
+        [(ts, payload) for ts, payload in deltas],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _guardian(db: Path, monkeypatch) -> BGLGuardian:
+    for key in ("BGL_FLOW_REQUIRE_EVENTS", "BGL_FLOW_SEQUENCE_INFER", "BGL_FLOW_MIN_EVENTS"):
+        monkeypatch.delenv(key, raising=False)
+    guardian = BGLGuardian(ROOT)
+    guardian.db_path = db
+    guardian.config = {}
+    monkeypatch.setattr(guardian, "_parse_flow_docs", lambda: [dict(f) for f in FLOWS])
+    return guardian
+
+
+def test_flow_coverage_counts_only_truthy_semantic_changes(tmp_path: Path, monkeypatch):
+    now = time.time()
+    deltas = [
+        (now - 50, json.dumps({"changed": True, "added": ["#total"]})),
+        (now - 40, json.dumps({"changed": False, "note": "changed"})),
+        (now - 30, json.dumps({"summary": {"changed": True}})),
+        (now - 20, json.dumps({"added": []})),
+        (now - 10, None),
+        (now - 30 * 86400, json.dumps({"changed": True})),
+    ]
+    db = tmp_path / "knowledge.db"
+    _seed(db, deltas)
+    guardian = _guardian(db, monkeypatch)
+
+    conn = sqlite3.connect(str(db))
+    assert guardian._count_semantic_changes(conn, now - 14 * 86400) == 1
+    conn.close()
+
+    report = guardian._compute_flow_coverage(days=14)
+    assert report["total_flows"] == 2
+    assert report["events_total"] == 12
+    assert report["semantic_change_count"] == 1
+    assert report["covered_flows"] == 1 and report["coverage_ratio"] == 50.0
+    assert report["operational_covered_flows"] == 1
+    assert report["reliable"] is True and report["reliability_reason"] == ""
+    status = {d["flow"]: d["status"] for d in report["details"]}
+    assert status == {"Login": "covered", "Reports": "uncovered"}
+    assert [d["flow"] for d in report["uncovered_sample"]] == ["Reports"]
+
+
+def test_flow_coverage_without_semantic_changes_is_not_operational(tmp_path: Path, monkeypatch):
+    now = time.time()
+    db = tmp_path / "knowledge.db"
+    _seed(db, [(now - 40, json.dumps({"changed": False})), (now - 20, json.dumps({"added": ["x"]}))])
+    report = _guardian(db, monkeypatch)._compute_flow_coverage(days=14)
+    assert report["semantic_change_count"] == 0
+    assert report["covered_flows"] == 1
+    assert report["operational_covered_flows"] == 0 and report["operational_coverage_ratio"] == 0.0
+    assert report["reliable"] is False and report["reliability_reason"] == "no_semantic_changes"
@@ -0,0 +1,92 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+from flow_index import FlowSessionIndex, RouteSequence, resolve_steps  # type: ignore
+
+
+def _db(tmp_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(tmp_path / "knowledge.db"))
+    conn.execute(
+        "CREATE TABLE runtime_events (id INTEGER PRIMARY KEY, timestamp REAL, session TEXT, event_type TEXT, route TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE ui_flow_transitions (id INTEGER PRIMARY KEY, created_at REAL, session TEXT, "
+        "from_url TEXT, to_url TEXT, action TEXT, selector TEXT)"
+    )
+    return conn
+
+
+def _event(conn, ts, sess, route, ev="api_call"):
+    conn.execute(
+        "INSERT INTO runtime_events (timestamp, session, event_type, route) VALUES (?, ?, ?, ?)",
+        (ts, sess, ev, route),
+    )
+    conn.commit()
+
+
+def _norm(value: str) -> str:
+    return value.split("?")[0].rstrip("/") or "/"
+
+
+def test_route_sequence_in_order():
+    seq = RouteSequence(["/a", "/b", "/a", "/c"])
+    assert seq.contains_in_order([{"/a"}, {"/c"}])
+    assert seq.contains_in_order([{"/b"}, {"/a"}, {"/c"}])
+    assert not seq.contains_in_order([{"/c"}, {"/b"}])
+    assert not seq.contains_in_order([{"/a"}, {"/a"}, {"/a"}])
+    steps = resolve_steps({"/a", "/a/1", "/b"}, [lambda r: r.startswith("/a")])
+    assert steps == [{"/a", "/a/1"}]
+
+
+def test_incremental_refresh_and_first_match(tmp_path: Path):
+    conn = _db(tmp_path)
+    idx = FlowSessionIndex(_norm, action_types={"api_call"})
+    _event(conn, 10, "s1", "/login")
+    _event(conn, 11, "s2", "/login")
+    _event(conn, 12, "s2", "/dash")
+    _event(conn, 13, "s1", "/ignored", ev="route_check")
+    assert idx.refresh(conn, 0)["rebuilt"]
+    assert idx.first_match([{"/login"}, {"/dash"}]) == "s2"
+
+    _event(conn, 14, "s1", "/dash?x=1")
+    stats = idx.refresh(conn, 0)
+    assert not stats["rebuilt"] and stats["rows_ingested"] == 1
+    # s1 started first, so it wins once its sequence matches too.
+    assert idx.first_match([{"/login"}, {"/dash"}]) == "s1"
+    assert idx.first_match([{"/dash"}, {"/login"}]) is None
+
+    # Sliding the window drops s1's /login (ts 10) and its match.
+    idx.refresh(conn, 10.5)
+    assert idx.first_match([{"/login"}, {"/dash"}]) == "s2"
+    assert "/ignored" not in idx.routes()
+
+
+def test_transitions_from_counts_per_normalized_route(tmp_path: Path):
+    conn = _db(tmp_path)
+    rows = [
+        (1, "s", "/a?x=1", "/b", "click", "#go"),
+        (2, "s", "/a", "/b", "click", "#go"),
+        (3, "s", "/a/", "/c", "click", ""),
+        (4, "s", "/a", "/c", "click", ""),
+        (5, "s", "/a", "/c", "click", ""),
+        (6, "s", "/z", "/a", "click", "#z"),
+    ]
+    conn.executemany(
+        "INSERT INTO ui_flow_transitions (created_at, session, from_url, to_url, action, selector) VALUES (?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    idx = FlowSessionIndex(_norm, include_events=False)
+    idx.refresh(conn, 0)
+    out = idx.transitions_from("/a", limit=0)
+    assert out[0] == {"to": "/c", "action": "click", "selector": "", "count": 3}
+    assert out[1] == {"to": "/b", "action": "click", "selector": "#go", "count": 2}
+    assert idx.transition_routes() == {"/a", "/b", "/c", "/z"}
+    idx.refresh(conn, 5.5)
+    assert idx.transitions_from("/a") == []
+    assert idx.transition_routes() == {"/z", "/a"}
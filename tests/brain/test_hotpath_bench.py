@@ -0,0 +1,33 @@
+import json
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import hotpath_bench  # type: ignore
+
+
+def test_evaluate_gates_on_percentage_and_floor():
+    assert hotpath_bench.evaluate(1.0, None, max_regression_pct=20) == ("BASELINE", 0.0)
+    assert hotpath_bench.evaluate(1.1, 1.0, max_regression_pct=20) == ("SUCCESS", 10.0)
+    assert hotpath_bench.evaluate(1.5, 1.0, max_regression_pct=20) == ("REGRESSION", 50.0)
+    # Tiny absolute deltas are noise, not regressions.
+    assert hotpath_bench.evaluate(0.03, 0.02, max_regression_pct=20, min_delta_ms=0.05)[0] == "SUCCESS"
+
+
+def test_run_bench_records_baseline_then_detects_regression(tmp_path: Path):
+    results = tmp_path / "benchmark_results.json"
+    results.write_text(json.dumps([{"case": "Structural_Rename", "status": "SUCCESS"}]), encoding="utf-8")
+    kwargs = dict(rounds=3, warmup=0, results_path=results, fixture_events=300)
+    first = hotpath_bench.run_bench(["context_digest_summarize", "load_config"], **kwargs)
+    assert [r["status"] for r in first] == ["BASELINE", "BASELINE"]
+    stored = json.loads(results.read_text(encoding="utf-8"))
+    assert stored[0]["case"] == "Structural_Rename"
+    assert stored[1]["baseline_median_ms"] == first[0]["median_ms"] > 0
+
+    stored[1]["baseline_median_ms"] = first[0]["median_ms"] / 100.0
+    results.write_text(json.dumps(stored), encoding="utf-8")
+    second = hotpath_bench.run_bench(["context_digest_summarize"], max_regression_pct=25, **kwargs)
+    assert second[0]["status"] == "REGRESSION" and second[0]["change_pct"] > 25
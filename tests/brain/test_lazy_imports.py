@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+from lazy_imports import is_available, is_loaded, lazy_import  # type: ignore
+from startup_profiler import parse_importtime  # type: ignore
+
+
+def test_lazy_import_defers_body_until_attribute_access():
+    sys.modules.pop("colorsys", None)
+    mod = lazy_import("colorsys")
+    assert not is_loaded("colorsys")
+    assert mod.rgb_to_hsv(1.0, 0.0, 0.0)[0] == 0.0
+    assert is_loaded("colorsys")
+
+
+def test_missing_dependency_raises_only_on_use():
+    mod = lazy_import("bgl_definitely_missing_pkg")
+    assert not mod
+    assert not is_available("bgl_definitely_missing_pkg")
+    with pytest.raises(ModuleNotFoundError):
+        mod.anything
+
+
+def test_parse_importtime_tree():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     _io",
+            "import time:       300 |        420 |   encodings",
+            "import time:        50 |        900 | guardian",
+        ]
+    )
+    rows = parse_importtime(stderr)
+    assert [r["module"] for r in rows] == ["_io", "encodings", "guardian"]
+    assert [r["depth"] for r in rows] == [2, 1, 0]
+    assert rows[-1]["cumulative_us"] == 900
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import sqlite3
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import load_generator  # type: ignore
+from schema_migrations import ensure_schema  # type: ignore
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.path == "/slow":
+            time.sleep(0.05)
+        code = 500 if self.path == "/fail" else 200
+        body = b"ok"
+        self.send_response(code)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+def test_histogram_and_schedule():
+    h = load_generator.LatencyHistogram()
+    for i in range(1, 10001):
+        h.record(i / 10.0)
+    s = h.summary()
+    for name, expected in (("p50", 500.0), ("p99", 990.0), ("p999", 999.0)):
+        assert abs(s[name] - expected) / expected < 0.011
+    assert s["max"] == 1000.0
+
+    profile = load_generator.build_profile(10, 3, ramp=1)
+    assert len(load_generator.arrival_times(profile)) == 25  # 5 during the ramp + 2s at 10 rps
+    assert load_generator.parse_route("POST /api/x.php=3") == ("POST", "/api/x.php", 3.0)
+    assert load_generator.parse_route("/v.php?id=1") == ("GET", "/v.php?id=1", 1.0)
+
+
+def test_open_loop_run_report_and_events(tmp_path: Path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        routes = [("GET", "/fast", 3.0), ("GET", "/slow", 1.0), ("POST", "/fail", 1.0)]
+        report = asyncio.run(
+            load_generator.run_load(base, routes, [(0.0, 100.0), (1.0, 100.0)], seed=1, timeout=5)
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert report["scheduled"] == report["requests"] == 100
+    by_route = report["routes"]
+    assert sum(r["count"] for r in by_route.values()) == 100
+    assert by_route["GET /fast"]["count"] > by_route["GET /slow"]["count"]
+    assert by_route["POST /fail"]["errors"] == by_route["POST /fail"]["count"] > 0
+    assert by_route["GET /slow"]["latency_ms"]["p50"] >= 45.0
+    assert report["errors"] == by_route["POST /fail"]["errors"]
+
+    records = load_generator.benchmark_records(report, [], max_regression_pct=30, min_delta_ms=5)
+    assert records[0]["case"] == "load:all" and records[0]["status"] == "BASELINE"
+    slower = [dict(records[0], baseline_p99_ms=records[0]["p99_ms"] / 3)]
+    again = load_generator.benchmark_records(report, slower, max_regression_pct=30, min_delta_ms=0)
+    assert again[0]["status"] == "REGRESSION"
+
+    db = tmp_path / "knowledge.db"
+    ensure_schema(db)
+    assert load_generator.log_report_events(db, "load_test", report) == len(by_route) + 1
+    with sqlite3.connect(str(db)) as conn:
+        kinds = conn.execute(
+            "SELECT event_type, COUNT(*) FROM runtime_events WHERE run_id='load_test' GROUP BY event_type"
+        ).fetchall()
+    assert dict(kinds) == {"load_test_route": len(by_route), "load_test_summary": 1}
+
+
+def test_route_mix_normalizes_event_urls_and_results_upsert(tmp_path: Path):
+    db = tmp_path / "knowledge.db"
+    ensure_schema(db)
+    now = time.time()
+    with sqlite3.connect(str(db)) as conn:
+        conn.executemany(
+            "INSERT INTO routes (uri, http_method) VALUES (?, ?)",
+            [("/api/a.php", "GET"), ("/api/b.php", "GET")],
+        )
+        conn.executemany(
+            "INSERT INTO runtime_events (timestamp, event_type, route) VALUES (?, 'http', ?)",
+            [(now, r) for r in ("http://localhost:8000/api/a.php?id=1", "/api/a.php", "https://x/api/a.php/")],
+        )
+    mix = {uri: w for _m, uri, w in load_generator.route_mix(db)}
+    assert mix == {"/api/a.php": 4.0, "/api/b.php": 1.0}
+
+    results = tmp_path / "benchmark_results.json"
+    load_generator.upsert_results(results, [{"case": "hotpath:x", "p": 1}, {"case": "load:all", "p": 1}])
+    load_generator.upsert_results(results, [{"case": "load:all", "p": 2}])
+    assert json.loads(results.read_text(encoding="utf-8")) == [
+        {"case": "hotpath:x", "p": 1},
+        {"case": "load:all", "p": 2},
+    ]
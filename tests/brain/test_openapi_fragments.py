@@ -0,0 +1,94 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import generate_openapi  # type: ignore
+
+
+def _project(tmp_path: Path) -> Path:
+    (tmp_path / "docs").mkdir()
+    (tmp_path / ".bgl_core" / "brain").mkdir(parents=True)
+    (tmp_path / "api").mkdir()
+    (tmp_path / "docs" / "openapi.manual.yaml").write_text(
+        "openapi: 3.0.0\ninfo:\n  title: Seed\n  version: '0.1'\npaths:\n"
+        "  /api/a.php:\n    get:\n      summary: Manual A\n      responses:\n        '200':\n          description: OK\n",
+        encoding="utf-8",
+    )
+    conn = sqlite3.connect(str(tmp_path / ".bgl_core" / "brain" / "knowledge.db"))
+    conn.execute("CREATE TABLE routes (id INTEGER PRIMARY KEY, uri TEXT, http_method TEXT, file_path TEXT)")
+    for name, method in (("a", "GET"), ("b", "ANY"), ("c", "POST")):
+        src = tmp_path / "api" / f"{name}.php"
+        src.write_text(f"<?php // {name}", encoding="utf-8")
+        conn.execute("INSERT INTO routes (uri, http_method, file_path) VALUES (?, ?, ?)", (f"/api/{name}.php", method, str(src)))
+    conn.commit()
+    conn.close()
+    return tmp_path
+
+
+def _outputs(root: Path):
+    return tuple((root / "docs" / n).read_bytes() for n in ("openapi.generated.yaml", "openapi.yaml"))
+
+
+def test_fragment_cache_is_byte_identical(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(generate_openapi.time, "strftime", lambda *a: "2026-01-01 00:00:00")
+    root = _project(tmp_path)
+    monkeypatch.setenv("BGL_OPENAPI_CACHE", "0")
+    generate_openapi.generate(root)
+    full = _outputs(root)
+    assert b"summary: Manual A" in full[1] and b"/api/c.php:\n    post:" in full[0]
+
+    monkeypatch.setenv("BGL_OPENAPI_CACHE", "1")
+    stats: dict = {}
+    generate_openapi.generate(root, stats=stats)
+    assert stats["fragments_rebuilt"] == 3 and _outputs(root) == full
+    generate_openapi.generate(root, stats=stats)
+    assert (stats["fragments_hit"], stats["fragments_rebuilt"], stats["manual_cached"]) == (3, 0, True)
+    assert _outputs(root) == full
+
+    # Fragments depend on uri + methods only; editing the PHP source is a hit.
+    (root / "api" / "b.php").write_text("<?php // b changed", encoding="utf-8")
+    generate_openapi.generate(root, stats=stats)
+    assert (stats["fragments_hit"], stats["fragments_rebuilt"]) == (3, 0)
+    assert _outputs(root) == full
+
+    conn = sqlite3.connect(str(root / ".bgl_core" / "brain" / "knowledge.db"))
+    conn.execute("UPDATE routes SET http_method = 'PUT' WHERE uri = '/api/c.php'")
+    conn.commit()
+    conn.close()
+    generate_openapi.generate(root, stats=stats)
+    assert (stats["fragments_hit"], stats["fragments_rebuilt"]) == (2, 1)
+    assert b"/api/c.php:\n    put:" in _outputs(root)[0]
+
+
+def test_manual_anchors_render_identically(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(generate_openapi.time, "strftime", lambda *a: "2026-01-01 00:00:00")
+    root = _project(tmp_path)
+    (root / "docs" / "openapi.manual.yaml").write_text(
+        "openapi: 3.0.0\ninfo:\n  title: Seed\n  version: '0.1'\n"
+        "x-ok: &ok\n  '200':\n    description: OK\n"
+        "paths:\n"
+        "  /api/a.php:\n    get:\n      responses: *ok\n"
+        "  /api/m.php:\n    post:\n      responses: *ok\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("BGL_OPENAPI_CACHE", "0")
+    generate_openapi.generate(root)
+    full = _outputs(root)
+    assert b"&" not in full[1] and b"*" not in full[1]
+
+    monkeypatch.setenv("BGL_OPENAPI_CACHE", "1")
+    generate_openapi.generate(root)
+    assert _outputs(root) == full
+    generate_openapi.generate(root)
+    assert _outputs(root) == full
+
+    shared = {"200": {"description": "OK"}}
+    doc = {"openapi": "3.0.0", "paths": {"/a": {"get": {"responses": shared}}, "/b": {"post": {"responses": shared}}}}
+    spliced = generate_openapi._render(
+        dict(doc, paths={}), [generate_openapi._path_fragment(u, ops) for u, ops in doc["paths"].items()]
+    )
+    assert spliced == generate_openapi._dump(doc)
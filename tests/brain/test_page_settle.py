@@ -0,0 +1,71 @@
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import page_settle  # type: ignore
+
+NODE = shutil.which("node")
+
+# A page whose last mutation is long past when the wait starts; an action's
+# update then lands `delay_ms` into the wait. `anims` are fake Web Animations
+# that stop running `until` ms into the wait (null: never; iterations null: Infinity).
+_HARNESS = """
+const opts = %(opts)s;
+global.requestAnimationFrame = (cb) => setTimeout(cb, 16);
+global.window = {};
+const started = performance.now();
+const anims = %(anims)s.map((a) => ({
+  get playState() { return a.until === null || performance.now() - started < a.until ? 'running' : 'finished'; },
+  effect: { getComputedTiming: () => ({ iterations: a.iterations === null ? Infinity : a.iterations }) },
+}));
+global.document = { getAnimations: () => anims };
+const s = { pending: 0, mutations: 0, lastMutation: performance.now() - 5000, lastNetwork: performance.now() - 5000 };
+window.__bglSettle = s;
+const wait = (%(js)s);
+setTimeout(() => { s.mutations += 1; s.lastMutation = performance.now(); }, %(delay)d);
+wait(opts).then((res) => { console.log(JSON.stringify(res)); process.exit(0); });
+"""
+
+
+def _run(delay_ms: int, anims=(), **opts) -> dict:
+    payload = {"max_ms": 2000, "min_ms": 0, "quiet_ms": 80, "long_poll_ms": 1500, "tick_ms": 5}
+    payload.update(opts)
+    script = _HARNESS % {
+        "opts": json.dumps(payload),
+        "js": page_settle.WAIT_SETTLE_JS,
+        "delay": delay_ms,
+        "anims": json.dumps(list(anims)),
+    }
+    out = subprocess.run([NODE, "-e", script], capture_output=True, text=True, timeout=20)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.skipif(NODE is None, reason="node not available")
+def test_stale_last_mutation_does_not_settle_before_delayed_update():
+    res = _run(40)
+    assert res["settled"] and res["reason"] == "quiet"
+    assert res["mutations"] == 1
+    assert res["waited_ms"] >= 40 + 80
+
+    res = _run(10_000, min_ms=150, max_ms=1000)
+    assert res["settled"] and res["waited_ms"] >= 150
+
+
+@pytest.mark.skipif(NODE is None, reason="node not available")
+def test_running_animations_delay_settle_within_max_ms():
+    res = _run(10_000, anims=[{"until": 300, "iterations": 1}])
+    assert res["settled"] and res["waited_ms"] >= 300 and res["animations"] == 0
+
+    # Infinite loops (spinners) do not hold the page; a stuck finite one hits max_ms.
+    res = _run(10_000, anims=[{"until": None, "iterations": None}])
+    assert res["settled"] and res["waited_ms"] < 300
+    res = _run(10_000, anims=[{"until": None, "iterations": 1}], max_ms=400)
+    assert not res["settled"] and res["reason"] == "max_wait" and res["animations"] == 1
@@ -0,0 +1,60 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+from indexer import EntityIndexer  # type: ignore
+
+FAKE_SENSOR = """
+import json, sys
+from pathlib import Path
+name = Path(sys.argv[1]).stem
+if name == "broken":
+    print(json.dumps({"status": "error", "message": "Parse Error"}))
+    sys.exit(0)
+print(json.dumps({"status": "success", "data": [
+    {"type": "root", "name": "global", "line": 1, "calls": []},
+    {"type": "class", "name": name, "line": 3, "methods": [
+        {"name": "run", "visibility": "public", "line": 4, "calls": [
+            {"type": "static_call", "class": "Db", "method": "find", "line": 5}
+        ]}
+    ]},
+]}))
+"""
+
+
+def test_parallel_index_writes_batches_and_skips_unchanged(tmp_path: Path):
+    app = tmp_path / "app"
+    (app / "vendor" / "lib").mkdir(parents=True)
+    (app / "src").mkdir()
+    for i in range(7):
+        (app / "src" / f"C{i}.php").write_text("<?php", encoding="utf-8")
+    (app / "src" / "broken.php").write_text("<?php", encoding="utf-8")
+    (app / "vendor" / "lib" / "V.php").write_text("<?php", encoding="utf-8")
+    sensor = tmp_path / "sensor.py"
+    sensor.write_text(FAKE_SENSOR, encoding="utf-8")
+
+    db = tmp_path / "knowledge.db"
+    seen = []
+    indexer = EntityIndexer(app, db, workers=2, batch_size=3, progress=seen.append)
+    indexer.sensor_cmd = [sys.executable, str(sensor)]
+    indexer.queue_size = 2
+    stats = indexer.index_project()
+
+    assert stats["indexed"] == 7
+    assert stats["failed"] == 1
+    assert seen and seen[-1]["final"]
+    conn = sqlite3.connect(str(db))
+    assert conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 7
+    assert conn.execute("SELECT COUNT(*) FROM entities WHERE type='class'").fetchone()[0] == 7
+    assert conn.execute("SELECT COUNT(*) FROM calls WHERE target_entity='Db'").fetchone()[0] == 7
+    conn.close()
+
+    again = EntityIndexer(app, db, workers=2, progress=seen.append)
+    again.sensor_cmd = [sys.executable, str(sensor)]
+    stats = again.index_project()
+    assert stats["indexed"] == 0
+    assert stats["failed"] == 1
@@ -0,0 +1,86 @@
+import sqlite3
+import time
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+from runtime_partitions import (  # type: ignore
+    archive_runtime_events,
+    full_history,
+    hot_meta,
+    rollup_scenario_stats,
+)
+from schema_migrations import ensure_schema  # type: ignore
+
+
+def test_archive_moves_cold_rows_and_keeps_history(tmp_path: Path):
+    db = tmp_path / "knowledge.db"
+    ensure_schema(db)
+    now = time.time()
+    conn = sqlite3.connect(str(db))
+    rows = [
+        (now - 86400 * day, "scn_a", "scenario_step_timeout" if day % 4 == 0 else "ui_click", "/x", 200)
+        for day in range(60)
+    ]
+    conn.executemany(
+        "INSERT INTO runtime_events (timestamp, scenario_id, event_type, route, status) VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+
+    stats = archive_runtime_events(db, hot_days=10, batch_size=7, archive_dir=tmp_path / "arc")
+    assert "error" not in stats
+    assert stats["archived"] == 50
+
+    meta = hot_meta(conn)
+    assert meta["count"] == 10
+    assert meta["archived_count"] == 50
+
+    archived = rollup_scenario_stats(conn)
+    assert archived["scn_a"]["count"] == 50
+    conn.close()
+
+    with full_history(db, archive_dir=tmp_path / "arc") as hist:
+        total = hist.execute("SELECT COUNT(*) FROM runtime_events_all").fetchone()[0]
+    assert total == 60
+
+    again = archive_runtime_events(db, hot_days=10, archive_dir=tmp_path / "arc")
+    assert again["archived"] == 0
+
+
+def test_rearchive_counts_only_new_rows_and_history_spans_all_months(tmp_path: Path):
+    db = tmp_path / "knowledge.db"
+    ensure_schema(db)
+    conn = sqlite3.connect(str(db))
+    # One event per month for 14 months, well past the attach limit.
+    base = time.time() - 86400 * 45
+    conn.executemany(
+        "INSERT INTO runtime_events (timestamp, scenario_id, event_type, route) VALUES (?, 'scn_b', 'ui_click', '/y')",
+        [(base - 86400 * 31 * m,) for m in range(14)],
+    )
+    conn.commit()
+    first = archive_runtime_events(db, hot_days=10, archive_dir=tmp_path / "arc")
+    assert first["archived"] == 14
+
+    # Simulate a crash after the archive write: the row is back in the hot table.
+    with full_history(db, archive_dir=tmp_path / "arc") as hist:
+        row = hist.execute("SELECT id, timestamp FROM runtime_events_all ORDER BY id LIMIT 1").fetchone()
+    conn.execute(
+        "INSERT INTO runtime_events (id, timestamp, scenario_id, event_type, route) VALUES (?, ?, 'scn_b', 'ui_click', '/y')",
+        row,
+    )
+    conn.commit()
+    again = archive_runtime_events(db, hot_days=10, archive_dir=tmp_path / "arc")
+    assert again["archived"] == 0 and again["already_archived"] == 1
+    assert hot_meta(conn)["count"] == 0
+    assert hot_meta(conn)["archived_count"] == 14
+    assert rollup_scenario_stats(conn)["scn_b"]["count"] == 14
+    conn.close()
+
+    with full_history(db, archive_dir=tmp_path / "arc") as hist:
+        assert hist.execute("SELECT COUNT(*) FROM runtime_events_all").fetchone()[0] == 14
+    with full_history(db, months=3, archive_dir=tmp_path / "arc") as hist:
+        assert hist.execute("SELECT COUNT(*) FROM runtime_events_all").fetchone()[0] == 3
@@ -0,0 +1,92 @@
+import sqlite3
+from pathlib import Path
+import sys
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+from schema_migrations import (  # type: ignore
+    LATEST_VERSION,
+    ensure_schema,
+    is_migrated,
+    schema_current,
+)
+
+
+def test_ensure_schema_upgrades_legacy_db(tmp_path: Path):
+    db = tmp_path / "knowledge.db"
+    conn = sqlite3.connect(str(db))
+    conn.execute(
+        "CREATE TABLE runtime_events (id INTEGER PRIMARY KEY, timestamp REAL NOT NULL, event_type TEXT NOT NULL)"
+    )
+    conn.commit()
+    conn.close()
+
+    assert ensure_schema(db) is True
+    assert is_migrated(db) is True
+
+    conn = sqlite3.connect(str(db))
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == LATEST_VERSION
+    assert schema_current(conn) is True
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(runtime_events)").fetchall()}
+    assert {"run_id", "scenario_id", "goal_id", "source", "step_id"}.issubset(cols)
+    tables = {
+        r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    assert {"selector_cooldowns", "exploration_outcomes", "ui_flow_transitions"}.issubset(tables)
+    conn.close()
+
+
+def test_schema_current_false_for_fresh_db(tmp_path: Path):
+    conn = sqlite3.connect(str(tmp_path / "fresh.db"))
+    assert schema_current(conn) is False
+    conn.close()
+
+
+def test_failed_migration_rolls_back_its_ddl(tmp_path: Path, monkeypatch):
+    import schema_migrations  # type: ignore
+
+    def _broken(conn: sqlite3.Connection) -> None:
+        conn.execute("CREATE TABLE half_done (id INTEGER PRIMARY KEY)")
+        raise RuntimeError("boom")
+
+    first = schema_migrations.MIGRATIONS[0]
+    monkeypatch.setattr(schema_migrations, "MIGRATIONS", [first, (first[0] + 1, "broken", _broken)])
+    conn = sqlite3.connect(str(tmp_path / "partial.db"))
+    try:
+        schema_migrations.apply_migrations(conn)
+    except RuntimeError:
+        pass
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert "half_done" not in tables and "files" in tables
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == first[0]
+    conn.close()
+
+
+def test_failed_ensure_schema_backs_off_and_logs_once(tmp_path: Path, monkeypatch, capsys):
+    import schema_migrations  # type: ignore
+
+    calls = []
+
+    def _broken(conn: sqlite3.Connection) -> None:
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(schema_migrations, "MIGRATIONS", [(1, "broken", _broken)])
+    monkeypatch.setattr(schema_migrations, "LATEST_VERSION", 1)
+    schema_migrations.reset_cache()
+    db = tmp_path / "stuck.db"
+    try:
+        assert [schema_migrations.ensure_schema(db) for _ in range(3)] == [False] * 3
+        assert len(calls) == 1
+
+        # Once the backoff elapses the chain is retried, without logging again.
+        key = schema_migrations._key(db)
+        schema_migrations._FAILED[key] = (0.0, schema_migrations._FAILED[key][1])
+        assert schema_migrations.ensure_schema(db) is False
+        assert len(calls) == 2
+        assert schema_migrations._FAILED[key][0] > 0
+        assert capsys.readouterr().out.count("migrating") == 1
+    finally:
+        schema_migrations.reset_cache()
@@ -0,0 +1,49 @@
+import asyncio
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import scenario_runner  # type: ignore
+
+
+class _FakePage:
+    """querySelector only understands CSS; query_selector also resolves Playwright syntax."""
+
+    def __init__(self, css_matches, pw_matches):
+        self.css_matches = set(css_matches)
+        self.pw_matches = set(pw_matches)
+        self.queried = []
+
+    async def evaluate(self, _js, opts):
+        items = [{"query": s} for s in opts.get("selectors") or [] if s in self.css_matches]
+        return {"gen": "g1", "items": items}
+
+    async def query_selector(self, sel):
+        self.queried.append(sel)
+        return object() if sel in self.pw_matches else None
+
+
+def test_present_selectors_resolves_has_text_reveals():
+    reveals = scenario_runner._text_reveal_selectors(["Advanced", "Missing"])
+    assert reveals and all(":has-text(" in s for s in reveals)
+    page = _FakePage(css_matches={"#toggle"}, pw_matches={reveals[0]})
+    present = asyncio.run(scenario_runner._present_selectors(page, ["#toggle", "#absent"] + reveals))
+    assert present == {"#toggle", reveals[0]}
+    assert "#toggle" not in page.queried and set(page.queried) == set(reveals)
+
+
+def test_selector_candidates_keep_distinct_elements_sharing_fallback():
+    ui_map = [
+        {"tag": "button", "text": "Save", "index": 0, "gen": "g1"},
+        {"tag": "button", "text": "Save", "index": 1, "gen": "g1"},
+        {"tag": "button", "text": "Save", "index": 1, "gen": "g1"},
+    ]
+    cands = scenario_runner._build_selector_candidates(ui_map)
+    assert len(cands) == 2
+    assert cands[0]["selector"] == cands[1]["selector"]
+
+    legacy = [{"tag": "a", "href": "/x"}, {"tag": "a", "href": "/x"}]
+    assert len(scenario_runner._build_selector_candidates(legacy)) == 1
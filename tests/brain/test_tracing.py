@@ -0,0 +1,82 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / ".bgl_core" / "brain"))
+
+import tracing  # type: ignore
+
+
+def _setup(tmp_path: Path, batch: int = 100) -> Path:
+    db = tmp_path / "knowledge.db"
+    tracing.reset()
+    tracing.configure(enabled=True, db_path=db, batch_size=batch)
+    tracing.set_run("run_test")
+    return db
+
+
+def test_spans_nest_across_tasks_and_flush_in_batches(tmp_path: Path, monkeypatch):
+    monkeypatch.delenv("BGL_TRACE_PARENT", raising=False)
+    db = _setup(tmp_path, batch=4)
+
+    @tracing.traced("child")
+    async def child(i: int) -> int:
+        await asyncio.sleep(0)
+        with tracing.span("leaf", i=i):
+            pass
+        return i
+
+    async def run() -> None:
+        with tracing.span("root"):
+            await asyncio.gather(*(asyncio.create_task(child(i)) for i in range(3)))
+
+    asyncio.run(run())
+    # 7 spans with batch 4: one batch written on the way, the rest still buffered.
+    assert tracing.stats["batches"] == 1
+    assert tracing.flush() == 3
+
+    spans = {s["span_id"]: s for s in tracing.load_spans(db, "run_test")}
+    assert len(spans) == 7
+    by_name: dict = {}
+    for s in spans.values():
+        by_name.setdefault(s["name"], []).append(s)
+    root_id = by_name["root"][0]["span_id"]
+    assert by_name["root"][0]["parent_id"] is None
+    assert all(s["parent_id"] == root_id for s in by_name["child"])
+    child_ids = {s["span_id"] for s in by_name["child"]}
+    assert {s["parent_id"] for s in by_name["leaf"]} == child_ids
+    assert sorted(s["attrs"]["i"] for s in by_name["leaf"]) == [0, 1, 2]
+
+    tree = tracing.flame_tree(list(spans.values()))
+    node = tree["children"]["root"]["children"]["child"]
+    assert node["count"] == 3 and node["children"]["leaf"]["count"] == 3
+    assert "root" in tracing.render_flame(list(spans.values()))
+
+    events = tracing.chrome_trace(list(spans.values()))["traceEvents"]
+    assert sum(1 for e in events if e["ph"] == "X") == 7
+    json.dumps(events)
+    tracing.reset()
+
+
+def test_errors_env_parent_and_disabled(tmp_path: Path, monkeypatch):
+    db = _setup(tmp_path)
+    monkeypatch.setenv("BGL_TRACE_PARENT", "parentspan")
+    try:
+        with tracing.span("boom"):
+            raise ValueError("x")
+    except ValueError:
+        pass
+    tracing.flush()
+    (s,) = tracing.load_spans(db, "run_test")
+    assert s["parent_id"] == "parentspan"
+    assert s["status"] == "error" and s["attrs"]["error"] == "ValueError"
+
+    tracing.configure(enabled=False)
+    with tracing.span("skipped") as noop:
+        noop.set(a=1)
+    assert tracing.flush() == 0
+    assert tracing.current_span() is None
+    tracing.reset()